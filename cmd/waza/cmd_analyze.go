@@ -0,0 +1,129 @@
+package main
+
+import (
+	"encoding/json"
+	"fmt"
+	"os"
+	"strings"
+	"text/tabwriter"
+
+	"github.com/spboyer/waza/internal/telemetry"
+	"github.com/spf13/cobra"
+)
+
+func newAnalyzeCommand() *cobra.Command {
+	var (
+		skill      string
+		outputPath string
+		statePath  string
+		workers    int
+		asJSON     bool
+	)
+
+	cmd := &cobra.Command{
+		Use:   "analyze <path...>",
+		Short: "Summarize runtime telemetry",
+		Long: `Compute success rate, duration and tool call metrics over runtime telemetry
+sessions, overall and per skill.
+
+Paths are files or directories of telemetry: JSON lines files written by the
+telemetry sink, plain or gzipped, and JSON arrays exported by a collector.
+Files are streamed, one session at a time, and read in parallel.
+
+With --incremental, the analysis is kept in a state file and each run only
+reads the files, and the lines appended to files, that are new since the
+last one. The metrics still cover everything read so far.`,
+		Args: cobra.MinimumNArgs(1),
+		RunE: func(cmd *cobra.Command, args []string) error {
+			analyzer := telemetry.NewAnalyzer(telemetry.WithSkill(skill), telemetry.WithParallelism(workers))
+
+			state := telemetry.NewState(skill)
+			if statePath != "" {
+				var err error
+				if state, err = telemetry.LoadState(statePath, skill); err != nil {
+					return err
+				}
+			}
+
+			err := analyzer.Update(state, args...)
+			if state.Aggregate().Sessions == 0 && err != nil {
+				return err
+			}
+			warnScan(err)
+
+			if statePath != "" {
+				if err := state.Save(statePath); err != nil {
+					return fmt.Errorf("failed to save analysis state: %w", err)
+				}
+			}
+
+			agg := state.Aggregate()
+			report := agg.Report()
+			if report.Malformed > 0 {
+				fmt.Fprintf(os.Stderr, "Warning: skipped %d malformed line(s)\n", report.Malformed)
+			}
+
+			if outputPath != "" {
+				data, err := json.MarshalIndent(report, "", "  ")
+				if err != nil {
+					return err
+				}
+				if err := os.WriteFile(outputPath, data, 0644); err != nil {
+					return fmt.Errorf("failed to write analysis: %w", err)
+				}
+			}
+
+			if asJSON {
+				return printJSON(report)
+			}
+			return printAnalysis(agg, report)
+		},
+	}
+
+	cmd.Flags().StringVar(&skill, "skill", "", "Only analyze sessions of this skill")
+	cmd.Flags().StringVarP(&outputPath, "output", "o", "", "Also write the analysis as JSON to this file")
+	cmd.Flags().StringVar(&statePath, "incremental", "", "Keep the analysis in this file and only read what was added since (default with no value: .waza/analyze-state.json)")
+	cmd.Flags().Lookup("incremental").NoOptDefVal = ".waza/analyze-state.json"
+	cmd.Flags().IntVar(&workers, "workers", 0, "Files read in parallel (default: number of CPUs)")
+	cmd.Flags().BoolVar(&asJSON, "json", false, "Print JSON instead of tables")
+
+	return cmd
+}
+
+func printAnalysis(agg *telemetry.Aggregate, report telemetry.Report) error {
+	fmt.Println("Runtime Telemetry Analysis")
+	fmt.Println()
+	fmt.Printf("Sessions analyzed: %d\n", report.Sessions)
+	if names := agg.SkillNames(); len(names) > 0 {
+		fmt.Printf("Skills invoked: %s\n", strings.Join(names, ", "))
+	}
+	fmt.Println()
+
+	w := tabwriter.NewWriter(os.Stdout, 0, 0, 2, ' ', 0)
+	fmt.Fprintln(w, "METRIC\tVALUE")
+	fmt.Fprintf(w, "success_rate\t%.1f%%\n", report.SuccessRate*100)
+	fmt.Fprintf(w, "avg_duration_ms\t%.0f\n", report.AvgDurationMs)
+	fmt.Fprintf(w, "p50_duration_ms\t%.0f\n", report.P50DurationMs)
+	fmt.Fprintf(w, "p95_duration_ms\t%.0f\n", report.P95DurationMs)
+	fmt.Fprintf(w, "p99_duration_ms\t%.0f\n", report.P99DurationMs)
+	fmt.Fprintf(w, "total_tool_calls\t%d\n", report.TotalToolCalls)
+	fmt.Fprintf(w, "avg_tool_calls_per_session\t%.1f\n", report.AvgToolCallsPerSession)
+	if err := w.Flush(); err != nil {
+		return err
+	}
+
+	names := agg.SkillNames()
+	if len(names) == 0 {
+		return nil
+	}
+
+	fmt.Println()
+	w = tabwriter.NewWriter(os.Stdout, 0, 0, 2, ' ', 0)
+	fmt.Fprintln(w, "SKILL\tINVOCATIONS\tSUCCESS\tAVG MS\tP95 MS\tTOOL CALLS")
+	for _, name := range names {
+		m := report.Skills[name]
+		fmt.Fprintf(w, "%s\t%d\t%.1f%%\t%.0f\t%.0f\t%d\n", name, m.Sessions, m.SuccessRate*100,
+			m.AvgDurationMs, m.P95DurationMs, m.TotalToolCalls)
+	}
+	return w.Flush()
+}
@@ -0,0 +1,89 @@
+package main
+
+import (
+	"fmt"
+	"os"
+	"path/filepath"
+
+	"github.com/spboyer/waza/internal/telemetry"
+	"github.com/spf13/cobra"
+	"gopkg.in/yaml.v3"
+)
+
+func newConvertCommand() *cobra.Command {
+	var (
+		outputDir     string
+		skill         string
+		similarity    float64
+		minSessions   int
+		includeFailed bool
+	)
+
+	cmd := &cobra.Command{
+		Use:   "convert <telemetry path...>",
+		Short: "Turn runtime telemetry into eval tasks",
+		Long: `Turn runtime telemetry sessions into eval task files, one per group of
+near-duplicate sessions.
+
+Sessions are grouped when their prompts and tool call sequences are similar
+(estimated with MinHash and locality-sensitive hashing, so millions of
+sessions can be grouped in one pass). Each group becomes one task, made from
+its first successful session and weighted by the group's size, so the
+aggregate score still reflects production traffic. Add expected outcomes to
+the tasks before using them.`,
+		Args: cobra.MinimumNArgs(1),
+		RunE: func(cmd *cobra.Command, args []string) error {
+			if similarity <= 0 || similarity > 1 {
+				return fmt.Errorf("similarity must be in (0, 1], got %v", similarity)
+			}
+
+			clusterer := telemetry.NewClusterer(telemetry.WithSimilarity(similarity))
+			sessions := 0
+			malformed, err := telemetry.ReadSamples(args, skill, func(s *telemetry.Sample) {
+				if s.Success || includeFailed {
+					clusterer.Add(s)
+					sessions++
+				}
+			})
+			if err != nil {
+				return err
+			}
+			if malformed > 0 {
+				fmt.Fprintf(os.Stderr, "Warning: skipped %d malformed record(s)\n", malformed)
+			}
+
+			if err := os.MkdirAll(outputDir, 0755); err != nil {
+				return err
+			}
+
+			clusters := clusterer.Clusters()
+			written := 0
+			for _, cluster := range clusters {
+				if cluster.Size < minSessions {
+					break
+				}
+				task := cluster.Task()
+				data, err := yaml.Marshal(&task)
+				if err != nil {
+					return err
+				}
+				if err := os.WriteFile(filepath.Join(outputDir, task.TestID+".yaml"), data, 0644); err != nil {
+					return err
+				}
+				written++
+			}
+
+			fmt.Printf("Grouped %d session(s) into %d task(s); wrote %d to %s\n",
+				sessions, len(clusters), written, outputDir)
+			return nil
+		},
+	}
+
+	cmd.Flags().StringVarP(&outputDir, "output", "o", "tasks", "Directory to write task files to")
+	cmd.Flags().StringVar(&skill, "skill", "", "Only convert sessions of this skill")
+	cmd.Flags().Float64Var(&similarity, "similarity", telemetry.DefaultSimilarity, "Similarity (0-1) at which sessions are grouped")
+	cmd.Flags().IntVar(&minSessions, "min-sessions", 1, "Skip groups with fewer sessions")
+	cmd.Flags().BoolVar(&includeFailed, "include-failed", false, "Also convert sessions that did not succeed")
+
+	return cmd
+}
@@ -0,0 +1,92 @@
+package main
+
+import (
+	"encoding/json"
+	"errors"
+	"fmt"
+	"os"
+	"path/filepath"
+	"time"
+
+	"github.com/spboyer/waza/internal/models"
+	"github.com/spboyer/waza/internal/store"
+	"github.com/spf13/cobra"
+)
+
+func newExportCommand() *cobra.Command {
+	opts := &queryOptions{}
+	var exportPath string
+
+	cmd := &cobra.Command{
+		Use:   "export [results.json...]",
+		Short: "Export results as columnar NumPy arrays",
+		Long: `Export results as a NumPy .npz archive with one row per (trial, grader).
+
+Rows come from the results store, narrowed by the filters, or from the given
+JSON outputs of 'waza run -o'. See the README for the column layout.`,
+		RunE: func(cmd *cobra.Command, args []string) error {
+			if filepath.Ext(exportPath) != ".npz" {
+				return fmt.Errorf("export path %q must end in .npz", exportPath)
+			}
+
+			var columns *store.Columns
+			if len(args) > 0 {
+				columns = store.NewColumns()
+				for _, path := range args {
+					outcome, err := loadOutcome(path)
+					if err != nil {
+						return err
+					}
+					columns.AddOutcome(outcome)
+				}
+			} else {
+				results, err := opts.open()
+				if err != nil {
+					return err
+				}
+				f, err := opts.filter(time.Now())
+				if err != nil {
+					return err
+				}
+				if columns, err = results.Export(f); err != nil {
+					return err
+				}
+			}
+
+			if err := writeColumns(columns, exportPath); err != nil {
+				return fmt.Errorf("failed to export results: %w", err)
+			}
+
+			fmt.Printf("Exported %d row(s) to %s\n", columns.Len(), exportPath)
+			return nil
+		},
+	}
+
+	opts.addFilterFlags(cmd)
+	cmd.Flags().StringVarP(&exportPath, "output", "o", "results.npz", "Output .npz file")
+
+	return cmd
+}
+
+func loadOutcome(path string) (*models.EvaluationOutcome, error) {
+	data, err := os.ReadFile(path)
+	if err != nil {
+		return nil, err
+	}
+
+	var outcome models.EvaluationOutcome
+	if err := json.Unmarshal(data, &outcome); err != nil {
+		return nil, fmt.Errorf("failed to parse %s: %w", path, err)
+	}
+	return &outcome, nil
+}
+
+func writeColumns(columns *store.Columns, path string) (err error) {
+	f, err := os.Create(path)
+	if err != nil {
+		return err
+	}
+	defer func() { err = errors.Join(err, f.Close()) }()
+
+	return columns.WriteNPZ(f)
+}
@@ -0,0 +1,222 @@
+package main
+
+import (
+	"encoding/json"
+	"fmt"
+	"os"
+	"strconv"
+	"strings"
+	"text/tabwriter"
+	"time"
+
+	"github.com/spboyer/waza/internal/store"
+	"github.com/spf13/cobra"
+)
+
+// queryOptions are the flags shared by the query and trend commands
+type queryOptions struct {
+	dir    string
+	skill  string
+	model  string
+	test   string
+	grader string
+	since  string
+	until  string
+	by     string
+	asJSON bool
+}
+
+func (o *queryOptions) addFilterFlags(cmd *cobra.Command) {
+	cmd.Flags().StringVar(&o.dir, "store", store.DefaultDir, "Results store directory")
+	cmd.Flags().StringVar(&o.skill, "skill", "", "Only runs of this skill")
+	cmd.Flags().StringVar(&o.model, "model", "", "Only runs with this model")
+	cmd.Flags().StringVar(&o.test, "test", "", "Only this test ID")
+	cmd.Flags().StringVar(&o.grader, "grader", "", "Only this grader's results")
+	cmd.Flags().StringVar(&o.since, "since", "", "Only runs since a date (2006-01-02) or age (24h, 7d)")
+	cmd.Flags().StringVar(&o.until, "until", "", "Only runs before a date (2006-01-02) or age (24h, 7d)")
+}
+
+func (o *queryOptions) addFlags(cmd *cobra.Command, defaultBy store.GroupBy) {
+	o.addFilterFlags(cmd)
+	cmd.Flags().StringVar(&o.by, "by", string(defaultBy), "Group by test, model, skill or grader")
+	cmd.Flags().BoolVar(&o.asJSON, "json", false, "Print JSON instead of a table")
+}
+
+func (o *queryOptions) filter(now time.Time) (store.Filter, error) {
+	f := store.Filter{
+		Skill:  o.skill,
+		Model:  o.model,
+		TestID: o.test,
+		Grader: o.grader,
+	}
+
+	var err error
+	if f.Since, err = parseSince(o.since, now); err != nil {
+		return f, fmt.Errorf("invalid --since: %w", err)
+	}
+	if f.Until, err = parseSince(o.until, now); err != nil {
+		return f, fmt.Errorf("invalid --until: %w", err)
+	}
+
+	return f, nil
+}
+
+func (o *queryOptions) groupBy() (store.GroupBy, error) {
+	switch by := store.GroupBy(o.by); by {
+	case store.GroupByTest, store.GroupByModel, store.GroupBySkill, store.GroupByGrader:
+		return by, nil
+	default:
+		return "", fmt.Errorf("invalid --by %q: use test, model, skill or grader", o.by)
+	}
+}
+
+func (o *queryOptions) open() (*store.Store, error) {
+	if _, err := os.Stat(o.dir); err != nil {
+		return nil, fmt.Errorf("no results store at %s (record runs with 'waza run --store')", o.dir)
+	}
+	return store.Open(o.dir)
+}
+
+func newQueryCommand() *cobra.Command {
+	opts := &queryOptions{}
+
+	cmd := &cobra.Command{
+		Use:   "query",
+		Short: "Summarize stored results",
+		Long: `Summarize pass rates and latency across the runs in a results store.
+
+Runs are recorded with 'waza run --store'. Only the trials of runs that match
+the filters are read.`,
+		Args: cobra.NoArgs,
+		RunE: func(cmd *cobra.Command, args []string) error {
+			results, err := opts.open()
+			if err != nil {
+				return err
+			}
+			f, err := opts.filter(time.Now())
+			if err != nil {
+				return err
+			}
+			by, err := opts.groupBy()
+			if err != nil {
+				return err
+			}
+
+			summaries, err := results.Summarize(f, by)
+			if err != nil {
+				return err
+			}
+
+			if opts.asJSON {
+				return printJSON(summaries)
+			}
+
+			w := tabwriter.NewWriter(os.Stdout, 0, 0, 2, ' ', 0)
+			fmt.Fprintf(w, "%s\tTRIALS\tPASS RATE\tMEAN\tP50\tP95\n", strings.ToUpper(string(by)))
+			for _, s := range summaries {
+				fmt.Fprintf(w, "%s\t%d\t%.1f%%\t%s\t%s\t%s\n", s.Key, s.Trials, s.PassRate*100,
+					formatMs(int64(s.MeanMs)), formatMs(s.P50Ms), formatMs(s.P95Ms))
+			}
+			return w.Flush()
+		},
+	}
+
+	opts.addFlags(cmd, store.GroupByTest)
+	return cmd
+}
+
+func newTrendCommand() *cobra.Command {
+	opts := &queryOptions{}
+	var period string
+
+	cmd := &cobra.Command{
+		Use:   "trend",
+		Short: "Show pass rate and latency over time",
+		Long: `Show pass rate and latency per day or week across the runs in a results store.
+
+Use --by to split each period by test, model, skill or grader, and the filters
+to narrow it down, for example: waza trend --model gpt-4o --by test --period week`,
+		Args: cobra.NoArgs,
+		RunE: func(cmd *cobra.Command, args []string) error {
+			results, err := opts.open()
+			if err != nil {
+				return err
+			}
+			f, err := opts.filter(time.Now())
+			if err != nil {
+				return err
+			}
+			by, err := opts.groupBy()
+			if err != nil {
+				return err
+			}
+
+			var length time.Duration
+			switch period {
+			case "day":
+				length = 24 * time.Hour
+			case "week":
+				length = 7 * 24 * time.Hour
+			default:
+				return fmt.Errorf("invalid --period %q: use day or week", period)
+			}
+
+			points, err := results.Trend(f, by, length)
+			if err != nil {
+				return err
+			}
+
+			if opts.asJSON {
+				return printJSON(points)
+			}
+
+			w := tabwriter.NewWriter(os.Stdout, 0, 0, 2, ' ', 0)
+			fmt.Fprintf(w, "PERIOD\t%s\tTRIALS\tPASS RATE\tMEAN\tP95\n", strings.ToUpper(string(by)))
+			for _, p := range points {
+				fmt.Fprintf(w, "%s\t%s\t%d\t%.1f%%\t%s\t%s\n", p.Period.Format("2006-01-02"), p.Key, p.Trials,
+					p.PassRate*100, formatMs(int64(p.MeanMs)), formatMs(p.P95Ms))
+			}
+			return w.Flush()
+		},
+	}
+
+	opts.addFlags(cmd, store.GroupByModel)
+	cmd.Flags().StringVar(&period, "period", "day", "Period length: day or week")
+
+	return cmd
+}
+
+// parseSince accepts a date, an RFC 3339 time, or an age such as 36h or 7d
+func parseSince(value string, now time.Time) (time.Time, error) {
+	if value == "" {
+		return time.Time{}, nil
+	}
+
+	if days, ok := strings.CutSuffix(value, "d"); ok {
+		n, err := strconv.Atoi(days)
+		if err != nil {
+			return time.Time{}, err
+		}
+		return now.AddDate(0, 0, -n), nil
+	}
+
+	if age, err := time.ParseDuration(value); err == nil {
+		return now.Add(-age), nil
+	}
+
+	if t, err := time.Parse("2006-01-02", value); err == nil {
+		return t, nil
+	}
+
+	return time.Parse(time.RFC3339, value)
+}
+
+func formatMs(ms int64) string {
+	return (time.Duration(ms) * time.Millisecond).String()
+}
+
+func printJSON(v any) error {
+	enc := json.NewEncoder(os.Stdout)
+	enc.SetIndent("", "  ")
+	return enc.Encode(v)
+}
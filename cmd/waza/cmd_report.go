@@ -0,0 +1,84 @@
+package main
+
+import (
+	"bufio"
+	"errors"
+	"fmt"
+	"io"
+	"os"
+
+	"github.com/spboyer/waza/internal/models"
+	"github.com/spboyer/waza/internal/report"
+	"github.com/spf13/cobra"
+)
+
+func newReportCommand() *cobra.Command {
+	var (
+		outputPath string
+		opts       report.Options
+		printTitle bool
+	)
+
+	cmd := &cobra.Command{
+		Use:   "report <results.json>",
+		Short: "Render results as a Markdown issue body",
+		Long: `Render the JSON output of 'waza run -o' as a Markdown issue body.
+
+Failed tasks are listed first, most severe first. The body never grows past
+--budget bytes: tasks and failure details that don't fit are counted in a
+closing note instead. The full results are linked with --results-link, or
+embedded as JSON when they fit.
+
+  gh issue create --title "$(waza report --title results.json)" \
+    --body-file <(waza report results.json --results-link https://...)`,
+		Args: cobra.ExactArgs(1),
+		RunE: func(cmd *cobra.Command, args []string) error {
+			outcome, err := loadOutcome(args[0])
+			if err != nil {
+				return err
+			}
+
+			if printTitle {
+				fmt.Println(report.Title(outcome))
+				return nil
+			}
+
+			stats, err := writeReport(outcome, outputPath, opts)
+			if err != nil {
+				return fmt.Errorf("failed to write report: %w", err)
+			}
+
+			if stats.TasksOmitted > 0 || stats.DetailsOmitted > 0 {
+				fmt.Fprintf(os.Stderr, "Report is %d bytes; %d task row(s) and %d failure detail(s) did not fit\n",
+					stats.Bytes, stats.TasksOmitted, stats.DetailsOmitted)
+			}
+			return nil
+		},
+	}
+
+	cmd.Flags().StringVarP(&outputPath, "output", "o", "", "Write the body to a file instead of stdout")
+	cmd.Flags().IntVar(&opts.Budget, "budget", report.DefaultBudget, "Maximum body size in bytes")
+	cmd.Flags().BoolVar(&opts.FailedOnly, "failed-only", false, "Leave passing tasks out of the task table")
+	cmd.Flags().StringVar(&opts.ResultsLink, "results-link", "", "URL or path of the full results, linked instead of embedding them")
+	cmd.Flags().BoolVar(&printTitle, "title", false, "Print the issue title instead of the body")
+
+	return cmd
+}
+
+func writeReport(outcome *models.EvaluationOutcome, path string, opts report.Options) (stats report.Stats, err error) {
+	var w io.Writer = os.Stdout
+	if path != "" {
+		f, err := os.Create(path)
+		if err != nil {
+			return report.Stats{}, err
+		}
+		defer func() { err = errors.Join(err, f.Close()) }()
+		w = f
+	}
+
+	buf := bufio.NewWriter(w)
+	if stats, err = report.Write(buf, outcome, opts); err != nil {
+		return stats, err
+	}
+	return stats, buf.Flush()
+}
@@ -7,19 +7,28 @@ import (
 	"os"
 	"path/filepath"
 	"strings"
+	"text/tabwriter"
 	"time"
 
 	"github.com/spboyer/waza/internal/config"
 	"github.com/spboyer/waza/internal/execution"
 	"github.com/spboyer/waza/internal/models"
 	"github.com/spboyer/waza/internal/orchestration"
+	"github.com/spboyer/waza/internal/server"
+	"github.com/spboyer/waza/internal/store"
 	"github.com/spf13/cobra"
 )
 
 var (
-	contextDir string
-	outputPath string
-	verbose    bool
+	contextDir   string
+	outputPath   string
+	storeDir     string
+	verbose      bool
+	watchMode    bool
+	watchEvery   time.Duration
+	remoteAddr   string
+	remoteToken  string
+	historyPaths []string
 )
 
 func newRunCommand() *cobra.Command {
@@ -37,17 +46,126 @@ Resources are loaded from the context directory (defaults to ./fixtures).`,
 	cmd.Flags().StringVar(&contextDir, "context-dir", "", "Context directory for fixtures (default: ./fixtures relative to spec)")
 	cmd.Flags().StringVarP(&outputPath, "output", "o", "", "Output JSON file for results")
 	cmd.Flags().BoolVarP(&verbose, "verbose", "v", false, "Verbose output with detailed progress")
+	cmd.Flags().StringVar(&storeDir, "store", "", "Also record results in a results store (default dir with no value: "+store.DefaultDir+")")
+	cmd.Flags().Lookup("store").NoOptDefVal = store.DefaultDir
+	cmd.Flags().BoolVarP(&watchMode, "watch", "w", false, "Re-run affected tests whenever the skill, tasks, fixtures or grader scripts change")
+	cmd.Flags().DurationVar(&watchEvery, "watch-interval", orchestration.DefaultWatchInterval, "How often --watch checks for changed files")
+	cmd.Flags().StringSliceVar(&historyPaths, "history", nil, "Results JSON files or results stores whose durations schedule concurrent trials, longest first (--store is always used)")
+	cmd.Flags().StringVar(&remoteAddr, "remote", "", "Run on a 'waza serve' daemon at this address (default with no value: "+server.DefaultSocket+")")
+	cmd.Flags().Lookup("remote").NoOptDefVal = server.DefaultSocket
+	cmd.Flags().StringVar(&remoteToken, "token", "", "Bearer token of a --remote daemon on TCP (default: read from "+server.DefaultTokenFile+")")
 
 	return cmd
 }
 
 func runCommandE(cmd *cobra.Command, args []string) error {
-	specPath := args[0]
+	if watchMode {
+		return watchCommandE(args[0])
+	}
+	if remoteAddr != "" {
+		return remoteCommandE(args[0])
+	}
+
+	spec, runner, err := newBenchmarkRunner(args[0])
+	if err != nil {
+		return err
+	}
+
+	// Run benchmark
+	ctx := context.Background()
+
+	fmt.Printf("Running benchmark: %s\n", spec.Name)
+	fmt.Printf("Skill: %s\n", spec.SkillName)
+	fmt.Printf("Engine: %s\n", spec.Config.EngineType)
+	if len(spec.Config.Models) > 0 {
+		fmt.Printf("Models: %s\n", strings.Join(modelIDs(spec.Config.Models), ", "))
+		fmt.Println()
+		return runMatrix(ctx, runner)
+	}
+	fmt.Printf("Model: %s\n", spec.Config.ModelID)
+	fmt.Println()
+
+	outcome, err := runner.RunBenchmark(ctx)
+	if err != nil {
+		return fmt.Errorf("benchmark failed: %w", err)
+	}
+
+	return reportOutcome(outcome)
+}
+
+// reportOutcome prints, saves and records the outcome of a single-model
+// benchmark, and fails if any test did
+func reportOutcome(outcome *models.EvaluationOutcome) error {
+	// Print summary
+	printSummary(outcome)
+
+	// Save output if requested
+	if outputPath != "" {
+		if err := saveOutcome(outcome, outputPath); err != nil {
+			return fmt.Errorf("failed to save output: %w", err)
+		}
+		fmt.Printf("\nResults saved to: %s\n", outputPath)
+	}
+
+	if storeDir != "" {
+		if err := recordOutcome(outcome, storeDir); err != nil {
+			return fmt.Errorf("failed to record results: %w", err)
+		}
+		fmt.Printf("Results recorded in: %s\n", storeDir)
+	}
 
+	// Exit with error code if tests failed
+	if outcome.Digest.Failed > 0 || outcome.Digest.Errors > 0 {
+		return fmt.Errorf("benchmark completed with failures")
+	}
+
+	return nil
+}
+
+// newBenchmarkRunner loads the spec at specPath and creates its runner, with
+// progress reported on stdout
+func newBenchmarkRunner(specPath string) (*models.BenchmarkSpec, *orchestration.TestRunner, error) {
+	spec, cfg, err := newBenchmarkConfig(specPath)
+	if err != nil {
+		return nil, nil, err
+	}
+
+	// Create engine based on spec
+	engine, err := newEngine(spec, spec.Config.ModelID)
+	if err != nil {
+		return nil, nil, err
+	}
+
+	history, err := loadDurationHistory(spec)
+	if err != nil {
+		return nil, nil, fmt.Errorf("failed to load duration history: %w", err)
+	}
+
+	// Create runner
+	runner := orchestration.NewTestRunner(cfg, engine,
+		orchestration.WithEngineFactory(func(modelID string) (execution.AgentEngine, error) {
+			return newEngine(spec, modelID)
+		}),
+		orchestration.WithDurationHistory(history),
+	)
+
+	// Add progress listener
+	if verbose {
+		runner.OnProgress(verboseProgressListener)
+	} else {
+		runner.OnProgress(simpleProgressListener)
+	}
+
+	return spec, runner, nil
+}
+
+// newBenchmarkConfig loads the spec at specPath, resolving its task and
+// fixture directories
+func newBenchmarkConfig(specPath string) (*models.BenchmarkSpec, *config.BenchmarkConfig, error) {
 	// Load spec
 	spec, err := models.LoadBenchmarkSpec(specPath)
 	if err != nil {
-		return fmt.Errorf("failed to load spec: %w", err)
+		return nil, nil, fmt.Errorf("failed to load spec: %w", err)
 	}
 
 	// Get spec directory for resolving relative paths
@@ -80,74 +198,129 @@ func runCommandE(cmd *cobra.Command, args []string) error {
 		config.WithOutputPath(outputPath),
 	)
 
-	// Create engine based on spec
-	var engine execution.AgentEngine
-
-	switch spec.Config.EngineType {
-	case "mock":
-		engine = execution.NewMockEngine(spec.Config.ModelID)
-	case "copilot-sdk":
-		engine = execution.NewCopilotEngineBuilder(spec.Config.ModelID).Build()
-	default:
-		return fmt.Errorf("unknown engine type: %s", spec.Config.EngineType)
-	}
+	return spec, cfg, nil
+}
 
-	// Create runner
-	runner := orchestration.NewTestRunner(cfg, engine)
+// loadDurationHistory reads earlier trial durations of the spec's skill from
+// the --history files and stores, and from the --store results store
+func loadDurationHistory(spec *models.BenchmarkSpec) (*orchestration.DurationHistory, error) {
+	history := orchestration.NewDurationHistory()
 
-	// Add progress listener
-	if verbose {
-		runner.OnProgress(verboseProgressListener)
-	} else {
-		runner.OnProgress(simpleProgressListener)
+	paths := historyPaths
+	if storeDir != "" {
+		paths = append(paths[:len(paths):len(paths)], storeDir)
 	}
+	for _, path := range paths {
+		info, err := os.Stat(path)
+		if os.IsNotExist(err) && path == storeDir {
+			continue
+		}
+		if err != nil {
+			return nil, err
+		}
 
-	// Run benchmark
-	ctx := context.Background()
+		if !info.IsDir() {
+			outcome, err := loadOutcome(path)
+			if err != nil {
+				return nil, err
+			}
+			history.AddOutcome(outcome)
+			continue
+		}
 
-	fmt.Printf("Running benchmark: %s\n", spec.Name)
-	fmt.Printf("Skill: %s\n", spec.SkillName)
-	fmt.Printf("Engine: %s\n", spec.Config.EngineType)
-	fmt.Printf("Model: %s\n", spec.Config.ModelID)
-	fmt.Println()
+		results, err := store.Open(path)
+		if err != nil {
+			return nil, err
+		}
+		filter := store.Filter{Skill: spec.SkillName}
+		if len(spec.Config.Models) == 0 {
+			filter.Model = spec.Config.ModelID
+		}
+		err = results.Trials(filter, func(_ store.RunRecord, t store.TrialRecord) error {
+			history.Add(t.TestID, t.DurationMs)
+			return nil
+		})
+		if err != nil {
+			return nil, err
+		}
+	}
+	return history, nil
+}
 
-	outcome, err := runner.RunBenchmark(ctx)
+// runMatrix runs every model of the spec in one benchmark and reports them
+// side by side
+func runMatrix(ctx context.Context, runner *orchestration.TestRunner) error {
+	matrix, err := runner.RunMatrix(ctx)
 	if err != nil {
 		return fmt.Errorf("benchmark failed: %w", err)
 	}
 
-	// Print summary
-	printSummary(outcome)
+	return reportMatrix(matrix)
+}
+
+// reportMatrix is reportOutcome for a multi-model benchmark
+func reportMatrix(matrix *models.MatrixOutcome) error {
+	if err := printMatrixSummary(matrix); err != nil {
+		return err
+	}
 
-	// Save output if requested
 	if outputPath != "" {
-		if err := saveOutcome(outcome, outputPath); err != nil {
+		if err := saveOutcome(matrix, outputPath); err != nil {
 			return fmt.Errorf("failed to save output: %w", err)
 		}
 		fmt.Printf("\nResults saved to: %s\n", outputPath)
 	}
 
-	// Exit with error code if tests failed
-	if outcome.Digest.Failed > 0 || outcome.Digest.Errors > 0 {
-		return fmt.Errorf("benchmark completed with failures")
+	if storeDir != "" {
+		for _, outcome := range matrix.Outcomes {
+			if err := recordOutcome(outcome, storeDir); err != nil {
+				return fmt.Errorf("failed to record results: %w", err)
+			}
+		}
+		fmt.Printf("Results recorded in: %s\n", storeDir)
+	}
+
+	for _, outcome := range matrix.Outcomes {
+		if outcome.Digest.Failed > 0 || outcome.Digest.Errors > 0 {
+			return fmt.Errorf("benchmark completed with failures")
+		}
 	}
 
 	return nil
 }
 
+func newEngine(spec *models.BenchmarkSpec, modelID string) (execution.AgentEngine, error) {
+	switch spec.Config.EngineType {
+	case "mock":
+		return execution.NewMockEngine(modelID, execution.WithMockConfig(spec.Config.Mock)), nil
+	case "copilot-sdk":
+		return execution.NewCopilotEngineBuilder(modelID).Build(), nil
+	default:
+		return nil, fmt.Errorf("unknown engine type: %s", spec.Config.EngineType)
+	}
+}
+
+func modelIDs(targets []models.ModelTarget) []string {
+	ids := make([]string, len(targets))
+	for i, t := range targets {
+		ids[i] = t.ID
+	}
+	return ids
+}
+
 func verboseProgressListener(event orchestration.ProgressEvent) {
 	switch event.EventType {
 	case orchestration.EventBenchmarkStart:
 		fmt.Printf("Starting benchmark with %d test(s)...\n\n", event.TotalTests)
 	case orchestration.EventTestStart:
-		fmt.Printf("[%d/%d] Running test: %s\n", event.TestNum, event.TotalTests, event.TestName)
+		fmt.Printf("[%d/%d] Running test: %s%s\n", event.TestNum, event.TotalTests, event.TestName, modelSuffix(event))
 	case orchestration.EventRunStart:
 		fmt.Printf("  Run %d/%d...", event.RunNum, event.TotalRuns)
 	case orchestration.EventRunComplete:
 		duration := time.Duration(event.DurationMs) * time.Millisecond
 		fmt.Printf(" %s (%v)\n", event.Status, duration)
 	case orchestration.EventTestComplete:
-		fmt.Printf("  Test %s: %s\n\n", event.TestName, event.Status)
+		fmt.Printf("  Test %s%s: %s\n\n", event.TestName, modelSuffix(event), event.Status)
 	case orchestration.EventBenchmarkComplete:
 		duration := time.Duration(event.DurationMs) * time.Millisecond
 		fmt.Printf("Benchmark completed in %v\n\n", duration)
@@ -161,10 +334,18 @@ func simpleProgressListener(event orchestration.ProgressEvent) {
 		if event.Status != "passed" {
 			status = "✗"
 		}
-		fmt.Printf("%s [%d/%d] %s\n", status, event.TestNum, event.TotalTests, event.TestName)
+		fmt.Printf("%s [%d/%d] %s%s\n", status, event.TestNum, event.TotalTests, event.TestName, modelSuffix(event))
 	}
 }
 
+// modelSuffix names the model of an event from a multi-model run
+func modelSuffix(event orchestration.ProgressEvent) string {
+	if event.Model == "" {
+		return ""
+	}
+	return " (" + event.Model + ")"
+}
+
 func printSummary(outcome *models.EvaluationOutcome) {
 	fmt.Println("=" + strings.Repeat("=", 50))
 	fmt.Println(" BENCHMARK RESULTS")
@@ -182,6 +363,19 @@ func printSummary(outcome *models.EvaluationOutcome) {
 
 	duration := time.Duration(digest.DurationMs) * time.Millisecond
 	fmt.Printf("Duration:       %v\n", duration)
+	if s := digest.Schedule; s != nil {
+		fmt.Printf("Makespan:       %v (predicted %v from %d/%d tests' history, %d workers)\n",
+			time.Duration(s.ActualMs)*time.Millisecond, time.Duration(s.PredictedMs)*time.Millisecond,
+			s.KnownTests, digest.TotalTests, s.Workers)
+	}
+	if gc := digest.GraderCache; gc != nil {
+		fmt.Printf("Grader Cache:   %d hits, %d misses (%.1f%% reused)\n", gc.Hits, gc.Misses,
+			float64(gc.Hits)/float64(gc.Hits+gc.Misses)*100)
+	}
+	if rl := digest.RateLimit; rl != nil {
+		fmt.Printf("Rate Limit:     %d throttled (%d retried), %d timed out; concurrency %d (ranged %d-%d)\n",
+			rl.Throttled, rl.Retried, rl.TimedOut, rl.Concurrency, rl.MinConcurrency, rl.MaxConcurrency)
+	}
 	fmt.Println()
 
 	// Show failed tests
@@ -207,7 +401,46 @@ func printSummary(outcome *models.EvaluationOutcome) {
 	}
 }
 
-func saveOutcome(outcome *models.EvaluationOutcome, path string) error {
+func printMatrixSummary(matrix *models.MatrixOutcome) error {
+	fmt.Println("=" + strings.Repeat("=", 50))
+	fmt.Println(" MODEL COMPARISON")
+	fmt.Println("=" + strings.Repeat("=", 50))
+	fmt.Println()
+
+	w := tabwriter.NewWriter(os.Stdout, 0, 0, 2, ' ', 0)
+	fmt.Fprintln(w, "MODEL\tPASSED\tSUCCESS RATE\tSCORE\tDURATION")
+	for _, outcome := range matrix.Outcomes {
+		d := outcome.Digest
+		fmt.Fprintf(w, "%s\t%d/%d\t%.1f%%\t%.2f\t%v\n", outcome.Setup.ModelID, d.Succeeded, d.TotalTests,
+			d.SuccessRate*100, d.AggregateScore, time.Duration(d.DurationMs)*time.Millisecond)
+	}
+	if err := w.Flush(); err != nil {
+		return err
+	}
+
+	if len(matrix.Comparisons) == 0 {
+		return nil
+	}
+
+	fmt.Printf("\nCompared with %s, per test:\n", matrix.Comparisons[0].Baseline)
+	w = tabwriter.NewWriter(os.Stdout, 0, 0, 2, ' ', 0)
+	fmt.Fprintln(w, "MODEL\tSCORE DIFF\t95% CI\tP-VALUE\tWINS\tLOSSES\tTIES")
+	for _, c := range matrix.Comparisons {
+		fmt.Fprintf(w, "%s\t%+.3f\t[%+.3f, %+.3f]\t%.3f\t%d\t%d\t%d\n", c.Candidate, c.ScoreDiff,
+			c.ScoreDiffLow, c.ScoreDiffHigh, c.PValue, c.Wins, c.Losses, c.Ties)
+	}
+	return w.Flush()
+}
+
+func recordOutcome(outcome *models.EvaluationOutcome, dir string) error {
+	results, err := store.Open(dir)
+	if err != nil {
+		return err
+	}
+	return results.Save(outcome)
+}
+
+func saveOutcome(outcome any, path string) error {
 	data, err := json.MarshalIndent(outcome, "", "  ")
 	if err != nil {
 		return err
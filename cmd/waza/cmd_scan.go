@@ -0,0 +1,132 @@
+package main
+
+import (
+	"context"
+	"fmt"
+	"os"
+	"text/tabwriter"
+
+	"github.com/spboyer/waza/internal/scanner"
+	"github.com/spf13/cobra"
+)
+
+// refSkills are the skills found at one git ref
+type refSkills struct {
+	Ref    string              `json:"ref"`
+	Skills []scanner.SkillInfo `json:"skills"`
+}
+
+func newScanCommand() *cobra.Command {
+	var (
+		cachePath string
+		refs      []string
+		workers   int
+		asJSON    bool
+	)
+
+	cmd := &cobra.Command{
+		Use:   "scan [dir]",
+		Short: "Find the skills in a repository",
+		Long: `Find every SKILL.md under a directory (default: the current one) and list
+each skill's name and description from its frontmatter.
+
+Directories excluded by .gitignore files, and dependency and VCS directories
+such as node_modules and .git, are skipped. With --cache, parsed skills are
+kept between runs, so later scans only read SKILL.md files that changed.
+
+With --ref, dir is a git repository (bare, mirror or working copy) and each
+ref is scanned straight from its object store without a checkout, for
+example: waza scan skills.git --ref main --ref v1.2 --cache`,
+		Args: cobra.MaximumNArgs(1),
+		RunE: func(cmd *cobra.Command, args []string) error {
+			root := "."
+			if len(args) > 0 {
+				root = args[0]
+			}
+
+			s := scanner.New(scanner.WithWorkers(workers))
+			if cachePath != "" {
+				if err := s.LoadCache(cachePath); err != nil {
+					return err
+				}
+			}
+
+			results, err := scanRefs(cmd.Context(), s, root, refs)
+			if err != nil {
+				return err
+			}
+
+			if cachePath != "" {
+				if err := s.SaveCache(cachePath); err != nil {
+					return fmt.Errorf("failed to save scan cache: %w", err)
+				}
+			}
+
+			if asJSON {
+				if len(refs) == 0 {
+					return printJSON(results[0].Skills)
+				}
+				return printJSON(results)
+			}
+
+			w := tabwriter.NewWriter(os.Stdout, 0, 0, 2, ' ', 0)
+			if len(refs) == 0 {
+				fmt.Fprintln(w, "NAME\tPATH\tDESCRIPTION")
+				for _, skill := range results[0].Skills {
+					fmt.Fprintf(w, "%s\t%s\t%s\n", skill.Name, skill.Path, skill.Description)
+				}
+				return w.Flush()
+			}
+
+			fmt.Fprintln(w, "REF\tNAME\tPATH\tDESCRIPTION")
+			for _, r := range results {
+				for _, skill := range r.Skills {
+					fmt.Fprintf(w, "%s\t%s\t%s\t%s\n", r.Ref, skill.Name, skill.Path, skill.Description)
+				}
+			}
+			return w.Flush()
+		},
+	}
+
+	cmd.Flags().StringVar(&cachePath, "cache", "", "Keep parsed skills in this file between scans (default with no value: .waza/scan-cache.json)")
+	cmd.Flags().Lookup("cache").NoOptDefVal = ".waza/scan-cache.json"
+	cmd.Flags().StringArrayVar(&refs, "ref", nil, "Scan this git ref of the repository at dir instead of its files (repeatable)")
+	cmd.Flags().IntVar(&workers, "workers", 0, "Directories read in parallel (default: number of CPUs)")
+	cmd.Flags().BoolVar(&asJSON, "json", false, "Print JSON instead of a table")
+
+	return cmd
+}
+
+// scanRefs scans the files under root, or each git ref of the repository at
+// root. Problems with single skills are printed as warnings.
+func scanRefs(ctx context.Context, s *scanner.Scanner, root string, refs []string) ([]refSkills, error) {
+	if len(refs) == 0 {
+		skills, err := s.Scan(root)
+		if skills == nil && err != nil {
+			return nil, err
+		}
+		warnScan(err)
+		return []refSkills{{Skills: skills}}, nil
+	}
+
+	if ctx == nil {
+		ctx = context.Background()
+	}
+
+	results := make([]refSkills, 0, len(refs))
+	for _, ref := range refs {
+		skills, err := s.ScanGit(ctx, root, ref)
+		if skills == nil && err != nil {
+			return nil, err
+		}
+		warnScan(err)
+		results = append(results, refSkills{Ref: ref, Skills: skills})
+	}
+	return results, nil
+}
+
+func warnScan(err error) {
+	if err != nil {
+		fmt.Fprintf(os.Stderr, "Warning: %v\n", err)
+	}
+}
@@ -0,0 +1,144 @@
+package main
+
+import (
+	"context"
+	"errors"
+	"fmt"
+	"os"
+	"os/signal"
+	"path/filepath"
+
+	"github.com/spboyer/waza/internal/server"
+	"github.com/spf13/cobra"
+)
+
+func newServeCommand() *cobra.Command {
+	var (
+		listen        string
+		workers       int
+		maxJobs       int
+		graderWorkers int
+		token         string
+	)
+
+	cmd := &cobra.Command{
+		Use:   "serve",
+		Short: "Run a local daemon that queues and runs benchmarks",
+		Long: `Run a long-lived daemon that accepts benchmark jobs, from 'waza run --remote'
+or any HTTP client, and runs them with shared resources.
+
+Engines stay initialized between jobs and Python graders run in one shared
+worker pool, so repeated runs skip the start-up cost. Sessions of concurrent
+jobs share the --workers slots fairly: a free slot goes to the job with the
+fewest sessions running, so a small job is not stuck behind a large one.
+
+The daemon listens on a unix socket, accessible only to your user, by
+default; pass --listen host:port to listen on TCP instead. Jobs run grader
+code and read specs and fixtures as your user, so TCP addresses must be
+loopback ones, such as 127.0.0.1, and clients must send a bearer token:
+--token, or one generated into ` + server.DefaultTokenFile + `, which
+'waza run --remote' reads.`,
+		Args: cobra.NoArgs,
+		RunE: func(cmd *cobra.Command, args []string) error {
+			if server.IsTCP(listen) && token == "" {
+				var err error
+				if token, err = server.LoadOrCreateToken(server.DefaultTokenFile); err != nil {
+					return err
+				}
+				fmt.Printf("Clients authenticate with the token in %s\n", server.DefaultTokenFile)
+			}
+
+			l, err := server.Listen(listen)
+			if err != nil {
+				return fmt.Errorf("failed to listen: %w", err)
+			}
+
+			srv := server.New(newEngine,
+				server.WithWorkers(workers),
+				server.WithMaxJobs(maxJobs),
+				server.WithGraderWorkers(graderWorkers),
+				server.WithToken(token),
+			)
+
+			ctx, stop := signal.NotifyContext(context.Background(), os.Interrupt)
+			defer stop()
+
+			fmt.Printf("Listening on %s (Ctrl+C to stop)\n", l.Addr())
+			return srv.Serve(ctx, l)
+		},
+	}
+
+	cmd.Flags().StringVar(&listen, "listen", server.DefaultSocket, "Unix socket path or host:port to listen on")
+	cmd.Flags().IntVar(&workers, "workers", 0, "Sessions run at once across all jobs (default: one per CPU)")
+	cmd.Flags().IntVar(&maxJobs, "max-jobs", server.DefaultMaxJobs, "Jobs run at once; the rest are queued")
+	cmd.Flags().IntVar(&graderWorkers, "grader-workers", 0, "Python grader worker processes (default: one per CPU)")
+	cmd.Flags().StringVar(&token, "token", "", "Bearer token clients must send (default on TCP: generated into "+server.DefaultTokenFile+")")
+
+	return cmd
+}
+
+// remoteCommandE runs the benchmark on a daemon started with 'waza serve'
+// and reports it as a local run would
+func remoteCommandE(specPath string) error {
+	req := server.JobRequest{SpecPath: specPath, ContextDir: contextDir}
+	for _, path := range []*string{&req.SpecPath, &req.ContextDir} {
+		if *path == "" {
+			continue
+		}
+		abs, err := filepath.Abs(*path)
+		if err != nil {
+			return err
+		}
+		*path = abs
+	}
+
+	ctx, stop := signal.NotifyContext(context.Background(), os.Interrupt)
+	defer stop()
+
+	var opts []server.ClientOption
+	if remoteToken == "" && server.IsTCP(remoteAddr) {
+		token, err := server.ReadToken(server.DefaultTokenFile)
+		if err != nil {
+			return fmt.Errorf("no token for %s; pass --token: %w", remoteAddr, err)
+		}
+		remoteToken = token
+	}
+	if remoteToken != "" {
+		opts = append(opts, server.WithBearerToken(remoteToken))
+	}
+
+	client := server.NewClient(remoteAddr, opts...)
+	status, err := client.Submit(ctx, req)
+	if err != nil {
+		return err
+	}
+	fmt.Printf("Submitted job %s to %s\n\n", status.ID, remoteAddr)
+
+	progress := simpleProgressListener
+	if verbose {
+		progress = verboseProgressListener
+	}
+	final, err := client.Events(ctx, status.ID, func(event server.Event) {
+		if event.Progress != nil {
+			progress(*event.Progress)
+		}
+	})
+	if err != nil {
+		if ctx.Err() != nil {
+			// Interrupted: don't leave the job running
+			return errors.Join(ctx.Err(), client.Cancel(context.Background(), status.ID))
+		}
+		return err
+	}
+
+	switch {
+	case final.Type == server.EventError:
+		return fmt.Errorf("benchmark failed: %s", final.Error)
+	case final.Matrix != nil:
+		return reportMatrix(final.Matrix)
+	case final.Outcome != nil:
+		return reportOutcome(final.Outcome)
+	default:
+		return fmt.Errorf("job %s finished without a result", status.ID)
+	}
+}
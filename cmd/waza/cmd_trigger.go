@@ -0,0 +1,115 @@
+package main
+
+import (
+	"context"
+	"errors"
+	"fmt"
+	"os"
+	"text/tabwriter"
+
+	"github.com/spboyer/waza/internal/execution"
+	"github.com/spboyer/waza/internal/models"
+	"github.com/spboyer/waza/internal/orchestration"
+	"github.com/spf13/cobra"
+)
+
+func newTriggerCommand() *cobra.Command {
+	var (
+		executor   string
+		modelID    string
+		workers    int
+		timeoutSec int
+		outputPath string
+		asJSON     bool
+	)
+
+	cmd := &cobra.Command{
+		Use:   "trigger <trigger_tests.yaml...>",
+		Short: "Measure how accurately skills are activated",
+		Long: `Measure how accurately skills are activated by the prompts of trigger test
+suites (should_trigger_prompts and should_not_trigger_prompts), and report
+precision and recall per skill.
+
+Prompts run concurrently on one warm client. Each session ends as soon as the
+agent has loaded a skill or finished its first turn without one, so a suite
+costs a fraction of running its prompts as full eval tasks.`,
+		Args: cobra.MinimumNArgs(1),
+		RunE: func(cmd *cobra.Command, args []string) (err error) {
+			suites := make([]*models.TriggerSuite, 0, len(args))
+			for _, path := range args {
+				suite, err := models.LoadTriggerSuite(path)
+				if err != nil {
+					return fmt.Errorf("failed to load trigger suite: %w", err)
+				}
+				suites = append(suites, suite)
+			}
+
+			var engine execution.AgentEngine
+			switch executor {
+			case "mock":
+				engine = execution.NewMockEngine(modelID)
+			case "copilot-sdk":
+				engine = execution.NewCopilotEngineBuilder(modelID).WithWarmClient().Build()
+			default:
+				return fmt.Errorf("unknown engine type: %s", executor)
+			}
+
+			ctx := context.Background()
+			if err := engine.Initialize(ctx); err != nil {
+				return fmt.Errorf("failed to initialize engine: %w", err)
+			}
+			defer func() { err = errors.Join(err, engine.Shutdown(ctx)) }()
+
+			opts := orchestration.TriggerOptions{Workers: workers, TimeoutSec: timeoutSec}
+			reports := make([]*models.TriggerReport, 0, len(suites))
+			for _, suite := range suites {
+				reports = append(reports, orchestration.RunTriggers(ctx, engine, suite, opts))
+			}
+
+			if outputPath != "" {
+				if err := saveOutcome(reports, outputPath); err != nil {
+					return fmt.Errorf("failed to save results: %w", err)
+				}
+			}
+			if asJSON {
+				return printJSON(reports)
+			}
+			return printTriggerReports(reports)
+		},
+	}
+
+	cmd.Flags().StringVar(&executor, "executor", "copilot-sdk", "Engine to run prompts with: copilot-sdk or mock")
+	cmd.Flags().StringVar(&modelID, "model", "claude-sonnet-4-20250514", "Model to run prompts with")
+	cmd.Flags().IntVar(&workers, "workers", orchestration.DefaultTriggerWorkers, "Prompts to run at once")
+	cmd.Flags().IntVar(&timeoutSec, "timeout", orchestration.DefaultTriggerTimeout, "Timeout for each prompt, in seconds")
+	cmd.Flags().StringVarP(&outputPath, "output", "o", "", "Output JSON file for results")
+	cmd.Flags().BoolVar(&asJSON, "json", false, "Print results as JSON")
+
+	return cmd
+}
+
+func printTriggerReports(reports []*models.TriggerReport) error {
+	for _, report := range reports {
+		for _, r := range report.Results {
+			if r.Correct() {
+				continue
+			}
+			switch {
+			case r.ErrorMsg != "":
+				fmt.Printf("⚠ %s: %q: %s\n", report.Skill, r.Prompt, r.ErrorMsg)
+			case r.Expected:
+				fmt.Printf("✗ %s: missed %q\n", report.Skill, r.Prompt)
+			default:
+				fmt.Printf("✗ %s: falsely triggered by %q\n", report.Skill, r.Prompt)
+			}
+		}
+	}
+
+	w := tabwriter.NewWriter(os.Stdout, 0, 0, 2, ' ', 0)
+	fmt.Fprintln(w, "SKILL\tPROMPTS\tPRECISION\tRECALL\tF1\tACCURACY\tERRORS\tDURATION")
+	for _, r := range reports {
+		fmt.Fprintf(w, "%s\t%d\t%.1f%%\t%.1f%%\t%.2f\t%.1f%%\t%d\t%dms\n", r.Skill, len(r.Results),
+			r.Precision*100, r.Recall*100, r.F1, r.Accuracy*100, r.Errors, r.DurationMs)
+	}
+	return w.Flush()
+}
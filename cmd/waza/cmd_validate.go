@@ -0,0 +1,80 @@
+package main
+
+import (
+	"context"
+	"errors"
+	"fmt"
+	"time"
+
+	"github.com/spboyer/waza/internal/orchestration"
+	"github.com/spf13/cobra"
+)
+
+// validateReport is the --json output of waza validate
+type validateReport struct {
+	Spec       string                         `json:"spec"`
+	Tasks      int                            `json:"tasks"`
+	DurationMs int64                          `json:"duration_ms"`
+	Issues     []orchestration.PreflightIssue `json:"issues"`
+}
+
+func newValidateCommand() *cobra.Command {
+	var asJSON bool
+
+	cmd := &cobra.Command{
+		Use:   "validate <eval.yaml>",
+		Short: "Check a benchmark's tasks, graders and fixtures without running it",
+		Long: `Load every task of a benchmark, create every global and task grader and
+resolve every fixture, without starting an agent session.
+
+Grader regexes are compiled, the Python of inline assertions and grader
+scripts is compiled in a single interpreter call, and unsupported grader
+types are rejected. Every problem found is reported at once. waza run does
+the same before its first session.`,
+		Args: cobra.ExactArgs(1),
+		RunE: func(cmd *cobra.Command, args []string) error {
+			spec, cfg, err := newBenchmarkConfig(args[0])
+			if err != nil {
+				return err
+			}
+
+			start := time.Now()
+			testCases, err := orchestration.NewTestRunner(cfg, nil).Preflight(context.Background())
+			var preflightErr *orchestration.PreflightError
+			if err != nil && !errors.As(err, &preflightErr) {
+				return err
+			}
+
+			report := validateReport{
+				Spec:       spec.Name,
+				Tasks:      len(testCases),
+				DurationMs: time.Since(start).Milliseconds(),
+				Issues:     []orchestration.PreflightIssue{},
+			}
+			if preflightErr != nil {
+				report.Issues = preflightErr.Issues
+			}
+
+			if asJSON {
+				if err := printJSON(report); err != nil {
+					return err
+				}
+			} else {
+				for _, issue := range report.Issues {
+					fmt.Println(issue)
+				}
+				fmt.Printf("%s: %d task(s), %d problem(s) (%dms)\n", spec.Name, report.Tasks, len(report.Issues), report.DurationMs)
+			}
+
+			if len(report.Issues) > 0 {
+				return fmt.Errorf("validation found %d problem(s)", len(report.Issues))
+			}
+			return nil
+		},
+	}
+
+	cmd.Flags().StringVar(&contextDir, "context-dir", "", "Context directory for fixtures (default: ./fixtures relative to spec)")
+	cmd.Flags().BoolVar(&asJSON, "json", false, "Output the problems as JSON")
+
+	return cmd
+}
@@ -0,0 +1,115 @@
+package main
+
+import (
+	"context"
+	"errors"
+	"fmt"
+	"os"
+	"os/signal"
+	"path/filepath"
+	"time"
+
+	"github.com/spboyer/waza/internal/orchestration"
+)
+
+// watchCommandE runs the benchmark and re-runs what each change affects until
+// interrupted. The spec is reloaded, with a fresh engine, whenever it changes.
+func watchCommandE(specPath string) error {
+	if storeDir != "" {
+		return fmt.Errorf("--store can't be used with --watch")
+	}
+
+	ctx, stop := signal.NotifyContext(context.Background(), os.Interrupt)
+	defer stop()
+
+	for {
+		spec, runner, err := newBenchmarkRunner(specPath)
+		if err != nil {
+			return err
+		}
+
+		fmt.Printf("Watching benchmark: %s (Ctrl+C to stop)\n", spec.Name)
+		fmt.Printf("Skill: %s\n", spec.SkillName)
+		fmt.Printf("Engine: %s\n", spec.Config.EngineType)
+		fmt.Printf("Model: %s\n\n", spec.Config.ModelID)
+
+		err = runner.Watch(ctx, specPath, watchEvery, printWatchRound)
+		if !errors.Is(err, orchestration.ErrSpecChanged) {
+			return err
+		}
+		fmt.Printf("\n%s changed, reloading...\n\n", filepath.Base(specPath))
+	}
+}
+
+func printWatchRound(round *orchestration.WatchRound) {
+	for _, err := range round.Errors {
+		fmt.Fprintf(os.Stderr, "Warning: %v\n", err)
+	}
+
+	if round.Round == 0 {
+		printSummary(round.Outcome)
+	} else {
+		printRoundDiff(round)
+	}
+
+	if outputPath != "" {
+		if err := saveOutcome(round.Outcome, outputPath); err != nil {
+			fmt.Fprintf(os.Stderr, "Warning: failed to save output: %v\n", err)
+		}
+	}
+
+	fmt.Printf("[%s] Watching for changes...\n", time.Now().Format("15:04:05"))
+}
+
+// printRoundDiff shows what changed since the previous round
+func printRoundDiff(round *orchestration.WatchRound) {
+	fmt.Println()
+	for _, file := range round.Files {
+		fmt.Printf("Changed: %s\n", relPath(file))
+	}
+	fmt.Printf("Re-ran %d test(s), re-graded %d\n\n", len(round.Rerun), len(round.Regraded))
+
+	for _, c := range round.Changes {
+		name := c.DisplayName
+		if name == "" {
+			name = c.TestID
+		}
+		switch {
+		case c.Before == "":
+			fmt.Printf("  + %s: %s (score %.2f)\n", name, c.After, c.AfterScore)
+		case c.After == "":
+			fmt.Printf("  - %s: removed\n", name)
+		case c.Before != c.After:
+			fmt.Printf("  %s %s: %s → %s (score %.2f → %.2f)\n", statusMark(c.After), name, c.Before, c.After,
+				c.BeforeScore, c.AfterScore)
+		case c.BeforeScore != c.AfterScore:
+			fmt.Printf("  %s %s: %s (score %.2f → %.2f)\n", statusMark(c.After), name, c.After, c.BeforeScore, c.AfterScore)
+		default:
+			fmt.Printf("  %s %s: %s (unchanged)\n", statusMark(c.After), name, c.After)
+		}
+	}
+
+	d := round.Outcome.Digest
+	fmt.Printf("\nTotal: %d/%d passed (%.1f%%), aggregate score %.2f\n", d.Succeeded, d.TotalTests,
+		d.SuccessRate*100, d.AggregateScore)
+}
+
+func statusMark(status string) string {
+	if status == "passed" {
+		return "✓"
+	}
+	return "✗"
+}
+
+// relPath shows path relative to the working directory when it is below it
+func relPath(path string) string {
+	wd, err := os.Getwd()
+	if err != nil {
+		return path
+	}
+	rel, err := filepath.Rel(wd, path)
+	if err != nil || !filepath.IsLocal(rel) {
+		return path
+	}
+	return rel
+}
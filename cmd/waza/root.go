@@ -20,6 +20,16 @@ performance against predefined test cases.`,
 
 	// Add subcommands
 	cmd.AddCommand(newRunCommand())
+	cmd.AddCommand(newValidateCommand())
+	cmd.AddCommand(newQueryCommand())
+	cmd.AddCommand(newTrendCommand())
+	cmd.AddCommand(newExportCommand())
+	cmd.AddCommand(newScanCommand())
+	cmd.AddCommand(newReportCommand())
+	cmd.AddCommand(newAnalyzeCommand())
+	cmd.AddCommand(newConvertCommand())
+	cmd.AddCommand(newTriggerCommand())
+	cmd.AddCommand(newServeCommand())
 
 	return cmd
 }
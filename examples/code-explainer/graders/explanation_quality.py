@@ -8,7 +8,7 @@ Usage:
   Can be used as a custom grader in eval.yaml:
   
   graders:
-    - type: custom
+    - type: script
       name: explanation_quality
       config:
         script: graders/explanation_quality.py
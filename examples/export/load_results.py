@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Load a columnar results export written by `waza export`.
+
+Usage:
+  python load_results.py results.npz           # pass rate by model
+  python load_results.py --json results.npz    # every column as JSON
+
+Or import it to work with the columns as NumPy arrays:
+
+  from load_results import load_results
+
+  results = load_results("results.npz")
+  gpt = results["model"] == "gpt-4o"
+  print(results["score"][gpt].mean())
+"""
+
+import argparse
+import json
+import sys
+from typing import Any
+
+import numpy as np
+
+# Suffix of the arrays holding the distinct values of a string column, which
+# itself holds int32 codes into them
+VALUES_SUFFIX = "_values"
+
+
+def load_results(path: str, decode: bool = True) -> dict[str, np.ndarray]:
+    """Return a dict of column name to 1-d NumPy array, one row per (trial, grader).
+
+    String columns are decoded in one vectorized step per column. With
+    decode=False they keep their int32 codes, and their distinct values stay
+    under "<name>_values"; comparing codes is cheaper than comparing strings
+    when you only group or filter.
+    """
+    with np.load(path) as data:
+        columns = {name: data[name] for name in data.files}
+
+    if decode:
+        for name in [n for n in columns if n.endswith(VALUES_SUFFIX)]:
+            column = name[: -len(VALUES_SUFFIX)]
+            columns[column] = columns.pop(name)[columns[column]]
+    return columns
+
+
+def to_json(columns: dict[str, np.ndarray]) -> dict[str, Any]:
+    """Describe decoded columns as JSON: each column's dtype and its values.
+
+    NaN scores, for trials without graders, become null.
+    """
+    values = {}
+    for name, column in columns.items():
+        rows = column.tolist()
+        if column.dtype.kind == "f":
+            rows = [None if np.isnan(v) else v for v in rows]
+        values[name] = rows
+
+    return {
+        "rows": len(columns["score"]),
+        "dtypes": {name: column.dtype.str for name, column in columns.items()},
+        "columns": values,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load a waza results export")
+    parser.add_argument("path", help="the .npz file written by waza export")
+    parser.add_argument("--json", action="store_true", help="print every column as JSON")
+    args = parser.parse_args()
+
+    results = load_results(args.path)
+    if args.json:
+        json.dump(to_json(results), sys.stdout)
+        print()
+        return 0
+
+    print(f"{len(results['score'])} rows")
+    for model in np.unique(results["model"]):
+        rows = results["model"] == model
+        print(f"{model}: {results['passed'][rows].mean():.1%} of grader results passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+package execution
+
+import (
+	"context"
+	"time"
+
+	"github.com/spboyer/waza/internal/models"
+)
+
+// Budget limits a single execution. Zero values are unlimited.
+type Budget struct {
+	MaxToolCalls    int
+	MaxIterations   int
+	MaxTokens       int
+	MaxResponseTime time.Duration
+}
+
+// Usage is the token usage reported during a session
+type Usage struct {
+	InputTokens  int
+	OutputTokens int
+}
+
+// TotalTokens returns input and output tokens combined
+func (u Usage) TotalTokens() int {
+	return u.InputTokens + u.OutputTokens
+}
+
+// budgetTracker watches a session's events as they arrive and reports the
+// first budget the session exceeds, so engines can end it right away instead
+// of waiting for it to go idle or time out.
+type budgetTracker struct {
+	budget     Budget
+	start      time.Time
+	toolCalls  int
+	iterations int
+	usage      Usage
+	violation  *models.BudgetViolation
+}
+
+func newBudgetTracker(budget Budget, start time.Time) *budgetTracker {
+	return &budgetTracker{
+		budget: budget,
+		start:  start,
+	}
+}
+
+// observe accounts for evt and returns the violation, if any budget is now
+// exceeded. Once a budget is violated later events are ignored.
+func (t *budgetTracker) observe(evt SessionEvent) *models.BudgetViolation {
+	if t.violation != nil {
+		return t.violation
+	}
+
+	switch evt.EventType {
+	case "tool.execution_start":
+		t.toolCalls++
+	case "assistant.message":
+		t.iterations++
+	case "assistant.usage":
+		t.usage.InputTokens += getIntFromPayload(evt.Payload, "inputTokens")
+		t.usage.OutputTokens += getIntFromPayload(evt.Payload, "outputTokens")
+	}
+
+	switch {
+	case exceeds(t.budget.MaxToolCalls, t.toolCalls):
+		t.violate("max_tool_calls", t.budget.MaxToolCalls, t.toolCalls)
+	case exceeds(t.budget.MaxIterations, t.iterations):
+		t.violate("max_iterations", t.budget.MaxIterations, t.iterations)
+	case exceeds(t.budget.MaxTokens, t.usage.TotalTokens()):
+		t.violate("max_tokens", t.budget.MaxTokens, t.usage.TotalTokens())
+	}
+
+	return t.violation
+}
+
+// withDeadline bounds ctx by the response time budget
+func (t *budgetTracker) withDeadline(ctx context.Context) (context.Context, context.CancelFunc) {
+	if t.budget.MaxResponseTime <= 0 {
+		return context.WithCancel(ctx)
+	}
+	return context.WithDeadline(ctx, t.start.Add(t.budget.MaxResponseTime))
+}
+
+// exceedResponseTime records that the session ran past its response time
+// budget, unless another budget was violated first
+func (t *budgetTracker) exceedResponseTime() *models.BudgetViolation {
+	if t.violation == nil {
+		t.violation = &models.BudgetViolation{
+			Budget: "max_response_time_ms",
+			Limit:  t.budget.MaxResponseTime.Milliseconds(),
+			Actual: time.Since(t.start).Milliseconds(),
+		}
+	}
+	return t.violation
+}
+
+// apply copies the tracked usage and any violation onto resp
+func (t *budgetTracker) apply(resp *ExecutionResponse) {
+	resp.Usage = t.usage
+	if t.violation != nil {
+		resp.BudgetViolation = t.violation
+		resp.ErrorMsg = t.violation.String()
+	}
+}
+
+func (t *budgetTracker) violate(budget string, limit, actual int) {
+	t.violation = &models.BudgetViolation{
+		Budget: budget,
+		Limit:  int64(limit),
+		Actual: int64(actual),
+	}
+}
+
+func exceeds(limit, actual int) bool {
+	return limit > 0 && actual > limit
+}
@@ -0,0 +1,107 @@
+package execution
+
+import (
+	"context"
+	"testing"
+	"time"
+
+	"github.com/spboyer/waza/internal/models"
+	"github.com/stretchr/testify/require"
+)
+
+func TestBudgetTracker(t *testing.T) {
+	tracker := newBudgetTracker(Budget{MaxToolCalls: 2, MaxTokens: 100}, time.Now())
+
+	require.Nil(t, tracker.observe(mockEvent("tool.execution_start", map[string]any{"toolName": "bash"})))
+	require.Nil(t, tracker.observe(mockEvent("assistant.usage", map[string]any{"inputTokens": 40.0, "outputTokens": 20})))
+	require.Nil(t, tracker.observe(mockEvent("tool.execution_start", map[string]any{"toolName": "bash"})))
+
+	v := tracker.observe(mockEvent("tool.execution_start", map[string]any{"toolName": "bash"}))
+	require.Equal(t, &models.BudgetViolation{Budget: "max_tool_calls", Limit: 2, Actual: 3}, v)
+	require.Equal(t, "budget exceeded: max_tool_calls 3 > 2", v.String())
+
+	// the first violation sticks
+	require.Same(t, v, tracker.observe(mockEvent("assistant.usage", map[string]any{"inputTokens": 500})))
+	require.Same(t, v, tracker.exceedResponseTime())
+
+	resp := &ExecutionResponse{}
+	tracker.apply(resp)
+	require.Equal(t, Usage{InputTokens: 40, OutputTokens: 20}, resp.Usage)
+	require.Equal(t, v, resp.BudgetViolation)
+	require.Equal(t, v.String(), resp.ErrorMsg)
+}
+
+func TestMockEngine_Budget(t *testing.T) {
+	newEngine := func() *MockEngine {
+		return NewMockEngine("test-model", WithMockConfig(&models.MockConfig{
+			Output:  "a fairly long answer that costs some tokens",
+			Latency: models.MockLatency{MeanMs: 200},
+			ToolCalls: []models.MockToolCall{
+				{Name: "bash", Arguments: map[string]any{"command": "ls"}, Count: 10},
+			},
+		}))
+	}
+
+	t.Run("within budget", func(t *testing.T) {
+		resp, err := newEngine().Execute(context.Background(), &ExecutionRequest{
+			TestID:  "t1",
+			Message: "go",
+			Budget:  Budget{MaxToolCalls: 10, MaxResponseTime: 5 * time.Second},
+		})
+		require.NoError(t, err)
+		require.True(t, resp.Success)
+		require.Nil(t, resp.BudgetViolation)
+		require.Equal(t, 1, resp.Usage.InputTokens)
+		require.Equal(t, 11, resp.Usage.OutputTokens)
+	})
+
+	t.Run("tool calls end the session", func(t *testing.T) {
+		start := time.Now()
+		resp, err := newEngine().Execute(context.Background(), &ExecutionRequest{
+			TestID:  "t1",
+			Message: "go",
+			Budget:  Budget{MaxToolCalls: 2},
+		})
+		require.NoError(t, err)
+		require.False(t, resp.Success)
+		require.Equal(t, "max_tool_calls", resp.BudgetViolation.Budget)
+		require.Len(t, resp.ToolCalls, 3)
+		require.Empty(t, resp.FinalOutput)
+		// 3 of the 11 latency steps elapsed before the session was ended
+		require.Less(t, time.Since(start), 150*time.Millisecond)
+	})
+
+	t.Run("tokens", func(t *testing.T) {
+		resp, err := newEngine().Execute(context.Background(), &ExecutionRequest{
+			TestID:  "t1",
+			Message: "go",
+			Budget:  Budget{MaxTokens: 5},
+		})
+		require.NoError(t, err)
+		require.Equal(t, &models.BudgetViolation{Budget: "max_tokens", Limit: 5, Actual: 12}, resp.BudgetViolation)
+	})
+
+	t.Run("response time", func(t *testing.T) {
+		resp, err := newEngine().Execute(context.Background(), &ExecutionRequest{
+			TestID:  "t1",
+			Message: "go",
+			Budget:  Budget{MaxResponseTime: 50 * time.Millisecond},
+		})
+		require.NoError(t, err)
+		require.False(t, resp.Success)
+		require.Equal(t, "max_response_time_ms", resp.BudgetViolation.Budget)
+		require.Less(t, resp.DurationMs, int64(150))
+	})
+
+	t.Run("cancellation is still an error", func(t *testing.T) {
+		ctx, cancel := context.WithCancel(context.Background())
+		cancel()
+
+		_, err := newEngine().Execute(ctx, &ExecutionRequest{
+			TestID:  "t1",
+			Message: "go",
+			Budget:  Budget{MaxResponseTime: time.Second},
+		})
+		require.ErrorIs(t, err, context.Canceled)
+	})
+}
@@ -15,6 +15,7 @@ import (
 // CopilotEngine integrates with GitHub Copilot SDK
 type CopilotEngine struct {
 	modelID string
+	warm    bool
 
 	// Mutex to protect concurrent access to workspace and client
 	mu        sync.Mutex
@@ -36,6 +37,16 @@ func NewCopilotEngineBuilder(modelID string) *CopilotEngineBuilder {
 	}
 }
 
+// WithWarmClient keeps one client and workspace for every execution, so
+// sessions start without launching a new client each time and run in
+// parallel. Executions share the workspace and can't add resources to it;
+// it suits prompts that only need the agent's first moves, such as trigger
+// tests.
+func (b *CopilotEngineBuilder) WithWarmClient() *CopilotEngineBuilder {
+	b.engine.warm = true
+	return b
+}
+
 func (b *CopilotEngineBuilder) Build() *CopilotEngine {
 	return b.engine
 }
@@ -51,6 +62,10 @@ func (e *CopilotEngine) Initialize(ctx context.Context) error {
 // Execute runs a test with Copilot SDK
 // This method is now concurrency-safe through mutex protection
 func (e *CopilotEngine) Execute(ctx context.Context, req *ExecutionRequest) (*ExecutionResponse, error) {
+	if e.warm {
+		return e.executeWarm(ctx, req)
+	}
+
 	// Lock for the entire execution to ensure workspace/client isolation
 	e.mu.Lock()
 	defer e.mu.Unlock()
@@ -94,8 +109,47 @@ func (e *CopilotEngine) Execute(ctx context.Context, req *ExecutionRequest) (*Ex
 	}
 	e.client = client
 
+	return e.runSession(ctx, client, req, start)
+}
+
+// executeWarm runs a session on the shared client, starting it on first use.
+// The lock is only held while the client starts.
+func (e *CopilotEngine) executeWarm(ctx context.Context, req *ExecutionRequest) (*ExecutionResponse, error) {
+	start := time.Now()
+	if len(req.Resources) > 0 {
+		return nil, fmt.Errorf("resources are not supported with a warm client")
+	}
+
+	e.mu.Lock()
+	if e.client == nil {
+		tmpDir, err := os.MkdirTemp("", "waza-*")
+		if err != nil {
+			e.mu.Unlock()
+			return nil, fmt.Errorf("failed to create temp workspace: %w", err)
+		}
+		e.workspace = tmpDir
+
+		client := copilot.NewClient(&copilot.ClientOptions{
+			Cwd:      e.workspace,
+			LogLevel: "error",
+		})
+		if err := client.Start(ctx); err != nil {
+			e.mu.Unlock()
+			return nil, fmt.Errorf("failed to start copilot client: %w", err)
+		}
+		e.client = client
+	}
+	client := e.client
+	e.mu.Unlock()
+
+	return e.runSession(ctx, client, req, start)
+}
+
+// runSession sends the request's prompt in a new session on client and
+// collects its events until the session ends
+func (e *CopilotEngine) runSession(ctx context.Context, client *copilot.Client, req *ExecutionRequest, start time.Time) (*ExecutionResponse, error) {
 	// Create session with updated API
-	session, err := e.client.CreateSession(ctx, &copilot.SessionConfig{
+	session, err := client.CreateSession(ctx, &copilot.SessionConfig{
 		Model: e.modelID,
 	})
 	if err != nil {
@@ -113,8 +167,23 @@ func (e *CopilotEngine) Execute(ctx context.Context, req *ExecutionRequest) (*Ex
 	var errorMsg string
 	done := make(chan struct{})
 
+	// the handler runs on the SDK's goroutine while we wait below
+	var eventsMu sync.Mutex
+	tracker := newBudgetTracker(req.Budget, time.Now())
+
+	finish := func() {
+		select {
+		case <-done:
+		default:
+			close(done)
+		}
+	}
+
 	// Event handler with updated API
 	unsubscribe := session.On(func(evt copilot.SessionEvent) {
+		eventsMu.Lock()
+		defer eventsMu.Unlock()
+
 		// Convert to our event format
 		event := SessionEvent{
 			EventType: string(evt.Type),
@@ -130,25 +199,41 @@ func (e *CopilotEngine) Execute(ctx context.Context, req *ExecutionRequest) (*Ex
 			}
 		}
 
+		// Keep what budgets and graders need from tool calls and usage reports
+		switch event.EventType {
+		case "tool.execution_start":
+			if evt.Data.ToolName != nil {
+				event.Payload["toolName"] = *evt.Data.ToolName
+			}
+			if args, ok := evt.Data.Arguments.(map[string]any); ok {
+				event.Payload["arguments"] = args
+			}
+		case "assistant.usage":
+			if evt.Data.InputTokens != nil {
+				event.Payload["inputTokens"] = *evt.Data.InputTokens
+			}
+			if evt.Data.OutputTokens != nil {
+				event.Payload["outputTokens"] = *evt.Data.OutputTokens
+			}
+		}
+
 		// Check for completion
 		if evt.Type == copilot.SessionIdle {
-			select {
-			case <-done:
-			default:
-				close(done)
-			}
+			finish()
 		} else if evt.Type == copilot.SessionError {
 			if evt.Data.Message != nil {
 				errorMsg = *evt.Data.Message
 			}
-			select {
-			case <-done:
-			default:
-				close(done)
-			}
+			finish()
 		}
 
 		events = append(events, event)
+
+		// end the session as soon as it runs over budget, or once the
+		// caller has what it needs
+		if tracker.observe(event) != nil || (req.StopWhen != nil && req.StopWhen(event)) {
+			finish()
+		}
 	})
 	defer unsubscribe()
 
@@ -164,13 +249,26 @@ func (e *CopilotEngine) Execute(ctx context.Context, req *ExecutionRequest) (*Ex
 	timeoutCtx, cancel := context.WithTimeout(ctx, time.Duration(req.TimeoutSec)*time.Second)
 	defer cancel()
 
+	budgetCtx, cancelBudget := tracker.withDeadline(timeoutCtx)
+	defer cancelBudget()
+
 	select {
 	case <-done:
-		// Completed normally
-	case <-timeoutCtx.Done():
-		errorMsg = fmt.Sprintf("execution timed out after %ds", req.TimeoutSec)
+		// Completed normally or ran over budget
+	case <-budgetCtx.Done():
+		eventsMu.Lock()
+		if timeoutCtx.Err() != nil {
+			errorMsg = fmt.Sprintf("execution timed out after %ds", req.TimeoutSec)
+		} else {
+			tracker.exceedResponseTime()
+		}
+		eventsMu.Unlock()
 	}
 
+	// the handler may still be running for late events
+	eventsMu.Lock()
+	defer eventsMu.Unlock()
+
 	duration := time.Since(start)
 
 	// Build response
@@ -182,8 +280,9 @@ func (e *CopilotEngine) Execute(ctx context.Context, req *ExecutionRequest) (*Ex
 		DurationMs:   duration.Milliseconds(),
 		ToolCalls:    extractToolCalls(events),
 		ErrorMsg:     errorMsg,
-		Success:      errorMsg == "",
 	}
+	tracker.apply(resp)
+	resp.Success = resp.ErrorMsg == ""
 
 	return resp, nil
 }
@@ -283,6 +382,18 @@ func getStringFromPayload(payload map[string]any, key string) string {
 	return ""
 }
 
+func getIntFromPayload(payload map[string]any, key string) int {
+	switch val := payload[key].(type) {
+	case int:
+		return val
+	case int64:
+		return int(val)
+	case float64:
+		return int(val)
+	}
+	return 0
+}
+
 func getMapFromPayload(payload map[string]any, key string) map[string]any {
 	if val, ok := payload[key].(map[string]any); ok {
 		return val
@@ -4,6 +4,8 @@ import (
 	"context"
 	"strings"
 	"time"
+
+	"github.com/spboyer/waza/internal/models"
 )
 
 // AgentEngine is the interface for executing test prompts
@@ -26,6 +28,12 @@ type ExecutionRequest struct {
 	Resources  []ResourceFile
 	SkillName  string
 	TimeoutSec int
+	// Budget ends the session early when exceeded
+	Budget Budget
+	// StopWhen, if set, is called with each event as it arrives and ends
+	// the session early once it returns true, e.g. when all a caller needs
+	// is already known. It is called from one goroutine at a time.
+	StopWhen func(SessionEvent) bool
 }
 
 // ResourceFile represents a file resource
@@ -44,6 +52,10 @@ type ExecutionResponse struct {
 	ToolCalls    []ToolCall
 	ErrorMsg     string
 	Success      bool
+	Usage        Usage
+	// BudgetViolation is set when the session was ended for exceeding the
+	// request's budget
+	BudgetViolation *models.BudgetViolation
 }
 
 // SessionEvent represents an event during execution
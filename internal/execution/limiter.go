@@ -0,0 +1,360 @@
+package execution
+
+import (
+	"context"
+	"errors"
+	"math/rand"
+	"strings"
+	"sync"
+	"time"
+
+	"github.com/spboyer/waza/internal/models"
+)
+
+// Limiter defaults
+const (
+	DefaultMaxRetries = 3
+	// DefaultMaxConcurrency bounds an adaptive limiter with no max_concurrency
+	DefaultMaxConcurrency = 64
+)
+
+const (
+	// latencyTolerance is how far above its running average a session's
+	// latency may be for the adaptive window to keep growing
+	latencyTolerance = 2.0
+	// smoothing weighs each session in the running averages of latency and
+	// tokens used
+	smoothing     = 0.1
+	retryMaxDelay = 30 * time.Second
+)
+
+// retryBaseDelay is the backoff before the first retry of a throttled session
+var retryBaseDelay = time.Second
+
+// LimiterStats counts what a Limiter did
+type LimiterStats struct {
+	// Throttled counts sessions rejected as rate limited, retried or not
+	Throttled int
+	Retried   int
+	TimedOut  int
+	// Concurrency is the window at the end, and MinConcurrency and
+	// MaxConcurrency the range it moved in
+	Concurrency    int
+	MinConcurrency int
+	MaxConcurrency int
+}
+
+// Limiter paces sessions across every engine it executes on. It caps the
+// sessions in flight with a window that, when adaptive, grows additively
+// while latency holds steady and halves on throttling or timeouts, at most
+// once per typical session so one burst of failures backs off once. Optional
+// token buckets cap requests and tokens per minute, and throttled sessions
+// are retried with exponential backoff.
+type Limiter struct {
+	adaptive   bool
+	ceiling    int
+	maxRetries int
+
+	mu       sync.Mutex
+	window   float64
+	inFlight int
+	// wake is closed and replaced whenever a slot may have opened
+	wake chan struct{}
+	// latencyMs is the running average latency of sessions that went through
+	latencyMs    float64
+	lastBackoff  time.Time
+	requests     *tokenBucket
+	tokens       *tokenBucket
+	tokensPerReq float64
+	stats        LimiterStats
+}
+
+// NewLimiter creates a limiter for cfg, starting at workers sessions in
+// flight
+func NewLimiter(cfg models.RateLimitConfig, workers int) *Limiter {
+	if workers <= 0 {
+		workers = 1
+	}
+	l := &Limiter{
+		adaptive:   cfg.Adaptive,
+		ceiling:    workers,
+		maxRetries: DefaultMaxRetries,
+		window:     float64(workers),
+		wake:       make(chan struct{}),
+	}
+	if cfg.Adaptive {
+		l.ceiling = cfg.MaxConcurrency
+		if l.ceiling <= 0 {
+			l.ceiling = DefaultMaxConcurrency
+		}
+		if l.ceiling < workers {
+			l.ceiling = workers
+		}
+	}
+	if cfg.MaxRetries != nil {
+		l.maxRetries = *cfg.MaxRetries
+	}
+	if cfg.RequestsPerMinute > 0 {
+		l.requests = newTokenBucket(cfg.RequestsPerMinute)
+	}
+	if cfg.TokensPerMinute > 0 {
+		l.tokens = newTokenBucket(cfg.TokensPerMinute)
+	}
+	l.stats.MinConcurrency, l.stats.MaxConcurrency = workers, workers
+	return l
+}
+
+// Ceiling returns the most sessions the limiter ever lets run at once
+func (l *Limiter) Ceiling() int {
+	return l.ceiling
+}
+
+// Stats returns what the limiter did so far
+func (l *Limiter) Stats() LimiterStats {
+	l.mu.Lock()
+	defer l.mu.Unlock()
+	stats := l.stats
+	stats.Concurrency = int(l.window)
+	return stats
+}
+
+// Execute runs req on engine once the limits allow, retrying it while it is
+// throttled
+func (l *Limiter) Execute(ctx context.Context, engine AgentEngine, req *ExecutionRequest) (*ExecutionResponse, error) {
+	for attempt := 0; ; attempt++ {
+		if err := l.acquire(ctx); err != nil {
+			return nil, err
+		}
+		estimate, err := l.pace(ctx)
+		if err != nil {
+			l.release(sessionCancelled, 0, estimate, 0)
+			return nil, err
+		}
+
+		start := time.Now()
+		resp, err := engine.Execute(ctx, req)
+		outcome := classifySession(ctx, resp, err)
+		tokens := 0
+		if resp != nil {
+			tokens = resp.Usage.TotalTokens()
+		}
+		l.release(outcome, time.Since(start), estimate, tokens)
+
+		if outcome != sessionThrottled || attempt >= l.maxRetries {
+			return resp, err
+		}
+
+		l.mu.Lock()
+		l.stats.Retried++
+		l.mu.Unlock()
+		if err := sleepContext(ctx, retryDelay(attempt)); err != nil {
+			return nil, err
+		}
+	}
+}
+
+// acquire waits for a slot in the window
+func (l *Limiter) acquire(ctx context.Context) error {
+	for {
+		l.mu.Lock()
+		if l.inFlight < int(l.window) {
+			l.inFlight++
+			l.mu.Unlock()
+			return nil
+		}
+		wake := l.wake
+		l.mu.Unlock()
+
+		select {
+		case <-wake:
+		case <-ctx.Done():
+			return ctx.Err()
+		}
+	}
+}
+
+// pace takes a request, and the tokens a request is expected to use, from
+// the buckets, waiting until they have them. It returns the tokens taken.
+func (l *Limiter) pace(ctx context.Context) (int, error) {
+	now := time.Now()
+	l.mu.Lock()
+	var wait time.Duration
+	if l.requests != nil {
+		wait = l.requests.take(1, now)
+	}
+	estimate := 0
+	if l.tokens != nil {
+		estimate = int(l.tokensPerReq)
+		if w := l.tokens.take(estimate, now); w > wait {
+			wait = w
+		}
+	}
+	l.mu.Unlock()
+
+	return estimate, sleepContext(ctx, wait)
+}
+
+type sessionOutcome int
+
+const (
+	sessionOK sessionOutcome = iota
+	sessionFailed
+	sessionCancelled
+	sessionThrottled
+	sessionTimedOut
+)
+
+// release frees a session's slot and adapts the limits to how it went
+func (l *Limiter) release(outcome sessionOutcome, latency time.Duration, estimate, tokens int) {
+	l.mu.Lock()
+	defer l.mu.Unlock()
+	l.inFlight--
+
+	if l.tokens != nil {
+		// settle the estimate against what the session used
+		l.tokens.take(tokens-estimate, time.Now())
+		if tokens > 0 {
+			l.tokensPerReq = average(l.tokensPerReq, float64(tokens))
+		}
+	}
+
+	switch outcome {
+	case sessionThrottled:
+		l.stats.Throttled++
+		l.backOffLocked()
+	case sessionTimedOut:
+		l.stats.TimedOut++
+		l.backOffLocked()
+	case sessionOK:
+		ms := float64(latency.Milliseconds())
+		steady := l.latencyMs == 0 || ms <= l.latencyMs*latencyTolerance
+		l.latencyMs = average(l.latencyMs, ms)
+		if l.adaptive && steady && l.window < float64(l.ceiling) {
+			l.window += 1 / l.window
+			if l.window > float64(l.ceiling) {
+				l.window = float64(l.ceiling)
+			}
+			if n := int(l.window); n > l.stats.MaxConcurrency {
+				l.stats.MaxConcurrency = n
+			}
+		}
+	}
+
+	close(l.wake)
+	l.wake = make(chan struct{})
+}
+
+// average adds a sample to a running average, which starts at the first
+func average(avg, sample float64) float64 {
+	if avg == 0 {
+		return sample
+	}
+	return avg + smoothing*(sample-avg)
+}
+
+// backOffLocked halves the window, once per typical session latency
+func (l *Limiter) backOffLocked() {
+	if !l.adaptive {
+		return
+	}
+	now := time.Now()
+	if now.Sub(l.lastBackoff) < time.Duration(l.latencyMs)*time.Millisecond {
+		return
+	}
+	l.lastBackoff = now
+
+	l.window /= 2
+	if l.window < 1 {
+		l.window = 1
+	}
+	if n := int(l.window); n < l.stats.MinConcurrency {
+		l.stats.MinConcurrency = n
+	}
+}
+
+// classifySession tells throttled and timed out sessions from the rest
+func classifySession(ctx context.Context, resp *ExecutionResponse, err error) sessionOutcome {
+	msg := ""
+	switch {
+	case ctx.Err() != nil:
+		return sessionCancelled
+	case err != nil:
+		msg = err.Error()
+		if errors.Is(err, context.DeadlineExceeded) {
+			return sessionTimedOut
+		}
+	case resp != nil:
+		msg = resp.ErrorMsg
+	}
+
+	switch {
+	case msg == "":
+		return sessionOK
+	case IsThrottled(msg):
+		return sessionThrottled
+	case strings.Contains(msg, "timed out"):
+		return sessionTimedOut
+	default:
+		return sessionFailed
+	}
+}
+
+// IsThrottled reports whether an error message says the model's service
+// rejected the session for exceeding its rate limits
+func IsThrottled(msg string) bool {
+	msg = strings.ToLower(msg)
+	for _, marker := range []string{"429", "too many requests", "rate limit", "rate_limit", "ratelimit", "throttl"} {
+		if strings.Contains(msg, marker) {
+			return true
+		}
+	}
+	return false
+}
+
+// retryDelay is the exponential backoff, with jitter, before retry attempt+1
+func retryDelay(attempt int) time.Duration {
+	delay := retryBaseDelay << attempt
+	if delay > retryMaxDelay || delay <= 0 {
+		delay = retryMaxDelay
+	}
+	return delay/2 + time.Duration(rand.Int63n(int64(delay/2)+1))
+}
+
+// tokenBucket refills at a per-minute rate up to one second's worth, at
+// least one unit. Taking more than it holds leaves it in debt, which later
+// takers wait out.
+type tokenBucket struct {
+	perSec   float64
+	capacity float64
+	level    float64
+	last     time.Time
+}
+
+func newTokenBucket(perMinute int) *tokenBucket {
+	perSec := float64(perMinute) / 60
+	capacity := perSec
+	if capacity < 1 {
+		capacity = 1
+	}
+	return &tokenBucket{perSec: perSec, capacity: capacity, level: capacity, last: time.Now()}
+}
+
+// take removes n units and returns how long to wait until the bucket is
+// out of debt. A negative n returns units.
+func (b *tokenBucket) take(n int, now time.Time) time.Duration {
+	if elapsed := now.Sub(b.last); elapsed > 0 {
+		b.level += elapsed.Seconds() * b.perSec
+		if b.level > b.capacity {
+			b.level = b.capacity
+		}
+		b.last = now
+	}
+	b.level -= float64(n)
+	if b.level > b.capacity {
+		b.level = b.capacity
+	}
+	if b.level >= 0 {
+		return 0
+	}
+	return time.Duration(-b.level / b.perSec * float64(time.Second))
+}
@@ -0,0 +1,129 @@
+package execution
+
+import (
+	"context"
+	"sync/atomic"
+	"testing"
+	"time"
+
+	"github.com/spboyer/waza/internal/models"
+	"github.com/stretchr/testify/require"
+)
+
+// throttlingEngine rejects its first sessions as rate limited
+type throttlingEngine struct {
+	AgentEngine
+	throttle int64
+	calls    atomic.Int64
+}
+
+func (e *throttlingEngine) Execute(ctx context.Context, req *ExecutionRequest) (*ExecutionResponse, error) {
+	if e.calls.Add(1) <= e.throttle {
+		return &ExecutionResponse{ErrorMsg: "CAPIError: 429 Too Many Requests"}, nil
+	}
+	return &ExecutionResponse{Success: true, Usage: Usage{InputTokens: 30, OutputTokens: 10}}, nil
+}
+
+func TestLimiter_RetriesThrottledSessions(t *testing.T) {
+	defer func(d time.Duration) { retryBaseDelay = d }(retryBaseDelay)
+	retryBaseDelay = time.Millisecond
+
+	engine := &throttlingEngine{throttle: 2}
+	l := NewLimiter(models.RateLimitConfig{}, 2)
+
+	resp, err := l.Execute(context.Background(), engine, &ExecutionRequest{})
+	require.NoError(t, err)
+	require.True(t, resp.Success)
+	require.Equal(t, int64(3), engine.calls.Load())
+
+	stats := l.Stats()
+	require.Equal(t, 2, stats.Throttled)
+	require.Equal(t, 2, stats.Retried)
+	// not adaptive: the window stays at max_workers
+	require.Equal(t, 2, stats.Concurrency)
+
+	t.Run("gives up after max_retries", func(t *testing.T) {
+		retries := 1
+		engine := &throttlingEngine{throttle: 5}
+		l := NewLimiter(models.RateLimitConfig{MaxRetries: &retries}, 2)
+
+		resp, err := l.Execute(context.Background(), engine, &ExecutionRequest{})
+		require.NoError(t, err)
+		require.Contains(t, resp.ErrorMsg, "429")
+		require.Equal(t, int64(2), engine.calls.Load())
+	})
+}
+
+func TestLimiter_AdaptsWindow(t *testing.T) {
+	l := NewLimiter(models.RateLimitConfig{Adaptive: true, MaxConcurrency: 6}, 2)
+	require.Equal(t, 6, l.Ceiling())
+
+	// steady latency grows the window by about one per window of sessions
+	for i := 0; i < 12; i++ {
+		require.NoError(t, l.acquire(context.Background()))
+		l.release(sessionOK, 100*time.Millisecond, 0, 0)
+	}
+	require.Equal(t, 5, l.Stats().Concurrency)
+
+	// a latency spike holds it
+	require.NoError(t, l.acquire(context.Background()))
+	l.release(sessionOK, time.Second, 0, 0)
+	require.Equal(t, 5, l.Stats().Concurrency)
+
+	// throttling halves it, once per typical session
+	l.lastBackoff = time.Time{}
+	for i := 0; i < 3; i++ {
+		require.NoError(t, l.acquire(context.Background()))
+		l.release(sessionThrottled, 0, 0, 0)
+	}
+	stats := l.Stats()
+	require.Equal(t, 2, stats.Concurrency)
+	require.Equal(t, 2, stats.MinConcurrency)
+	require.Equal(t, 5, stats.MaxConcurrency)
+	require.Equal(t, 3, stats.Throttled)
+}
+
+func TestLimiter_WindowBoundsSessionsInFlight(t *testing.T) {
+	l := NewLimiter(models.RateLimitConfig{}, 1)
+	require.NoError(t, l.acquire(context.Background()))
+
+	ctx, cancel := context.WithTimeout(context.Background(), 10*time.Millisecond)
+	defer cancel()
+	require.ErrorIs(t, l.acquire(ctx), context.DeadlineExceeded)
+
+	l.release(sessionOK, time.Millisecond, 0, 0)
+	require.NoError(t, l.acquire(context.Background()))
+}
+
+func TestTokenBucket(t *testing.T) {
+	now := time.Now()
+	b := newTokenBucket(120) // 2 per second, holding up to 2
+	b.last = now
+
+	require.Zero(t, b.take(2, now))
+	require.Equal(t, 500*time.Millisecond, b.take(1, now))
+	// a second later it has refilled the debt and one more
+	require.Zero(t, b.take(1, now.Add(time.Second)))
+	// it never holds more than a second's worth
+	require.Equal(t, 500*time.Millisecond, b.take(3, now.Add(time.Hour)))
+}
+
+func TestClassifySession(t *testing.T) {
+	ctx := context.Background()
+	require.Equal(t, sessionOK, classifySession(ctx, &ExecutionResponse{}, nil))
+	require.Equal(t, sessionThrottled, classifySession(ctx, &ExecutionResponse{ErrorMsg: "Rate limit exceeded, retry later"}, nil))
+	require.Equal(t, sessionTimedOut, classifySession(ctx, &ExecutionResponse{ErrorMsg: "execution timed out after 30s"}, nil))
+	require.Equal(t, sessionFailed, classifySession(ctx, &ExecutionResponse{ErrorMsg: "mock: injected session error"}, nil))
+	require.Equal(t, sessionTimedOut, classifySession(ctx, nil, context.DeadlineExceeded))
+
+	cancelled, cancel := context.WithCancel(ctx)
+	cancel()
+	require.Equal(t, sessionCancelled, classifySession(cancelled, nil, context.Canceled))
+}
+
+func TestMockEngine_InjectsThrottling(t *testing.T) {
+	engine := NewMockEngine("test-model", WithMockConfig(&models.MockConfig{ThrottleRate: 1}))
+	resp, err := engine.Execute(context.Background(), &ExecutionRequest{TestID: "a", TimeoutSec: 10})
+	require.NoError(t, err)
+	require.True(t, IsThrottled(resp.ErrorMsg))
+}
@@ -3,19 +3,49 @@ package execution
 import (
 	"context"
 	"fmt"
+	"hash/fnv"
+	"math"
+	"math/rand"
+	"sync"
 	"time"
+
+	"github.com/spboyer/waza/internal/models"
 )
 
 // MockEngine is a simple mock implementation for testing
 type MockEngine struct {
 	modelID string
+	profile *models.MockConfig
+
+	// attempts counts executions per test so that seeded runs stay
+	// deterministic regardless of scheduling order
+	mu       sync.Mutex
+	attempts map[string]int
+}
+
+// MockOption configures a MockEngine
+type MockOption func(*MockEngine)
+
+// WithMockConfig makes the engine simulate latency, streaming events and
+// injected failures as described by the spec's mock configuration
+func WithMockConfig(cfg *models.MockConfig) MockOption {
+	return func(m *MockEngine) {
+		m.profile = cfg
+	}
 }
 
 // NewMockEngine creates a new mock engine
-func NewMockEngine(modelID string) *MockEngine {
-	return &MockEngine{
-		modelID: modelID,
+func NewMockEngine(modelID string, opts ...MockOption) *MockEngine {
+	m := &MockEngine{
+		modelID:  modelID,
+		attempts: make(map[string]int),
 	}
+
+	for _, opt := range opts {
+		opt(m)
+	}
+
+	return m
 }
 
 func (m *MockEngine) Initialize(ctx context.Context) error {
@@ -23,15 +53,14 @@ func (m *MockEngine) Initialize(ctx context.Context) error {
 }
 
 func (m *MockEngine) Execute(ctx context.Context, req *ExecutionRequest) (*ExecutionResponse, error) {
+	if m.profile != nil {
+		return m.executeProfile(ctx, req)
+	}
+
 	start := time.Now()
 
 	// Simple mock response
-	output := fmt.Sprintf("Mock response for: %s", req.Message)
-
-	// Add some context if files are present
-	if len(req.Resources) > 0 {
-		output += fmt.Sprintf("\nAnalyzed %d file(s)", len(req.Resources))
-	}
+	output := m.defaultOutput(req)
 
 	resp := &ExecutionResponse{
 		FinalOutput:  output,
@@ -49,3 +78,252 @@ func (m *MockEngine) Execute(ctx context.Context, req *ExecutionRequest) (*Execu
 func (m *MockEngine) Shutdown(ctx context.Context) error {
 	return nil
 }
+
+func (m *MockEngine) defaultOutput(req *ExecutionRequest) string {
+	output := fmt.Sprintf("Mock response for: %s", req.Message)
+
+	// Add some context if files are present
+	if len(req.Resources) > 0 {
+		output += fmt.Sprintf("\nAnalyzed %d file(s)", len(req.Resources))
+	}
+
+	return output
+}
+
+// executeProfile plays back a simulated session: it sleeps for a latency drawn
+// from the configured distribution, spreading the wait across the emitted
+// tool and delta events, and injects errors, timeouts or throttling at the
+// configured rates.
+// The request's budget is enforced as events are emitted, like a real session.
+func (m *MockEngine) executeProfile(ctx context.Context, req *ExecutionRequest) (*ExecutionResponse, error) {
+	start := time.Now()
+	profile := m.profile
+	rng := rand.New(rand.NewSource(m.seedFor(req.TestID)))
+
+	resp := &ExecutionResponse{
+		ModelID:      m.modelID,
+		SkillInvoked: req.SkillName,
+	}
+
+	tracker := newBudgetTracker(req.Budget, start)
+	runCtx, cancel := tracker.withDeadline(ctx)
+	defer cancel()
+
+	latency := sampleLatency(rng, profile.Latency)
+	roll := rng.Float64()
+
+	var err error
+	switch {
+	case roll < profile.TimeoutRate:
+		// simulate a session that never goes idle
+		timeout := time.Duration(req.TimeoutSec) * time.Second
+		if err = sleepContext(runCtx, timeout); err == nil {
+			resp.ErrorMsg = fmt.Sprintf("execution timed out after %ds", req.TimeoutSec)
+		}
+	case roll < profile.TimeoutRate+profile.ErrorRate:
+		if err = sleepContext(runCtx, latency); err == nil {
+			resp.ErrorMsg = "mock: injected session error"
+			resp.Events = append(resp.Events, mockEvent("session.error", map[string]any{"message": resp.ErrorMsg}))
+		}
+	case roll < profile.TimeoutRate+profile.ErrorRate+profile.ThrottleRate:
+		resp.ErrorMsg = "mock: 429 Too Many Requests: rate limit exceeded"
+		resp.Events = append(resp.Events, mockEvent("session.error", map[string]any{"message": resp.ErrorMsg}))
+	default:
+		err = m.streamEvents(runCtx, req, resp, latency, tracker)
+	}
+
+	if err != nil {
+		if ctx.Err() != nil {
+			return nil, err
+		}
+		// only the response time budget can end runCtx early
+		tracker.exceedResponseTime()
+	}
+	tracker.apply(resp)
+
+	resp.ToolCalls = extractToolCalls(resp.Events)
+	if resp.ToolCalls == nil {
+		resp.ToolCalls = []ToolCall{}
+	}
+	resp.DurationMs = time.Since(start).Milliseconds()
+	resp.Success = resp.ErrorMsg == ""
+
+	return resp, nil
+}
+
+func (m *MockEngine) streamEvents(ctx context.Context, req *ExecutionRequest, resp *ExecutionResponse, latency time.Duration, tracker *budgetTracker) error {
+	output := m.profile.Output
+	if output == "" {
+		output = m.defaultOutput(req)
+	}
+
+	var toolCalls []models.MockToolCall
+	for _, tc := range m.profile.ToolCalls {
+		count := tc.Count
+		if count <= 0 {
+			count = 1
+		}
+		for i := 0; i < count; i++ {
+			toolCalls = append(toolCalls, tc)
+		}
+	}
+
+	chunks := splitChunks(output, m.profile.DeltaChunks)
+
+	// emit records events and reports whether the session may continue
+	emit := func(events ...SessionEvent) bool {
+		for _, evt := range events {
+			resp.Events = append(resp.Events, evt)
+			if tracker.observe(evt) != nil || (req.StopWhen != nil && req.StopWhen(evt)) {
+				return false
+			}
+		}
+		return true
+	}
+
+	// every tool call and delta is one step; the final message is the last
+	steps := len(toolCalls) + len(chunks) + 1
+	stepDelay := latency / time.Duration(steps)
+
+	for i, tc := range toolCalls {
+		if err := sleepContext(ctx, stepDelay); err != nil {
+			return err
+		}
+		callID := fmt.Sprintf("call-%d", i+1)
+		if !emit(
+			mockEvent("tool.execution_start", map[string]any{
+				"toolCallId": callID,
+				"toolName":   tc.Name,
+				"arguments":  tc.Arguments,
+			}),
+			mockEvent("tool.execution_complete", map[string]any{
+				"toolCallId": callID,
+				"success":    true,
+			}),
+		) {
+			return nil
+		}
+	}
+
+	for _, chunk := range chunks {
+		if err := sleepContext(ctx, stepDelay); err != nil {
+			return err
+		}
+		if !emit(mockEvent("assistant.message_delta", map[string]any{"content": chunk})) {
+			return nil
+		}
+	}
+
+	if err := sleepContext(ctx, latency-stepDelay*time.Duration(steps-1)); err != nil {
+		return err
+	}
+	if !emit(
+		mockEvent("assistant.usage", map[string]any{
+			"inputTokens":  estimateTokens(req.Message),
+			"outputTokens": estimateTokens(output),
+		}),
+		mockEvent("assistant.message", map[string]any{"content": output}),
+		mockEvent("session.idle", map[string]any{}),
+	) {
+		return nil
+	}
+	resp.FinalOutput = output
+
+	return nil
+}
+
+// seedFor derives a per-execution seed from the configured seed, the test and
+// how many times that test has run, so concurrent runs replay identically.
+func (m *MockEngine) seedFor(testID string) int64 {
+	m.mu.Lock()
+	attempt := m.attempts[testID]
+	m.attempts[testID] = attempt + 1
+	m.mu.Unlock()
+
+	h := fnv.New64a()
+	fmt.Fprintf(h, "%d\x00%s\x00%d", m.profile.Seed, testID, attempt)
+	return int64(h.Sum64())
+}
+
+func sampleLatency(rng *rand.Rand, cfg models.MockLatency) time.Duration {
+	var ms float64
+
+	switch cfg.Distribution {
+	case models.LatencyUniform:
+		ms = cfg.MinMs + rng.Float64()*(cfg.MaxMs-cfg.MinMs)
+	case models.LatencyNormal:
+		ms = cfg.MeanMs + rng.NormFloat64()*cfg.StdDevMs
+	case models.LatencyLogNormal:
+		// parameterized by the mean and stddev of the resulting distribution
+		if cfg.MeanMs > 0 {
+			variance := math.Log(1 + (cfg.StdDevMs*cfg.StdDevMs)/(cfg.MeanMs*cfg.MeanMs))
+			mu := math.Log(cfg.MeanMs) - variance/2
+			ms = math.Exp(mu + rng.NormFloat64()*math.Sqrt(variance))
+		}
+	default:
+		ms = cfg.MeanMs
+	}
+
+	if ms < cfg.MinMs {
+		ms = cfg.MinMs
+	}
+	if cfg.MaxMs > 0 && ms > cfg.MaxMs {
+		ms = cfg.MaxMs
+	}
+	if ms < 0 {
+		ms = 0
+	}
+
+	return time.Duration(ms * float64(time.Millisecond))
+}
+
+// splitChunks breaks output into n roughly equal pieces on rune boundaries
+func splitChunks(output string, n int) []string {
+	runes := []rune(output)
+	if n <= 0 || len(runes) == 0 {
+		return nil
+	}
+	if n > len(runes) {
+		n = len(runes)
+	}
+
+	chunks := make([]string, 0, n)
+	size := len(runes) / n
+	for i := 0; i < n; i++ {
+		end := (i + 1) * size
+		if i == n-1 {
+			end = len(runes)
+		}
+		chunks = append(chunks, string(runes[i*size:end]))
+	}
+	return chunks
+}
+
+// estimateTokens approximates a token count at four characters per token
+func estimateTokens(text string) int {
+	return (len(text) + 3) / 4
+}
+
+func mockEvent(eventType string, payload map[string]any) SessionEvent {
+	return SessionEvent{
+		EventType: eventType,
+		Timestamp: time.Now(),
+		Payload:   payload,
+	}
+}
+
+func sleepContext(ctx context.Context, d time.Duration) error {
+	if d <= 0 {
+		return ctx.Err()
+	}
+
+	timer := time.NewTimer(d)
+	defer timer.Stop()
+
+	select {
+	case <-timer.C:
+		return nil
+	case <-ctx.Done():
+		return ctx.Err()
+	}
+}
@@ -0,0 +1,102 @@
+package execution
+
+import (
+	"context"
+	"strings"
+	"testing"
+	"time"
+
+	"github.com/spboyer/waza/internal/models"
+	"github.com/stretchr/testify/require"
+)
+
+func TestMockEngine_Default(t *testing.T) {
+	engine := NewMockEngine("test-model")
+
+	resp, err := engine.Execute(context.Background(), &ExecutionRequest{
+		TestID:  "t1",
+		Message: "hello",
+	})
+	require.NoError(t, err)
+	require.True(t, resp.Success)
+	require.Equal(t, "Mock response for: hello", resp.FinalOutput)
+	require.Empty(t, resp.Events)
+}
+
+func TestMockEngine_StreamsEvents(t *testing.T) {
+	engine := NewMockEngine("test-model", WithMockConfig(&models.MockConfig{
+		Output:      "the quick brown fox",
+		DeltaChunks: 4,
+		ToolCalls: []models.MockToolCall{
+			{Name: "bash", Arguments: map[string]any{"command": "ls"}, Count: 3},
+		},
+	}))
+
+	resp, err := engine.Execute(context.Background(), &ExecutionRequest{TestID: "t1", Message: "go"})
+	require.NoError(t, err)
+	require.True(t, resp.Success)
+	require.Equal(t, "the quick brown fox", resp.FinalOutput)
+
+	require.Len(t, resp.ToolCalls, 3)
+	require.Equal(t, "bash", resp.ToolCalls[0].Name)
+	require.Equal(t, "ls", resp.ToolCalls[0].Arguments["command"])
+
+	var deltas []string
+	for _, evt := range resp.Events {
+		if evt.EventType == "assistant.message_delta" {
+			deltas = append(deltas, evt.Payload["content"].(string))
+		}
+	}
+	require.Len(t, deltas, 4)
+	require.Equal(t, "the quick brown fox", strings.Join(deltas, ""))
+	require.Equal(t, "session.idle", resp.Events[len(resp.Events)-1].EventType)
+}
+
+func TestMockEngine_Latency(t *testing.T) {
+	engine := NewMockEngine("test-model", WithMockConfig(&models.MockConfig{
+		Latency: models.MockLatency{Distribution: models.LatencyFixed, MeanMs: 50},
+	}))
+
+	start := time.Now()
+	_, err := engine.Execute(context.Background(), &ExecutionRequest{TestID: "t1"})
+	require.NoError(t, err)
+	require.GreaterOrEqual(t, time.Since(start), 50*time.Millisecond)
+
+	ctx, cancel := context.WithTimeout(context.Background(), 10*time.Millisecond)
+	defer cancel()
+
+	slow := NewMockEngine("test-model", WithMockConfig(&models.MockConfig{
+		Latency: models.MockLatency{MeanMs: 10_000},
+	}))
+	_, err = slow.Execute(ctx, &ExecutionRequest{TestID: "t1"})
+	require.ErrorIs(t, err, context.DeadlineExceeded)
+}
+
+func TestMockEngine_InjectedFailuresAreSeeded(t *testing.T) {
+	cfg := &models.MockConfig{Seed: 42, ErrorRate: 0.5}
+
+	outcomes := func() []bool {
+		engine := NewMockEngine("test-model", WithMockConfig(cfg))
+		var results []bool
+		for i := 0; i < 20; i++ {
+			resp, err := engine.Execute(context.Background(), &ExecutionRequest{TestID: "t1"})
+			require.NoError(t, err)
+			results = append(results, resp.Success)
+		}
+		return results
+	}
+
+	first := outcomes()
+	require.Equal(t, first, outcomes())
+	require.Contains(t, first, true)
+	require.Contains(t, first, false)
+}
+
+func TestMockEngine_InjectedTimeout(t *testing.T) {
+	engine := NewMockEngine("test-model", WithMockConfig(&models.MockConfig{TimeoutRate: 1}))
+
+	resp, err := engine.Execute(context.Background(), &ExecutionRequest{TestID: "t1", TimeoutSec: 0})
+	require.NoError(t, err)
+	require.False(t, resp.Success)
+	require.Equal(t, "execution timed out after 0s", resp.ErrorMsg)
+}
@@ -0,0 +1,67 @@
+package execution
+
+// SkillTool is the tool agents call to load a skill
+const SkillTool = "skill"
+
+// ActivationDetector decides, from a session's events as they arrive,
+// whether the agent activated a skill. Agents choose their skills before
+// acting on a request, so the decision is usually known long before the
+// session goes idle:
+//   - a call to the skill tool, or a skill.invoked event, names the skill the
+//     agent loaded
+//   - a first turn that ends without loading a skill, or a session that ends,
+//     means the skill was passed over
+type ActivationDetector struct {
+	skill     string
+	decided   bool
+	activated bool
+}
+
+// NewActivationDetector creates a detector for the named skill
+func NewActivationDetector(skill string) *ActivationDetector {
+	return &ActivationDetector{skill: skill}
+}
+
+// Observe accounts for evt and reports whether the outcome is now known.
+// Once it is, later events are ignored.
+func (d *ActivationDetector) Observe(evt SessionEvent) bool {
+	if d.decided {
+		return true
+	}
+
+	switch evt.EventType {
+	case "skill.invoked":
+		d.decide(skillName(evt.Payload))
+	case "tool.execution_start":
+		if getStringFromPayload(evt.Payload, "toolName") == SkillTool {
+			d.decide(skillName(getMapFromPayload(evt.Payload, "arguments")))
+		}
+	case "assistant.turn_end", "session.idle", "session.error":
+		d.decide("")
+	}
+	return d.decided
+}
+
+// Decided reports whether the outcome is known
+func (d *ActivationDetector) Decided() bool {
+	return d.decided
+}
+
+// Activated reports whether the skill was activated
+func (d *ActivationDetector) Activated() bool {
+	return d.activated
+}
+
+func (d *ActivationDetector) decide(loaded string) {
+	d.decided = true
+	d.activated = loaded == d.skill
+}
+
+func skillName(payload map[string]any) string {
+	for _, key := range []string{"skill", "skillName", "name"} {
+		if name := getStringFromPayload(payload, key); name != "" {
+			return name
+		}
+	}
+	return ""
+}
@@ -0,0 +1,64 @@
+package execution
+
+import (
+	"context"
+	"testing"
+
+	"github.com/spboyer/waza/internal/models"
+	"github.com/stretchr/testify/require"
+)
+
+func TestActivationDetector(t *testing.T) {
+	skillCall := func(args map[string]any) SessionEvent {
+		return mockEvent("tool.execution_start", map[string]any{"toolName": SkillTool, "arguments": args})
+	}
+
+	tests := []struct {
+		name      string
+		events    []SessionEvent
+		decided   bool
+		activated bool
+	}{
+		{"skill tool loads the skill", []SessionEvent{skillCall(map[string]any{"skill": "explainer"})}, true, true},
+		{"skill tool loads another skill", []SessionEvent{skillCall(map[string]any{"name": "debugger"})}, true, false},
+		{"skill.invoked event", []SessionEvent{mockEvent("skill.invoked", map[string]any{"skillName": "explainer"})}, true, true},
+		{"other tools leave it open", []SessionEvent{mockEvent("tool.execution_start", map[string]any{"toolName": "bash"})}, false, false},
+		{"first turn ends without a skill", []SessionEvent{
+			mockEvent("assistant.message", map[string]any{"content": "hi"}),
+			mockEvent("assistant.turn_end", nil),
+			skillCall(map[string]any{"skill": "explainer"}),
+		}, true, false},
+		{"session errors", []SessionEvent{mockEvent("session.error", nil)}, true, false},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			d := NewActivationDetector("explainer")
+			for _, evt := range tt.events {
+				d.Observe(evt)
+			}
+			require.Equal(t, tt.decided, d.Decided())
+			require.Equal(t, tt.activated, d.Activated())
+		})
+	}
+}
+
+func TestMockEngine_StopWhen(t *testing.T) {
+	engine := NewMockEngine("test-model", WithMockConfig(&models.MockConfig{
+		ToolCalls: []models.MockToolCall{
+			{Name: SkillTool, Arguments: map[string]any{"skill": "explainer"}},
+			{Name: "bash", Arguments: map[string]any{"command": "ls"}, Count: 3},
+		},
+	}))
+
+	detector := NewActivationDetector("explainer")
+	resp, err := engine.Execute(context.Background(), &ExecutionRequest{
+		TestID:   "t1",
+		Message:  "explain this",
+		StopWhen: detector.Observe,
+	})
+	require.NoError(t, err)
+	require.True(t, detector.Activated())
+	require.Len(t, resp.Events, 1)
+	require.Len(t, resp.ToolCalls, 1)
+}
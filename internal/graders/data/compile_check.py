@@ -0,0 +1,37 @@
+import json
+import sys
+
+## NOTE: this compiles inline assertions and grader scripts without running any of them. It reads
+## {"assertions": [...], "scripts": [...]} from stdin and prints the compile error of each, or "",
+## in the same order.
+
+
+def check(source: str, filename: str, mode: str) -> str:
+    try:
+        compile(source, filename, mode)
+    except SyntaxError as e:
+        if mode == "eval":
+            return f"{e.msg} at column {e.offset}"
+        return f"{e.msg} at line {e.lineno}"
+    except (ValueError, TypeError) as e:
+        return str(e)
+
+    return ""
+
+
+def check_script(path: str) -> str:
+    try:
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+    except OSError as e:
+        return str(e)
+
+    return check(source, path, "exec")
+
+
+data = json.load(sys.stdin)
+
+print(json.dumps({
+    "assertions": [check(assertion, "<assertion>", "eval") for assertion in data['assertions']],
+    "scripts": [check_script(path) for path in data['scripts']],
+}))
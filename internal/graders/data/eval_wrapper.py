@@ -13,13 +13,18 @@ class Event(TypedDict):
 
 class Data(TypedDict):
     output: str
-    assertions: list[str]
     outcome: dict[str, Any]
     transcript: list[dict[str, Event]]
+    tool_calls: list[dict[str, Any]]
     duration_ms: int
 
+class Request(TypedDict):
+    assertions: list[str]
+    context: Data
+
 input_data = sys.stdin.read()
-data: Data = json.loads(input_data)
+request: Request = json.loads(input_data)
+data: Data = request['context']
 
 # stderr isn't captured by the caller, so you can use this to do some print debugging.
 # print(f"Received data: {input_data}", file=sys.stderr)
@@ -31,7 +36,8 @@ eval_context = {
     "output": data['output'] or "",
     "outcome": data['outcome'],
     "chat_events": data['transcript'],
-    "tool_calls": [t for t in data['transcript'] if t['role'] == "tool" or t["type"] == "tool_call"],
+    # the caller indexes tool calls once per run; the fallback covers older callers
+    "tool_calls": data.get('tool_calls', [t for t in data['transcript'] if t.get('role') == "tool" or t.get("type") == "tool_call"]),
     "errors": [t for t in data['transcript'] if t.get("type") == "error" or "error" in str(t.get("content", ""))],
     "duration_ms": data['duration_ms'],
     "len": len,
@@ -49,11 +55,19 @@ eval_context = {
 }
 
 results = []
+# an assertion that raises fails only the graders that own it
+errors = []
 
-for assertion in data['assertions']:
-    result = eval(assertion, {"__builtins__": {}}, eval_context)
-    results.append(not not result)
+for assertion in request['assertions']:
+    try:
+        result = eval(assertion, {"__builtins__": {}}, eval_context)
+        results.append(not not result)
+        errors.append("")
+    except Exception as e:
+        results.append(False)
+        errors.append(f"{type(e).__name__}: {e}")
 
 print(json.dumps({
     "results": results,
+    "errors": errors,
 }))
@@ -0,0 +1,128 @@
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import sys
+from typing import Any
+
+## NOTE: this is a long-lived worker. Requests arrive on stdin and responses go to stdout, one
+## JSON object per line. Anything printed while grading is redirected to stderr so it can't
+## corrupt the protocol.
+
+protocol_out = sys.stdout
+sys.stdout = sys.stderr
+
+# assertions are compiled once per worker and reused for every context
+compiled_assertions: dict[str, Any] = {}
+
+# grader scripts are imported once and only re-imported when the file changes: path -> (mtime, grade)
+loaded_scripts: dict[str, tuple[int, Any]] = {}
+
+
+def build_eval_context(data: dict[str, Any]) -> dict[str, Any]:
+    transcript = data.get('transcript') or []
+
+    return {
+        "output": data.get('output') or "",
+        "outcome": data.get('outcome') or {},
+        "chat_events": transcript,
+        "tool_calls": data.get('tool_calls', [t for t in transcript if t.get('role') == "tool" or t.get("type") == "tool_call"]),
+        "errors": [t for t in transcript if t.get("type") == "error" or "error" in str(t.get("content", ""))],
+        "duration_ms": data.get('duration_ms', 0),
+        "len": len,
+        "any": any,
+        "all": all,
+        "re": re,
+        "str": str,
+        "int": int,
+        "float": float,
+        "bool": bool,
+        "list": list,
+        "dict": dict,
+        "True": True,
+        "False": False,
+    }
+
+
+def compile_assertion(assertion: str) -> Any:
+    code = compiled_assertions.get(assertion)
+
+    if code is None:
+        code = compile(assertion, "<assertion>", "eval")
+        compiled_assertions[assertion] = code
+
+    return code
+
+
+def run_assertions(request: dict[str, Any]) -> dict[str, Any]:
+    eval_context = build_eval_context(request['context'])
+
+    results = []
+    # an assertion that raises fails only the graders that own it
+    errors = []
+
+    for assertion in request['assertions']:
+        try:
+            result = eval(compile_assertion(assertion), {"__builtins__": {}}, eval_context)
+            results.append(not not result)
+            errors.append("")
+        except Exception as e:
+            results.append(False)
+            errors.append(f"{type(e).__name__}: {e}")
+
+    return {"results": results, "errors": errors}
+
+
+def load_grade_function(path: str) -> Any:
+    mtime = os.stat(path).st_mtime_ns
+    cached = loaded_scripts.get(path)
+
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    module_name = "waza_grader_" + hashlib.sha1(path.encode()).hexdigest()
+    spec = importlib.util.spec_from_file_location(module_name, path)
+
+    if spec is None or spec.loader is None:
+        raise ImportError(f"cannot load grader script {path}")
+
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    grade = getattr(module, "grade", None)
+
+    if not callable(grade):
+        raise TypeError(f"{path} does not define grade(context)")
+
+    loaded_scripts[path] = (mtime, grade)
+    return grade
+
+
+def run_script(request: dict[str, Any]) -> dict[str, Any]:
+    grade = load_grade_function(request['path'])
+    result = grade(request['context'])
+
+    if not isinstance(result, dict):
+        raise TypeError(f"grade() must return a dict, got {type(result).__name__}")
+
+    return {"result": result}
+
+
+handlers = {
+    "assertions": run_assertions,
+    "script": run_script,
+}
+
+for line in sys.stdin:
+    if not line.strip():
+        continue
+
+    try:
+        request = json.loads(line)
+        response = handlers[request['op']](request)
+    except Exception as e:
+        response = {"error": f"{type(e).__name__}: {e}"}
+
+    protocol_out.write(json.dumps(response) + "\n")
+    protocol_out.flush()
@@ -16,8 +16,12 @@ const (
 	// embed a Python interpreter here, so reconsider how we want to do that one.
 	TypeInlineScript Type = "code"
 
-	TypePrompt Type = "prompt"
-	TypeRegex  Type = "regex"
+	TypePrompt    Type = "prompt"
+	TypeRegex     Type = "regex"
+	TypeToolCalls Type = "tool_calls"
+
+	// TypeWeightedPatterns scores weighted regex criteria in one pass
+	TypeWeightedPatterns Type = "weighted_patterns"
 
 	// TypeFile does existence/content checks
 	TypeFile       Type = "file"
@@ -26,6 +30,9 @@ const (
 
 	TypeProgram Type = "program"
 
+	// TypePythonScript calls grade(context) from a Python script file
+	TypePythonScript Type = "script"
+
 	// TODO: unsure what this would actually be.
 	// TypeComposite Type = "composite"
 )
@@ -50,10 +57,40 @@ type Context struct {
 	Outcome    map[string]any
 	DurationMS int64
 	Metadata   map[string]any
+
+	// ToolCalls indexes the transcript's tool calls once per run. Graders
+	// build their own from Transcript when it is nil.
+	ToolCalls *ToolCallIndex
+
+	// script is the context as Python graders see it, encoded once per run
+	script encodedScriptContext
+	// assertions, set by BatchAssertions, evaluates the assertions of every
+	// code grader of the run together
+	assertions *assertionBatch
+}
+
+// CreateOption configures shared resources for graders built by Create
+type CreateOption func(*createOptions)
+
+type createOptions struct {
+	pythonPool *PythonWorkerPool
+}
+
+// WithPythonPool makes Python-backed graders run on the given worker pool
+// instead of starting a new interpreter for every grading call
+func WithPythonPool(pool *PythonWorkerPool) CreateOption {
+	return func(o *createOptions) {
+		o.pythonPool = pool
+	}
 }
 
 // Create creates a validator from the global registry
-func Create(graderType Type, identifier string, params map[string]any) (Grader, error) {
+func Create(graderType Type, identifier string, params map[string]any, opts ...CreateOption) (Grader, error) {
+	var options createOptions
+	for _, opt := range opts {
+		opt(&options)
+	}
+
 	switch graderType {
 	case TypeInlineScript:
 		var v *struct {
@@ -64,7 +101,13 @@ func Create(graderType Type, identifier string, params map[string]any) (Grader,
 			return nil, err
 		}
 
-		return NewInlineScriptGrader(identifier, LanguagePython, v.Assertions)
+		isg, err := NewInlineScriptGrader(identifier, LanguagePython, v.Assertions)
+		if err != nil {
+			return nil, err
+		}
+
+		isg.pool = options.pythonPool
+		return isg, nil
 	case TypeRegex:
 		var v *struct {
 			MustMatch    []string `mapstructure:"must_match"`
@@ -76,6 +119,56 @@ func Create(graderType Type, identifier string, params map[string]any) (Grader,
 		}
 
 		return NewRegexGrader(identifier, v.MustMatch, v.MustNotMatch)
+	case TypeToolCalls:
+		var v struct {
+			Required  []any
+			Forbidden []any
+			MaxCalls  int `mapstructure:"max_calls"`
+		}
+
+		if err := mapstructure.Decode(params, &v); err != nil {
+			return nil, err
+		}
+
+		required, err := toolCallPatterns(v.Required)
+		if err != nil {
+			return nil, err
+		}
+
+		forbidden, err := toolCallPatterns(v.Forbidden)
+		if err != nil {
+			return nil, err
+		}
+
+		return NewToolCallGrader(identifier, required, forbidden, v.MaxCalls)
+	case TypeWeightedPatterns:
+		var v struct {
+			Criteria      []WeightedCriterion
+			PassThreshold float64 `mapstructure:"pass_threshold"`
+		}
+
+		if err := mapstructure.Decode(params, &v); err != nil {
+			return nil, err
+		}
+
+		return NewWeightedPatternsGrader(identifier, v.Criteria, v.PassThreshold)
+	case TypePythonScript:
+		var v struct {
+			Script         string
+			TimeoutSeconds int `mapstructure:"timeout_seconds"`
+		}
+
+		if err := mapstructure.Decode(params, &v); err != nil {
+			return nil, err
+		}
+
+		sg, err := NewScriptGrader(identifier, v.Script, time.Duration(v.TimeoutSeconds)*time.Second)
+		if err != nil {
+			return nil, err
+		}
+
+		sg.pool = options.pythonPool
+		return sg, nil
 	case TypePrompt, TypeFile, TypeKeyword, TypeJSONSchema, TypeProgram:
 		return nil, fmt.Errorf("'%s' is not yet implemented", graderType)
 	default:
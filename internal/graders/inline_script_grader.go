@@ -4,6 +4,7 @@ import (
 	"bytes"
 	"context"
 	"encoding/json"
+	"errors"
 	"fmt"
 	"os"
 	"os/exec"
@@ -29,6 +30,7 @@ type InlineScriptGrader struct {
 	name       string
 	assertions []string
 	language   Language
+	pool       *PythonWorkerPool
 }
 
 type InlineScriptResult struct {
@@ -66,12 +68,21 @@ func (isg *InlineScriptGrader) Grade(ctx context.Context, gradingContext *Contex
 			}, nil
 		}
 
-		failures, passed, err := runPythonScript(ctx, gradingContext, isg.assertions)
-
+		results, err := isg.evaluate(ctx, gradingContext)
 		if err != nil {
 			return nil, err
 		}
 
+		var failures []string
+		var passed int
+		for i, v := range results {
+			if !v {
+				failures = append(failures, fmt.Sprintf("Failed: %s", isg.assertions[i]))
+			} else {
+				passed++
+			}
+		}
+
 		score := float64(passed) / float64(len(isg.assertions))
 		allPassed := len(failures) == 0
 
@@ -96,18 +107,91 @@ func (isg *InlineScriptGrader) Grade(ctx context.Context, gradingContext *Contex
 	})
 }
 
-func runPythonScript(ctx context.Context, gradingContext *Context, assertions []string) (failures []string, passed int, err error) {
-	pythonStdinText, err := getPythonStdinText(gradingContext, assertions)
+// evaluate returns whether each of the grader's assertions held, from the
+// run's batch when BatchAssertions set one up
+func (isg *InlineScriptGrader) evaluate(ctx context.Context, gradingContext *Context) ([]bool, error) {
+	if batch := gradingContext.assertions; batch.covers(isg) {
+		return batch.evaluate(ctx, gradingContext, isg.assertions)
+	}
+	results, err := runAssertions(ctx, isg.pool, gradingContext, isg.assertions)
+	if err != nil {
+		return nil, err
+	}
+	return results.pick(isg.assertions, nil)
+}
+
+// assertionResults are the outcome of evaluating a list of assertions: whether
+// each held and, for each that raised, its error
+type assertionResults struct {
+	Results []bool   `json:"results"`
+	Errors  []string `json:"errors"`
+}
+
+// pick returns the results of assertions, found at index[assertion], or in
+// order when index is nil. Any of them that raised is an error.
+func (a *assertionResults) pick(assertions []string, index map[string]int) ([]bool, error) {
+	results := make([]bool, len(assertions))
+	var errs []error
+	for i, assertion := range assertions {
+		at := i
+		if index != nil {
+			at = index[assertion]
+		}
+		if msg := a.Errors[at]; msg != "" {
+			errs = append(errs, fmt.Errorf("assertion %q raised %s", assertion, msg))
+		}
+		results[i] = a.Results[at]
+	}
+	if len(errs) > 0 {
+		return nil, errors.Join(errs...)
+	}
+	return results, nil
+}
 
+// runAssertions evaluates assertions in one Python call, on a pool worker
+// if there is a pool. An assertion that raises doesn't fail the call; its
+// error is in the results.
+func runAssertions(ctx context.Context, pool *PythonWorkerPool, gradingContext *Context, assertions []string) (*assertionResults, error) {
+	scriptContext, err := gradingContext.scriptJSON(nil)
 	if err != nil {
 		// let's not quit the entire thing, but we can mark this failure.
-		return nil, 0, fmt.Errorf("Failed: script conversion failed for assertions: %w", err)
+		return nil, fmt.Errorf("Failed: script conversion failed for assertions: %w", err)
+	}
+
+	request, err := workerRequest(struct {
+		Op         string   `json:"op"`
+		Assertions []string `json:"assertions"`
+	}{
+		Op:         "assertions",
+		Assertions: assertions,
+	}, scriptContext)
+	if err != nil {
+		return nil, err
+	}
+
+	var results *assertionResults
+	if pool != nil {
+		results, err = runPooledAssertions(ctx, pool, request)
+	} else {
+		results, err = runPythonScript(ctx, request)
+	}
+	if err != nil {
+		return nil, err
 	}
 
+	// TODO: it might be nice to get more rich results here, but for now it's literally an array
+	// as big as assertions, with a true/false value.
+	if len(results.Results) != len(assertions) || len(results.Errors) != len(assertions) {
+		return nil, fmt.Errorf("got %d results for %d assertions", len(results.Results), len(assertions))
+	}
+	return results, nil
+}
+
+func runPythonScript(ctx context.Context, request json.RawMessage) (*assertionResults, error) {
 	tempPythonFile, err := os.CreateTemp("", "temp-python-*.py")
 
 	if err != nil {
-		return nil, 0, err
+		return nil, err
 	}
 
 	defer func() {
@@ -115,88 +199,48 @@ func runPythonScript(ctx context.Context, gradingContext *Context, assertions []
 	}()
 
 	if _, err := tempPythonFile.Write([]byte(evalWrapperPy)); err != nil {
-		return nil, 0, err
+		return nil, err
 	}
 
 	if err := tempPythonFile.Close(); err != nil {
-		return nil, 0, err
+		return nil, err
 	}
 
-	// TODO: maybe they have their own python we should use.
-	cmd := exec.CommandContext(ctx, "python", tempPythonFile.Name())
+	cmd := pythonCommand(ctx, tempPythonFile.Name())
 
-	cmd.Stdin = bytes.NewReader(pythonStdinText)
+	cmd.Stdin = bytes.NewReader(request)
 	cmd.Stderr = os.Stderr
 
 	outputBytes, err := cmd.Output()
 
 	if err != nil {
-		return nil, 0, fmt.Errorf("failed to execute inline script for assertions (%s): %w", string(outputBytes), err)
+		return nil, fmt.Errorf("failed to execute inline script for assertions (%s): %w", string(outputBytes), err)
 	}
 
-	var pythonOutput *struct {
-		Results []bool
-	}
+	var pythonOutput assertionResults
 
 	if err := json.Unmarshal(outputBytes, &pythonOutput); err != nil {
-		return nil, 0, fmt.Errorf("failed to deserialize output (%s) from assertions: %w", string(outputBytes), err)
+		return nil, fmt.Errorf("failed to deserialize output (%s) from assertions: %w", string(outputBytes), err)
 	}
 
-	// TODO: it might be nice to get more rich results here, but for now it's literally an array
-	// as big as assertions, with a true/false value.
-	for i, v := range pythonOutput.Results {
-		if !v {
-			failures = append(failures, fmt.Sprintf("Failed: %s", assertions[i]))
-		} else {
-			passed++
-		}
-	}
-	return failures, passed, nil
+	return &pythonOutput, nil
 }
 
-func getPythonStdinText(gradingContext *Context, assertions []string) ([]byte, error) {
-	/*
-	   class Event(TypedDict):
-	       role: str
-	       content: Any
-	       type: str
-
-	   class Data(TypedDict):
-	       output: str
-	       assertions: list[str]
-	       outcome: dict[str, Any]
-	       transcript: list[dict[str, Event]]
-	       duration_ms: int
-	*/
-
-	scriptStdin := struct {
-		Output     string                   `json:"output"`
-		Outcome    map[string]any           `json:"outcome"`
-		Transcript []models.TranscriptEntry `json:"transcript"`
-		DurationMS int64                    `json:"duration_ms"`
-		Assertions []string                 `json:"assertions"`
-	}{
-		Output:     gradingContext.Output,
-		Outcome:    gradingContext.Outcome,
-		Transcript: gradingContext.Transcript,
-		DurationMS: gradingContext.DurationMS,
-		Assertions: assertions,
-	}
-
-	// make life easier for scripters and init values to an empty value, instead of None/nil/null
-	if scriptStdin.Transcript == nil {
-		scriptStdin.Transcript = []models.TranscriptEntry{}
-	}
-
-	if scriptStdin.Outcome == nil {
-		scriptStdin.Outcome = map[string]any{}
-	}
+// pythonCommand returns a command running the Python interpreter with args.
+// Every grader that runs Python starts it through here.
+func pythonCommand(ctx context.Context, args ...string) *exec.Cmd {
+	// TODO: maybe they have their own python we should use.
+	return exec.CommandContext(ctx, "python", args...)
+}
 
-	scriptJSON, err := json.MarshalIndent(scriptStdin, "  ", "  ")
+// runPooledAssertions evaluates assertions on a long-lived worker, which
+// compiles each assertion once and reuses it for every later context.
+func runPooledAssertions(ctx context.Context, pool *PythonWorkerPool, request json.RawMessage) (*assertionResults, error) {
+	var response assertionResults
 
-	if err != nil {
-		return nil, err
+	if err := pool.call(ctx, request, &response); err != nil {
+		return nil, fmt.Errorf("failed to execute inline script for assertions: %w", err)
 	}
 
-	return scriptJSON, nil
+	return &response, nil
 }
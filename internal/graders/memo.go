@@ -0,0 +1,233 @@
+package graders
+
+import (
+	"container/list"
+	"context"
+	"crypto/sha256"
+	"encoding/json"
+	"maps"
+	"strings"
+	"sync"
+	"time"
+
+	"github.com/spboyer/waza/internal/models"
+)
+
+// DefaultMemoEntries bounds a MemoCache created with no size
+const DefaultMemoEntries = 4096
+
+// memoizable graders are pure functions of part of the grading context.
+// memoInput returns that part; two contexts with equal inputs get the same
+// result.
+type memoizable interface {
+	memoInput(gradingContext *Context) (any, error)
+}
+
+// Deterministic reports whether graders of type t are memoized unless their
+// config opts out. Script graders run arbitrary code, which may call out to
+// services or use randomness, so they have to opt in.
+func Deterministic(t Type) bool {
+	switch t {
+	case TypeRegex, TypeToolCalls, TypeWeightedPatterns, TypeInlineScript:
+		return true
+	default:
+		return false
+	}
+}
+
+type memoKey [sha256.Size]byte
+
+type memoEntry struct {
+	key    memoKey
+	result models.GraderResults
+}
+
+// MemoCache is a bounded LRU of grader results, shared by the memoized
+// graders of a benchmark, so trials with identical output are graded once
+type MemoCache struct {
+	capacity int
+
+	mu      sync.Mutex
+	order   *list.List // most recently used first
+	entries map[memoKey]*list.Element
+	hits    int
+	misses  int
+}
+
+// MemoStats counts a MemoCache's lookups
+type MemoStats struct {
+	Hits   int
+	Misses int
+}
+
+// NewMemoCache creates a cache holding up to capacity results
+func NewMemoCache(capacity int) *MemoCache {
+	if capacity <= 0 {
+		capacity = DefaultMemoEntries
+	}
+	return &MemoCache{
+		capacity: capacity,
+		order:    list.New(),
+		entries:  make(map[memoKey]*list.Element),
+	}
+}
+
+// Stats returns the cache's hits and misses so far
+func (c *MemoCache) Stats() MemoStats {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	return MemoStats{Hits: c.hits, Misses: c.misses}
+}
+
+func (c *MemoCache) get(key memoKey) (models.GraderResults, bool) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	elem, ok := c.entries[key]
+	if !ok {
+		c.misses++
+		return models.GraderResults{}, false
+	}
+	c.hits++
+	c.order.MoveToFront(elem)
+	return elem.Value.(*memoEntry).result, true
+}
+
+func (c *MemoCache) contains(key memoKey) bool {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	_, ok := c.entries[key]
+	return ok
+}
+
+func (c *MemoCache) put(key memoKey, result models.GraderResults) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	if elem, ok := c.entries[key]; ok {
+		c.order.MoveToFront(elem)
+		return
+	}
+	c.entries[key] = c.order.PushFront(&memoEntry{key: key, result: result})
+	if c.order.Len() > c.capacity {
+		oldest := c.order.Back()
+		c.order.Remove(oldest)
+		delete(c.entries, oldest.Value.(*memoEntry).key)
+	}
+}
+
+// Memoize returns a grader that looks up g's results in cache, keyed by a
+// hash of config, which must identify g's configuration, and of the part of
+// the context g reads. Graders that can't say what they read are returned
+// as they are.
+func Memoize(g Grader, config any, cache *MemoCache) Grader {
+	m, ok := g.(memoizable)
+	if !ok {
+		return g
+	}
+	configJSON, err := json.Marshal(config)
+	if err != nil {
+		return g
+	}
+	return &memoGrader{Grader: g, input: m, config: sha256.Sum256(configJSON), cache: cache}
+}
+
+type memoGrader struct {
+	Grader
+	input  memoizable
+	config [sha256.Size]byte
+	cache  *MemoCache
+}
+
+func (mg *memoGrader) Grade(ctx context.Context, gradingContext *Context) (*models.GraderResults, error) {
+	start := time.Now()
+
+	key, ok := mg.key(gradingContext)
+	if !ok {
+		return mg.Grader.Grade(ctx, gradingContext)
+	}
+
+	if cached, ok := mg.cache.get(key); ok {
+		cached.Details = maps.Clone(cached.Details)
+		cached.Cached = true
+		cached.DurationMs = time.Since(start).Milliseconds()
+		return &cached, nil
+	}
+
+	result, err := mg.Grader.Grade(ctx, gradingContext)
+	if err == nil && result != nil {
+		stored := *result
+		stored.Details = maps.Clone(result.Details)
+		mg.cache.put(key, stored)
+	}
+	return result, err
+}
+
+// key hashes the grader's config with the part of the context it reads. It
+// reports false when the input can't be hashed, and the grader isn't memoized.
+func (mg *memoGrader) key(gradingContext *Context) (memoKey, bool) {
+	var key memoKey
+	input, err := mg.input.memoInput(gradingContext)
+	if err != nil {
+		return key, false
+	}
+	h := sha256.New()
+	h.Write(mg.config[:])
+	if err := json.NewEncoder(h).Encode(input); err != nil {
+		return key, false
+	}
+	h.Sum(key[:0])
+	return key, true
+}
+
+// cached reports whether grading gradingContext would reuse a cached result,
+// without counting as a lookup
+func (mg *memoGrader) cached(gradingContext *Context) bool {
+	key, ok := mg.key(gradingContext)
+	return ok && mg.cache.contains(key)
+}
+
+func (reg *RegexGrader) memoInput(gradingContext *Context) (any, error) {
+	return gradingContext.Output, nil
+}
+
+func (tcg *ToolCallGrader) memoInput(gradingContext *Context) (any, error) {
+	return gradingContext.toolCalls().texts(), nil
+}
+
+func (wpg *WeightedPatternsGrader) memoInput(gradingContext *Context) (any, error) {
+	var taskContext map[string]any
+	if gradingContext.TestCase != nil {
+		taskContext = gradingContext.TestCase.Stimulus.Metadata
+	}
+	return []any{gradingContext.Output, taskContext}, nil
+}
+
+func (isg *InlineScriptGrader) memoInput(gradingContext *Context) (any, error) {
+	shared, err := gradingContext.sharedScriptJSON()
+	if err != nil {
+		return nil, err
+	}
+	// no two sessions take exactly as long; only assertions that look at
+	// the duration depend on it
+	var durationMS int64
+	if mentions(isg.assertions, "duration_ms") {
+		durationMS = gradingContext.DurationMS
+	}
+	return []any{shared, durationMS}, nil
+}
+
+func (sg *ScriptGrader) memoInput(gradingContext *Context) (any, error) {
+	shared, err := gradingContext.sharedScriptJSON()
+	if err != nil {
+		return nil, err
+	}
+	return []any{shared, gradingContext.DurationMS, scriptTask(gradingContext)}, nil
+}
+
+func mentions(assertions []string, name string) bool {
+	for _, a := range assertions {
+		if strings.Contains(a, name) {
+			return true
+		}
+	}
+	return false
+}
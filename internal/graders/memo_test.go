@@ -0,0 +1,91 @@
+package graders
+
+import (
+	"context"
+	"testing"
+
+	"github.com/spboyer/waza/internal/models"
+	"github.com/stretchr/testify/require"
+)
+
+func TestMemoize_ReusesResultsForIdenticalOutput(t *testing.T) {
+	regex, err := NewRegexGrader("test", []string{`hello`}, nil)
+	require.NoError(t, err)
+
+	cache := NewMemoCache(0)
+	g := Memoize(regex, "config", cache)
+	require.Equal(t, "test", g.Name())
+	require.Equal(t, TypeRegex, g.Type())
+
+	first, err := g.Grade(context.Background(), &Context{Output: "hello world", DurationMS: 10})
+	require.NoError(t, err)
+	require.False(t, first.Cached)
+
+	// a different duration doesn't change what a regex grader sees
+	second, err := g.Grade(context.Background(), &Context{Output: "hello world", DurationMS: 20})
+	require.NoError(t, err)
+	require.True(t, second.Cached)
+	require.Equal(t, first.Score, second.Score)
+	require.Equal(t, first.Feedback, second.Feedback)
+
+	// the cached details are a copy
+	second.Details["extra"] = true
+	third, err := g.Grade(context.Background(), &Context{Output: "hello world"})
+	require.NoError(t, err)
+	require.NotContains(t, third.Details, "extra")
+
+	other, err := g.Grade(context.Background(), &Context{Output: "goodbye"})
+	require.NoError(t, err)
+	require.False(t, other.Cached)
+	require.False(t, other.Passed)
+
+	require.Equal(t, MemoStats{Hits: 2, Misses: 2}, cache.Stats())
+
+	t.Run("config is part of the key", func(t *testing.T) {
+		g := Memoize(regex, "other config", cache)
+		res, err := g.Grade(context.Background(), &Context{Output: "hello world"})
+		require.NoError(t, err)
+		require.False(t, res.Cached)
+	})
+}
+
+func TestMemoCache_EvictsLeastRecentlyUsed(t *testing.T) {
+	cache := NewMemoCache(2)
+	key := func(b byte) memoKey { return memoKey{b} }
+
+	cache.put(key(1), models.GraderResults{Name: "1"})
+	cache.put(key(2), models.GraderResults{Name: "2"})
+	_, ok := cache.get(key(1))
+	require.True(t, ok)
+	cache.put(key(3), models.GraderResults{Name: "3"})
+
+	_, ok = cache.get(key(2))
+	require.False(t, ok)
+	res, ok := cache.get(key(1))
+	require.True(t, ok)
+	require.Equal(t, "1", res.Name)
+	_, ok = cache.get(key(3))
+	require.True(t, ok)
+}
+
+func TestInlineScriptGrader_MemoInputIgnoresUnusedDuration(t *testing.T) {
+	gradingContext := &Context{Output: "done", DurationMS: 1234}
+
+	g, err := NewInlineScriptGrader("test", LanguagePython, []string{`"done" in output`})
+	require.NoError(t, err)
+	input, err := g.memoInput(gradingContext)
+	require.NoError(t, err)
+	require.Zero(t, input.([]any)[1])
+
+	g, err = NewInlineScriptGrader("test", LanguagePython, []string{`duration_ms < 5000`})
+	require.NoError(t, err)
+	input, err = g.memoInput(gradingContext)
+	require.NoError(t, err)
+	require.Equal(t, int64(1234), input.([]any)[1])
+}
+
+func TestDeterministic(t *testing.T) {
+	require.True(t, Deterministic(TypeRegex))
+	require.True(t, Deterministic(TypeInlineScript))
+	require.False(t, Deterministic(TypePythonScript))
+}
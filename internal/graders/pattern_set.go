@@ -0,0 +1,87 @@
+package graders
+
+import (
+	"fmt"
+	"regexp"
+	"strings"
+)
+
+// patternSet is a list of regular expressions compiled once. Texts that no
+// pattern matches, the common case for forbidden patterns, are ruled out by a
+// single scan; otherwise each pattern is checked on its own, so matching text
+// costs one scan per pattern.
+type patternSet struct {
+	patterns []string
+	each     []*regexp.Regexp
+	// any is the non-capturing alternation of every pattern, or nil when
+	// there are none or the alternation is too large to compile
+	any *regexp.Regexp
+}
+
+// compilePatternSet compiles patterns into a patternSet. Invalid patterns are
+// reported by index and left out of the set.
+func compilePatternSet(patterns []string) (*patternSet, map[int]error) {
+	ps := &patternSet{}
+	invalid := map[int]error{}
+
+	var alternatives []string
+
+	for i, pattern := range patterns {
+		re, err := regexp.Compile(pattern)
+		if err != nil {
+			invalid[i] = err
+			continue
+		}
+
+		ps.patterns = append(ps.patterns, pattern)
+		ps.each = append(ps.each, re)
+		alternatives = append(alternatives, "(?:"+pattern+")")
+	}
+
+	if len(alternatives) > 0 {
+		// every alternative compiled on its own, but together they can exceed
+		// the size limit; then every pattern is simply checked on its own
+		if re, err := regexp.Compile(strings.Join(alternatives, "|")); err == nil {
+			ps.any = re
+		}
+	}
+
+	return ps, invalid
+}
+
+// mustCompilePatternSet is compilePatternSet for callers that treat any
+// invalid pattern as an error
+func mustCompilePatternSet(patterns []string) (*patternSet, error) {
+	ps, invalid := compilePatternSet(patterns)
+	for i := range patterns {
+		if err, ok := invalid[i]; ok {
+			return nil, fmt.Errorf("invalid regex pattern %q: %w", patterns[i], err)
+		}
+	}
+	return ps, nil
+}
+
+// Len returns the number of valid patterns in the set
+func (ps *patternSet) Len() int { return len(ps.patterns) }
+
+// Match reports, for each valid pattern in order, whether it matches text.
+func (ps *patternSet) Match(text string) []bool {
+	matched := make([]bool, len(ps.patterns))
+	ps.matchInto(matched, text)
+	return matched
+}
+
+// matchInto sets matched[i] for each pattern not already matched that
+// matches text
+func (ps *patternSet) matchInto(matched []bool, text string) {
+	if ps.any != nil && !ps.any.MatchString(text) {
+		// nothing in the alternation matched, so no single pattern can either
+		return
+	}
+
+	for i, re := range ps.each {
+		if !matched[i] {
+			matched[i] = re.MatchString(text)
+		}
+	}
+}
@@ -0,0 +1,100 @@
+package graders
+
+import (
+	"fmt"
+	"regexp"
+	"strings"
+	"testing"
+
+	"github.com/stretchr/testify/require"
+)
+
+func TestPatternSet_MatchesLikeIndividualPatterns(t *testing.T) {
+	patterns := []string{`a`, `ab`, `(?i)B`, `b+c`, `x(y)z`, `^h`, `q$`, `a|zz`}
+	texts := []string{"", "ab", "abc", "hello abq", "xyz", "BBC", "zz top", "h"}
+
+	ps, invalid := compilePatternSet(patterns)
+	require.Empty(t, invalid)
+	require.Equal(t, len(patterns), ps.Len())
+
+	for _, text := range texts {
+		matched := ps.Match(text)
+		for i, pattern := range patterns {
+			expected := regexp.MustCompile(pattern).MatchString(text)
+			require.Equal(t, expected, matched[i], "pattern %q on %q", pattern, text)
+		}
+	}
+}
+
+func TestPatternSet_InvalidPatterns(t *testing.T) {
+	ps, invalid := compilePatternSet([]string{`ok`, `[invalid`, `fine`})
+	require.Len(t, invalid, 1)
+	require.Contains(t, invalid, 1)
+	require.Equal(t, []bool{true, false}, ps.Match("ok"))
+
+	_, err := mustCompilePatternSet([]string{`ok`, `[invalid`})
+	require.ErrorContains(t, err, `invalid regex pattern "[invalid"`)
+}
+
+func TestPatternSet_WithoutAlternation(t *testing.T) {
+	ps, invalid := compilePatternSet([]string{`^a`, `b$`, `zz`})
+	require.Empty(t, invalid)
+	// as when the alternation is too large to compile
+	ps.any = nil
+
+	require.Equal(t, []bool{true, true, false}, ps.Match("ab"))
+	require.Equal(t, []bool{false, false, false}, ps.Match("ba"))
+}
+
+func TestPatternSet_Empty(t *testing.T) {
+	ps, invalid := compilePatternSet(nil)
+	require.Empty(t, invalid)
+	require.Empty(t, ps.Match("anything"))
+}
+
+// benchmarkPatterns are 20 case-insensitive patterns of the kind regex graders
+// list, checked against about 8 KB of agent output
+func benchmarkPatterns() ([]string, string) {
+	var patterns []string
+	for i := 0; i < 20; i++ {
+		patterns = append(patterns, fmt.Sprintf(`(?i)step %d\b.*(done|complete)`, i*7))
+	}
+	var sb strings.Builder
+	for i := 0; sb.Len() < 8*1024; i++ {
+		fmt.Fprintf(&sb, "Step %d: ran the command and checked the output, done.\n", i)
+	}
+	return patterns, sb.String()
+}
+
+func BenchmarkPatternSet_Match(b *testing.B) {
+	patterns, text := benchmarkPatterns()
+	ps, _ := compilePatternSet(patterns)
+	b.ResetTimer()
+	for i := 0; i < b.N; i++ {
+		ps.Match(text)
+	}
+}
+
+func BenchmarkPatternSet_MatchNone(b *testing.B) {
+	patterns, _ := benchmarkPatterns()
+	ps, _ := compilePatternSet(patterns)
+	text := strings.Repeat("nothing to see here\n", 400)
+	b.ResetTimer()
+	for i := 0; i < b.N; i++ {
+		ps.Match(text)
+	}
+}
+
+func BenchmarkPatternSet_EachPattern(b *testing.B) {
+	patterns, text := benchmarkPatterns()
+	var each []*regexp.Regexp
+	for _, pattern := range patterns {
+		each = append(each, regexp.MustCompile(pattern))
+	}
+	b.ResetTimer()
+	for i := 0; i < b.N; i++ {
+		for _, re := range each {
+			re.MatchString(text)
+		}
+	}
+}
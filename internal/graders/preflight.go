@@ -0,0 +1,133 @@
+package graders
+
+import (
+	"bytes"
+	"context"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"os"
+	"strings"
+
+	_ "embed"
+)
+
+//go:embed data/compile_check.py
+var compileCheckPy string
+
+// Preflight finds what would make graders fail on every trial, without
+// grading anything: invalid regex patterns, which regex graders otherwise
+// only report when grading, and syntax errors in inline assertions and
+// grader scripts. The Python of every grader is compiled in a single
+// interpreter call. It returns each grader's problems by index, nil for
+// graders with none. The error is set when Python couldn't be compiled at
+// all, and wraps exec.ErrNotFound when there is no interpreter; the
+// problems found without it are still returned.
+func Preflight(ctx context.Context, gs []Grader) ([]error, error) {
+	failures := make([][]string, len(gs))
+	for i, g := range gs {
+		if reg, ok := g.(*RegexGrader); ok {
+			failures[i] = reg.invalidPatterns()
+		}
+	}
+
+	err := compilePython(ctx, gs, failures)
+
+	errs := make([]error, len(gs))
+	for i := range gs {
+		if len(failures[i]) > 0 {
+			errs[i] = errors.New(strings.Join(failures[i], "; "))
+		}
+	}
+	return errs, err
+}
+
+// invalidPatterns lists the patterns that didn't compile
+func (reg *RegexGrader) invalidPatterns() []string {
+	var failures []string
+	for i, pattern := range reg.mustMatch {
+		if err, ok := reg.invalidMustMatch[i]; ok {
+			failures = append(failures, fmt.Sprintf("Invalid 'must_match' regex pattern %q: %v", pattern, err))
+		}
+	}
+	for i, pattern := range reg.mustNotMatch {
+		if err, ok := reg.invalidMustNotMatch[i]; ok {
+			failures = append(failures, fmt.Sprintf("Invalid 'must_not_match' regex pattern %q: %v", pattern, err))
+		}
+	}
+	return failures
+}
+
+// compilePython compiles the inline assertions and script files of gs in one
+// interpreter call, adding each grader's syntax errors to its failures
+func compilePython(ctx context.Context, gs []Grader, failures [][]string) error {
+	request := struct {
+		Assertions []string `json:"assertions"`
+		Scripts    []string `json:"scripts"`
+	}{Assertions: []string{}, Scripts: []string{}}
+
+	// graders often share assertions and scripts; each is compiled once
+	assertionIndex := make(map[string]int)
+	scriptIndex := make(map[string]int)
+	for _, g := range gs {
+		switch g := g.(type) {
+		case *InlineScriptGrader:
+			for _, assertion := range g.assertions {
+				if _, ok := assertionIndex[assertion]; !ok {
+					assertionIndex[assertion] = len(request.Assertions)
+					request.Assertions = append(request.Assertions, assertion)
+				}
+			}
+		case *ScriptGrader:
+			if _, ok := scriptIndex[g.path]; !ok {
+				scriptIndex[g.path] = len(request.Scripts)
+				request.Scripts = append(request.Scripts, g.path)
+			}
+		}
+	}
+
+	if len(request.Assertions) == 0 && len(request.Scripts) == 0 {
+		return nil
+	}
+
+	input, err := json.Marshal(request)
+	if err != nil {
+		return err
+	}
+
+	cmd := pythonCommand(ctx, "-c", compileCheckPy)
+	cmd.Stdin = bytes.NewReader(input)
+	cmd.Stderr = os.Stderr
+
+	outputBytes, err := cmd.Output()
+	if err != nil {
+		return fmt.Errorf("failed to compile python graders: %w", err)
+	}
+
+	var response struct {
+		Assertions []string `json:"assertions"`
+		Scripts    []string `json:"scripts"`
+	}
+	if err := json.Unmarshal(outputBytes, &response); err != nil {
+		return fmt.Errorf("failed to deserialize output (%s) from compiling python graders: %w", string(outputBytes), err)
+	}
+	if len(response.Assertions) != len(request.Assertions) || len(response.Scripts) != len(request.Scripts) {
+		return errors.New("compiling python graders returned the wrong number of results")
+	}
+
+	for i, g := range gs {
+		switch g := g.(type) {
+		case *InlineScriptGrader:
+			for _, assertion := range g.assertions {
+				if msg := response.Assertions[assertionIndex[assertion]]; msg != "" {
+					failures[i] = append(failures[i], fmt.Sprintf("assertion %q: %s", assertion, msg))
+				}
+			}
+		case *ScriptGrader:
+			if msg := response.Scripts[scriptIndex[g.path]]; msg != "" {
+				failures[i] = append(failures[i], fmt.Sprintf("script %s: %s", g.path, msg))
+			}
+		}
+	}
+	return nil
+}
@@ -0,0 +1,49 @@
+package graders
+
+import (
+	"context"
+	"os"
+	"path/filepath"
+	"testing"
+
+	"github.com/stretchr/testify/require"
+)
+
+func TestPreflight(t *testing.T) {
+	skipIfNoPython(t)
+
+	good, err := NewInlineScriptGrader("good", LanguagePython, []string{"len(output) > 0"})
+	require.NoError(t, err)
+	bad, err := NewInlineScriptGrader("bad", LanguagePython, []string{"len(output) > 0", "output ==", "'x' in"})
+	require.NoError(t, err)
+	regex, err := NewRegexGrader("regex", []string{"x", "(unclosed"}, []string{"[z-a]"})
+	require.NoError(t, err)
+
+	dir := t.TempDir()
+	brokenScript := filepath.Join(dir, "broken.py")
+	require.NoError(t, os.WriteFile(brokenScript, []byte("def grade(context)\n    return {}\n"), 0644))
+	script, err := NewScriptGrader("script", brokenScript, 0)
+	require.NoError(t, err)
+
+	errs, err := Preflight(context.Background(), []Grader{good, bad, regex, script})
+	require.NoError(t, err)
+	require.Len(t, errs, 4)
+
+	require.NoError(t, errs[0])
+	require.ErrorContains(t, errs[1], `assertion "output =="`)
+	require.ErrorContains(t, errs[1], `assertion "'x' in"`)
+	require.NotContains(t, errs[1].Error(), "len(output)")
+	require.ErrorContains(t, errs[2], `Invalid 'must_match' regex pattern "(unclosed"`)
+	require.ErrorContains(t, errs[2], `Invalid 'must_not_match' regex pattern "[z-a]"`)
+	require.ErrorContains(t, errs[3], "broken.py")
+	require.ErrorContains(t, errs[3], "line 1")
+
+	t.Run("nothing to report", func(t *testing.T) {
+		regex, err := NewRegexGrader("regex", []string{"x"}, nil)
+		require.NoError(t, err)
+
+		errs, err := Preflight(context.Background(), []Grader{regex, good})
+		require.NoError(t, err)
+		require.Equal(t, []error{nil, nil}, errs)
+	})
+}
@@ -0,0 +1,238 @@
+package graders
+
+import (
+	"bufio"
+	"context"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"io"
+	"os"
+	"os/exec"
+	"sync"
+	"time"
+
+	_ "embed"
+)
+
+//go:embed data/grader_worker.py
+var graderWorkerPy string
+
+// PythonWorkerPool keeps a fixed number of long-lived Python processes that
+// grade requests sent to them as JSON lines. Workers are started lazily, so an
+// unused pool costs nothing, and each worker compiles assertions only once.
+// Python graders given a pool spread their work across cores instead of
+// paying interpreter startup on every call.
+type PythonWorkerPool struct {
+	// slots holds one token per worker that may be busy at a time
+	slots chan struct{}
+
+	mu     sync.Mutex
+	idle   []*pythonWorker
+	closed bool
+}
+
+// NewPythonWorkerPool creates a pool that runs at most size Python workers
+func NewPythonWorkerPool(size int) *PythonWorkerPool {
+	if size < 1 {
+		size = 1
+	}
+
+	return &PythonWorkerPool{
+		slots: make(chan struct{}, size),
+	}
+}
+
+// Size returns the maximum number of concurrent workers
+func (p *PythonWorkerPool) Size() int { return cap(p.slots) }
+
+// Close stops all idle workers. Workers that are busy are stopped as soon as
+// their current request completes.
+func (p *PythonWorkerPool) Close() error {
+	p.mu.Lock()
+	idle := p.idle
+	p.idle = nil
+	p.closed = true
+	p.mu.Unlock()
+
+	var errs []error
+	for _, w := range idle {
+		errs = append(errs, w.close())
+	}
+	return errors.Join(errs...)
+}
+
+// call sends request to a worker and decodes its reply into response. A
+// json.RawMessage request is sent as it is. If ctx ends first the worker is
+// killed and replaced, since it may still be busy.
+func (p *PythonWorkerPool) call(ctx context.Context, request any, response any) error {
+	return p.callWithTimeout(ctx, 0, request, response)
+}
+
+// callWithTimeout is call with the request bounded by timeout, if positive.
+// Time spent waiting for a free worker doesn't count against it, so a busy
+// pool doesn't time out requests that haven't started.
+func (p *PythonWorkerPool) callWithTimeout(ctx context.Context, timeout time.Duration, request any, response any) error {
+	payload, ok := request.(json.RawMessage)
+	if !ok {
+		var err error
+		if payload, err = json.Marshal(request); err != nil {
+			return err
+		}
+	}
+
+	w, err := p.acquire(ctx)
+	if err != nil {
+		return err
+	}
+
+	if timeout > 0 {
+		var cancel context.CancelFunc
+		ctx, cancel = context.WithTimeout(ctx, timeout)
+		defer cancel()
+	}
+
+	line, err := w.roundTrip(ctx, payload)
+	p.release(w, err == nil)
+
+	if err != nil {
+		return fmt.Errorf("python grader worker: %w", err)
+	}
+
+	var envelope struct {
+		Error string `json:"error"`
+	}
+
+	if err := json.Unmarshal(line, &envelope); err != nil {
+		return fmt.Errorf("failed to deserialize output (%s) from python grader worker: %w", string(line), err)
+	}
+
+	if envelope.Error != "" {
+		return errors.New(envelope.Error)
+	}
+
+	return json.Unmarshal(line, response)
+}
+
+func (p *PythonWorkerPool) acquire(ctx context.Context) (*pythonWorker, error) {
+	if err := ctx.Err(); err != nil {
+		return nil, err
+	}
+
+	select {
+	case p.slots <- struct{}{}:
+	case <-ctx.Done():
+		return nil, ctx.Err()
+	}
+
+	p.mu.Lock()
+	if p.closed {
+		p.mu.Unlock()
+		<-p.slots
+		return nil, errors.New("python grader worker pool is closed")
+	}
+
+	if n := len(p.idle); n > 0 {
+		w := p.idle[n-1]
+		p.idle = p.idle[:n-1]
+		p.mu.Unlock()
+		return w, nil
+	}
+	p.mu.Unlock()
+
+	w, err := startPythonWorker()
+	if err != nil {
+		<-p.slots
+		return nil, err
+	}
+	return w, nil
+}
+
+func (p *PythonWorkerPool) release(w *pythonWorker, healthy bool) {
+	defer func() { <-p.slots }()
+
+	p.mu.Lock()
+	if healthy && !p.closed {
+		p.idle = append(p.idle, w)
+		p.mu.Unlock()
+		return
+	}
+	p.mu.Unlock()
+
+	w.kill()
+}
+
+type pythonWorker struct {
+	cmd    *exec.Cmd
+	stdin  io.WriteCloser
+	stdout *bufio.Reader
+}
+
+func startPythonWorker() (*pythonWorker, error) {
+	// workers outlive any one request, so no request's context ends them
+	cmd := pythonCommand(context.Background(), "-c", graderWorkerPy)
+	cmd.Stderr = os.Stderr
+
+	stdin, err := cmd.StdinPipe()
+	if err != nil {
+		return nil, err
+	}
+
+	stdout, err := cmd.StdoutPipe()
+	if err != nil {
+		return nil, err
+	}
+
+	if err := cmd.Start(); err != nil {
+		return nil, fmt.Errorf("failed to start python grader worker: %w", err)
+	}
+
+	return &pythonWorker{
+		cmd:    cmd,
+		stdin:  stdin,
+		stdout: bufio.NewReader(stdout),
+	}, nil
+}
+
+func (w *pythonWorker) roundTrip(ctx context.Context, payload []byte) ([]byte, error) {
+	type reply struct {
+		line []byte
+		err  error
+	}
+
+	replies := make(chan reply, 1)
+
+	go func() {
+		if _, err := w.stdin.Write(append(payload, '\n')); err != nil {
+			replies <- reply{err: err}
+			return
+		}
+		line, err := w.stdout.ReadBytes('\n')
+		replies <- reply{line: line, err: err}
+	}()
+
+	select {
+	case r := <-replies:
+		return r.line, r.err
+	case <-ctx.Done():
+		return nil, ctx.Err()
+	}
+}
+
+func (w *pythonWorker) close() error {
+	if err := w.stdin.Close(); err != nil {
+		w.kill()
+		return err
+	}
+	return w.cmd.Wait()
+}
+
+func (w *pythonWorker) kill() {
+	if w.cmd.Process != nil {
+		if err := w.cmd.Process.Kill(); err != nil && !errors.Is(err, os.ErrProcessDone) {
+			fmt.Fprintf(os.Stderr, "Warning: failed to stop python grader worker: %v\n", err)
+		}
+	}
+	// killed processes always report an exit error
+	_ = w.cmd.Wait()
+}
@@ -0,0 +1,78 @@
+package graders
+
+import (
+	"context"
+	"fmt"
+	"sync"
+	"testing"
+
+	"github.com/stretchr/testify/require"
+)
+
+func TestPythonWorkerPool(t *testing.T) {
+	skipIfNoPython(t)
+
+	pool := NewPythonWorkerPool(2)
+	defer func() { require.NoError(t, pool.Close()) }()
+
+	grader, err := Create(TypeInlineScript, "pooled", map[string]any{
+		"assertions": []string{`"hello" in output`, `len(output) > 100`},
+	}, WithPythonPool(pool))
+	require.NoError(t, err)
+
+	t.Run("matches subprocess results", func(t *testing.T) {
+		pooled, err := grader.Grade(context.Background(), &Context{Output: "hello world"})
+		require.NoError(t, err)
+
+		unpooled, err := Create(TypeInlineScript, "pooled", map[string]any{
+			"assertions": []string{`"hello" in output`, `len(output) > 100`},
+		})
+		require.NoError(t, err)
+
+		expected, err := unpooled.Grade(context.Background(), &Context{Output: "hello world"})
+		require.NoError(t, err)
+
+		pooled.DurationMs, expected.DurationMs = 0, 0
+		require.Equal(t, expected, pooled)
+	})
+
+	t.Run("concurrent grading", func(t *testing.T) {
+		var wg sync.WaitGroup
+		for i := 0; i < 16; i++ {
+			wg.Add(1)
+			go func(i int) {
+				defer wg.Done()
+				results, err := grader.Grade(context.Background(), &Context{Output: fmt.Sprintf("hello %d", i)})
+				require.NoError(t, err)
+				require.Equal(t, 0.5, results.Score)
+			}(i)
+		}
+		wg.Wait()
+	})
+
+	t.Run("assertion errors leave the pool usable", func(t *testing.T) {
+		broken, err := Create(TypeInlineScript, "broken", map[string]any{
+			"assertions": []string{`1/0`},
+		}, WithPythonPool(pool))
+		require.NoError(t, err)
+
+		_, err = broken.Grade(context.Background(), &Context{})
+		require.ErrorContains(t, err, "ZeroDivisionError")
+
+		results, err := grader.Grade(context.Background(), &Context{Output: "hello"})
+		require.NoError(t, err)
+		require.Equal(t, 0.5, results.Score)
+	})
+
+	t.Run("cancelled calls replace the worker", func(t *testing.T) {
+		ctx, cancel := context.WithCancel(context.Background())
+		cancel()
+
+		_, err := grader.Grade(ctx, &Context{Output: "hello"})
+		require.ErrorIs(t, err, context.Canceled)
+
+		results, err := grader.Grade(context.Background(), &Context{Output: "hello"})
+		require.NoError(t, err)
+		require.Equal(t, 0.5, results.Score)
+	})
+}
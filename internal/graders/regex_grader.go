@@ -3,24 +3,37 @@ package graders
 import (
 	"context"
 	"fmt"
-	"regexp"
 	"strings"
 
 	"github.com/spboyer/waza/internal/models"
 )
 
-// RegexGrader validates using regex patterns
+// RegexGrader validates using regex patterns. Each pattern list is compiled
+// once, when the grader is created.
 type RegexGrader struct {
 	name         string
 	mustMatch    []string
 	mustNotMatch []string
+
+	mustMatchSet    *patternSet
+	mustNotMatchSet *patternSet
+	// invalid patterns are reported as failures when grading
+	invalidMustMatch    map[int]error
+	invalidMustNotMatch map[int]error
 }
 
 func NewRegexGrader(name string, mustMatch []string, mustNotMatch []string) (*RegexGrader, error) {
+	mustMatchSet, invalidMustMatch := compilePatternSet(mustMatch)
+	mustNotMatchSet, invalidMustNotMatch := compilePatternSet(mustNotMatch)
+
 	return &RegexGrader{
-		name:         name,
-		mustMatch:    mustMatch,
-		mustNotMatch: mustNotMatch,
+		name:                name,
+		mustMatch:           mustMatch,
+		mustNotMatch:        mustNotMatch,
+		mustMatchSet:        mustMatchSet,
+		mustNotMatchSet:     mustNotMatchSet,
+		invalidMustMatch:    invalidMustMatch,
+		invalidMustNotMatch: invalidMustNotMatch,
 	}, nil
 }
 
@@ -31,28 +44,32 @@ func (reg *RegexGrader) Grade(ctx context.Context, gradingContext *Context) (*mo
 	return measureTime(func() (*models.GraderResults, error) {
 		var failures []string
 
-		for _, pattern := range reg.mustMatch {
-			re, err := regexp.Compile(pattern)
-			if err != nil {
+		matched := reg.mustMatchSet.Match(gradingContext.Output)
+		next := 0
+		for i, pattern := range reg.mustMatch {
+			if err, ok := reg.invalidMustMatch[i]; ok {
 				failures = append(failures, fmt.Sprintf("Invalid 'must_match' regex pattern %q: %v", pattern, err))
 				continue
 			}
 
-			if !re.MatchString(gradingContext.Output) {
+			if !matched[next] {
 				failures = append(failures, fmt.Sprintf("Missing expected pattern: %s", pattern))
 			}
+			next++
 		}
 
-		for _, pattern := range reg.mustNotMatch {
-			re, err := regexp.Compile(pattern)
-			if err != nil {
+		forbidden := reg.mustNotMatchSet.Match(gradingContext.Output)
+		next = 0
+		for i, pattern := range reg.mustNotMatch {
+			if err, ok := reg.invalidMustNotMatch[i]; ok {
 				failures = append(failures, fmt.Sprintf("Invalid 'must_not_match' regex pattern %q: %v", pattern, err))
 				continue
 			}
 
-			if re.MatchString(gradingContext.Output) {
+			if forbidden[next] {
 				failures = append(failures, fmt.Sprintf("Found forbidden pattern: %s", pattern))
 			}
+			next++
 		}
 
 		totalChecks := len(reg.mustMatch) + len(reg.mustNotMatch)
@@ -0,0 +1,185 @@
+package graders
+
+import (
+	"context"
+	"encoding/json"
+	"strconv"
+	"sync"
+
+	"github.com/spboyer/waza/internal/models"
+)
+
+// scriptContext is the grading context as Python graders see it, apart from
+// the duration, which Context.scriptJSON adds to each request
+type scriptContext struct {
+	Output     string                   `json:"output"`
+	Outcome    map[string]any           `json:"outcome"`
+	Transcript []models.TranscriptEntry `json:"transcript"`
+	ToolCalls  []map[string]any         `json:"tool_calls"`
+}
+
+func newScriptContext(gradingContext *Context) scriptContext {
+	input := scriptContext{
+		Output:     gradingContext.Output,
+		Outcome:    gradingContext.Outcome,
+		Transcript: gradingContext.Transcript,
+		ToolCalls:  gradingContext.toolCalls().scriptView(),
+	}
+
+	// make life easier for scripters and init values to an empty value, instead of None/nil/null
+	if input.Transcript == nil {
+		input.Transcript = []models.TranscriptEntry{}
+	}
+
+	if input.Outcome == nil {
+		input.Outcome = map[string]any{}
+	}
+
+	return input
+}
+
+// encodedScriptContext holds a scriptContext encoded as compact JSON
+type encodedScriptContext struct {
+	once sync.Once
+	data json.RawMessage
+	err  error
+}
+
+// sharedScriptJSON returns the part of the context every Python grader sees,
+// encoded on first use. The transcript is usually most of a run's context,
+// so it is encoded once per run rather than once per grader.
+func (c *Context) sharedScriptJSON() (json.RawMessage, error) {
+	c.script.once.Do(func() {
+		c.script.data, c.script.err = json.Marshal(newScriptContext(c))
+	})
+	return c.script.data, c.script.err
+}
+
+// scriptJSON returns the context as Python graders see it:
+//
+//	class Data(TypedDict):
+//	    output: str
+//	    outcome: dict[str, Any]
+//	    transcript: list[dict[str, Event]]
+//	    tool_calls: list[dict[str, Any]]
+//	    duration_ms: int
+//	    task: dict[str, Any]  # grader scripts only
+//
+// The duration and task are spliced into the run's shared encoding, so
+// nothing already encoded is encoded again.
+func (c *Context) scriptJSON(task map[string]any) (json.RawMessage, error) {
+	shared, err := c.sharedScriptJSON()
+	if err != nil {
+		return nil, err
+	}
+
+	var taskJSON []byte
+	if task != nil {
+		if taskJSON, err = json.Marshal(task); err != nil {
+			return nil, err
+		}
+	}
+
+	// shared is an object; drop its closing brace and add the fields
+	data := make([]byte, 0, len(shared)+len(taskJSON)+32)
+	data = append(data, shared[:len(shared)-1]...)
+	data = append(data, `,"duration_ms":`...)
+	data = strconv.AppendInt(data, c.DurationMS, 10)
+	if taskJSON != nil {
+		data = append(data, `,"task":`...)
+		data = append(data, taskJSON...)
+	}
+	return append(data, '}'), nil
+}
+
+// workerRequest encodes request, a struct, with an already encoded context
+// added as its "context" field
+func workerRequest(request any, context json.RawMessage) (json.RawMessage, error) {
+	head, err := json.Marshal(request)
+	if err != nil {
+		return nil, err
+	}
+
+	// one spare byte for the worker protocol's newline
+	payload := make([]byte, 0, len(head)+len(context)+16)
+	payload = append(payload, head[:len(head)-1]...)
+	if len(head) > 2 {
+		payload = append(payload, ',')
+	}
+	payload = append(payload, `"context":`...)
+	payload = append(payload, context...)
+	return append(payload, '}'), nil
+}
+
+// assertionBatch evaluates the assertions of several code graders of one run
+// in a single Python call, so the context is sent and decoded only once
+type assertionBatch struct {
+	pool       *PythonWorkerPool
+	assertions []string
+	index      map[string]int
+
+	once    sync.Once
+	results *assertionResults
+	err     error
+}
+
+// BatchAssertions makes the code graders among gs evaluate their assertions
+// together: the first of them to grade gradingContext evaluates every one of
+// their assertions in a single Python call, against one decoded context, and
+// the rest read their results from it. Memoized graders that already have a
+// result for the context are left out, so they add nothing to the cost; one
+// whose result is evicted meanwhile evaluates its assertions on its own. An
+// assertion that raises is an error only for the graders that list it.
+func BatchAssertions(gradingContext *Context, gs []Grader) {
+	var batch *assertionBatch
+	for _, g := range gs {
+		if mg, ok := g.(*memoGrader); ok {
+			if mg.cached(gradingContext) {
+				continue
+			}
+			g = mg.Grader
+		}
+		isg, ok := g.(*InlineScriptGrader)
+		if !ok || len(isg.assertions) == 0 {
+			continue
+		}
+
+		if batch == nil {
+			batch = &assertionBatch{pool: isg.pool, index: make(map[string]int)}
+		} else if isg.pool != batch.pool {
+			continue
+		}
+		for _, assertion := range isg.assertions {
+			if _, ok := batch.index[assertion]; !ok {
+				batch.index[assertion] = len(batch.assertions)
+				batch.assertions = append(batch.assertions, assertion)
+			}
+		}
+	}
+	gradingContext.assertions = batch
+}
+
+// evaluate returns the results of assertions, all of which are in the batch,
+// evaluating the whole batch on first use
+func (b *assertionBatch) evaluate(ctx context.Context, gradingContext *Context, assertions []string) ([]bool, error) {
+	b.once.Do(func() {
+		b.results, b.err = runAssertions(ctx, b.pool, gradingContext, b.assertions)
+	})
+	if b.err != nil {
+		return nil, b.err
+	}
+	return b.results.pick(assertions, b.index)
+}
+
+// covers reports whether the batch evaluates a grader's assertions
+func (b *assertionBatch) covers(isg *InlineScriptGrader) bool {
+	if b == nil || b.pool != isg.pool {
+		return false
+	}
+	for _, assertion := range isg.assertions {
+		if _, ok := b.index[assertion]; !ok {
+			return false
+		}
+	}
+	return true
+}
@@ -0,0 +1,141 @@
+package graders
+
+import (
+	"context"
+	"encoding/json"
+	"testing"
+
+	"github.com/spboyer/waza/internal/models"
+	"github.com/stretchr/testify/require"
+)
+
+func TestContext_ScriptJSON(t *testing.T) {
+	gradingContext := &Context{
+		Output:     "done",
+		DurationMS: 1234,
+		Transcript: []models.TranscriptEntry{{Type: "assistant.message", Data: map[string]any{"content": "done"}}},
+		TestCase: &models.TestCase{
+			TestID:   "one",
+			Stimulus: models.TestStimulus{Message: "go"},
+		},
+	}
+
+	shared, err := gradingContext.sharedScriptJSON()
+	require.NoError(t, err)
+	require.NotContains(t, string(shared), "\n")
+	again, err := gradingContext.sharedScriptJSON()
+	require.NoError(t, err)
+	// encoded once and shared
+	require.Same(t, &shared[0], &again[0])
+
+	data, err := gradingContext.scriptJSON(nil)
+	require.NoError(t, err)
+	var decoded map[string]any
+	require.NoError(t, json.Unmarshal(data, &decoded))
+	require.Equal(t, "done", decoded["output"])
+	require.Equal(t, float64(1234), decoded["duration_ms"])
+	require.Equal(t, map[string]any{}, decoded["outcome"])
+	require.Len(t, decoded["transcript"], 1)
+	require.NotContains(t, decoded, "task")
+
+	data, err = gradingContext.scriptJSON(scriptTask(gradingContext))
+	require.NoError(t, err)
+	decoded = nil
+	require.NoError(t, json.Unmarshal(data, &decoded))
+	require.Equal(t, "one", decoded["task"].(map[string]any)["id"])
+	require.Equal(t, float64(1234), decoded["duration_ms"])
+
+	request, err := workerRequest(struct {
+		Op string `json:"op"`
+	}{"script"}, data)
+	require.NoError(t, err)
+	var envelope struct {
+		Op      string         `json:"op"`
+		Context map[string]any `json:"context"`
+	}
+	require.NoError(t, json.Unmarshal(request, &envelope))
+	require.Equal(t, "script", envelope.Op)
+	require.Equal(t, decoded, envelope.Context)
+}
+
+func TestBatchAssertions(t *testing.T) {
+	skipIfNoPython(t)
+
+	short, err := NewInlineScriptGrader("short", LanguagePython, []string{"len(output) > 0"})
+	require.NoError(t, err)
+	long, err := NewInlineScriptGrader("long", LanguagePython, []string{"'missing' in output", "len(output) > 0"})
+	require.NoError(t, err)
+	regex, err := NewRegexGrader("regex", []string{"done"}, nil)
+	require.NoError(t, err)
+	memoized := Memoize(long, "long", NewMemoCache(0))
+
+	gradingContext := &Context{Output: "done"}
+	BatchAssertions(gradingContext, []Grader{short, regex, memoized})
+
+	batch := gradingContext.assertions
+	require.Equal(t, []string{"len(output) > 0", "'missing' in output"}, batch.assertions)
+
+	// the first grader evaluates every assertion of the run
+	res, err := short.Grade(context.Background(), gradingContext)
+	require.NoError(t, err)
+	require.True(t, res.Passed)
+	require.Equal(t, []bool{true, false}, batch.results.Results)
+
+	res, err = memoized.Grade(context.Background(), gradingContext)
+	require.NoError(t, err)
+	require.False(t, res.Passed)
+	require.Equal(t, 0.5, res.Score)
+	require.Equal(t, "Failed: 'missing' in output", res.Feedback)
+
+	t.Run("graders outside the batch run on their own", func(t *testing.T) {
+		other, err := NewInlineScriptGrader("other", LanguagePython, []string{"output == 'done'"})
+		require.NoError(t, err)
+		require.False(t, batch.covers(other))
+
+		res, err := other.Grade(context.Background(), gradingContext)
+		require.NoError(t, err)
+		require.True(t, res.Passed)
+	})
+}
+
+func TestBatchAssertions_SkipsCachedGraders(t *testing.T) {
+	g, err := NewInlineScriptGrader("cached", LanguagePython, []string{"len(output) > 0"})
+	require.NoError(t, err)
+	memoized := Memoize(g, "cached", NewMemoCache(0))
+
+	gradingContext := &Context{Output: "done"}
+	mg := memoized.(*memoGrader)
+	key, ok := mg.key(gradingContext)
+	require.True(t, ok)
+	mg.cache.put(key, models.GraderResults{Name: "cached", Passed: true})
+
+	BatchAssertions(gradingContext, []Grader{memoized})
+	require.Nil(t, gradingContext.assertions)
+	require.Equal(t, MemoStats{}, mg.cache.Stats(), "checking the cache isn't a lookup")
+}
+
+func TestBatchAssertions_ErrorsStayWithTheirGrader(t *testing.T) {
+	skipIfNoPython(t)
+
+	for _, pool := range []*PythonWorkerPool{nil, NewPythonWorkerPool(1)} {
+		broken, err := NewInlineScriptGrader("broken", LanguagePython, []string{"len(output) > 0", "1 / 0 > 0"})
+		require.NoError(t, err)
+		fine, err := NewInlineScriptGrader("fine", LanguagePython, []string{"len(output) > 0"})
+		require.NoError(t, err)
+		broken.pool, fine.pool = pool, pool
+
+		gradingContext := &Context{Output: "done"}
+		BatchAssertions(gradingContext, []Grader{broken, fine})
+
+		_, err = broken.Grade(context.Background(), gradingContext)
+		require.ErrorContains(t, err, `assertion "1 / 0 > 0" raised ZeroDivisionError`)
+
+		res, err := fine.Grade(context.Background(), gradingContext)
+		require.NoError(t, err)
+		require.True(t, res.Passed)
+
+		if pool != nil {
+			require.NoError(t, pool.Close())
+		}
+	}
+}
@@ -0,0 +1,138 @@
+package graders
+
+import (
+	"context"
+	"errors"
+	"fmt"
+	"os"
+	"time"
+
+	"github.com/spboyer/waza/internal/models"
+)
+
+// DefaultScriptTimeout bounds a single call to a grader script's grade
+// function, not counting time spent waiting for a free worker
+const DefaultScriptTimeout = 30 * time.Second
+
+// ScriptGrader calls the grade(context) function of a Python grader script.
+// The script is imported once per pool worker and only re-imported when the
+// file's modification time changes, so trials don't pay interpreter startup
+// and module import on every call.
+type ScriptGrader struct {
+	name    string
+	path    string
+	timeout time.Duration
+	pool    *PythonWorkerPool
+}
+
+func NewScriptGrader(name string, path string, timeout time.Duration) (*ScriptGrader, error) {
+	if path == "" {
+		return nil, fmt.Errorf("script grader '%s' has no script configured", name)
+	}
+
+	if _, err := os.Stat(path); err != nil {
+		return nil, fmt.Errorf("script grader '%s': %w", name, err)
+	}
+
+	if timeout <= 0 {
+		timeout = DefaultScriptTimeout
+	}
+
+	return &ScriptGrader{
+		name:    name,
+		path:    path,
+		timeout: timeout,
+	}, nil
+}
+
+func (sg *ScriptGrader) Name() string { return sg.name }
+func (sg *ScriptGrader) Type() Type   { return TypePythonScript }
+
+func (sg *ScriptGrader) Grade(ctx context.Context, gradingContext *Context) (*models.GraderResults, error) {
+	return measureTime(func() (*models.GraderResults, error) {
+		if sg.pool == nil {
+			return nil, fmt.Errorf("script grader '%s' needs a python worker pool", sg.name)
+		}
+
+		scriptContext, err := gradingContext.scriptJSON(scriptTask(gradingContext))
+		if err != nil {
+			return nil, err
+		}
+
+		request, err := workerRequest(struct {
+			Op   string `json:"op"`
+			Path string `json:"path"`
+		}{
+			Op:   "script",
+			Path: sg.path,
+		}, scriptContext)
+		if err != nil {
+			return nil, err
+		}
+
+		var response struct {
+			Result struct {
+				Score   float64        `json:"score"`
+				Passed  bool           `json:"passed"`
+				Message string         `json:"message"`
+				Details map[string]any `json:"details"`
+			} `json:"result"`
+		}
+
+		// the timeout covers running the script, not waiting for a worker
+		if err := sg.pool.callWithTimeout(ctx, sg.timeout, request, &response); err != nil {
+			// the benchmark itself is stopping, so don't turn that into a grade
+			if ctx.Err() != nil {
+				return nil, ctx.Err()
+			}
+
+			// a broken or slow script fails this grader, not the whole benchmark
+			feedback := fmt.Sprintf("Script %s failed: %v", sg.path, err)
+			if errors.Is(err, context.DeadlineExceeded) {
+				feedback = fmt.Sprintf("Script %s timed out after %v", sg.path, sg.timeout)
+			}
+
+			return &models.GraderResults{
+				Name:     sg.name,
+				Type:     string(TypePythonScript),
+				Score:    0.0,
+				Passed:   false,
+				Feedback: feedback,
+				Details: map[string]any{
+					"script": sg.path,
+				},
+			}, nil
+		}
+
+		result := response.Result
+
+		return &models.GraderResults{
+			Name:     sg.name,
+			Type:     string(TypePythonScript),
+			Score:    result.Score,
+			Passed:   result.Passed,
+			Feedback: result.Message,
+			Details:  result.Details,
+		}, nil
+	})
+}
+
+// scriptTask is the task as a script's grade function sees it in
+// context["task"]
+func scriptTask(gradingContext *Context) map[string]any {
+	tc := gradingContext.TestCase
+	if tc == nil {
+		return map[string]any{}
+	}
+
+	// mirror the task YAML layout that grader scripts are written against
+	return map[string]any{
+		"id":   tc.TestID,
+		"name": tc.DisplayName,
+		"tags": tc.Labels,
+		"inputs": map[string]any{
+			"prompt":  tc.Stimulus.Message,
+			"context": tc.Stimulus.Metadata,
+		},
+	}
+}
@@ -0,0 +1,164 @@
+package graders
+
+import (
+	"context"
+	"os"
+	"path/filepath"
+	"testing"
+	"time"
+
+	"github.com/spboyer/waza/internal/models"
+	"github.com/stretchr/testify/require"
+)
+
+func writeGraderScript(t *testing.T, path string, body string) {
+	t.Helper()
+	require.NoError(t, os.WriteFile(path, []byte(body), 0644))
+}
+
+func TestScriptGrader(t *testing.T) {
+	skipIfNoPython(t)
+
+	pool := NewPythonWorkerPool(1)
+	defer func() { require.NoError(t, pool.Close()) }()
+
+	dir := t.TempDir()
+	script := filepath.Join(dir, "quality.py")
+	writeGraderScript(t, script, `
+def grade(context):
+    language = context["task"]["inputs"]["context"]["language"]
+    passed = language in context["output"]
+    return {
+        "score": 1.0 if passed else 0.0,
+        "passed": passed,
+        "message": "mentions " + language,
+        "details": {"tool_calls": len(context["tool_calls"])},
+    }
+`)
+
+	grader, err := Create(TypePythonScript, "quality", map[string]any{"script": script}, WithPythonPool(pool))
+	require.NoError(t, err)
+	require.Equal(t, TypePythonScript, grader.Type())
+
+	gradingContext := &Context{
+		TestCase: &models.TestCase{
+			TestID:   "t1",
+			Stimulus: models.TestStimulus{Metadata: map[string]any{"language": "python"}},
+		},
+		Output: "this python function",
+		Transcript: []models.TranscriptEntry{
+			{Type: "tool.execution_start", Data: map[string]any{"toolName": "view"}},
+		},
+	}
+
+	t.Run("calls grade", func(t *testing.T) {
+		results, err := grader.Grade(context.Background(), gradingContext)
+		require.NoError(t, err)
+		require.True(t, results.Passed)
+		require.Equal(t, 1.0, results.Score)
+		require.Equal(t, "mentions python", results.Feedback)
+		require.Equal(t, map[string]any{"tool_calls": float64(1)}, results.Details)
+	})
+
+	t.Run("reloads when the script changes", func(t *testing.T) {
+		writeGraderScript(t, script, `
+def grade(context):
+    return {"score": 0.25, "passed": False, "message": "reloaded"}
+`)
+		future := time.Now().Add(time.Minute)
+		require.NoError(t, os.Chtimes(script, future, future))
+
+		results, err := grader.Grade(context.Background(), gradingContext)
+		require.NoError(t, err)
+		require.Equal(t, "reloaded", results.Feedback)
+		require.Equal(t, 0.25, results.Score)
+	})
+
+	t.Run("exceptions fail only this grader", func(t *testing.T) {
+		broken := filepath.Join(dir, "broken.py")
+		writeGraderScript(t, broken, `
+def grade(context):
+    raise ValueError("boom")
+`)
+		g, err := Create(TypePythonScript, "broken", map[string]any{"script": broken}, WithPythonPool(pool))
+		require.NoError(t, err)
+
+		results, err := g.Grade(context.Background(), gradingContext)
+		require.NoError(t, err)
+		require.False(t, results.Passed)
+		require.Contains(t, results.Feedback, "ValueError: boom")
+	})
+
+	t.Run("timeouts fail the grader and replace the worker", func(t *testing.T) {
+		slow := filepath.Join(dir, "slow.py")
+		writeGraderScript(t, slow, `
+import time
+
+def grade(context):
+    time.sleep(30)
+`)
+		g, err := NewScriptGrader("slow", slow, 200*time.Millisecond)
+		require.NoError(t, err)
+		g.pool = pool
+
+		results, err := g.Grade(context.Background(), gradingContext)
+		require.NoError(t, err)
+		require.False(t, results.Passed)
+		require.Contains(t, results.Feedback, "timed out")
+
+		results, err = grader.Grade(context.Background(), gradingContext)
+		require.NoError(t, err)
+		require.Equal(t, "reloaded", results.Feedback)
+	})
+}
+
+func TestScriptGrader_TimeoutExcludesWaitingForAWorker(t *testing.T) {
+	skipIfNoPython(t)
+
+	pool := NewPythonWorkerPool(1)
+	defer func() { require.NoError(t, pool.Close()) }()
+
+	script := filepath.Join(t.TempDir(), "slow.py")
+	writeGraderScript(t, script, `
+import time
+
+def grade(context):
+    time.sleep(0.5)
+    return {"score": 1.0, "passed": True, "message": "slow but fine"}
+`)
+
+	// each call fits its timeout, but not alongside the other's
+	g, err := NewScriptGrader("slow", script, 800*time.Millisecond)
+	require.NoError(t, err)
+	g.pool = pool
+
+	// start the worker, so neither call below pays for it
+	_, err = g.Grade(context.Background(), &Context{})
+	require.NoError(t, err)
+
+	type graded struct {
+		res *models.GraderResults
+		err error
+	}
+	results := make(chan graded, 2)
+	for i := 0; i < 2; i++ {
+		go func() {
+			res, err := g.Grade(context.Background(), &Context{})
+			results <- graded{res, err}
+		}()
+	}
+
+	for i := 0; i < 2; i++ {
+		r := <-results
+		require.NoError(t, r.err)
+		require.True(t, r.res.Passed, r.res.Feedback)
+	}
+}
+
+func TestScriptGrader_MissingScript(t *testing.T) {
+	_, err := Create(TypePythonScript, "missing", map[string]any{"script": "does/not/exist.py"})
+	require.Error(t, err)
+
+	_, err = Create(TypePythonScript, "empty", map[string]any{})
+	require.ErrorContains(t, err, "has no script configured")
+}
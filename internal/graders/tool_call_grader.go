@@ -0,0 +1,119 @@
+package graders
+
+import (
+	"context"
+	"fmt"
+	"strings"
+
+	"github.com/spboyer/waza/internal/models"
+)
+
+// ToolCallGrader validates which tools were called and how. Required and
+// forbidden patterns are compiled once and matched against each call in the
+// run's shared ToolCallIndex.
+type ToolCallGrader struct {
+	name      string
+	required  []string
+	forbidden []string
+	maxCalls  int
+
+	requiredSet  *patternSet
+	forbiddenSet *patternSet
+}
+
+func NewToolCallGrader(name string, required []string, forbidden []string, maxCalls int) (*ToolCallGrader, error) {
+	requiredSet, err := mustCompilePatternSet(required)
+	if err != nil {
+		return nil, fmt.Errorf("tool_calls grader '%s' required: %w", name, err)
+	}
+
+	forbiddenSet, err := mustCompilePatternSet(forbidden)
+	if err != nil {
+		return nil, fmt.Errorf("tool_calls grader '%s' forbidden: %w", name, err)
+	}
+
+	return &ToolCallGrader{
+		name:         name,
+		required:     required,
+		forbidden:    forbidden,
+		maxCalls:     maxCalls,
+		requiredSet:  requiredSet,
+		forbiddenSet: forbiddenSet,
+	}, nil
+}
+
+func (tcg *ToolCallGrader) Name() string { return tcg.name }
+func (tcg *ToolCallGrader) Type() Type   { return TypeToolCalls }
+
+func (tcg *ToolCallGrader) Grade(ctx context.Context, gradingContext *Context) (*models.GraderResults, error) {
+	return measureTime(func() (*models.GraderResults, error) {
+		index := gradingContext.toolCalls()
+
+		var failures []string
+
+		for i, found := range index.Match(tcg.requiredSet) {
+			if !found {
+				failures = append(failures, fmt.Sprintf("Missing required tool call: %s", tcg.required[i]))
+			}
+		}
+
+		for i, found := range index.Match(tcg.forbiddenSet) {
+			if found {
+				failures = append(failures, fmt.Sprintf("Found forbidden tool call: %s", tcg.forbidden[i]))
+			}
+		}
+
+		totalChecks := len(tcg.required) + len(tcg.forbidden)
+		if tcg.maxCalls > 0 {
+			totalChecks++
+			if index.Len() > tcg.maxCalls {
+				failures = append(failures, fmt.Sprintf("Too many tool calls: %d > %d", index.Len(), tcg.maxCalls))
+			}
+		}
+
+		score := 1.0
+		if totalChecks > 0 {
+			score = float64(totalChecks-len(failures)) / float64(totalChecks)
+		}
+
+		feedback := "All tool call checks passed"
+		if len(failures) > 0 {
+			feedback = strings.Join(failures, "; ")
+		}
+
+		return &models.GraderResults{
+			Name:     tcg.name,
+			Type:     string(TypeToolCalls),
+			Score:    score,
+			Passed:   len(failures) == 0,
+			Feedback: feedback,
+			Details: map[string]any{
+				"required":   tcg.required,
+				"forbidden":  tcg.forbidden,
+				"max_calls":  tcg.maxCalls,
+				"call_count": index.Len(),
+				"failures":   failures,
+			},
+		}, nil
+	})
+}
+
+// toolCallPatterns accepts both `- pattern: "azd up"` entries and plain strings
+func toolCallPatterns(entries []any) ([]string, error) {
+	patterns := make([]string, 0, len(entries))
+	for _, entry := range entries {
+		switch v := entry.(type) {
+		case string:
+			patterns = append(patterns, v)
+		case map[string]any:
+			pattern, ok := v["pattern"].(string)
+			if !ok {
+				return nil, fmt.Errorf("tool call entry %v has no 'pattern'", v)
+			}
+			patterns = append(patterns, pattern)
+		default:
+			return nil, fmt.Errorf("unsupported tool call entry %v", entry)
+		}
+	}
+	return patterns, nil
+}
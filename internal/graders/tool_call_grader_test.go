@@ -0,0 +1,105 @@
+package graders
+
+import (
+	"context"
+	"testing"
+
+	"github.com/spboyer/waza/internal/models"
+	"github.com/stretchr/testify/require"
+)
+
+func toolCallTranscript(calls ...map[string]any) []models.TranscriptEntry {
+	var transcript []models.TranscriptEntry
+	for _, call := range calls {
+		transcript = append(transcript,
+			models.TranscriptEntry{Type: "tool.execution_start", Data: call},
+			models.TranscriptEntry{Type: "tool.execution_complete", Data: map[string]any{}},
+		)
+	}
+	return transcript
+}
+
+func TestToolCallIndex(t *testing.T) {
+	idx := NewToolCallIndex(toolCallTranscript(
+		map[string]any{"toolName": "bash", "arguments": map[string]any{"command": "azd up", "cwd": "/src"}},
+		map[string]any{"toolName": "view", "arguments": map[string]any{"path": "main.go"}},
+		map[string]any{"toolName": "bash", "arguments": map[string]any{"command": "git commit -m wip"}},
+	))
+
+	require.Equal(t, 3, idx.Len())
+	require.Equal(t, []string{"bash", "view", "bash"}, idx.Names())
+	require.Equal(t, "bash azd up /src", idx.calls[0].Text)
+	require.Equal(t, 2, idx.calls[2].Position)
+
+	// patterns can't span two calls
+	ps, _ := compilePatternSet([]string{`/src\s+view`})
+	require.Equal(t, []bool{false}, idx.Match(ps))
+}
+
+func TestToolCallIndex_MatchesEachCall(t *testing.T) {
+	idx := NewToolCallIndex(toolCallTranscript(
+		map[string]any{"toolName": "view", "arguments": map[string]any{"path": "a.go"}},
+		map[string]any{"toolName": "bash", "arguments": map[string]any{"command": "azd up"}},
+	))
+
+	ps, invalid := compilePatternSet([]string{`^bash`, `^bash azd up$`, `^view a\.go$`, `view[^x]*azd`, `a\.go\s*bash`})
+	require.Empty(t, invalid)
+	require.Equal(t, []bool{true, true, true, false, false}, idx.Match(ps))
+
+	g, err := NewToolCallGrader("anchored", []string{`^bash azd up$`}, []string{`view[^x]*azd`}, 0)
+	require.NoError(t, err)
+	res, err := g.Grade(context.Background(), &Context{ToolCalls: idx})
+	require.NoError(t, err)
+	require.True(t, res.Passed, res.Feedback)
+}
+
+func TestToolCallGrader(t *testing.T) {
+	transcript := toolCallTranscript(
+		map[string]any{"toolName": "bash", "arguments": map[string]any{"command": "azd up"}},
+		map[string]any{"toolName": "bash", "arguments": map[string]any{"command": "sudo rm -rf /tmp/x"}},
+	)
+
+	t.Run("via Create", func(t *testing.T) {
+		g, err := Create(TypeToolCalls, "tools", map[string]any{
+			"required": []any{
+				map[string]any{"pattern": "azd up"},
+				map[string]any{"pattern": "git commit"},
+			},
+			"forbidden": []any{"rm -rf", "sudo", "curl"},
+			"max_calls": 1,
+		})
+		require.NoError(t, err)
+		require.Equal(t, TypeToolCalls, g.Type())
+
+		results, err := g.Grade(context.Background(), &Context{Transcript: transcript})
+		require.NoError(t, err)
+		require.False(t, results.Passed)
+		// 6 checks: git commit missing, rm -rf and sudo found, too many calls
+		require.Equal(t, 2.0/6.0, results.Score)
+		require.Contains(t, results.Feedback, "Missing required tool call: git commit")
+		require.Contains(t, results.Feedback, "Found forbidden tool call: rm -rf")
+		require.Contains(t, results.Feedback, "Found forbidden tool call: sudo")
+		require.Contains(t, results.Feedback, "Too many tool calls: 2 > 1")
+		require.Equal(t, 2, results.Details["call_count"])
+	})
+
+	t.Run("uses the shared index", func(t *testing.T) {
+		g, err := NewToolCallGrader("tools", []string{"azd up"}, []string{"curl"}, 0)
+		require.NoError(t, err)
+
+		results, err := g.Grade(context.Background(), &Context{
+			ToolCalls: NewToolCallIndex(transcript),
+		})
+		require.NoError(t, err)
+		require.True(t, results.Passed)
+		require.Equal(t, 1.0, results.Score)
+	})
+
+	t.Run("invalid patterns are rejected", func(t *testing.T) {
+		_, err := NewToolCallGrader("tools", []string{"[invalid"}, nil, 0)
+		require.Error(t, err)
+	})
+}
+
+// Ensure ToolCallGrader satisfies the Grader interface at compile time.
+var _ Grader = (*ToolCallGrader)(nil)
@@ -0,0 +1,142 @@
+package graders
+
+import (
+	"fmt"
+	"sort"
+	"strings"
+
+	"github.com/spboyer/waza/internal/models"
+)
+
+// indexedToolCall is one tool invocation from a run's transcript
+type indexedToolCall struct {
+	// Position is the call's ordinal among all tool calls in the run
+	Position  int
+	Name      string
+	Arguments map[string]any
+	// Text is the tool name followed by its flattened argument values; this
+	// is what tool call patterns are matched against
+	Text string
+}
+
+// ToolCallIndex is built once per run and shared by every grader that looks at
+// tool usage, so none of them has to walk the transcript again.
+type ToolCallIndex struct {
+	calls []indexedToolCall
+}
+
+// NewToolCallIndex indexes the tool.execution_start events of a transcript
+func NewToolCallIndex(transcript []models.TranscriptEntry) *ToolCallIndex {
+	idx := &ToolCallIndex{}
+
+	for _, entry := range transcript {
+		if entry.Type != "tool.execution_start" {
+			continue
+		}
+
+		var name string
+		if v, ok := entry.Data["toolName"].(string); ok {
+			name = v
+		}
+
+		var args map[string]any
+		if v, ok := entry.Data["arguments"].(map[string]any); ok {
+			args = v
+		}
+
+		var text strings.Builder
+		text.WriteString(name)
+		flattenArguments(&text, args)
+
+		call := indexedToolCall{
+			Position:  len(idx.calls),
+			Name:      name,
+			Arguments: args,
+			Text:      text.String(),
+		}
+
+		idx.calls = append(idx.calls, call)
+	}
+
+	return idx
+}
+
+// Len returns the number of tool calls
+func (idx *ToolCallIndex) Len() int { return len(idx.calls) }
+
+// Names returns the tool name of every call, in order
+func (idx *ToolCallIndex) Names() []string {
+	names := make([]string, 0, len(idx.calls))
+	for _, call := range idx.calls {
+		names = append(names, call.Name)
+	}
+	return names
+}
+
+// Match reports which patterns of the set match any tool call. Each call's
+// Text is matched on its own, so anchors apply to every call and no pattern
+// matches across two calls. Calls no pattern matches cost one scan; patterns
+// already found aren't checked against later calls.
+func (idx *ToolCallIndex) Match(ps *patternSet) []bool {
+	matched := make([]bool, ps.Len())
+	for _, call := range idx.calls {
+		ps.matchInto(matched, call.Text)
+	}
+	return matched
+}
+
+// texts returns the Text of every call, in order
+func (idx *ToolCallIndex) texts() []string {
+	texts := make([]string, 0, len(idx.calls))
+	for _, call := range idx.calls {
+		texts = append(texts, call.Text)
+	}
+	return texts
+}
+
+// scriptView is the list of tool calls handed to Python graders
+func (idx *ToolCallIndex) scriptView() []map[string]any {
+	view := make([]map[string]any, 0, len(idx.calls))
+	for _, call := range idx.calls {
+		view = append(view, map[string]any{
+			"name":      call.Name,
+			"arguments": call.Arguments,
+			"position":  call.Position,
+		})
+	}
+	return view
+}
+
+// flattenArguments appends argument values to b in a stable order
+func flattenArguments(b *strings.Builder, value any) {
+	switch v := value.(type) {
+	case nil:
+	case string:
+		b.WriteByte(' ')
+		b.WriteString(v)
+	case map[string]any:
+		keys := make([]string, 0, len(v))
+		for k := range v {
+			keys = append(keys, k)
+		}
+		sort.Strings(keys)
+		for _, k := range keys {
+			flattenArguments(b, v[k])
+		}
+	case []any:
+		for _, item := range v {
+			flattenArguments(b, item)
+		}
+	default:
+		b.WriteByte(' ')
+		fmt.Fprint(b, v)
+	}
+}
+
+// toolCalls returns the run's shared index, building one if the caller didn't
+func (c *Context) toolCalls() *ToolCallIndex {
+	if c.ToolCalls == nil {
+		return NewToolCallIndex(c.Transcript)
+	}
+	return c.ToolCalls
+}
@@ -0,0 +1,235 @@
+package graders
+
+import (
+	"context"
+	"fmt"
+	"strings"
+	"unicode/utf8"
+
+	"github.com/spboyer/waza/internal/models"
+)
+
+// WeightedCriterion is one scored check of a WeightedPatternsGrader
+type WeightedCriterion struct {
+	Name string
+	// Weight is the criterion's share of the score (default 1); a weight of
+	// 0 reports the criterion without scoring it
+	Weight *float64
+
+	// Patterns are counted as hits when they match the output
+	Patterns []string
+	// MinHits is the number of distinct patterns that must match (default 1)
+	MinHits *int `mapstructure:"min_hits"`
+	// MaxHits caps the number of patterns that may match; 0 forbids them all
+	MaxHits *int `mapstructure:"max_hits"`
+	// MinLength is the minimum output length in characters
+	MinLength int `mapstructure:"min_length"`
+
+	// Select names a task context key (inputs.context) whose value picks the
+	// pattern list from Variants. Criteria whose key is missing or has no
+	// variant are credited and reported as skipped.
+	Select   string
+	Variants map[string][]string
+}
+
+// WeightedPatternsGrader scores the output against weighted criteria. The
+// patterns of every criterion are compiled once into a shared patternSet and
+// matched once per grade; criteria then read their hits from that result.
+type WeightedPatternsGrader struct {
+	name      string
+	criteria  []WeightedCriterion
+	weights   []float64
+	threshold float64
+
+	patterns *patternSet
+	// ranges[i] is criterion i's slice of patterns; variantRanges holds the
+	// same for each of its variants
+	ranges        []patternRange
+	variantRanges []map[string]patternRange
+}
+
+type patternRange struct {
+	start, end int
+}
+
+func NewWeightedPatternsGrader(name string, criteria []WeightedCriterion, threshold float64) (*WeightedPatternsGrader, error) {
+	if len(criteria) == 0 {
+		return nil, fmt.Errorf("weighted_patterns grader '%s' has no criteria", name)
+	}
+
+	if threshold <= 0 {
+		threshold = 1.0
+	}
+
+	wpg := &WeightedPatternsGrader{
+		name:      name,
+		threshold: threshold,
+	}
+
+	var all []string
+	add := func(patterns []string) patternRange {
+		r := patternRange{start: len(all)}
+		all = append(all, patterns...)
+		r.end = len(all)
+		return r
+	}
+
+	totalWeight := 0.0
+	for _, c := range criteria {
+		weight := 1.0
+		if c.Weight != nil {
+			weight = *c.Weight
+		}
+		if weight < 0 {
+			return nil, fmt.Errorf("criterion '%s' has a negative weight", c.Name)
+		}
+		totalWeight += weight
+		if len(c.Patterns) == 0 && len(c.Variants) == 0 && c.MinLength == 0 {
+			return nil, fmt.Errorf("criterion '%s' needs patterns, variants or min_length", c.Name)
+		}
+		if len(c.Variants) > 0 && c.Select == "" {
+			return nil, fmt.Errorf("criterion '%s' has variants but no select key", c.Name)
+		}
+
+		wpg.criteria = append(wpg.criteria, c)
+		wpg.weights = append(wpg.weights, weight)
+		wpg.ranges = append(wpg.ranges, add(c.Patterns))
+
+		variants := map[string]patternRange{}
+		for key, patterns := range c.Variants {
+			variants[key] = add(patterns)
+		}
+		wpg.variantRanges = append(wpg.variantRanges, variants)
+	}
+
+	if totalWeight == 0 {
+		return nil, fmt.Errorf("weighted_patterns grader '%s' has no criterion with a weight above 0", name)
+	}
+
+	patterns, err := mustCompilePatternSet(all)
+	if err != nil {
+		return nil, fmt.Errorf("weighted_patterns grader '%s': %w", name, err)
+	}
+	wpg.patterns = patterns
+
+	return wpg, nil
+}
+
+func (wpg *WeightedPatternsGrader) Name() string { return wpg.name }
+func (wpg *WeightedPatternsGrader) Type() Type   { return TypeWeightedPatterns }
+
+func (wpg *WeightedPatternsGrader) Grade(ctx context.Context, gradingContext *Context) (*models.GraderResults, error) {
+	return measureTime(func() (*models.GraderResults, error) {
+		output := gradingContext.Output
+		matched := wpg.patterns.Match(output)
+		// min_length counts characters, not bytes
+		outputLen := utf8.RuneCountInString(output)
+
+		var taskContext map[string]any
+		if gradingContext.TestCase != nil {
+			taskContext = gradingContext.TestCase.Stimulus.Metadata
+		}
+
+		totalWeight := 0.0
+		passedWeight := 0.0
+		var failures []string
+		details := make([]map[string]any, 0, len(wpg.criteria))
+
+		for i, c := range wpg.criteria {
+			weight := wpg.weights[i]
+			totalWeight += weight
+
+			r := wpg.ranges[i]
+			skipped := false
+			if c.Select != "" {
+				variant, ok := wpg.variantRanges[i][fmt.Sprint(taskContext[c.Select])]
+				if ok {
+					r = variant
+				} else {
+					skipped = r.start == r.end
+				}
+			}
+
+			var hits []string
+			for p := r.start; p < r.end; p++ {
+				if matched[p] {
+					hits = append(hits, wpg.patterns.patterns[p])
+				}
+			}
+
+			passed, reason := c.evaluate(outputLen, len(hits), r.end-r.start, skipped)
+			if passed {
+				passedWeight += weight
+			} else {
+				failures = append(failures, fmt.Sprintf("%s: %s", c.Name, reason))
+			}
+
+			details = append(details, map[string]any{
+				"name":    c.Name,
+				"weight":  weight,
+				"passed":  passed,
+				"skipped": skipped,
+				"hits":    len(hits),
+				"matched": hits,
+			})
+		}
+
+		score := 0.0
+		if totalWeight > 0 {
+			score = passedWeight / totalWeight
+		}
+
+		// tolerate float error from summing weights like 0.2
+		allPassed := score >= wpg.threshold-1e-9
+
+		feedback := fmt.Sprintf("Score %.2f meets threshold %.2f", score, wpg.threshold)
+		if !allPassed {
+			feedback = fmt.Sprintf("Score %.2f below threshold %.2f: %s", score, wpg.threshold, strings.Join(failures, "; "))
+		}
+
+		return &models.GraderResults{
+			Name:     wpg.name,
+			Type:     string(TypeWeightedPatterns),
+			Score:    score,
+			Passed:   allPassed,
+			Feedback: feedback,
+			Details: map[string]any{
+				"threshold": wpg.threshold,
+				"criteria":  details,
+				"failures":  failures,
+			},
+		}, nil
+	})
+}
+
+func (c *WeightedCriterion) evaluate(outputLen, hits, candidates int, skipped bool) (bool, string) {
+	if skipped {
+		return true, ""
+	}
+
+	if outputLen < c.MinLength {
+		return false, fmt.Sprintf("output too short (%d < %d characters)", outputLen, c.MinLength)
+	}
+
+	if candidates == 0 {
+		return true, ""
+	}
+
+	if c.MaxHits != nil && hits > *c.MaxHits {
+		return false, fmt.Sprintf("%d pattern(s) matched, at most %d allowed", hits, *c.MaxHits)
+	}
+
+	minHits := 1
+	if c.MinHits != nil {
+		minHits = *c.MinHits
+	} else if c.MaxHits != nil {
+		// a pure "must not match" criterion
+		minHits = 0
+	}
+
+	if hits < minHits {
+		return false, fmt.Sprintf("%d pattern(s) matched, at least %d required", hits, minHits)
+	}
+
+	return true, ""
+}
@@ -0,0 +1,203 @@
+package graders
+
+import (
+	"context"
+	"strings"
+	"testing"
+
+	"github.com/spboyer/waza/internal/models"
+	"github.com/stretchr/testify/require"
+	"gopkg.in/yaml.v3"
+)
+
+// explanationQualityYAML is examples/code-explainer/graders/explanation_quality.py
+// written as a weighted_patterns grader
+const explanationQualityYAML = `
+type: weighted_patterns
+name: explanation_quality
+config:
+  pass_threshold: 0.6
+  criteria:
+    - name: length
+      weight: 0.2
+      min_length: 200
+    - name: structure
+      weight: 0.2
+      min_hits: 2
+      patterns:
+        - "(?i)(overview|summary|introduction)"
+        - "(?i)(step[\\s-]?by[\\s-]?step|step \\d|first,|then,|finally,|1\\.)"
+        - "(?i)(key concept|important|note|remember)"
+    - name: language
+      weight: 0.2
+      select: language
+      variants:
+        python: ["(?i)\\bpython\\b", "\\bdef\\b", "\\bimport\\b", "__\\w+__"]
+        javascript: ["(?i)\\bjavascript\\b", "(?i)\\bjs\\b", "\\bfunction\\b", "\\bconst\\b", "\\blet\\b"]
+        sql: ["(?i)\\bsql\\b", "(?i)\\bquery\\b", "(?i)\\bselect\\b", "(?i)\\btable\\b"]
+        java: ["(?i)\\bjava\\b", "\\bclass\\b", "\\bpublic\\b", "\\bprivate\\b"]
+        typescript: ["(?i)\\btypescript\\b", "(?i)\\bts\\b", "\\binterface\\b", "\\btype\\b"]
+    - name: educational
+      weight: 0.2
+      min_hits: 2
+      patterns:
+        - "(?i)this (code|function|method|query|snippet)"
+        - "(?i)(returns|produces|creates|generates|outputs)"
+        - "(?i)(means|indicates|represents|is used to)"
+        - "(?i)(because|since|therefore|so that)"
+        - "(?i)(for example|such as|like|e\\.g\\.)"
+    - name: no_errors
+      weight: 0.2
+      max_hits: 0
+      patterns:
+        - "(?i)i don'?t know"
+        - "(?i)i cannot (explain|understand|help)"
+        - "(?i)error occurred"
+        - "(?i)unable to (process|analyze|explain)"
+        - "(?i)not sure what"
+        - "(?i)invalid (code|syntax|input)"
+`
+
+func newExplanationQualityGrader(t *testing.T) Grader {
+	var cfg models.GraderConfig
+	require.NoError(t, yaml.Unmarshal([]byte(explanationQualityYAML), &cfg))
+
+	g, err := Create(Type(cfg.Kind), cfg.Identifier, cfg.Parameters)
+	require.NoError(t, err)
+	require.Equal(t, TypeWeightedPatterns, g.Type())
+	return g
+}
+
+func gradeWithLanguage(t *testing.T, g Grader, output string, language string) *models.GraderResults {
+	tc := &models.TestCase{}
+	if language != "" {
+		tc.Stimulus.Metadata = map[string]any{"language": language}
+	}
+
+	results, err := g.Grade(context.Background(), &Context{Output: output, TestCase: tc})
+	require.NoError(t, err)
+	return results
+}
+
+func criterionDetail(t *testing.T, results *models.GraderResults, name string) map[string]any {
+	criteria, ok := results.Details["criteria"].([]map[string]any)
+	require.True(t, ok)
+	for _, c := range criteria {
+		if c["name"] == name {
+			return c
+		}
+	}
+	require.Failf(t, "criterion not found", "%s", name)
+	return nil
+}
+
+func TestWeightedPatternsGrader(t *testing.T) {
+	g := newExplanationQualityGrader(t)
+
+	good := "Overview: this function returns the sum because it loops. " +
+		"Step by step, the python def walks the list. " + strings.Repeat("More detail. ", 15)
+
+	t.Run("all criteria pass", func(t *testing.T) {
+		results := gradeWithLanguage(t, g, good, "python")
+		require.True(t, results.Passed, results.Feedback)
+		require.Equal(t, 1.0, results.Score)
+
+		lang := criterionDetail(t, results, "language")
+		require.Equal(t, false, lang["skipped"])
+		require.Equal(t, 2, lang["hits"])
+	})
+
+	t.Run("variant picked by task context", func(t *testing.T) {
+		results := gradeWithLanguage(t, g, good, "sql")
+		require.True(t, results.Passed)
+		require.InDelta(t, 0.8, results.Score, 1e-9)
+		require.Equal(t, false, criterionDetail(t, results, "language")["passed"])
+	})
+
+	t.Run("unknown language is credited", func(t *testing.T) {
+		for _, language := range []string{"", "cobol"} {
+			results := gradeWithLanguage(t, g, good, language)
+			require.Equal(t, 1.0, results.Score)
+			require.Equal(t, true, criterionDetail(t, results, "language")["skipped"])
+		}
+	})
+
+	t.Run("threshold", func(t *testing.T) {
+		// short, unstructured and apologetic: only language and educational pass
+		results := gradeWithLanguage(t, g, "I don't know. This code returns x because python.", "python")
+		require.False(t, results.Passed)
+		require.InDelta(t, 0.4, results.Score, 1e-9)
+		require.Contains(t, results.Feedback, "length: output too short")
+		require.Contains(t, results.Feedback, "no_errors: 1 pattern(s) matched, at most 0 allowed")
+
+		// exactly at the threshold passes despite float error in the weights
+		results = gradeWithLanguage(t, g, "python "+strings.Repeat("Filler. ", 30), "python")
+		require.InDelta(t, 0.6, results.Score, 1e-9)
+		require.True(t, results.Passed)
+	})
+}
+
+func TestWeightedPatternsGrader_Config(t *testing.T) {
+	minHits := 1
+
+	_, err := NewWeightedPatternsGrader("empty", nil, 0)
+	require.ErrorContains(t, err, "has no criteria")
+
+	_, err = NewWeightedPatternsGrader("bad", []WeightedCriterion{
+		{Name: "broken", Patterns: []string{"("}},
+	}, 0)
+	require.ErrorContains(t, err, "invalid regex pattern")
+
+	_, err = NewWeightedPatternsGrader("nothing", []WeightedCriterion{{Name: "nothing"}}, 0)
+	require.ErrorContains(t, err, "needs patterns, variants or min_length")
+
+	_, err = NewWeightedPatternsGrader("variants", []WeightedCriterion{
+		{Name: "lang", Variants: map[string][]string{"go": {"func"}}},
+	}, 0)
+	require.ErrorContains(t, err, "no select key")
+
+	// weights default to 1 and the threshold defaults to every criterion passing
+	g, err := NewWeightedPatternsGrader("defaults", []WeightedCriterion{
+		{Name: "a", Patterns: []string{"alpha"}, MinHits: &minHits},
+		{Name: "b", Patterns: []string{"beta"}},
+	}, 0)
+	require.NoError(t, err)
+
+	results, err := g.Grade(context.Background(), &Context{Output: "alpha"})
+	require.NoError(t, err)
+	require.Equal(t, 0.5, results.Score)
+	require.False(t, results.Passed)
+
+	// an explicit weight of 0 reports a criterion without scoring it
+	zero := 0.0
+	g, err = NewWeightedPatternsGrader("informational", []WeightedCriterion{
+		{Name: "a", Patterns: []string{"alpha"}},
+		{Name: "b", Patterns: []string{"beta"}, Weight: &zero},
+	}, 0)
+	require.NoError(t, err)
+
+	results, err = g.Grade(context.Background(), &Context{Output: "alpha"})
+	require.NoError(t, err)
+	require.Equal(t, 1.0, results.Score)
+	require.True(t, results.Passed)
+
+	_, err = NewWeightedPatternsGrader("unweighted", []WeightedCriterion{
+		{Name: "b", Patterns: []string{"beta"}, Weight: &zero},
+	}, 0)
+	require.ErrorContains(t, err, "no criterion with a weight above 0")
+}
+
+func TestWeightedPatternsGrader_MinLengthCountsCharacters(t *testing.T) {
+	g, err := NewWeightedPatternsGrader("length", []WeightedCriterion{{Name: "long", MinLength: 5}}, 0)
+	require.NoError(t, err)
+
+	// 4 characters, 12 bytes
+	results, err := g.Grade(context.Background(), &Context{Output: "日本語。"})
+	require.NoError(t, err)
+	require.False(t, results.Passed)
+	require.Contains(t, results.Feedback, "output too short (4 < 5 characters)")
+
+	results, err = g.Grade(context.Background(), &Context{Output: "日本語です。"})
+	require.NoError(t, err)
+	require.True(t, results.Passed)
+}
@@ -1,6 +1,9 @@
 package models
 
-import "time"
+import (
+	"fmt"
+	"time"
+)
 
 // EvaluationOutcome represents the complete result of an evaluation run
 type EvaluationOutcome struct {
@@ -15,6 +18,34 @@ type EvaluationOutcome struct {
 	Metadata     map[string]any           `json:"metadata,omitempty"`
 }
 
+// MatrixOutcome is the result of running one benchmark against several
+// models. Each model gets a complete outcome of its own; Comparisons pairs
+// every model with the first one.
+type MatrixOutcome struct {
+	Models      []string             `json:"models"`
+	Outcomes    []*EvaluationOutcome `json:"outcomes"`
+	Comparisons []ModelComparison    `json:"comparisons"`
+}
+
+// ModelComparison compares a candidate model against the baseline over the
+// tests both of them ran. Score differences are candidate minus baseline,
+// paired by test.
+type ModelComparison struct {
+	Baseline      string  `json:"baseline"`
+	Candidate     string  `json:"candidate"`
+	Tests         int     `json:"tests"`
+	Wins          int     `json:"wins"`
+	Losses        int     `json:"losses"`
+	Ties          int     `json:"ties"`
+	PassRateDiff  float64 `json:"pass_rate_diff"`
+	ScoreDiff     float64 `json:"score_diff"`
+	ScoreDiffLow  float64 `json:"score_diff_low"`
+	ScoreDiffHigh float64 `json:"score_diff_high"`
+	// PValue is the chance of a score difference at least this large if
+	// the models were equally good
+	PValue float64 `json:"p_value"`
+}
+
 type OutcomeSetup struct {
 	RunsPerTest int    `json:"runs_per_test"`
 	ModelID     string `json:"model_id"`
@@ -31,6 +62,45 @@ type OutcomeDigest struct {
 	SuccessRate    float64 `json:"success_rate"`
 	AggregateScore float64 `json:"aggregate_score"`
 	DurationMs     int64   `json:"duration_ms"`
+	// Schedule is set for concurrent runs scheduled from earlier runs'
+	// durations
+	Schedule *ScheduleDigest `json:"schedule,omitempty"`
+	// RateLimit is set for runs with a rate_limit; a matrix's models share it
+	RateLimit *RateLimitDigest `json:"rate_limit,omitempty"`
+	// GraderCache counts memoized grader results reused and computed; a
+	// matrix's models share it
+	GraderCache *GraderCacheDigest `json:"grader_cache,omitempty"`
+}
+
+// GraderCacheDigest counts lookups of memoized grader results
+type GraderCacheDigest struct {
+	Hits   int `json:"hits"`
+	Misses int `json:"misses"`
+}
+
+// RateLimitDigest reports how a rate-limited run was paced
+type RateLimitDigest struct {
+	// Throttled counts sessions rejected as rate limited, Retried those of
+	// them that were run again
+	Throttled int `json:"throttled"`
+	Retried   int `json:"retried"`
+	TimedOut  int `json:"timed_out"`
+	// Concurrency is the sessions-in-flight window at the end of the run, and
+	// Min and MaxConcurrency the range it moved in
+	Concurrency    int `json:"concurrency"`
+	MinConcurrency int `json:"min_concurrency"`
+	MaxConcurrency int `json:"max_concurrency"`
+}
+
+// ScheduleDigest compares the wall time a concurrent run's trials were
+// predicted to take, from earlier runs' durations, with what they took
+type ScheduleDigest struct {
+	Workers int `json:"workers"`
+	// KnownTests is how many tests had recorded durations; the others were
+	// predicted to take the mean of those
+	KnownTests  int   `json:"known_tests"`
+	PredictedMs int64 `json:"predicted_makespan_ms"`
+	ActualMs    int64 `json:"actual_makespan_ms"`
 }
 
 type MeasureResult struct {
@@ -49,6 +119,7 @@ type TestOutcome struct {
 	Status      string      `json:"status"`
 	Runs        []RunResult `json:"runs"`
 	Stats       *TestStats  `json:"stats,omitempty"`
+	Weight      float64     `json:"weight,omitempty"`
 }
 
 // RunResult is the result of a single run/trial
@@ -61,6 +132,20 @@ type RunResult struct {
 	Transcript    []TranscriptEntry        `json:"transcript,omitempty"`
 	FinalOutput   string                   `json:"final_output"`
 	ErrorMsg      string                   `json:"error_msg,omitempty"`
+	// BudgetViolation is set when the session was ended for exceeding one
+	// of the test's behavior budgets
+	BudgetViolation *BudgetViolation `json:"budget_violation,omitempty"`
+}
+
+// BudgetViolation records the behavior budget that ended a session early
+type BudgetViolation struct {
+	Budget string `json:"budget"`
+	Limit  int64  `json:"limit"`
+	Actual int64  `json:"actual"`
+}
+
+func (v *BudgetViolation) String() string {
+	return fmt.Sprintf("budget exceeded: %s %d > %d", v.Budget, v.Actual, v.Limit)
 }
 
 type GraderResults struct {
@@ -71,6 +156,9 @@ type GraderResults struct {
 	Feedback   string         `json:"feedback"`
 	Details    map[string]any `json:"details,omitempty"`
 	DurationMs int64          `json:"duration_ms"`
+	// Cached is set when the result was reused from an earlier run with the
+	// same output
+	Cached bool `json:"cached,omitempty"`
 }
 
 type SessionDigest struct {
@@ -91,7 +179,11 @@ type TranscriptEntry struct {
 }
 
 type TestStats struct {
-	PassRate      float64 `json:"pass_rate"`
+	PassRate float64 `json:"pass_rate"`
+	// PassRateLow and PassRateHigh bound the pass rate with a 95% Wilson
+	// score interval
+	PassRateLow   float64 `json:"pass_rate_low"`
+	PassRateHigh  float64 `json:"pass_rate_high"`
 	AvgScore      float64 `json:"avg_score"`
 	MinScore      float64 `json:"min_score"`
 	MaxScore      float64 `json:"max_score"`
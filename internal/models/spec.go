@@ -28,15 +28,99 @@ type SpecIdentity struct {
 
 // Config controls execution behavior
 type Config struct {
-	RunsPerTest   int            `yaml:"trials_per_task" json:"runs_per_test"`
-	TimeoutSec    int            `yaml:"timeout_seconds" json:"timeout_sec"`
-	Concurrent    bool           `yaml:"parallel" json:"concurrent"`
-	Workers       int            `yaml:"max_workers,omitempty" json:"workers,omitempty"`
-	StopOnError   bool           `yaml:"fail_fast,omitempty" json:"stop_on_error,omitempty"`
-	EngineType    string         `yaml:"executor" json:"engine_type"`
-	ModelID       string         `yaml:"model" json:"model_id"`
+	RunsPerTest   int  `yaml:"trials_per_task" json:"runs_per_test"`
+	TimeoutSec    int  `yaml:"timeout_seconds" json:"timeout_sec"`
+	Concurrent    bool `yaml:"parallel" json:"concurrent"`
+	Workers       int  `yaml:"max_workers,omitempty" json:"workers,omitempty"`
+	GraderWorkers int  `yaml:"grader_workers,omitempty" json:"grader_workers,omitempty"`
+	// GraderCache bounds the memoized grader results kept per benchmark;
+	// 0 means the default and a negative value turns memoization off
+	GraderCache int    `yaml:"grader_cache,omitempty" json:"grader_cache,omitempty"`
+	StopOnError bool   `yaml:"fail_fast,omitempty" json:"stop_on_error,omitempty"`
+	EngineType  string `yaml:"executor" json:"engine_type"`
+	ModelID     string `yaml:"model" json:"model_id"`
+	// Models runs the benchmark against each listed model in one invocation,
+	// instead of ModelID
+	Models        []ModelTarget  `yaml:"models,omitempty" json:"models,omitempty"`
 	SkillPaths    []string       `yaml:"skill_directories,omitempty" json:"skill_paths,omitempty"`
 	ServerConfigs map[string]any `yaml:"mcp_servers,omitempty" json:"server_configs,omitempty"`
+	Mock          *MockConfig    `yaml:"mock,omitempty" json:"mock,omitempty"`
+	// RateLimit paces engine calls across all workers and models
+	RateLimit *RateLimitConfig `yaml:"rate_limit,omitempty" json:"rate_limit,omitempty"`
+}
+
+// RateLimitConfig paces the sessions of a benchmark. Zero values are
+// unlimited.
+type RateLimitConfig struct {
+	// Adaptive starts at max_workers sessions in flight and grows while
+	// latency holds steady, up to MaxConcurrency, backing off on throttling
+	// and timeouts
+	Adaptive       bool `yaml:"adaptive,omitempty" json:"adaptive,omitempty"`
+	MaxConcurrency int  `yaml:"max_concurrency,omitempty" json:"max_concurrency,omitempty"`
+	// RequestsPerMinute and TokensPerMinute are token buckets shared by all
+	// sessions
+	RequestsPerMinute int `yaml:"requests_per_minute,omitempty" json:"requests_per_minute,omitempty"`
+	TokensPerMinute   int `yaml:"tokens_per_minute,omitempty" json:"tokens_per_minute,omitempty"`
+	// MaxRetries is how often a throttled session is retried before it counts
+	// as an error; nil means 3
+	MaxRetries *int `yaml:"max_retries,omitempty" json:"max_retries,omitempty"`
+}
+
+// ModelTarget is one model of a multi-model run. In YAML it is either a
+// plain model name or a mapping with a concurrency cap.
+type ModelTarget struct {
+	ID string `yaml:"id" json:"id"`
+	// Workers caps this model's trials in flight, on top of max_workers
+	Workers int `yaml:"max_workers,omitempty" json:"workers,omitempty"`
+}
+
+// UnmarshalYAML accepts a bare model name as well as the mapping form
+func (m *ModelTarget) UnmarshalYAML(value *yaml.Node) error {
+	if value.Kind == yaml.ScalarNode {
+		m.ID = value.Value
+		return nil
+	}
+
+	type plain ModelTarget
+	return value.Decode((*plain)(m))
+}
+
+// MockConfig shapes the responses produced by the mock executor so that
+// concurrency, timeouts and transcript-heavy grading can be exercised offline
+type MockConfig struct {
+	Seed        int64          `yaml:"seed,omitempty" json:"seed,omitempty"`
+	Latency     MockLatency    `yaml:"latency,omitempty" json:"latency,omitempty"`
+	Output      string         `yaml:"output,omitempty" json:"output,omitempty"`
+	DeltaChunks int            `yaml:"delta_chunks,omitempty" json:"delta_chunks,omitempty"`
+	ToolCalls   []MockToolCall `yaml:"tool_calls,omitempty" json:"tool_calls,omitempty"`
+	ErrorRate   float64        `yaml:"error_rate,omitempty" json:"error_rate,omitempty"`
+	TimeoutRate float64        `yaml:"timeout_rate,omitempty" json:"timeout_rate,omitempty"`
+	// ThrottleRate is the share of sessions rejected at once as rate limited
+	ThrottleRate float64 `yaml:"throttle_rate,omitempty" json:"throttle_rate,omitempty"`
+}
+
+// MockLatency describes the distribution a mock response time is drawn from
+type MockLatency struct {
+	Distribution string  `yaml:"distribution,omitempty" json:"distribution,omitempty"`
+	MeanMs       float64 `yaml:"mean_ms,omitempty" json:"mean_ms,omitempty"`
+	StdDevMs     float64 `yaml:"stddev_ms,omitempty" json:"stddev_ms,omitempty"`
+	MinMs        float64 `yaml:"min_ms,omitempty" json:"min_ms,omitempty"`
+	MaxMs        float64 `yaml:"max_ms,omitempty" json:"max_ms,omitempty"`
+}
+
+// Latency distributions understood by the mock executor
+const (
+	LatencyFixed     = "fixed"
+	LatencyUniform   = "uniform"
+	LatencyNormal    = "normal"
+	LatencyLogNormal = "lognormal"
+)
+
+// MockToolCall is a tool invocation the mock executor replays in its event stream
+type MockToolCall struct {
+	Name      string         `yaml:"name" json:"name"`
+	Arguments map[string]any `yaml:"arguments,omitempty" json:"arguments,omitempty"`
+	Count     int            `yaml:"count,omitempty" json:"count,omitempty"`
 }
 
 // GraderConfig defines a validator/grader
@@ -47,6 +131,9 @@ type GraderConfig struct {
 	Rubric     string         `yaml:"rubric,omitempty" json:"rubric,omitempty"`
 	ModelID    string         `yaml:"model,omitempty" json:"model_id,omitempty"`
 	Parameters map[string]any `yaml:"config,omitempty" json:"parameters,omitempty"`
+	// Memoize overrides whether results are reused for identical outputs;
+	// by default they are for every type but script
+	Memoize *bool `yaml:"memoize,omitempty" json:"memoize,omitempty"`
 }
 
 // MeasurementDef defines a metric
@@ -54,8 +141,13 @@ type MeasurementDef struct {
 	Identifier string  `yaml:"name" json:"identifier"`
 	Weight     float64 `yaml:"weight" json:"weight"`
 	Cutoff     float64 `yaml:"threshold" json:"cutoff"`
-	Enabled    bool    `yaml:"enabled,omitempty" json:"enabled,omitempty"`
-	Desc       string  `yaml:"description,omitempty" json:"desc,omitempty"`
+	// Enabled set to false leaves the metric out; it is on when omitted
+	Enabled *bool  `yaml:"enabled,omitempty" json:"enabled,omitempty"`
+	Desc    string `yaml:"description,omitempty" json:"desc,omitempty"`
+	// Graders whose mean score is the metric's value. Without it, built-in
+	// metrics are computed from trial status and others from the grader
+	// with the metric's name.
+	Graders []string `yaml:"graders,omitempty" json:"graders,omitempty"`
 }
 
 // LoadBenchmarkSpec loads a spec from a YAML file
@@ -86,6 +178,49 @@ func (s *BenchmarkSpec) Validate() error {
 	if s.Config.TimeoutSec < 1 {
 		return fmt.Errorf("timeout_seconds must be at least 1, got %d", s.Config.TimeoutSec)
 	}
+	if s.Config.GraderWorkers < 0 {
+		return fmt.Errorf("grader_workers must not be negative, got %d", s.Config.GraderWorkers)
+	}
+	if s.Config.Mock != nil {
+		if err := s.Config.Mock.Validate(); err != nil {
+			return fmt.Errorf("mock: %w", err)
+		}
+	}
+	return nil
+}
+
+// Validate checks that the mock configuration is usable
+func (m *MockConfig) Validate() error {
+	if m.ErrorRate < 0 || m.ErrorRate > 1 {
+		return fmt.Errorf("error_rate must be between 0 and 1, got %g", m.ErrorRate)
+	}
+	if m.TimeoutRate < 0 || m.TimeoutRate > 1 {
+		return fmt.Errorf("timeout_rate must be between 0 and 1, got %g", m.TimeoutRate)
+	}
+	if m.ErrorRate+m.TimeoutRate > 1 {
+		return fmt.Errorf("error_rate + timeout_rate must not exceed 1, got %g", m.ErrorRate+m.TimeoutRate)
+	}
+	if m.DeltaChunks < 0 {
+		return fmt.Errorf("delta_chunks must not be negative, got %d", m.DeltaChunks)
+	}
+
+	switch m.Latency.Distribution {
+	case "", LatencyFixed, LatencyUniform, LatencyNormal, LatencyLogNormal:
+	default:
+		return fmt.Errorf("unknown latency distribution '%s'", m.Latency.Distribution)
+	}
+	if m.Latency.MeanMs < 0 || m.Latency.StdDevMs < 0 || m.Latency.MinMs < 0 || m.Latency.MaxMs < 0 {
+		return fmt.Errorf("latency values must not be negative")
+	}
+	if m.Latency.MaxMs > 0 && m.Latency.MinMs > m.Latency.MaxMs {
+		return fmt.Errorf("latency min_ms (%g) is greater than max_ms (%g)", m.Latency.MinMs, m.Latency.MaxMs)
+	}
+
+	for _, tc := range m.ToolCalls {
+		if tc.Name == "" {
+			return fmt.Errorf("tool_calls entries must have a name")
+		}
+	}
 	return nil
 }
 
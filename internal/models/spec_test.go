@@ -110,3 +110,87 @@ config:
 		t.Errorf("Expected engine='mock', got '%s'", spec.Config.EngineType)
 	}
 }
+
+func TestBenchmarkSpec_MockConfig(t *testing.T) {
+	tempDir := t.TempDir()
+	yamlContent := `name: mock-load
+skill: test
+config:
+  trials_per_task: 1
+  timeout_seconds: 30
+  executor: mock
+  mock:
+    seed: 7
+    latency:
+      distribution: lognormal
+      mean_ms: 800
+      stddev_ms: 300
+    delta_chunks: 8
+    tool_calls:
+      - name: bash
+        arguments:
+          command: ls
+        count: 5
+    error_rate: 0.05
+    timeout_rate: 0.01
+`
+	specPath := filepath.Join(tempDir, "mock.yaml")
+	if err := os.WriteFile(specPath, []byte(yamlContent), 0644); err != nil {
+		t.Fatalf("Failed to write spec file: %v", err)
+	}
+
+	spec, err := LoadBenchmarkSpec(specPath)
+	if err != nil {
+		t.Fatalf("Failed to load spec: %v", err)
+	}
+
+	mock := spec.Config.Mock
+	if mock == nil {
+		t.Fatal("Expected mock config to be loaded")
+	}
+	if mock.Latency.Distribution != LatencyLogNormal || mock.Latency.MeanMs != 800 {
+		t.Errorf("Unexpected latency config: %+v", mock.Latency)
+	}
+	if len(mock.ToolCalls) != 1 || mock.ToolCalls[0].Count != 5 {
+		t.Errorf("Unexpected tool calls: %+v", mock.ToolCalls)
+	}
+
+	mock.ErrorRate = 1.5
+	if err := spec.Validate(); err == nil {
+		t.Error("Expected error_rate > 1 to fail validation")
+	}
+}
+
+func TestBenchmarkSpec_LoadModels(t *testing.T) {
+	tempDir := t.TempDir()
+	yamlContent := `name: matrix
+skill: test-skill
+config:
+  trials_per_task: 1
+  timeout_seconds: 60
+  executor: mock
+  models:
+    - gpt-4o
+    - id: claude-sonnet-4
+      max_workers: 2
+`
+	specPath := filepath.Join(tempDir, "spec.yaml")
+	if err := os.WriteFile(specPath, []byte(yamlContent), 0644); err != nil {
+		t.Fatalf("Failed to write spec file: %v", err)
+	}
+
+	spec, err := LoadBenchmarkSpec(specPath)
+	if err != nil {
+		t.Fatalf("Failed to load spec: %v", err)
+	}
+
+	want := []ModelTarget{{ID: "gpt-4o"}, {ID: "claude-sonnet-4", Workers: 2}}
+	if len(spec.Config.Models) != len(want) {
+		t.Fatalf("Expected %d models, got %d", len(want), len(spec.Config.Models))
+	}
+	for i, m := range spec.Config.Models {
+		if m != want[i] {
+			t.Errorf("Expected model %d to be %+v, got %+v", i, want[i], m)
+		}
+	}
+}
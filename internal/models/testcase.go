@@ -18,6 +18,9 @@ type TestCase struct {
 	Active      *bool             `yaml:"enabled,omitempty" json:"active,omitempty"`
 	TimeoutSec  *int              `yaml:"timeout_seconds,omitempty" json:"timeout_sec,omitempty"`
 	ContextRoot string            `yaml:"context_dir,omitempty" json:"context_root,omitempty"`
+	// Weight is how much the test counts towards the aggregate score, e.g.
+	// the number of production sessions it stands for; 0 counts as 1
+	Weight float64 `yaml:"weight,omitempty" json:"weight,omitempty"`
 }
 
 // TestStimulus defines the input for a test
@@ -53,6 +56,7 @@ type BehaviorRules struct {
 	MaxToolInvocations int      `yaml:"max_tool_calls,omitempty" json:"max_tool_invocations,omitempty"`
 	MaxRounds          int      `yaml:"max_iterations,omitempty" json:"max_rounds,omitempty"`
 	MaxTokens          int      `yaml:"max_tokens,omitempty" json:"max_tokens,omitempty"`
+	MaxResponseTimeMs  int      `yaml:"max_response_time_ms,omitempty" json:"max_response_time_ms,omitempty"`
 	MustUseTool        []string `yaml:"required_tools,omitempty" json:"must_use_tool,omitempty"`
 	ForbidTool         []string `yaml:"forbidden_tools,omitempty" json:"forbid_tool,omitempty"`
 }
@@ -65,6 +69,8 @@ type ValidatorInline struct {
 	Rubric     string         `yaml:"rubric,omitempty" json:"rubric,omitempty"`
 	Weight     float64        `yaml:"weight,omitempty" json:"weight,omitempty"`
 	Parameters map[string]any `yaml:"config,omitempty" json:"parameters,omitempty"`
+	// Memoize is as for spec graders
+	Memoize *bool `yaml:"memoize,omitempty" json:"memoize,omitempty"`
 }
 
 // LoadTestCase loads a test case from YAML
@@ -0,0 +1,75 @@
+package models
+
+import (
+	"fmt"
+	"os"
+
+	"gopkg.in/yaml.v3"
+)
+
+// TriggerSuite lists prompts that should and should not make an agent
+// activate a skill
+type TriggerSuite struct {
+	Skill            string          `yaml:"skill" json:"skill"`
+	ShouldTrigger    []TriggerPrompt `yaml:"should_trigger_prompts" json:"should_trigger_prompts"`
+	ShouldNotTrigger []TriggerPrompt `yaml:"should_not_trigger_prompts" json:"should_not_trigger_prompts"`
+}
+
+// TriggerPrompt is one prompt of a trigger suite
+type TriggerPrompt struct {
+	Prompt string `yaml:"prompt" json:"prompt"`
+	Reason string `yaml:"reason,omitempty" json:"reason,omitempty"`
+	// Confidence is how clear-cut the prompt is: high, medium or low
+	Confidence string `yaml:"confidence,omitempty" json:"confidence,omitempty"`
+}
+
+// LoadTriggerSuite loads a trigger suite from YAML
+func LoadTriggerSuite(path string) (*TriggerSuite, error) {
+	data, err := os.ReadFile(path)
+	if err != nil {
+		return nil, err
+	}
+
+	var suite TriggerSuite
+	if err := yaml.Unmarshal(data, &suite); err != nil {
+		return nil, err
+	}
+	if suite.Skill == "" {
+		return nil, fmt.Errorf("%s: trigger suite has no skill", path)
+	}
+	return &suite, nil
+}
+
+// TriggerResult is the outcome of one trigger prompt
+type TriggerResult struct {
+	Prompt     string `json:"prompt"`
+	Confidence string `json:"confidence,omitempty"`
+	// Expected is whether the prompt should activate the skill, Triggered
+	// whether it did
+	Expected   bool   `json:"expected"`
+	Triggered  bool   `json:"triggered"`
+	DurationMs int64  `json:"duration_ms"`
+	ErrorMsg   string `json:"error_msg,omitempty"`
+}
+
+// Correct reports whether the skill was activated as expected
+func (r TriggerResult) Correct() bool {
+	return r.ErrorMsg == "" && r.Expected == r.Triggered
+}
+
+// TriggerReport summarizes a trigger suite's results. Prompts that errored
+// before activation was known count towards Errors only.
+type TriggerReport struct {
+	Skill          string          `json:"skill"`
+	TruePositives  int             `json:"true_positives"`
+	FalsePositives int             `json:"false_positives"`
+	TrueNegatives  int             `json:"true_negatives"`
+	FalseNegatives int             `json:"false_negatives"`
+	Errors         int             `json:"errors"`
+	Precision      float64         `json:"precision"`
+	Recall         float64         `json:"recall"`
+	F1             float64         `json:"f1"`
+	Accuracy       float64         `json:"accuracy"`
+	DurationMs     int64           `json:"duration_ms"`
+	Results        []TriggerResult `json:"results"`
+}
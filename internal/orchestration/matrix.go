@@ -0,0 +1,224 @@
+package orchestration
+
+import (
+	"context"
+	"fmt"
+	"math"
+	"strings"
+	"time"
+
+	"github.com/spboyer/waza/internal/models"
+	"github.com/spboyer/waza/internal/stats"
+)
+
+// RunMatrix runs the benchmark against every model in the spec's models
+// list. Test cases, resource files and graders are loaded once and shared by
+// all models, whose trials run side by side on one scheduler. Engines come
+// from the runner's EngineFactory.
+func (r *TestRunner) RunMatrix(ctx context.Context) (*models.MatrixOutcome, error) {
+	startTime := time.Now()
+
+	targets, err := r.modelRuns()
+	if err != nil {
+		return nil, err
+	}
+
+	testCases, err := r.Preflight(ctx)
+	if err != nil {
+		return nil, err
+	}
+
+	for i, target := range targets {
+		if err := target.engine.Initialize(ctx); err != nil {
+			shutdownEngines(ctx, targets[:i])
+			return nil, fmt.Errorf("failed to initialize engine for %s: %w", target.model, err)
+		}
+	}
+	defer shutdownEngines(ctx, targets)
+
+	cleanup := r.prepare(testCases)
+	defer cleanup()
+
+	r.notifyProgress(ProgressEvent{
+		EventType:  EventBenchmarkStart,
+		TotalTests: len(testCases),
+	})
+
+	// without parallel, trials of all models run one at a time
+	workers := 1
+	if r.cfg.Spec().Config.Concurrent {
+		workers = r.parallelWorkers()
+	}
+
+	runs := r.runMatrixTrials(ctx, testCases, targets, workers)
+
+	matrix := &models.MatrixOutcome{}
+	for m, target := range targets {
+		testOutcomes := make([]models.TestOutcome, len(testCases))
+		for i, tc := range testCases {
+			testOutcomes[i] = r.buildTestOutcome(tc, runs[m][i])
+		}
+
+		outcome := r.buildOutcome(testOutcomes, startTime, target.model)
+		// the models of one matrix start in the same second
+		outcome.RunID += "-" + runIDSuffix(target.model)
+
+		matrix.Models = append(matrix.Models, target.model)
+		matrix.Outcomes = append(matrix.Outcomes, outcome)
+	}
+	matrix.Comparisons = compareModels(matrix.Outcomes)
+
+	r.notifyProgress(ProgressEvent{
+		EventType:  EventBenchmarkComplete,
+		DurationMs: time.Since(startTime).Milliseconds(),
+	})
+
+	return matrix, nil
+}
+
+// modelRuns creates an engine for every model of the spec's matrix
+func (r *TestRunner) modelRuns() ([]*modelRun, error) {
+	spec := r.cfg.Spec()
+	if len(spec.Config.Models) == 0 {
+		return nil, fmt.Errorf("spec does not list any models")
+	}
+	if r.newEngine == nil {
+		return nil, fmt.Errorf("multi-model runs need an engine factory")
+	}
+
+	seen := make(map[string]bool, len(spec.Config.Models))
+	targets := make([]*modelRun, 0, len(spec.Config.Models))
+
+	for _, m := range spec.Config.Models {
+		if m.ID == "" {
+			return nil, fmt.Errorf("models entry without an id")
+		}
+		if seen[m.ID] {
+			return nil, fmt.Errorf("model %s is listed more than once", m.ID)
+		}
+		seen[m.ID] = true
+
+		engine, err := r.newEngine(m.ID)
+		if err != nil {
+			return nil, fmt.Errorf("failed to create engine for %s: %w", m.ID, err)
+		}
+
+		targets = append(targets, &modelRun{
+			model:   m.ID,
+			engine:  engine,
+			workers: m.Workers,
+			label:   m.ID,
+		})
+	}
+
+	return targets, nil
+}
+
+// runMatrixTrials runs every trial of every model and returns the runs
+// indexed by model, then test
+func (r *TestRunner) runMatrixTrials(ctx context.Context, testCases []*models.TestCase, targets []*modelRun, workers int) [][][]models.RunResult {
+	runsPerTest := r.cfg.Spec().Config.RunsPerTest
+
+	runs := make([][][]models.RunResult, len(targets))
+	for m := range runs {
+		runs[m] = make([][]models.RunResult, len(testCases))
+	}
+
+	for res := range r.streamTrials(ctx, testCases, targets, workers) {
+		testRuns := append(runs[res.ModelIndex][res.TestIndex], res.Run)
+		runs[res.ModelIndex][res.TestIndex] = testRuns
+
+		if len(testRuns) == runsPerTest {
+			outcome := r.buildTestOutcome(res.TestCase, testRuns)
+			r.notifyProgress(ProgressEvent{
+				EventType:  EventTestComplete,
+				Model:      res.Model,
+				TestName:   res.TestCase.DisplayName,
+				TestNum:    res.TestIndex + 1,
+				TotalTests: len(testCases),
+				Status:     outcome.Status,
+			})
+		}
+	}
+
+	return runs
+}
+
+func shutdownEngines(ctx context.Context, targets []*modelRun) {
+	for _, target := range targets {
+		if err := target.engine.Shutdown(ctx); err != nil {
+			fmt.Printf("warning: failed to shutdown engine for %s: %v\n", target.model, err)
+		}
+	}
+}
+
+// compareModels compares every outcome after the first against the first
+func compareModels(outcomes []*models.EvaluationOutcome) []models.ModelComparison {
+	if len(outcomes) < 2 {
+		return nil
+	}
+
+	comparisons := make([]models.ModelComparison, 0, len(outcomes)-1)
+	for _, candidate := range outcomes[1:] {
+		comparisons = append(comparisons, compareOutcomes(outcomes[0], candidate))
+	}
+	return comparisons
+}
+
+// compareOutcomes pairs the average scores of the tests both outcomes ran
+func compareOutcomes(baseline, candidate *models.EvaluationOutcome) models.ModelComparison {
+	baseScores := make(map[string]float64, len(baseline.TestOutcomes))
+	for _, to := range baseline.TestOutcomes {
+		if to.Stats != nil {
+			baseScores[to.TestID] = to.Stats.AvgScore
+		}
+	}
+
+	comparison := models.ModelComparison{
+		Baseline:     baseline.Setup.ModelID,
+		Candidate:    candidate.Setup.ModelID,
+		PassRateDiff: candidate.Digest.SuccessRate - baseline.Digest.SuccessRate,
+	}
+
+	var candScores, pairedBase []float64
+	for _, to := range candidate.TestOutcomes {
+		base, ok := baseScores[to.TestID]
+		if !ok || to.Stats == nil {
+			continue
+		}
+		score := to.Stats.AvgScore
+		candScores = append(candScores, score)
+		pairedBase = append(pairedBase, base)
+
+		switch diff := score - base; {
+		case math.Abs(diff) < 1e-9:
+			comparison.Ties++
+		case diff > 0:
+			comparison.Wins++
+		default:
+			comparison.Losses++
+		}
+	}
+
+	paired := stats.Paired(candScores, pairedBase, stats.DefaultResamples, stats.DefaultConfidence, measureSeed)
+	comparison.Tests = paired.N
+	comparison.ScoreDiff = paired.MeanDiff
+	comparison.ScoreDiffLow = paired.Interval.Low
+	comparison.ScoreDiffHigh = paired.Interval.High
+	comparison.PValue = paired.PValue
+
+	return comparison
+}
+
+// runIDSuffix turns a model name into something safe to use in a run ID,
+// which the results store also uses as a file name
+func runIDSuffix(model string) string {
+	return strings.Map(func(c rune) rune {
+		switch {
+		case c >= 'a' && c <= 'z', c >= 'A' && c <= 'Z', c >= '0' && c <= '9', c == '.', c == '-', c == '_':
+			return c
+		default:
+			return '-'
+		}
+	}, model)
+}
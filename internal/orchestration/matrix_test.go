@@ -0,0 +1,139 @@
+package orchestration
+
+import (
+	"context"
+	"os"
+	"path/filepath"
+	"sync"
+	"testing"
+
+	"github.com/spboyer/waza/internal/config"
+	"github.com/spboyer/waza/internal/execution"
+	"github.com/spboyer/waza/internal/models"
+	"github.com/stretchr/testify/require"
+)
+
+func TestRunMatrix(t *testing.T) {
+	dir := t.TempDir()
+	for _, id := range []string{"one", "two", "three"} {
+		task := "id: " + id + "\nname: " + id + "\ninputs:\n  prompt: go\n"
+		require.NoError(t, os.WriteFile(filepath.Join(dir, id+".yaml"), []byte(task), 0644))
+	}
+
+	spec := &models.BenchmarkSpec{
+		SpecIdentity: models.SpecIdentity{Name: "matrix"},
+		SkillName:    "test-skill",
+		Config: models.Config{
+			RunsPerTest: 2,
+			TimeoutSec:  10,
+			Concurrent:  true,
+			Workers:     4,
+			EngineType:  "mock",
+			Models:      []models.ModelTarget{{ID: "good"}, {ID: "vendor/bad", Workers: 1}},
+		},
+		Graders: []models.GraderConfig{{
+			Kind:       "regex",
+			Identifier: "says_done",
+			Parameters: map[string]any{"must_match": []string{"done"}},
+		}},
+		Tasks: []string{"*.yaml"},
+	}
+
+	var created []string
+	factory := func(modelID string) (execution.AgentEngine, error) {
+		created = append(created, modelID)
+		output := "done"
+		if modelID == "vendor/bad" {
+			output = "gave up"
+		}
+		return execution.NewMockEngine(modelID, execution.WithMockConfig(&models.MockConfig{Output: output})), nil
+	}
+
+	runner := NewTestRunner(config.NewBenchmarkConfig(spec, config.WithSpecDir(dir)), nil, WithEngineFactory(factory))
+
+	var mu sync.Mutex
+	completed := map[string]int{}
+	runner.OnProgress(func(event ProgressEvent) {
+		if event.EventType == EventTestComplete {
+			mu.Lock()
+			completed[event.Model]++
+			mu.Unlock()
+		}
+	})
+
+	matrix, err := runner.RunMatrix(context.Background())
+	require.NoError(t, err)
+
+	require.Equal(t, []string{"good", "vendor/bad"}, created)
+	require.Equal(t, []string{"good", "vendor/bad"}, matrix.Models)
+	require.Equal(t, map[string]int{"good": 3, "vendor/bad": 3}, completed)
+
+	good, bad := matrix.Outcomes[0], matrix.Outcomes[1]
+	require.Equal(t, "good", good.Setup.ModelID)
+	require.Equal(t, 1.0, good.Digest.SuccessRate)
+	require.Equal(t, "vendor/bad", bad.Setup.ModelID)
+	require.Equal(t, 0.0, bad.Digest.SuccessRate)
+	require.NotEqual(t, good.RunID, bad.RunID)
+	require.Contains(t, bad.RunID, "vendor-bad")
+
+	for _, to := range bad.TestOutcomes {
+		require.Len(t, to.Runs, 2)
+	}
+
+	require.Len(t, matrix.Comparisons, 1)
+	c := matrix.Comparisons[0]
+	require.Equal(t, "good", c.Baseline)
+	require.Equal(t, "vendor/bad", c.Candidate)
+	require.Equal(t, 3, c.Tests)
+	require.Equal(t, 3, c.Losses)
+	require.Equal(t, -1.0, c.ScoreDiff)
+	require.Equal(t, -1.0, c.PassRateDiff)
+}
+
+func TestRunMatrix_RequiresFactory(t *testing.T) {
+	runner := newMockRunner(t, models.Config{Models: []models.ModelTarget{{ID: "a"}}})
+
+	_, err := runner.RunMatrix(context.Background())
+	require.ErrorContains(t, err, "engine factory")
+}
+
+func TestStreamTrials_CapsEachModel(t *testing.T) {
+	runner := newMockRunner(t, models.Config{RunsPerTest: 4, TimeoutSec: 10})
+
+	newTarget := func(model string, workers int) *modelRun {
+		engine := execution.NewMockEngine(model, execution.WithMockConfig(&models.MockConfig{
+			Latency: models.MockLatency{MeanMs: 20},
+		}))
+		require.NoError(t, engine.Initialize(context.Background()))
+		return &modelRun{model: model, engine: engine, workers: workers, label: model}
+	}
+
+	var mu sync.Mutex
+	inFlight := map[string]int{}
+	peak := map[string]int{}
+	runner.OnProgress(func(event ProgressEvent) {
+		mu.Lock()
+		defer mu.Unlock()
+		switch event.EventType {
+		case EventRunStart:
+			inFlight[event.Model]++
+			if inFlight[event.Model] > peak[event.Model] {
+				peak[event.Model] = inFlight[event.Model]
+			}
+		case EventRunComplete:
+			inFlight[event.Model]--
+		}
+	})
+
+	targets := []*modelRun{newTarget("capped", 1), newTarget("open", 0)}
+
+	counts := map[string]int{}
+	for res := range runner.streamTrials(context.Background(), testCases("a", "b"), targets, 4) {
+		require.Equal(t, "passed", res.Run.Status)
+		counts[res.Model]++
+	}
+
+	require.Equal(t, map[string]int{"capped": 8, "open": 8}, counts)
+	require.Equal(t, 1, peak["capped"])
+	require.Greater(t, peak["open"], 1)
+}
@@ -0,0 +1,144 @@
+package orchestration
+
+import (
+	"github.com/spboyer/waza/internal/models"
+	"github.com/spboyer/waza/internal/stats"
+)
+
+// Built-in metrics computed from trial status rather than grader scores
+const (
+	metricTaskCompletion  = "task_completion"
+	metricBehaviorQuality = "behavior_quality"
+)
+
+// measureSeed keeps bootstrap intervals reproducible between runs of the same
+// results
+const measureSeed = 1
+
+// computeMeasures evaluates the spec's metrics over every trial, skipping
+// those disabled. Each metric is reduced to one value per trial; its result
+// is the mean of those values with a confidence interval in Details. Trials
+// the metric can't measure, e.g. when none of its graders ran, are left out.
+// The second return value is the composite score: the per-trial weighted
+// mean of all metrics, or nil when no metric was measured.
+func (r *TestRunner) computeMeasures(testOutcomes []models.TestOutcome) (map[string]models.MeasureResult, map[string]any) {
+	metrics := r.cfg.Spec().Metrics
+	measures := make(map[string]models.MeasureResult, len(metrics))
+
+	var runs []*models.RunResult
+	for i := range testOutcomes {
+		for j := range testOutcomes[i].Runs {
+			runs = append(runs, &testOutcomes[i].Runs[j])
+		}
+	}
+	if len(runs) == 0 || len(metrics) == 0 {
+		return measures, nil
+	}
+
+	// per-trial weighted sums for the composite score
+	weighted := make([]float64, len(runs))
+	weights := make([]float64, len(runs))
+
+	for _, metric := range metrics {
+		if metric.Enabled != nil && !*metric.Enabled {
+			continue
+		}
+
+		values := make([]float64, 0, len(runs))
+		for i, run := range runs {
+			v, ok := measureRun(metric, run)
+			if !ok {
+				continue
+			}
+			values = append(values, v)
+			weighted[i] += v * metric.Weight
+			weights[i] += metric.Weight
+		}
+		if len(values) == 0 {
+			continue
+		}
+
+		value := stats.Mean(values)
+		ci := metricInterval(metric, values)
+		measures[metric.Identifier] = models.MeasureResult{
+			Identifier: metric.Identifier,
+			Value:      value,
+			Cutoff:     metric.Cutoff,
+			Passed:     value >= metric.Cutoff,
+			Weight:     metric.Weight,
+			Details: map[string]any{
+				"trials":  len(values),
+				"ci_low":  ci.Low,
+				"ci_high": ci.High,
+			},
+		}
+	}
+
+	composite := make([]float64, 0, len(runs))
+	for i := range runs {
+		if weights[i] > 0 {
+			composite = append(composite, weighted[i]/weights[i])
+		}
+	}
+	if len(composite) == 0 {
+		return measures, nil
+	}
+
+	ci := stats.BootstrapMean(composite, stats.DefaultResamples, stats.DefaultConfidence, measureSeed)
+	return measures, map[string]any{
+		"score":   stats.Mean(composite),
+		"ci_low":  ci.Low,
+		"ci_high": ci.High,
+	}
+}
+
+// measureRun returns the value of a metric for one trial, or false when the
+// trial has nothing to measure it by
+func measureRun(metric models.MeasurementDef, run *models.RunResult) (float64, bool) {
+	if len(metric.Graders) > 0 {
+		var scores []float64
+		for _, name := range metric.Graders {
+			if v, ok := run.Validations[name]; ok {
+				scores = append(scores, v.Score)
+			}
+		}
+		if len(scores) == 0 {
+			return 0, false
+		}
+		return stats.Mean(scores), true
+	}
+
+	switch metric.Identifier {
+	case metricTaskCompletion:
+		return boolScore(run.Status == "passed"), true
+	case metricBehaviorQuality:
+		return boolScore(run.Status != "error" && run.BudgetViolation == nil), true
+	}
+
+	if v, ok := run.Validations[metric.Identifier]; ok {
+		return v.Score, true
+	}
+	return 0, false
+}
+
+// metricInterval uses the Wilson interval for pass/fail metrics and a
+// bootstrap interval for graded scores
+func metricInterval(metric models.MeasurementDef, values []float64) stats.Interval {
+	if len(metric.Graders) == 0 && (metric.Identifier == metricTaskCompletion || metric.Identifier == metricBehaviorQuality) {
+		passed := 0
+		for _, v := range values {
+			if v == 1 {
+				passed++
+			}
+		}
+		return stats.Wilson(passed, len(values), stats.DefaultConfidence)
+	}
+	return stats.BootstrapMean(values, stats.DefaultResamples, stats.DefaultConfidence, measureSeed)
+}
+
+func boolScore(b bool) float64 {
+	if b {
+		return 1
+	}
+	return 0
+}
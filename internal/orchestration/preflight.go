@@ -0,0 +1,165 @@
+package orchestration
+
+import (
+	"context"
+	"errors"
+	"fmt"
+	"os"
+	"os/exec"
+	"path/filepath"
+	"sort"
+	"strings"
+
+	"github.com/spboyer/waza/internal/graders"
+	"github.com/spboyer/waza/internal/models"
+)
+
+// PreflightIssue is a problem in a benchmark's tasks, graders or fixtures
+type PreflightIssue struct {
+	// Source is the task file the problem is in, or empty for the spec
+	Source string `json:"source,omitempty"`
+	// Grader names the grader the problem is in, if any
+	Grader  string `json:"grader,omitempty"`
+	Message string `json:"message"`
+}
+
+func (i PreflightIssue) String() string {
+	where := "spec"
+	if i.Source != "" {
+		where = i.Source
+	}
+	if i.Grader != "" {
+		where += ": grader " + i.Grader
+	}
+	return where + ": " + i.Message
+}
+
+// PreflightError lists every problem Preflight found
+type PreflightError struct {
+	Issues []PreflightIssue
+}
+
+func (e *PreflightError) Error() string {
+	lines := make([]string, 0, len(e.Issues)+1)
+	lines = append(lines, fmt.Sprintf("preflight found %d problem(s):", len(e.Issues)))
+	for _, issue := range e.Issues {
+		lines = append(lines, "  "+issue.String())
+	}
+	return strings.Join(lines, "\n")
+}
+
+// Preflight loads every task, creates and checks every global and task
+// grader, compiling all of their Python in a single interpreter call, and
+// resolves every fixture, so a bad regex, a syntax error in an assertion or an
+// unsupported grader type is reported before any session is paid for rather
+// than in the trial that first grades with it. It returns the active test
+// cases, and a *PreflightError listing every problem it found.
+func (r *TestRunner) Preflight(ctx context.Context) ([]*models.TestCase, error) {
+	testFiles, err := r.testFiles()
+	if err != nil {
+		return nil, fmt.Errorf("failed to load test cases: %w", err)
+	}
+
+	var (
+		issues    []PreflightIssue
+		testCases []*models.TestCase
+		// built graders, and where each is configured, for checking
+		built    []graders.Grader
+		builtAt  []PreflightIssue
+		checkAll = func(source string, setups []graderSetup) {
+			for _, setup := range setups {
+				grader, err := r.createGrader(setup)
+				if err != nil {
+					issues = append(issues, PreflightIssue{Source: source, Grader: setup.name, Message: err.Error()})
+					continue
+				}
+				built = append(built, grader)
+				builtAt = append(builtAt, PreflightIssue{Source: source, Grader: setup.name})
+			}
+		}
+	)
+
+	checkAll("", r.specGraderSetups())
+
+	for _, path := range testFiles {
+		source := r.sourceName(path)
+		tc, err := models.LoadTestCase(path)
+		if err != nil {
+			issues = append(issues, PreflightIssue{Source: source, Message: err.Error()})
+			continue
+		}
+		if tc.Active != nil && !*tc.Active {
+			continue
+		}
+		testCases = append(testCases, tc)
+
+		checkAll(source, r.testGraderSetups(tc))
+		for _, msg := range r.checkResources(tc) {
+			issues = append(issues, PreflightIssue{Source: source, Message: msg})
+		}
+	}
+
+	graderErrs, err := graders.Preflight(ctx, built)
+	switch {
+	case errors.Is(err, exec.ErrNotFound):
+		fmt.Fprintf(os.Stderr, "Warning: python graders were not compiled: %v\n", err)
+	case err != nil:
+		issues = append(issues, PreflightIssue{Message: err.Error()})
+	}
+	for i, err := range graderErrs {
+		if err != nil {
+			issue := builtAt[i]
+			issue.Message = err.Error()
+			issues = append(issues, issue)
+		}
+	}
+
+	if len(issues) > 0 {
+		// the spec's own problems first, then each task's together
+		sort.SliceStable(issues, func(i, j int) bool { return issues[i].Source < issues[j].Source })
+		return testCases, &PreflightError{Issues: issues}
+	}
+	if len(testCases) == 0 {
+		return nil, fmt.Errorf("no test cases found")
+	}
+	return testCases, nil
+}
+
+// checkResources resolves the test case's resource files, returning what is
+// wrong with those that can't be loaded
+func (r *TestRunner) checkResources(tc *models.TestCase) []string {
+	fixtureDir := r.fixtureDir(tc)
+
+	var problems []string
+	for _, ref := range tc.Stimulus.Resources {
+		if ref.Body != "" || ref.Location == "" {
+			continue
+		}
+		if fixtureDir == "" {
+			problems = append(problems, fmt.Sprintf("resource %q has no fixture directory to load from", ref.Location))
+			continue
+		}
+
+		fullPath, err := resourcePath(fixtureDir, ref.Location)
+		if err != nil {
+			problems = append(problems, err.Error())
+			continue
+		}
+		if info, err := os.Stat(fullPath); err != nil {
+			problems = append(problems, fmt.Sprintf("failed to load resource file: %v", err))
+		} else if info.IsDir() {
+			problems = append(problems, fmt.Sprintf("resource %q is a directory", ref.Location))
+		}
+	}
+	return problems
+}
+
+// sourceName is a task file's path relative to the spec directory
+func (r *TestRunner) sourceName(path string) string {
+	if specDir := r.cfg.SpecDir(); specDir != "" {
+		if rel, err := filepath.Rel(specDir, path); err == nil {
+			return rel
+		}
+	}
+	return path
+}
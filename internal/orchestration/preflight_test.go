@@ -0,0 +1,92 @@
+package orchestration
+
+import (
+	"context"
+	"os"
+	"os/exec"
+	"path/filepath"
+	"testing"
+
+	"github.com/spboyer/waza/internal/config"
+	"github.com/spboyer/waza/internal/execution"
+	"github.com/spboyer/waza/internal/models"
+	"github.com/stretchr/testify/require"
+)
+
+func TestPreflight_ReportsEveryProblem(t *testing.T) {
+	dir := t.TempDir()
+	fixtures := filepath.Join(dir, "fixtures")
+	require.NoError(t, os.MkdirAll(fixtures, 0755))
+	require.NoError(t, os.WriteFile(filepath.Join(fixtures, "main.py"), []byte("print(1)"), 0644))
+
+	tasks := map[string]string{
+		"good.yaml": "id: good\nname: good\ninputs:\n  prompt: go\n  files:\n    - path: main.py\n",
+		"bad_regex.yaml": "id: bad_regex\nname: bad_regex\ninputs:\n  prompt: go\n" +
+			"graders:\n  - type: regex\n    name: broken\n    config:\n      must_match: ['(unclosed']\n",
+		"missing_fixture.yaml": "id: missing_fixture\nname: missing_fixture\ninputs:\n  prompt: go\n  files:\n    - path: nope.py\n    - path: ../escape.py\n",
+		"inactive.yaml":        "id: inactive\nname: inactive\nenabled: false\ninputs:\n  prompt: go\n",
+	}
+	for name, task := range tasks {
+		require.NoError(t, os.WriteFile(filepath.Join(dir, name), []byte(task), 0644))
+	}
+
+	spec := &models.BenchmarkSpec{
+		SpecIdentity: models.SpecIdentity{Name: "preflight"},
+		SkillName:    "test-skill",
+		Config:       models.Config{RunsPerTest: 1, TimeoutSec: 10},
+		Graders: []models.GraderConfig{
+			{Kind: "regex", Identifier: "says_done", Parameters: map[string]any{"must_match": []string{"done"}}},
+			{Kind: "keyword", Identifier: "unsupported"},
+		},
+		Tasks: []string{"*.yaml"},
+	}
+	runner := NewTestRunner(config.NewBenchmarkConfig(spec, config.WithSpecDir(dir), config.WithFixtureDir(fixtures)), nil)
+
+	testCases, err := runner.Preflight(context.Background())
+	require.Len(t, testCases, 3)
+
+	var preflightErr *PreflightError
+	require.ErrorAs(t, err, &preflightErr)
+
+	var where []string
+	for _, issue := range preflightErr.Issues {
+		where = append(where, issue.Source+"/"+issue.Grader)
+	}
+	require.Equal(t, []string{
+		"/unsupported",
+		"bad_regex.yaml/broken",
+		"missing_fixture.yaml/",
+		"missing_fixture.yaml/",
+	}, where)
+	require.Contains(t, preflightErr.Issues[0].Message, "not yet implemented")
+	require.Contains(t, preflightErr.Issues[2].Message, "nope.py")
+	require.Contains(t, preflightErr.Issues[3].Message, "contains '..'")
+}
+
+func TestPreflight_CompilesAssertionsBeforeAnySession(t *testing.T) {
+	if err := exec.Command("python", "--version").Run(); err != nil {
+		t.Skip("Skipping preflight that needs Python")
+	}
+
+	dir := t.TempDir()
+	task := "id: one\nname: one\ninputs:\n  prompt: go\n" +
+		"graders:\n  - type: code\n    name: syntax\n    config:\n      assertions: ['len(output) >']\n"
+	require.NoError(t, os.WriteFile(filepath.Join(dir, "one.yaml"), []byte(task), 0644))
+
+	spec := &models.BenchmarkSpec{
+		SpecIdentity: models.SpecIdentity{Name: "preflight"},
+		SkillName:    "test-skill",
+		Config:       models.Config{RunsPerTest: 1, TimeoutSec: 10},
+		Tasks:        []string{"*.yaml"},
+	}
+	engine := &countingEngine{AgentEngine: execution.NewMockEngine("test-model")}
+	runner := NewTestRunner(config.NewBenchmarkConfig(spec, config.WithSpecDir(dir)), engine)
+
+	_, err := runner.RunBenchmark(context.Background())
+	var preflightErr *PreflightError
+	require.ErrorAs(t, err, &preflightErr)
+	require.Len(t, preflightErr.Issues, 1)
+	require.Equal(t, "syntax", preflightErr.Issues[0].Grader)
+	require.Contains(t, preflightErr.Issues[0].Message, `assertion "len(output) >"`)
+	require.Zero(t, engine.sessions.Load())
+}
@@ -2,9 +2,13 @@ package orchestration
 
 import (
 	"context"
+	"crypto/rand"
+	"encoding/hex"
 	"fmt"
 	"os"
 	"path/filepath"
+	"runtime"
+	"sort"
 	"strings"
 	"sync"
 	"time"
@@ -13,6 +17,7 @@ import (
 	"github.com/spboyer/waza/internal/execution"
 	"github.com/spboyer/waza/internal/graders"
 	"github.com/spboyer/waza/internal/models"
+	"github.com/spboyer/waza/internal/stats"
 )
 
 // TestRunner orchestrates the execution of tests
@@ -21,11 +26,66 @@ type TestRunner struct {
 	engine  execution.AgentEngine
 	verbose bool
 
+	// newEngine creates the engine for each model of a multi-model run
+	newEngine EngineFactory
+
+	// pythonPool runs Python graders on long-lived workers (opt-in via grader_workers)
+	pythonPool *graders.PythonWorkerPool
+	// sharedPool is set when pythonPool was given to the runner, which then
+	// leaves it running
+	sharedPool bool
+
+	// history holds earlier trial durations, to schedule concurrent trials by
+	history *DurationHistory
+	// limiter paces sessions during a benchmark with a rate_limit
+	limiter *execution.Limiter
+	// memo keeps deterministic graders' results during a benchmark
+	memo *graders.MemoCache
+
+	// plans caches each test case's execution request and graders, which
+	// every trial and model of a benchmark shares
+	plansMu sync.Mutex
+	plans   map[*models.TestCase]*testPlan
+
+	// responses keeps each trial's session for re-grading; only watch mode
+	// sets it
+	responses *responseCache
+
 	// Progress tracking
 	progressMu sync.Mutex
 	listeners  []ProgressListener
 }
 
+// RunnerOption configures a TestRunner
+type RunnerOption func(*TestRunner)
+
+// EngineFactory creates the engine that runs a benchmark against one model
+type EngineFactory func(modelID string) (execution.AgentEngine, error)
+
+// WithEngineFactory sets how RunMatrix creates an engine for each model
+func WithEngineFactory(factory EngineFactory) RunnerOption {
+	return func(r *TestRunner) {
+		r.newEngine = factory
+	}
+}
+
+// WithPythonPool runs Python graders on a pool shared with other runners,
+// such as the benchmarks of a long-running server. The runner never closes it.
+func WithPythonPool(pool *graders.PythonWorkerPool) RunnerOption {
+	return func(r *TestRunner) {
+		r.pythonPool = pool
+		r.sharedPool = pool != nil
+	}
+}
+
+// WithDurationHistory schedules concurrent trials longest expected first,
+// by the durations of earlier runs
+func WithDurationHistory(history *DurationHistory) RunnerOption {
+	return func(r *TestRunner) {
+		r.history = history
+	}
+}
+
 // ProgressListener receives progress updates
 type ProgressListener func(event ProgressEvent)
 
@@ -45,25 +105,30 @@ const (
 
 // ProgressEvent represents a progress update
 type ProgressEvent struct {
-	EventType  EventType
-	TestName   string
-	TestNum    int
-	TotalTests int
-	RunNum     int
-	TotalRuns  int
-	Status     string
-	DurationMs int64
-	Details    map[string]any
+	EventType  EventType      `json:"event_type"`
+	Model      string         `json:"model,omitempty"` // set in multi-model runs
+	TestName   string         `json:"test_name,omitempty"`
+	TestNum    int            `json:"test_num,omitempty"`
+	TotalTests int            `json:"total_tests,omitempty"`
+	RunNum     int            `json:"run_num,omitempty"`
+	TotalRuns  int            `json:"total_runs,omitempty"`
+	Status     string         `json:"status,omitempty"`
+	DurationMs int64          `json:"duration_ms,omitempty"`
+	Details    map[string]any `json:"details,omitempty"`
 }
 
 // NewTestRunner creates a new test runner
-func NewTestRunner(cfg *config.BenchmarkConfig, engine execution.AgentEngine) *TestRunner {
-	return &TestRunner{
+func NewTestRunner(cfg *config.BenchmarkConfig, engine execution.AgentEngine, opts ...RunnerOption) *TestRunner {
+	r := &TestRunner{
 		cfg:       cfg,
 		engine:    engine,
 		verbose:   cfg.Verbose(),
 		listeners: []ProgressListener{},
 	}
+	for _, opt := range opts {
+		opt(r)
+	}
+	return r
 }
 
 // OnProgress registers a progress listener
@@ -88,6 +153,11 @@ func (r *TestRunner) notifyProgress(event ProgressEvent) {
 func (r *TestRunner) RunBenchmark(ctx context.Context) (*models.EvaluationOutcome, error) {
 	startTime := time.Now()
 
+	testCases, err := r.Preflight(ctx)
+	if err != nil {
+		return nil, err
+	}
+
 	// Initialize engine
 	if err := r.engine.Initialize(ctx); err != nil {
 		return nil, fmt.Errorf("failed to initialize engine: %w", err)
@@ -98,15 +168,8 @@ func (r *TestRunner) RunBenchmark(ctx context.Context) (*models.EvaluationOutcom
 		}
 	}()
 
-	// Load test cases
-	testCases, err := r.loadTestCases()
-	if err != nil {
-		return nil, fmt.Errorf("failed to load test cases: %w", err)
-	}
-
-	if len(testCases) == 0 {
-		return nil, fmt.Errorf("no test cases found")
-	}
+	cleanup := r.prepare(testCases)
+	defer cleanup()
 
 	r.notifyProgress(ProgressEvent{
 		EventType:  EventBenchmarkStart,
@@ -115,18 +178,22 @@ func (r *TestRunner) RunBenchmark(ctx context.Context) (*models.EvaluationOutcom
 
 	// Execute tests
 	var testOutcomes []models.TestOutcome
+	var schedule *models.ScheduleDigest
 
 	spec := r.cfg.Spec()
 	// Now that CopilotEngine is concurrency-safe (protected by mutex),
 	// we can safely use concurrent execution when configured
 	if spec.Config.Concurrent {
+		trialsStart := time.Now()
 		testOutcomes = r.runConcurrent(ctx, testCases)
+		schedule = r.scheduleDigest(testCases, r.parallelWorkers(), time.Since(trialsStart))
 	} else {
 		testOutcomes = r.runSequential(ctx, testCases)
 	}
 
 	// Compute statistics
-	outcome := r.buildOutcome(testOutcomes, startTime)
+	outcome := r.buildOutcome(testOutcomes, startTime, spec.Config.ModelID)
+	outcome.Digest.Schedule = schedule
 
 	r.notifyProgress(ProgressEvent{
 		EventType:  EventBenchmarkComplete,
@@ -136,7 +203,86 @@ func (r *TestRunner) RunBenchmark(ctx context.Context) (*models.EvaluationOutcom
 	return outcome, nil
 }
 
-func (r *TestRunner) loadTestCases() ([]*models.TestCase, error) {
+// prepare sets up what every trial of the test cases shares: grader plans
+// and workers, the rate limiter and the grader cache. The returned cleanup
+// releases it once the benchmark is done.
+func (r *TestRunner) prepare(testCases []*models.TestCase) func() {
+	r.startGraderWorkers(testCases)
+
+	r.plansMu.Lock()
+	r.plans = make(map[*models.TestCase]*testPlan, len(testCases))
+	r.plansMu.Unlock()
+
+	// one limiter paces every worker and model
+	if rateLimit := r.cfg.Spec().Config.RateLimit; rateLimit != nil {
+		r.limiter = execution.NewLimiter(*rateLimit, r.maxWorkers())
+	}
+	if size := r.cfg.Spec().Config.GraderCache; size >= 0 {
+		r.memo = graders.NewMemoCache(size)
+	}
+
+	cleanup := func() {
+		// plans hold graders bound to the pool
+		r.plansMu.Lock()
+		r.plans = nil
+		r.plansMu.Unlock()
+
+		r.stopGraderWorkers()
+		r.limiter = nil
+		r.memo = nil
+	}
+
+	return cleanup
+}
+
+// startGraderWorkers starts the Python grader pool if the test cases need one
+// and it isn't running yet. Python graders share long-lived worker processes
+// when grader_workers is set; script graders always need them.
+func (r *TestRunner) startGraderWorkers(testCases []*models.TestCase) {
+	if r.pythonPool != nil {
+		return
+	}
+	if workers := r.graderWorkers(testCases); workers > 0 {
+		r.pythonPool = graders.NewPythonWorkerPool(workers)
+	}
+}
+
+// stopGraderWorkers stops the Python grader pool, unless it is shared
+func (r *TestRunner) stopGraderWorkers() {
+	if r.pythonPool == nil || r.sharedPool {
+		return
+	}
+	if err := r.pythonPool.Close(); err != nil {
+		fmt.Printf("warning: failed to stop grader workers: %v\n", err)
+	}
+	r.pythonPool = nil
+}
+
+// LoadTestCases resolves the spec's task patterns and loads every active test case
+func (r *TestRunner) LoadTestCases() ([]*models.TestCase, error) {
+	testFiles, err := r.testFiles()
+	if err != nil {
+		return nil, err
+	}
+
+	var testCases []*models.TestCase
+	for _, path := range testFiles {
+		tc, err := models.LoadTestCase(path)
+		if err != nil {
+			return nil, fmt.Errorf("failed to load test case %s: %w", path, err)
+		}
+		// Only include active test cases
+		// LoadTestCase defaults Active to true (nil case), so include nil or explicitly true
+		if tc.Active == nil || *tc.Active {
+			testCases = append(testCases, tc)
+		}
+	}
+
+	return testCases, nil
+}
+
+// testFiles resolves the spec's task patterns to files
+func (r *TestRunner) testFiles() ([]string, error) {
 	spec := r.cfg.Spec()
 
 	// Get base directory for test file resolution (spec directory)
@@ -160,20 +306,7 @@ func (r *TestRunner) loadTestCases() ([]*models.TestCase, error) {
 		return nil, fmt.Errorf("no test files matched patterns: %v in directory: %s", spec.Tasks, baseDir)
 	}
 
-	var testCases []*models.TestCase
-	for _, path := range testFiles {
-		tc, err := models.LoadTestCase(path)
-		if err != nil {
-			return nil, fmt.Errorf("failed to load test case %s: %w", path, err)
-		}
-		// Only include active test cases
-		// LoadTestCase defaults Active to true (nil case), so include nil or explicitly true
-		if tc.Active == nil || *tc.Active {
-			testCases = append(testCases, tc)
-		}
-	}
-
-	return testCases, nil
+	return testFiles, nil
 }
 
 func (r *TestRunner) runSequential(ctx context.Context, testCases []*models.TestCase) []models.TestOutcome {
@@ -219,101 +352,313 @@ func (r *TestRunner) runSequential(ctx context.Context, testCases []*models.Test
 }
 
 func (r *TestRunner) runConcurrent(ctx context.Context, testCases []*models.TestCase) []models.TestOutcome {
-	// Simple concurrent implementation
+	runsPerTest := r.cfg.Spec().Config.RunsPerTest
+
+	runs := make([][]models.RunResult, len(testCases))
+	for res := range r.StreamTrials(ctx, testCases) {
+		runs[res.TestIndex] = append(runs[res.TestIndex], res.Run)
+
+		if len(runs[res.TestIndex]) == runsPerTest {
+			outcome := r.buildTestOutcome(res.TestCase, runs[res.TestIndex])
+			r.notifyProgress(ProgressEvent{
+				EventType:  EventTestComplete,
+				TestName:   res.TestCase.DisplayName,
+				TestNum:    res.TestIndex + 1,
+				TotalTests: len(testCases),
+				Status:     outcome.Status,
+			})
+		}
+	}
+
+	results := make([]models.TestOutcome, len(testCases))
+	for i, tc := range testCases {
+		results[i] = r.buildTestOutcome(tc, runs[i])
+	}
+
+	return results
+}
+
+// scheduleDigest compares the predicted makespan of a concurrent run on
+// workers workers with the actual one. It is nil when no test has a recorded
+// duration.
+func (r *TestRunner) scheduleDigest(testCases []*models.TestCase, workers int, actual time.Duration) *models.ScheduleDigest {
 	spec := r.cfg.Spec()
-	workers := spec.Config.Workers
-	if workers <= 0 {
-		workers = 4
+	schedule := scheduleTrials(testCases, spec.Config.RunsPerTest, r.history)
+	if schedule.known == 0 {
+		return nil
 	}
 
-	type result struct {
-		index   int
-		outcome models.TestOutcome
+	return &models.ScheduleDigest{
+		Workers:     workers,
+		KnownTests:  schedule.known,
+		PredictedMs: schedule.makespan(workers).Milliseconds(),
+		ActualMs:    actual.Milliseconds(),
 	}
+}
 
-	resultChan := make(chan result, len(testCases))
-	semaphore := make(chan struct{}, workers)
+// maxWorkers is the max_workers setting, or its default
+func (r *TestRunner) maxWorkers() int {
+	if workers := r.cfg.Spec().Config.Workers; workers > 0 {
+		return workers
+	}
+	return defaultWorkers
+}
 
-	var wg sync.WaitGroup
+// parallelWorkers is how many trials a parallel benchmark runs at once:
+// max_workers, or more when an adaptive rate limit may grow past it
+func (r *TestRunner) parallelWorkers() int {
+	workers := r.maxWorkers()
+	if r.limiter != nil && r.limiter.Ceiling() > workers {
+		workers = r.limiter.Ceiling()
+	}
+	return workers
+}
 
-	for i, tc := range testCases {
-		wg.Add(1)
-		go func(idx int, test *models.TestCase) {
-			defer wg.Done()
+// rateLimitDigest reports what the benchmark's limiter did, if it has one
+func (r *TestRunner) rateLimitDigest() *models.RateLimitDigest {
+	if r.limiter == nil {
+		return nil
+	}
+	stats := r.limiter.Stats()
+	return &models.RateLimitDigest{
+		Throttled:      stats.Throttled,
+		Retried:        stats.Retried,
+		TimedOut:       stats.TimedOut,
+		Concurrency:    stats.Concurrency,
+		MinConcurrency: stats.MinConcurrency,
+		MaxConcurrency: stats.MaxConcurrency,
+	}
+}
 
-			semaphore <- struct{}{}
-			defer func() { <-semaphore }()
+// graderCacheDigest counts the benchmark's memoized grader lookups
+func (r *TestRunner) graderCacheDigest() *models.GraderCacheDigest {
+	if r.memo == nil {
+		return nil
+	}
+	stats := r.memo.Stats()
+	if stats.Hits+stats.Misses == 0 {
+		return nil
+	}
+	return &models.GraderCacheDigest{Hits: stats.Hits, Misses: stats.Misses}
+}
 
-			r.notifyProgress(ProgressEvent{
-				EventType:  EventTestStart,
-				TestName:   test.DisplayName,
-				TestNum:    idx + 1,
-				TotalTests: len(testCases),
-			})
+// TrialResult is a single completed run of a test case
+type TrialResult struct {
+	// TestIndex is the position of the test case in the slice given to StreamTrials
+	TestIndex int
+	TestCase  *models.TestCase
+	// ModelIndex is the position of the model in a multi-model run, and 0
+	// otherwise
+	ModelIndex int
+	Model      string
+	Run        models.RunResult
+}
 
-			outcome := r.runTest(ctx, test, idx+1, len(testCases))
-			resultChan <- result{index: idx, outcome: outcome}
+// modelRun is one model of a benchmark and the engine that runs it
+type modelRun struct {
+	model  string
+	engine execution.AgentEngine
+	// workers caps this model's trials in flight; 0 leaves only the shared cap
+	workers int
+	// label names the model in progress events of multi-model runs
+	label string
+}
 
-			r.notifyProgress(ProgressEvent{
-				EventType:  EventTestComplete,
-				TestName:   test.DisplayName,
-				TestNum:    idx + 1,
-				TotalTests: len(testCases),
-				Status:     outcome.Status,
-			})
-		}(i, tc)
+// defaultModel is the runner's own engine, used by single-model runs
+func (r *TestRunner) defaultModel() *modelRun {
+	return &modelRun{model: r.cfg.Spec().Config.ModelID, engine: r.engine}
+}
+
+type trialJob struct {
+	testIndex  int
+	tc         *models.TestCase
+	runNum     int
+	modelIndex int
+	target     *modelRun
+	// slots is the model's concurrency cap; the job holds one slot
+	slots chan struct{}
+}
+
+// StreamTrials runs every trial of the given test cases, with at most
+// max_workers runs in flight across all tests and trials, and delivers each
+// result as soon as it completes. Trials start longest expected first, by
+// the runner's duration history. Results arrive in completion order; the
+// channel is closed once every trial has finished, or once ctx is cancelled
+// and in-flight trials have returned. The engine must already be initialized.
+func (r *TestRunner) StreamTrials(ctx context.Context, testCases []*models.TestCase) <-chan TrialResult {
+	return r.streamTrials(ctx, testCases, []*modelRun{r.defaultModel()}, r.parallelWorkers())
+}
+
+// streamTrials is StreamTrials over several models at once. All models share
+// the max_workers pool; a model with its own cap only queues a trial once it
+// has a free slot, so it never holds up workers other models could use.
+func (r *TestRunner) streamTrials(ctx context.Context, testCases []*models.TestCase, targets []*modelRun, workers int) <-chan TrialResult {
+	spec := r.cfg.Spec()
+	if workers <= 0 {
+		workers = defaultWorkers
+	}
+	schedule := scheduleTrials(testCases, spec.Config.RunsPerTest, r.history)
+
+	jobs := make(chan trialJob)
+	results := make(chan TrialResult, workers)
+
+	var feeders sync.WaitGroup
+	for m, target := range targets {
+		var slots chan struct{}
+		if target.workers > 0 {
+			slots = make(chan struct{}, target.workers)
+		}
+
+		feeders.Add(1)
+		go func(m int, target *modelRun, slots chan struct{}) {
+			defer feeders.Done()
+			for _, slot := range schedule.slots {
+				job := trialJob{testIndex: slot.testIndex, tc: testCases[slot.testIndex], runNum: slot.runNum,
+					modelIndex: m, target: target, slots: slots}
+				if !queueTrial(ctx, jobs, job) {
+					return
+				}
+			}
+		}(m, target, slots)
 	}
 
 	go func() {
-		wg.Wait()
-		close(resultChan)
+		feeders.Wait()
+		close(jobs)
 	}()
 
-	// Collect results
-	results := make([]models.TestOutcome, len(testCases))
-	for res := range resultChan {
-		results[res.index] = res.outcome
+	// announce each test once per model, when its first trial is picked up
+	started := make([]sync.Once, len(targets)*len(testCases))
+
+	var wg sync.WaitGroup
+	for w := 0; w < workers; w++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for job := range jobs {
+				if ctx.Err() == nil {
+					res := r.runJob(ctx, job, testCases, started)
+					// a consumer that stopped reading must not keep the
+					// worker, and so the channel, open past cancellation
+					select {
+					case results <- res:
+					case <-ctx.Done():
+					}
+				}
+				if job.slots != nil {
+					<-job.slots
+				}
+			}
+		}()
 	}
 
+	go func() {
+		wg.Wait()
+		close(results)
+	}()
+
 	return results
 }
 
-func (r *TestRunner) runTest(ctx context.Context, tc *models.TestCase, testNum, totalTests int) models.TestOutcome {
-	spec := r.cfg.Spec()
-	runsPerTest := spec.Config.RunsPerTest
+// queueTrial takes a slot of the job's model, if it is capped, and hands the
+// job to the workers. It reports false once ctx is cancelled.
+func queueTrial(ctx context.Context, jobs chan<- trialJob, job trialJob) bool {
+	if job.slots != nil {
+		select {
+		case job.slots <- struct{}{}:
+		case <-ctx.Done():
+			return false
+		}
+	}
 
-	runs := make([]models.RunResult, 0, runsPerTest)
+	select {
+	case jobs <- job:
+		return true
+	case <-ctx.Done():
+		if job.slots != nil {
+			<-job.slots
+		}
+		return false
+	}
+}
 
-	for runNum := 1; runNum <= runsPerTest; runNum++ {
+func (r *TestRunner) runJob(ctx context.Context, job trialJob, testCases []*models.TestCase, started []sync.Once) TrialResult {
+	started[job.modelIndex*len(testCases)+job.testIndex].Do(func() {
 		r.notifyProgress(ProgressEvent{
-			EventType:  EventRunStart,
-			TestName:   tc.DisplayName,
-			TestNum:    testNum,
-			TotalTests: totalTests,
-			RunNum:     runNum,
-			TotalRuns:  runsPerTest,
+			EventType:  EventTestStart,
+			Model:      job.target.label,
+			TestName:   job.tc.DisplayName,
+			TestNum:    job.testIndex + 1,
+			TotalTests: len(testCases),
 		})
+	})
+
+	run := r.runTrial(ctx, job.target, job.tc, job.testIndex+1, len(testCases), job.runNum)
+	return TrialResult{
+		TestIndex:  job.testIndex,
+		TestCase:   job.tc,
+		ModelIndex: job.modelIndex,
+		Model:      job.target.model,
+		Run:        run,
+	}
+}
 
-		run := r.executeRun(ctx, tc, runNum)
-		runs = append(runs, run)
+func (r *TestRunner) runTest(ctx context.Context, tc *models.TestCase, testNum, totalTests int) models.TestOutcome {
+	runsPerTest := r.cfg.Spec().Config.RunsPerTest
 
-		r.notifyProgress(ProgressEvent{
-			EventType:  EventRunComplete,
-			TestName:   tc.DisplayName,
-			TestNum:    testNum,
-			TotalTests: totalTests,
-			RunNum:     runNum,
-			TotalRuns:  runsPerTest,
-			Status:     run.Status,
-			DurationMs: run.DurationMs,
-		})
+	runs := make([]models.RunResult, 0, runsPerTest)
+
+	for runNum := 1; runNum <= runsPerTest; runNum++ {
+		runs = append(runs, r.runTrial(ctx, r.defaultModel(), tc, testNum, totalTests, runNum))
 	}
 
+	return r.buildTestOutcome(tc, runs)
+}
+
+// runTrial executes a single run of a test case, reporting progress around it
+func (r *TestRunner) runTrial(ctx context.Context, target *modelRun, tc *models.TestCase, testNum, totalTests, runNum int) models.RunResult {
+	runsPerTest := r.cfg.Spec().Config.RunsPerTest
+
+	r.notifyProgress(ProgressEvent{
+		EventType:  EventRunStart,
+		Model:      target.label,
+		TestName:   tc.DisplayName,
+		TestNum:    testNum,
+		TotalTests: totalTests,
+		RunNum:     runNum,
+		TotalRuns:  runsPerTest,
+	})
+
+	run := r.executeRun(ctx, target.engine, tc, runNum)
+
+	r.notifyProgress(ProgressEvent{
+		EventType:  EventRunComplete,
+		Model:      target.label,
+		TestName:   tc.DisplayName,
+		TestNum:    testNum,
+		TotalTests: totalTests,
+		RunNum:     runNum,
+		TotalRuns:  runsPerTest,
+		Status:     run.Status,
+		DurationMs: run.DurationMs,
+	})
+
+	return run
+}
+
+func (r *TestRunner) buildTestOutcome(tc *models.TestCase, runs []models.RunResult) models.TestOutcome {
+	// Sort runs by run number - concurrent trials complete out of order
+	sort.Slice(runs, func(i, j int) bool { return runs[i].RunNumber < runs[j].RunNumber })
+
 	// Compute test statistics
 	stats := r.computeTestStats(runs)
 
 	// Determine overall status
 	status := "passed"
+	if len(runs) == 0 {
+		// never ran, e.g. the benchmark was cancelled first
+		status = "skipped"
+	}
 	for _, run := range runs {
 		if run.Status != "passed" {
 			status = "failed"
@@ -327,17 +672,23 @@ func (r *TestRunner) runTest(ctx context.Context, tc *models.TestCase, testNum,
 		Status:      status,
 		Runs:        runs,
 		Stats:       stats,
+		Weight:      tc.Weight,
 	}
 }
 
-func (r *TestRunner) executeRun(ctx context.Context, tc *models.TestCase, runNum int) models.RunResult {
+func (r *TestRunner) executeRun(ctx context.Context, engine execution.AgentEngine, tc *models.TestCase, runNum int) models.RunResult {
 	startTime := time.Now()
 
-	// Prepare execution request
-	req := r.buildExecutionRequest(tc)
+	plan := r.plan(tc)
 
 	// Execute
-	resp, err := r.engine.Execute(ctx, req)
+	var resp *execution.ExecutionResponse
+	var err error
+	if r.limiter != nil {
+		resp, err = r.limiter.Execute(ctx, engine, plan.request)
+	} else {
+		resp, err = engine.Execute(ctx, plan.request)
+	}
 	if err != nil {
 		return models.RunResult{
 			RunNumber:  runNum,
@@ -346,11 +697,19 @@ func (r *TestRunner) executeRun(ctx context.Context, tc *models.TestCase, runNum
 			ErrorMsg:   err.Error(),
 		}
 	}
+	if r.responses != nil {
+		r.responses.put(tc, runNum, resp)
+	}
+
+	return r.gradeRun(ctx, tc, plan, resp, runNum, startTime)
+}
 
+// gradeRun grades a finished session and builds the run's result
+func (r *TestRunner) gradeRun(ctx context.Context, tc *models.TestCase, plan *testPlan, resp *execution.ExecutionResponse, runNum int, startTime time.Time) models.RunResult {
 	// Build validation context
 	vCtx := r.buildGraderContext(tc, resp)
 
-	gradersResults, err := r.runGraders(ctx, tc, vCtx)
+	gradersResults, err := r.runGraders(ctx, plan, vCtx)
 
 	if err != nil {
 		return models.RunResult{
@@ -363,7 +722,10 @@ func (r *TestRunner) executeRun(ctx context.Context, tc *models.TestCase, runNum
 
 	// Determine status
 	status := "passed"
-	if resp.ErrorMsg != "" {
+	if resp.BudgetViolation != nil {
+		// the session was cut short, whatever the graders made of it
+		status = "failed"
+	} else if resp.ErrorMsg != "" {
 		status = "error"
 	} else {
 		for _, v := range gradersResults {
@@ -382,10 +744,12 @@ func (r *TestRunner) executeRun(ctx context.Context, tc *models.TestCase, runNum
 		Status:        status,
 		DurationMs:    resp.DurationMs,
 		Validations:   gradersResults,
-		SessionDigest: r.buildSessionDigest(resp),
+		SessionDigest: r.buildSessionDigest(resp, vCtx.ToolCalls),
 		Transcript:    transcript,
 		FinalOutput:   resp.FinalOutput,
 		ErrorMsg:      resp.ErrorMsg,
+
+		BudgetViolation: resp.BudgetViolation,
 	}
 }
 
@@ -399,6 +763,8 @@ func (r *TestRunner) buildExecutionRequest(tc *models.TestCase) *execution.Execu
 		timeout = *tc.TimeoutSec
 	}
 
+	rules := tc.Expectation.BehaviorRules
+
 	return &execution.ExecutionRequest{
 		TestID:     tc.TestID,
 		Message:    tc.Stimulus.Message,
@@ -406,17 +772,19 @@ func (r *TestRunner) buildExecutionRequest(tc *models.TestCase) *execution.Execu
 		Resources:  resources,
 		SkillName:  spec.SkillName,
 		TimeoutSec: timeout,
+		Budget: execution.Budget{
+			MaxToolCalls:    rules.MaxToolInvocations,
+			MaxIterations:   rules.MaxRounds,
+			MaxTokens:       rules.MaxTokens,
+			MaxResponseTime: time.Duration(rules.MaxResponseTimeMs) * time.Millisecond,
+		},
 	}
 }
 
 func (r *TestRunner) loadResources(tc *models.TestCase) []execution.ResourceFile {
 	var resources []execution.ResourceFile
 
-	// Determine fixture directory (for loading resource files)
-	fixtureDir := r.cfg.FixtureDir()
-	if tc.ContextRoot != "" {
-		fixtureDir = tc.ContextRoot
-	}
+	fixtureDir := r.fixtureDir(tc)
 
 	for _, ref := range tc.Stimulus.Resources {
 		if ref.Body != "" {
@@ -427,34 +795,9 @@ func (r *TestRunner) loadResources(tc *models.TestCase) []execution.ResourceFile
 			})
 		} else if ref.Location != "" && fixtureDir != "" {
 			// Load from file - validate path to prevent directory traversal
-			if filepath.IsAbs(ref.Location) {
-				fmt.Fprintf(os.Stderr, "Warning: absolute resource path %q rejected\n", ref.Location)
-				continue
-			}
-
-			cleanPath := filepath.Clean(ref.Location)
-			if strings.Contains(cleanPath, "..") {
-				fmt.Fprintf(os.Stderr, "Warning: resource path %q contains '..' and is rejected\n", ref.Location)
-				continue
-			}
-
-			fullPath := filepath.Join(fixtureDir, cleanPath)
-
-			// Ensure the resolved path is still within fixtureDir
-			absFixtureDir, err := filepath.Abs(fixtureDir)
+			fullPath, err := resourcePath(fixtureDir, ref.Location)
 			if err != nil {
-				fmt.Fprintf(os.Stderr, "Warning: failed to get absolute path for fixture dir: %v\n", err)
-				continue
-			}
-
-			absFullPath, err := filepath.Abs(fullPath)
-			if err != nil {
-				fmt.Fprintf(os.Stderr, "Warning: failed to get absolute path for resource: %v\n", err)
-				continue
-			}
-
-			if !strings.HasPrefix(absFullPath, absFixtureDir+string(filepath.Separator)) {
-				fmt.Fprintf(os.Stderr, "Warning: resource path %q escapes fixture directory\n", ref.Location)
+				fmt.Fprintf(os.Stderr, "Warning: %v\n", err)
 				continue
 			}
 
@@ -474,6 +817,46 @@ func (r *TestRunner) loadResources(tc *models.TestCase) []execution.ResourceFile
 	return resources
 }
 
+// resourcePath resolves a resource file's location in the fixture directory,
+// rejecting locations that would escape it
+func resourcePath(fixtureDir, location string) (string, error) {
+	if filepath.IsAbs(location) {
+		return "", fmt.Errorf("absolute resource path %q rejected", location)
+	}
+
+	cleanPath := filepath.Clean(location)
+	if strings.Contains(cleanPath, "..") {
+		return "", fmt.Errorf("resource path %q contains '..' and is rejected", location)
+	}
+
+	fullPath := filepath.Join(fixtureDir, cleanPath)
+
+	// Ensure the resolved path is still within fixtureDir
+	absFixtureDir, err := filepath.Abs(fixtureDir)
+	if err != nil {
+		return "", fmt.Errorf("failed to get absolute path for fixture dir: %w", err)
+	}
+
+	absFullPath, err := filepath.Abs(fullPath)
+	if err != nil {
+		return "", fmt.Errorf("failed to get absolute path for resource: %w", err)
+	}
+
+	if !strings.HasPrefix(absFullPath, absFixtureDir+string(filepath.Separator)) {
+		return "", fmt.Errorf("resource path %q escapes fixture directory", location)
+	}
+
+	return fullPath, nil
+}
+
+// fixtureDir is the directory a test case's resource files are loaded from
+func (r *TestRunner) fixtureDir(tc *models.TestCase) string {
+	if tc.ContextRoot != "" {
+		return tc.ContextRoot
+	}
+	return r.cfg.FixtureDir()
+}
+
 func (r *TestRunner) buildGraderContext(tc *models.TestCase, resp *execution.ExecutionResponse) *graders.Context {
 	// Convert events to transcript entries
 	var transcript []models.TranscriptEntry
@@ -492,75 +875,216 @@ func (r *TestRunner) buildGraderContext(tc *models.TestCase, resp *execution.Exe
 		Outcome:    make(map[string]any),
 		DurationMS: resp.DurationMs,
 		Metadata:   make(map[string]any),
+		ToolCalls:  graders.NewToolCallIndex(transcript),
 	}
 }
 
-func (r *TestRunner) runGraders(ctx context.Context, tc *models.TestCase, gradersContext *graders.Context) (map[string]models.GraderResults, error) {
-	graderResults := make(map[string]models.GraderResults)
-
-	// Run global validators
-	spec := r.cfg.Spec()
-	for _, vCfg := range spec.Graders {
-		grader, err := graders.Create(graders.Type(vCfg.Kind), vCfg.Identifier, vCfg.Parameters)
+func (r *TestRunner) runGraders(ctx context.Context, plan *testPlan, gradersContext *graders.Context) (map[string]models.GraderResults, error) {
+	if plan.err != nil {
+		return nil, plan.err
+	}
+	graders.BatchAssertions(gradersContext, plan.graders)
 
+	graderResults := make(map[string]models.GraderResults, len(plan.graders))
+	for _, grader := range plan.graders {
+		result, err := grader.Grade(ctx, gradersContext)
 		if err != nil {
-			return nil, err
+			return nil, fmt.Errorf("failed to run grader %s: %w", grader.Name(), err)
 		}
 
-		result, err := grader.Grade(ctx, gradersContext)
+		graderResults[result.Name] = *result
+	}
 
-		if err != nil {
-			return nil, err
+	return graderResults, nil
+}
+
+// testPlan is the part of a trial that is the same for every run and model
+// of a test case: its execution request, with resource files already read,
+// and its graders, which hold no per-run state
+type testPlan struct {
+	once    sync.Once
+	request *execution.ExecutionRequest
+	graders []graders.Grader
+	// err is set when a grader couldn't be created; every trial reports it
+	err error
+}
+
+// plan returns the test case's plan. While a benchmark runs, each plan is
+// built once, on first use; outside of one it is built on every call.
+func (r *TestRunner) plan(tc *models.TestCase) *testPlan {
+	r.plansMu.Lock()
+	p, ok := r.plans[tc]
+	if !ok {
+		p = &testPlan{}
+		if r.plans != nil {
+			r.plans[tc] = p
 		}
+	}
+	r.plansMu.Unlock()
 
-		graderResults[result.Name] = *result
+	p.once.Do(func() {
+		p.request = r.buildExecutionRequest(tc)
+		p.graders, p.err = r.buildGraders(tc)
+	})
+	return p
+}
+
+// graderSetup is a grader as the spec or a test case configures it, with
+// its params resolved
+type graderSetup struct {
+	kind    string
+	name    string
+	params  map[string]any
+	memoize *bool
+}
+
+// specGraderSetups lists the spec's global graders
+func (r *TestRunner) specGraderSetups() []graderSetup {
+	spec := r.cfg.Spec()
+	setups := make([]graderSetup, 0, len(spec.Graders))
+	for _, vCfg := range spec.Graders {
+		setups = append(setups, graderSetup{
+			kind:    vCfg.Kind,
+			name:    vCfg.Identifier,
+			params:  r.graderParams(vCfg.Parameters, vCfg.ScriptPath, nil),
+			memoize: vCfg.Memoize,
+		})
 	}
+	return setups
+}
 
-	// Run test-specific validators
+// testGraderSetups lists the test case's own graders
+func (r *TestRunner) testGraderSetups(tc *models.TestCase) []graderSetup {
+	setups := make([]graderSetup, 0, len(tc.Validators))
 	for _, vCfg := range tc.Validators {
-		kind := vCfg.Kind
-		if kind == "" {
-			return nil, fmt.Errorf("no kind associated with grader %s", vCfg.Identifier)
-		}
+		setups = append(setups, graderSetup{
+			kind:    vCfg.Kind,
+			name:    vCfg.Identifier,
+			params:  r.graderParams(vCfg.Parameters, "", vCfg.Checks),
+			memoize: vCfg.Memoize,
+		})
+	}
+	return setups
+}
 
-		params := vCfg.Parameters
-		if params == nil {
-			params = make(map[string]any)
-		}
-		if len(vCfg.Checks) > 0 {
-			params["assertions"] = vCfg.Checks
+// buildGraders creates the spec's global graders followed by the test's own
+func (r *TestRunner) buildGraders(tc *models.TestCase) ([]graders.Grader, error) {
+	setups := append(r.specGraderSetups(), r.testGraderSetups(tc)...)
+	built := make([]graders.Grader, 0, len(setups))
+
+	for _, setup := range setups {
+		grader, err := r.createGrader(setup)
+		if err != nil {
+			return nil, fmt.Errorf("failed to create grader %s: %w", setup.name, err)
 		}
+		built = append(built, r.memoize(grader, setup))
+	}
 
-		grader, err := graders.Create(graders.Type(kind), vCfg.Identifier, params)
+	return built, nil
+}
 
-		if err != nil {
-			return nil, fmt.Errorf("failed to create grader %s: %w", vCfg.Identifier, err)
+// createGrader creates a grader on the benchmark's shared resources
+func (r *TestRunner) createGrader(setup graderSetup) (graders.Grader, error) {
+	if setup.kind == "" {
+		return nil, fmt.Errorf("no kind associated with grader %s", setup.name)
+	}
+	return graders.Create(graders.Type(setup.kind), setup.name, setup.params, r.graderOptions()...)
+}
+
+// graderParams copies a grader's config so concurrent runs never share a map,
+// folds in shorthand fields, and resolves script paths against the spec directory
+func (r *TestRunner) graderParams(configured map[string]any, scriptPath string, checks []string) map[string]any {
+	params := make(map[string]any, len(configured)+1)
+	for k, v := range configured {
+		params[k] = v
+	}
+
+	if len(checks) > 0 {
+		params["assertions"] = checks
+	}
+
+	if scriptPath != "" {
+		params["script"] = scriptPath
+	}
+
+	if script, ok := params["script"].(string); ok && script != "" && !filepath.IsAbs(script) {
+		baseDir := r.cfg.SpecDir()
+		if baseDir == "" {
+			baseDir = "."
 		}
+		params["script"] = filepath.Join(baseDir, script)
+	}
 
-		result, err := grader.Grade(ctx, gradersContext)
+	return params
+}
 
-		if err != nil {
-			return nil, fmt.Errorf("failed to run grader %s: %w", vCfg.Identifier, err)
+// graderWorkers decides how many Python worker processes the benchmark needs
+func (r *TestRunner) graderWorkers(testCases []*models.TestCase) int {
+	spec := r.cfg.Spec()
+	if spec.Config.GraderWorkers > 0 {
+		return spec.Config.GraderWorkers
+	}
+
+	usesScripts := false
+	for _, vCfg := range spec.Graders {
+		usesScripts = usesScripts || graders.Type(vCfg.Kind) == graders.TypePythonScript
+	}
+	for _, tc := range testCases {
+		for _, vCfg := range tc.Validators {
+			usesScripts = usesScripts || graders.Type(vCfg.Kind) == graders.TypePythonScript
 		}
+	}
 
-		graderResults[result.Name] = *result
+	if usesScripts {
+		// workers start on demand, so this only caps parallel grading
+		return runtime.NumCPU()
 	}
+	return 0
+}
 
-	return graderResults, nil
+// memoize makes a grader reuse its results for identical outputs during the
+// benchmark, if its type is deterministic or its config opts in
+func (r *TestRunner) memoize(grader graders.Grader, setup graderSetup) graders.Grader {
+	enabled := graders.Deterministic(graders.Type(setup.kind))
+	if setup.memoize != nil {
+		enabled = *setup.memoize
+	}
+	if r.memo == nil || !enabled {
+		return grader
+	}
+
+	config := struct {
+		Kind   string
+		Name   string
+		Params map[string]any
+	}{setup.kind, setup.name, setup.params}
+	return graders.Memoize(grader, config, r.memo)
 }
 
-func (r *TestRunner) buildSessionDigest(resp *execution.ExecutionResponse) models.SessionDigest {
-	toolsUsed := make([]string, 0)
-	for _, call := range resp.ToolCalls {
-		toolsUsed = append(toolsUsed, call.Name)
+// graderOptions returns the shared resources handed to every grader
+func (r *TestRunner) graderOptions() []graders.CreateOption {
+	if r.pythonPool == nil {
+		return nil
 	}
+	return []graders.CreateOption{graders.WithPythonPool(r.pythonPool)}
+}
 
-	return models.SessionDigest{
+func (r *TestRunner) buildSessionDigest(resp *execution.ExecutionResponse, toolCalls *graders.ToolCallIndex) models.SessionDigest {
+	digest := models.SessionDigest{
 		TotalTurns:    len(resp.Events),
-		ToolCallCount: len(resp.ToolCalls),
-		ToolsUsed:     toolsUsed,
+		ToolCallCount: toolCalls.Len(),
+		TokensIn:      resp.Usage.InputTokens,
+		TokensOut:     resp.Usage.OutputTokens,
+		TokensTotal:   resp.Usage.TotalTokens(),
+		ToolsUsed:     toolCalls.Names(),
 		Errors:        []string{},
 	}
+
+	if resp.BudgetViolation != nil {
+		digest.Errors = append(digest.Errors, resp.BudgetViolation.String())
+	}
+
+	return digest
 }
 
 func (r *TestRunner) buildTranscript(resp *execution.ExecutionResponse) []models.TranscriptEntry {
@@ -596,15 +1120,21 @@ func (r *TestRunner) computeTestStats(runs []models.RunResult) *models.TestStats
 			maxScore = score
 		}
 
-		if run.AllValidationsPassed() {
+		// a run can fail with every validation passing, as when it went over
+		// budget, so its status decides
+		if run.Status == "passed" {
 			passed++
 		}
 
 		totalDuration += run.DurationMs
 	}
 
+	passRateCI := stats.Wilson(passed, len(runs), stats.DefaultConfidence)
+
 	return &models.TestStats{
 		PassRate:      float64(passed) / float64(len(runs)),
+		PassRateLow:   passRateCI.Low,
+		PassRateHigh:  passRateCI.High,
 		AvgScore:      totalScore / float64(len(runs)),
 		MinScore:      minScore,
 		MaxScore:      maxScore,
@@ -612,13 +1142,14 @@ func (r *TestRunner) computeTestStats(runs []models.RunResult) *models.TestStats
 	}
 }
 
-func (r *TestRunner) buildOutcome(testOutcomes []models.TestOutcome, startTime time.Time) *models.EvaluationOutcome {
+func (r *TestRunner) buildOutcome(testOutcomes []models.TestOutcome, startTime time.Time, modelID string) *models.EvaluationOutcome {
 	spec := r.cfg.Spec()
 
 	// Compute digest
 	succeeded := 0
 	failed := 0
 	errors := 0
+	skipped := 0
 
 	for _, to := range testOutcomes {
 		switch to.Status {
@@ -628,6 +1159,8 @@ func (r *TestRunner) buildOutcome(testOutcomes []models.TestOutcome, startTime t
 			failed++
 		case "error":
 			errors++
+		case "skipped":
+			skipped++
 		}
 	}
 
@@ -640,14 +1173,20 @@ func (r *TestRunner) buildOutcome(testOutcomes []models.TestOutcome, startTime t
 	// Compute aggregate score
 	aggregateScore := r.computeAggregateScore(testOutcomes)
 
+	measures, composite := r.computeMeasures(testOutcomes)
+	metadata := make(map[string]any)
+	if composite != nil {
+		metadata["composite_score"] = composite
+	}
+
 	return &models.EvaluationOutcome{
-		RunID:       fmt.Sprintf("run-%d", time.Now().Unix()),
+		RunID:       newRunID(),
 		SkillTested: spec.SkillName,
 		BenchName:   spec.Name,
 		Timestamp:   startTime,
 		Setup: models.OutcomeSetup{
 			RunsPerTest: spec.Config.RunsPerTest,
-			ModelID:     spec.Config.ModelID,
+			ModelID:     modelID,
 			EngineType:  spec.Config.EngineType,
 			TimeoutSec:  spec.Config.TimeoutSec,
 		},
@@ -656,28 +1195,42 @@ func (r *TestRunner) buildOutcome(testOutcomes []models.TestOutcome, startTime t
 			Succeeded:      succeeded,
 			Failed:         failed,
 			Errors:         errors,
-			Skipped:        0,
+			Skipped:        skipped,
 			SuccessRate:    successRate,
 			AggregateScore: aggregateScore,
 			DurationMs:     time.Since(startTime).Milliseconds(),
+			RateLimit:      r.rateLimitDigest(),
+			GraderCache:    r.graderCacheDigest(),
 		},
-		Measures:     make(map[string]models.MeasureResult),
+		Measures:     measures,
 		TestOutcomes: testOutcomes,
-		Metadata:     make(map[string]any),
+		Metadata:     metadata,
 	}
 }
 
-func (r *TestRunner) computeAggregateScore(testOutcomes []models.TestOutcome) float64 {
-	if len(testOutcomes) == 0 {
-		return 0.0
+// newRunID returns an ID that is unique even among runs started in the same
+// second, by one process or several
+func newRunID() string {
+	var b [4]byte
+	if _, err := rand.Read(b[:]); err != nil {
+		return fmt.Sprintf("run-%d", time.Now().UnixNano())
 	}
+	return fmt.Sprintf("run-%d-%s", time.Now().UnixNano(), hex.EncodeToString(b[:]))
+}
 
-	totalScore := 0.0
-	for _, to := range testOutcomes {
+// computeAggregateScore is the mean test score, weighted by test weight
+func (r *TestRunner) computeAggregateScore(testOutcomes []models.TestOutcome) float64 {
+	scores := make([]float64, len(testOutcomes))
+	weights := make([]float64, len(testOutcomes))
+	for i, to := range testOutcomes {
 		if to.Stats != nil {
-			totalScore += to.Stats.AvgScore
+			scores[i] = to.Stats.AvgScore
+		}
+		weights[i] = to.Weight
+		if weights[i] <= 0 {
+			weights[i] = 1
 		}
 	}
 
-	return totalScore / float64(len(testOutcomes))
+	return stats.WeightedMean(scores, weights)
 }
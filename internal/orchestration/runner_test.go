@@ -0,0 +1,334 @@
+package orchestration
+
+import (
+	"context"
+	"os"
+	"path/filepath"
+	"testing"
+	"time"
+
+	"github.com/spboyer/waza/internal/config"
+	"github.com/spboyer/waza/internal/execution"
+	"github.com/spboyer/waza/internal/models"
+	"github.com/stretchr/testify/require"
+)
+
+func newMockRunner(t *testing.T, cfg models.Config) *TestRunner {
+	t.Helper()
+
+	spec := &models.BenchmarkSpec{
+		SpecIdentity: models.SpecIdentity{Name: "test-bench"},
+		SkillName:    "test-skill",
+		Config:       cfg,
+	}
+
+	engine := execution.NewMockEngine("test-model", execution.WithMockConfig(cfg.Mock))
+	require.NoError(t, engine.Initialize(context.Background()))
+
+	return NewTestRunner(config.NewBenchmarkConfig(spec), engine)
+}
+
+func testCases(ids ...string) []*models.TestCase {
+	var tcs []*models.TestCase
+	for _, id := range ids {
+		tcs = append(tcs, &models.TestCase{TestID: id, DisplayName: id})
+	}
+	return tcs
+}
+
+func TestStreamTrials_BoundsConcurrencyAcrossTrials(t *testing.T) {
+	runner := newMockRunner(t, models.Config{
+		RunsPerTest: 4,
+		TimeoutSec:  10,
+		Workers:     8,
+		Mock: &models.MockConfig{
+			Latency: models.MockLatency{MeanMs: 100},
+		},
+	})
+
+	start := time.Now()
+	counts := map[int]int{}
+	for res := range runner.StreamTrials(context.Background(), testCases("a", "b")) {
+		require.Equal(t, "passed", res.Run.Status)
+		counts[res.TestIndex]++
+	}
+
+	// 8 trials of 100ms each with 8 workers run side by side
+	require.Less(t, time.Since(start), 400*time.Millisecond)
+	require.Equal(t, map[int]int{0: 4, 1: 4}, counts)
+}
+
+func TestStreamTrials_StopsOnCancel(t *testing.T) {
+	runner := newMockRunner(t, models.Config{
+		RunsPerTest: 10,
+		TimeoutSec:  10,
+		Workers:     1,
+		Mock: &models.MockConfig{
+			Latency: models.MockLatency{MeanMs: 20},
+		},
+	})
+
+	ctx, cancel := context.WithCancel(context.Background())
+	defer cancel()
+
+	delivered := 0
+	for range runner.StreamTrials(ctx, testCases("a")) {
+		delivered++
+		cancel()
+	}
+
+	require.Less(t, delivered, 10)
+}
+
+func TestStreamTrials_CancelReleasesBlockedWorkers(t *testing.T) {
+	runner := newMockRunner(t, models.Config{
+		RunsPerTest: 10,
+		TimeoutSec:  10,
+		Workers:     1,
+		Mock: &models.MockConfig{
+			Latency: models.MockLatency{MeanMs: 1},
+		},
+	})
+
+	ctx, cancel := context.WithCancel(context.Background())
+	results := runner.StreamTrials(ctx, testCases("a"))
+
+	// nobody reads: the buffer fills and the worker blocks on its next result
+	time.Sleep(100 * time.Millisecond)
+	cancel()
+	time.Sleep(50 * time.Millisecond)
+
+	delivered := 0
+	done := make(chan struct{})
+	go func() {
+		defer close(done)
+		for range results {
+			delivered++
+		}
+	}()
+
+	select {
+	case <-done:
+	case <-time.After(5 * time.Second):
+		require.Fail(t, "results channel not closed after cancel")
+	}
+	// only the buffered result; the blocked one was dropped on cancel
+	require.Equal(t, 1, delivered)
+}
+
+func TestRunConcurrent_OrdersRuns(t *testing.T) {
+	runner := newMockRunner(t, models.Config{
+		RunsPerTest: 3,
+		TimeoutSec:  10,
+		Workers:     3,
+		Mock: &models.MockConfig{
+			Seed:    1,
+			Latency: models.MockLatency{Distribution: models.LatencyUniform, MinMs: 1, MaxMs: 30},
+		},
+	})
+
+	outcomes := runner.runConcurrent(context.Background(), testCases("a", "b"))
+	require.Len(t, outcomes, 2)
+
+	for _, outcome := range outcomes {
+		require.Equal(t, "passed", outcome.Status)
+		require.Len(t, outcome.Runs, 3)
+		for i, run := range outcome.Runs {
+			require.Equal(t, i+1, run.RunNumber)
+		}
+	}
+}
+
+func TestExecuteRun_BudgetViolationFailsRun(t *testing.T) {
+	runner := newMockRunner(t, models.Config{
+		RunsPerTest: 1,
+		TimeoutSec:  10,
+		Mock: &models.MockConfig{
+			Output: "done",
+			ToolCalls: []models.MockToolCall{
+				{Name: "bash", Arguments: map[string]any{"command": "ls"}, Count: 5},
+			},
+		},
+	})
+
+	tc := &models.TestCase{TestID: "runaway", DisplayName: "runaway"}
+	tc.Stimulus.Message = "go"
+	tc.Expectation.BehaviorRules.MaxToolInvocations = 2
+
+	run := runner.executeRun(context.Background(), runner.engine, tc, 1)
+	require.Equal(t, "failed", run.Status)
+	require.Equal(t, &models.BudgetViolation{Budget: "max_tool_calls", Limit: 2, Actual: 3}, run.BudgetViolation)
+	require.Equal(t, 3, run.SessionDigest.ToolCallCount)
+	require.Equal(t, []string{"budget exceeded: max_tool_calls 3 > 2"}, run.SessionDigest.Errors)
+
+	// without the budget the session completes and reports its token usage
+	tc.Expectation.BehaviorRules.MaxToolInvocations = 0
+
+	run = runner.executeRun(context.Background(), runner.engine, tc, 2)
+	require.Equal(t, "passed", run.Status)
+	require.Nil(t, run.BudgetViolation)
+	require.Equal(t, 1, run.SessionDigest.TokensIn)
+	require.Equal(t, 1, run.SessionDigest.TokensOut)
+	require.Equal(t, 2, run.SessionDigest.TokensTotal)
+}
+
+func TestComputeTestStats_CountsOnlyPassedRuns(t *testing.T) {
+	runner := newMockRunner(t, models.Config{RunsPerTest: 1, TimeoutSec: 10})
+
+	validations := map[string]models.GraderResults{"check": {Name: "check", Score: 1, Passed: true}}
+	testStats := runner.computeTestStats([]models.RunResult{
+		{Status: "passed", Validations: validations},
+		// every grader passed, but the session was cut short
+		{Status: "failed", Validations: validations, BudgetViolation: &models.BudgetViolation{Budget: "max_tokens"}},
+		{Status: "error", ErrorMsg: "session failed"},
+	})
+
+	require.InDelta(t, 1.0/3, testStats.PassRate, 1e-9)
+	require.Less(t, testStats.PassRateHigh, 1.0)
+}
+
+func TestComputeMeasures(t *testing.T) {
+	runner := newMockRunner(t, models.Config{RunsPerTest: 1, TimeoutSec: 10})
+	disabled := false
+	runner.cfg.Spec().Metrics = []models.MeasurementDef{
+		{Identifier: "task_completion", Weight: 0.5, Cutoff: 0.8},
+		{Identifier: "behavior_quality", Weight: 0.25, Cutoff: 0.5},
+		{Identifier: "explanation", Weight: 0.25, Cutoff: 0.5, Graders: []string{"clarity", "accuracy"}},
+		{Identifier: "unmeasured", Weight: 1, Cutoff: 0.5},
+		{Identifier: "disabled", Weight: 1, Cutoff: 0.5, Graders: []string{"clarity"}, Enabled: &disabled},
+	}
+
+	graded := func(status string, clarity, accuracy float64) models.RunResult {
+		return models.RunResult{
+			Status: status,
+			Validations: map[string]models.GraderResults{
+				"clarity":  {Name: "clarity", Score: clarity},
+				"accuracy": {Name: "accuracy", Score: accuracy},
+			},
+		}
+	}
+
+	outcomes := []models.TestOutcome{
+		{TestID: "a", Runs: []models.RunResult{
+			graded("passed", 1, 1),
+			graded("passed", 1, 0.5),
+		}},
+		{TestID: "b", Runs: []models.RunResult{
+			graded("failed", 0.5, 0.5),
+			{Status: "failed", BudgetViolation: &models.BudgetViolation{Budget: "max_tokens"}},
+		}},
+	}
+
+	measures, composite := runner.computeMeasures(outcomes)
+	require.Len(t, measures, 3)
+	require.NotContains(t, measures, "unmeasured")
+	require.NotContains(t, measures, "disabled", "disabled metrics are neither reported nor in the composite")
+
+	completion := measures["task_completion"]
+	require.Equal(t, 0.5, completion.Value)
+	require.False(t, completion.Passed)
+	require.Equal(t, 4, completion.Details["trials"])
+	require.InDelta(t, 0.1500, completion.Details["ci_low"], 1e-4)
+	require.InDelta(t, 0.8500, completion.Details["ci_high"], 1e-4)
+
+	behavior := measures["behavior_quality"]
+	require.Equal(t, 0.75, behavior.Value)
+	require.True(t, behavior.Passed)
+
+	explanation := measures["explanation"]
+	require.Equal(t, 3, explanation.Details["trials"], "trial without graders is not measured")
+	require.InDelta(t, 0.75, explanation.Value, 1e-12)
+	require.True(t, explanation.Passed)
+
+	// per trial: (0.5*1 + 0.25*1 + 0.25*1), (0.5 + 0.25 + 0.25*0.75),
+	// (0 + 0.25 + 0.25*0.5) and (0 + 0) / 0.75
+	require.InDelta(t, (1+0.9375+0.375+0)/4, composite["score"], 1e-12)
+	require.LessOrEqual(t, composite["ci_low"], composite["score"])
+	require.GreaterOrEqual(t, composite["ci_high"], composite["score"])
+
+	again, _ := runner.computeMeasures(outcomes)
+	require.Equal(t, measures, again, "intervals are reproducible")
+}
+
+func TestComputeTestStats_PassRateInterval(t *testing.T) {
+	runner := newMockRunner(t, models.Config{RunsPerTest: 1, TimeoutSec: 10})
+
+	runs := make([]models.RunResult, 10)
+	for i := range runs {
+		runs[i].Status = "failed"
+		if i < 8 {
+			runs[i].Status = "passed"
+		}
+		runs[i].Validations = map[string]models.GraderResults{
+			"check": {Score: 1, Passed: i < 8},
+		}
+	}
+
+	testStats := runner.computeTestStats(runs)
+	require.Equal(t, 0.8, testStats.PassRate)
+	require.InDelta(t, 0.4902, testStats.PassRateLow, 1e-4)
+	require.InDelta(t, 0.9433, testStats.PassRateHigh, 1e-4)
+}
+
+func TestComputeAggregateScore_Weighted(t *testing.T) {
+	runner := newMockRunner(t, models.Config{RunsPerTest: 1, TimeoutSec: 10})
+
+	outcomes := []models.TestOutcome{
+		{TestID: "common", Stats: &models.TestStats{AvgScore: 1}, Weight: 3},
+		{TestID: "rare", Stats: &models.TestStats{AvgScore: 0}},
+	}
+	require.Equal(t, 0.75, runner.computeAggregateScore(outcomes))
+	require.Equal(t, 0.0, runner.computeAggregateScore(nil))
+}
+
+func TestRunBenchmark_MemoizesGraderResults(t *testing.T) {
+	dir := t.TempDir()
+	for _, id := range []string{"one", "two"} {
+		task := "id: " + id + "\nname: " + id + "\ninputs:\n  prompt: go\n"
+		require.NoError(t, os.WriteFile(filepath.Join(dir, id+".yaml"), []byte(task), 0644))
+	}
+
+	memoize := false
+	spec := &models.BenchmarkSpec{
+		SpecIdentity: models.SpecIdentity{Name: "memo"},
+		SkillName:    "test-skill",
+		Config: models.Config{
+			RunsPerTest: 3,
+			TimeoutSec:  10,
+			Mock:        &models.MockConfig{Output: "done"},
+		},
+		Graders: []models.GraderConfig{
+			{Kind: "regex", Identifier: "says_done", Parameters: map[string]any{"must_match": []string{"done"}}},
+			{Kind: "regex", Identifier: "uncached", Parameters: map[string]any{"must_match": []string{"done"}}, Memoize: &memoize},
+		},
+		Tasks: []string{"*.yaml"},
+	}
+	engine := execution.NewMockEngine("test-model", execution.WithMockConfig(spec.Config.Mock))
+	runner := NewTestRunner(config.NewBenchmarkConfig(spec, config.WithSpecDir(dir)), engine)
+
+	outcome, err := runner.RunBenchmark(context.Background())
+	require.NoError(t, err)
+
+	// every trial of both tasks says the same, so it's graded once
+	require.Equal(t, &models.GraderCacheDigest{Hits: 5, Misses: 1}, outcome.Digest.GraderCache)
+	cached := 0
+	for _, to := range outcome.TestOutcomes {
+		for _, run := range to.Runs {
+			require.True(t, run.Validations["says_done"].Passed)
+			require.False(t, run.Validations["uncached"].Cached)
+			if run.Validations["says_done"].Cached {
+				cached++
+			}
+		}
+	}
+	require.Equal(t, 5, cached)
+}
+
+func TestNewRunID_Unique(t *testing.T) {
+	seen := map[string]bool{}
+	for i := 0; i < 1000; i++ {
+		id := newRunID()
+		require.False(t, seen[id], id)
+		seen[id] = true
+	}
+}
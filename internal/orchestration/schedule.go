@@ -0,0 +1,138 @@
+package orchestration
+
+import (
+	"sort"
+	"time"
+
+	"github.com/spboyer/waza/internal/models"
+)
+
+// defaultWorkers is the number of trials in flight when max_workers isn't set
+const defaultWorkers = 4
+
+// maxDurationSamples is how many of a test's most recent trial durations
+// its expected duration is taken from
+const maxDurationSamples = 10
+
+// DurationHistory collects how long trials of each test took in earlier
+// runs, so the next run can schedule its longest trials first
+type DurationHistory struct {
+	samples map[string][]int64
+}
+
+// NewDurationHistory creates an empty history
+func NewDurationHistory() *DurationHistory {
+	return &DurationHistory{samples: make(map[string][]int64)}
+}
+
+// Add records one trial of a test. Add trials oldest first: only the most
+// recent ones are kept.
+func (h *DurationHistory) Add(testID string, durationMs int64) {
+	if durationMs <= 0 {
+		return
+	}
+	samples := append(h.samples[testID], durationMs)
+	if len(samples) > maxDurationSamples {
+		samples = samples[len(samples)-maxDurationSamples:]
+	}
+	h.samples[testID] = samples
+}
+
+// AddOutcome records every trial of an earlier outcome
+func (h *DurationHistory) AddOutcome(outcome *models.EvaluationOutcome) {
+	for _, to := range outcome.TestOutcomes {
+		for _, run := range to.Runs {
+			h.Add(to.TestID, run.DurationMs)
+		}
+	}
+}
+
+// Expected returns the median recorded duration of a trial of a test
+func (h *DurationHistory) Expected(testID string) (time.Duration, bool) {
+	if h == nil || len(h.samples[testID]) == 0 {
+		return 0, false
+	}
+	sorted := append([]int64(nil), h.samples[testID]...)
+	sort.Slice(sorted, func(i, j int) bool { return sorted[i] < sorted[j] })
+
+	n := len(sorted)
+	median := sorted[n/2]
+	if n%2 == 0 {
+		median = (sorted[n/2-1] + sorted[n/2]) / 2
+	}
+	return time.Duration(median) * time.Millisecond, true
+}
+
+// trialSlot is one trial of one test, in the order workers pick them up
+type trialSlot struct {
+	testIndex int
+	runNum    int
+}
+
+// trialSchedule is the order a benchmark's trials run in, and the duration
+// each is expected to take
+type trialSchedule struct {
+	slots    []trialSlot
+	expected []time.Duration // by test index
+	known    int             // tests with a recorded duration
+}
+
+// scheduleTrials orders every trial of testCases longest expected first, so
+// a slow test isn't picked up last and left to run on its own while the
+// other workers sit idle. Among tests expected to take as long as each other,
+// trials go round-robin - every test's first trial before any second one - so
+// one test's trials don't all end up at the back of the queue. Tests with no
+// history are expected to take the mean of those with one, and without any
+// history every test is, leaving the round-robin order.
+func scheduleTrials(testCases []*models.TestCase, runsPerTest int, history *DurationHistory) *trialSchedule {
+	s := &trialSchedule{expected: make([]time.Duration, len(testCases))}
+
+	known := make([]bool, len(testCases))
+	var total time.Duration
+	for i, tc := range testCases {
+		if d, ok := history.Expected(tc.TestID); ok {
+			s.expected[i], known[i] = d, true
+			total += d
+			s.known++
+		}
+	}
+	if s.known > 0 {
+		mean := total / time.Duration(s.known)
+		for i := range testCases {
+			if !known[i] {
+				s.expected[i] = mean
+			}
+		}
+	}
+
+	s.slots = make([]trialSlot, 0, len(testCases)*runsPerTest)
+	for runNum := 1; runNum <= runsPerTest; runNum++ {
+		for i := range testCases {
+			s.slots = append(s.slots, trialSlot{testIndex: i, runNum: runNum})
+		}
+	}
+	sort.SliceStable(s.slots, func(a, b int) bool {
+		return s.expected[s.slots[a].testIndex] > s.expected[s.slots[b].testIndex]
+	})
+	return s
+}
+
+// makespan predicts the wall time of running the schedule on the given
+// number of workers, each picking up the next trial as soon as it is free
+func (s *trialSchedule) makespan(workers int) time.Duration {
+	free := make([]time.Duration, workers)
+	var end time.Duration
+	for _, slot := range s.slots {
+		next := 0
+		for w := range free {
+			if free[w] < free[next] {
+				next = w
+			}
+		}
+		free[next] += s.expected[slot.testIndex]
+		if free[next] > end {
+			end = free[next]
+		}
+	}
+	return end
+}
@@ -0,0 +1,110 @@
+package orchestration
+
+import (
+	"context"
+	"path/filepath"
+	"testing"
+	"time"
+
+	"github.com/spboyer/waza/internal/config"
+	"github.com/spboyer/waza/internal/execution"
+	"github.com/spboyer/waza/internal/models"
+	"github.com/stretchr/testify/require"
+)
+
+func TestDurationHistory_MedianOfRecent(t *testing.T) {
+	h := NewDurationHistory()
+	h.Add("a", 100)
+	h.Add("a", 300)
+	h.Add("a", 200)
+	h.Add("b", 0) // unrecorded durations are skipped
+
+	d, ok := h.Expected("a")
+	require.True(t, ok)
+	require.Equal(t, 200*time.Millisecond, d)
+	_, ok = h.Expected("b")
+	require.False(t, ok)
+
+	// only the latest samples count
+	for i := 0; i < maxDurationSamples; i++ {
+		h.Add("a", 1000)
+	}
+	d, _ = h.Expected("a")
+	require.Equal(t, time.Second, d)
+}
+
+func TestScheduleTrials(t *testing.T) {
+	tcs := testCases("a", "b", "c")
+
+	t.Run("round-robin without history", func(t *testing.T) {
+		s := scheduleTrials(tcs, 2, nil)
+		require.Equal(t, []trialSlot{{0, 1}, {1, 1}, {2, 1}, {0, 2}, {1, 2}, {2, 2}}, s.slots)
+		require.Zero(t, s.known)
+	})
+
+	t.Run("longest expected first", func(t *testing.T) {
+		h := NewDurationHistory()
+		h.Add("a", 10)
+		h.Add("c", 30)
+
+		s := scheduleTrials(tcs, 2, h)
+		// b has no history and is expected to take the mean, 20ms
+		require.Equal(t, []trialSlot{{2, 1}, {2, 2}, {1, 1}, {1, 2}, {0, 1}, {0, 2}}, s.slots)
+		require.Equal(t, 2, s.known)
+		require.Equal(t, 60*time.Millisecond, s.makespan(2))
+		require.Equal(t, 120*time.Millisecond, s.makespan(1))
+	})
+}
+
+func TestStreamTrials_LongestExpectedFirst(t *testing.T) {
+	runner := newMockRunner(t, models.Config{
+		RunsPerTest: 2,
+		TimeoutSec:  10,
+		Workers:     1,
+		Mock: &models.MockConfig{
+			Latency: models.MockLatency{MeanMs: 5},
+		},
+	})
+	runner.history = NewDurationHistory()
+	runner.history.Add("fast", 5)
+	runner.history.Add("slow", 50)
+
+	var order []string
+	for res := range runner.StreamTrials(context.Background(), testCases("fast", "slow")) {
+		order = append(order, res.TestCase.TestID)
+	}
+	require.Equal(t, []string{"slow", "slow", "fast", "fast"}, order)
+
+	schedule := runner.scheduleDigest(testCases("fast", "slow"), runner.parallelWorkers(), 42*time.Millisecond)
+	require.Equal(t, &models.ScheduleDigest{Workers: 1, KnownTests: 2, PredictedMs: 110, ActualMs: 42}, schedule)
+}
+
+func TestRunBenchmark_ScheduleUsesParallelWorkers(t *testing.T) {
+	dir := t.TempDir()
+	writeFile(t, filepath.Join(dir, "tasks", "a.yaml"), "id: a\nname: A\ninputs:\n  prompt: explain a\n")
+
+	spec := &models.BenchmarkSpec{
+		SpecIdentity: models.SpecIdentity{Name: "scheduled"},
+		SkillName:    "test-skill",
+		Config: models.Config{
+			RunsPerTest: 2,
+			TimeoutSec:  10,
+			Concurrent:  true,
+			Workers:     1,
+			RateLimit:   &models.RateLimitConfig{Adaptive: true, MaxConcurrency: 4},
+		},
+		Tasks: []string{"tasks/*.yaml"},
+	}
+	history := NewDurationHistory()
+	history.Add("a", 10)
+
+	cfg := config.NewBenchmarkConfig(spec, config.WithSpecDir(dir))
+	runner := NewTestRunner(cfg, execution.NewMockEngine("test-model"), WithDurationHistory(history))
+
+	outcome, err := runner.RunBenchmark(context.Background())
+	require.NoError(t, err)
+	// the adaptive limit lets the pool grow past max_workers
+	require.NotNil(t, outcome.Digest.Schedule)
+	require.Equal(t, 4, outcome.Digest.Schedule.Workers)
+	require.Equal(t, int64(10), outcome.Digest.Schedule.PredictedMs)
+}
@@ -0,0 +1,149 @@
+package orchestration
+
+import (
+	"context"
+	"fmt"
+	"sync"
+	"time"
+
+	"github.com/spboyer/waza/internal/execution"
+	"github.com/spboyer/waza/internal/models"
+)
+
+// Trigger evaluation defaults
+const (
+	DefaultTriggerWorkers = 16
+	DefaultTriggerTimeout = 120
+)
+
+// TriggerOptions controls a trigger evaluation
+type TriggerOptions struct {
+	// Workers is how many prompts run at once; 0 means DefaultTriggerWorkers
+	Workers int
+	// TimeoutSec bounds each prompt's session; 0 means DefaultTriggerTimeout
+	TimeoutSec int
+}
+
+// RunTriggers runs every prompt of suite and reports how well the engine's
+// agent activates the skill. Only activation matters, so each session ends
+// as soon as an ActivationDetector can tell whether the skill was loaded,
+// usually well before the agent would answer. Prompts run concurrently on a
+// pool of workers; results keep the suite's order, prompts that should
+// trigger first.
+func RunTriggers(ctx context.Context, engine execution.AgentEngine, suite *models.TriggerSuite, opts TriggerOptions) *models.TriggerReport {
+	if opts.Workers <= 0 {
+		opts.Workers = DefaultTriggerWorkers
+	}
+	if opts.TimeoutSec <= 0 {
+		opts.TimeoutSec = DefaultTriggerTimeout
+	}
+
+	start := time.Now()
+	results := make([]models.TriggerResult, 0, len(suite.ShouldTrigger)+len(suite.ShouldNotTrigger))
+	for _, p := range suite.ShouldTrigger {
+		results = append(results, models.TriggerResult{Prompt: p.Prompt, Confidence: p.Confidence, Expected: true})
+	}
+	for _, p := range suite.ShouldNotTrigger {
+		results = append(results, models.TriggerResult{Prompt: p.Prompt, Confidence: p.Confidence})
+	}
+
+	jobs := make(chan int)
+	var wg sync.WaitGroup
+	for w := 0; w < opts.Workers && w < len(results); w++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for i := range jobs {
+				runTrigger(ctx, engine, suite.Skill, i, opts.TimeoutSec, &results[i])
+			}
+		}()
+	}
+
+queue:
+	for i := range results {
+		select {
+		case jobs <- i:
+		case <-ctx.Done():
+			for ; i < len(results); i++ {
+				results[i].ErrorMsg = ctx.Err().Error()
+			}
+			break queue
+		}
+	}
+	close(jobs)
+	wg.Wait()
+
+	report := summarizeTriggers(suite.Skill, results)
+	report.DurationMs = time.Since(start).Milliseconds()
+	return report
+}
+
+// runTrigger runs one prompt and records whether it activated skill
+func runTrigger(ctx context.Context, engine execution.AgentEngine, skill string, index, timeoutSec int, result *models.TriggerResult) {
+	start := time.Now()
+	detector := execution.NewActivationDetector(skill)
+
+	resp, err := engine.Execute(ctx, &execution.ExecutionRequest{
+		TestID:     fmt.Sprintf("trigger-%03d", index+1),
+		Message:    result.Prompt,
+		SkillName:  skill,
+		TimeoutSec: timeoutSec,
+		StopWhen:   detector.Observe,
+	})
+	result.DurationMs = time.Since(start).Milliseconds()
+	if err != nil {
+		result.ErrorMsg = err.Error()
+		return
+	}
+
+	// replay the events on a fresh detector: the engine may have ignored
+	// StopWhen, and late events may still reach the first one
+	replay := execution.NewActivationDetector(skill)
+	for _, evt := range resp.Events {
+		if replay.Observe(evt) {
+			break
+		}
+	}
+
+	switch {
+	case replay.Decided():
+		result.Triggered = replay.Activated()
+	case resp.ErrorMsg != "":
+		result.ErrorMsg = resp.ErrorMsg
+	}
+}
+
+// summarizeTriggers counts results into a confusion matrix and derives the
+// report's rates from it
+func summarizeTriggers(skill string, results []models.TriggerResult) *models.TriggerReport {
+	report := &models.TriggerReport{Skill: skill, Results: results}
+	for _, r := range results {
+		switch {
+		case r.ErrorMsg != "":
+			report.Errors++
+		case r.Expected && r.Triggered:
+			report.TruePositives++
+		case r.Expected:
+			report.FalseNegatives++
+		case r.Triggered:
+			report.FalsePositives++
+		default:
+			report.TrueNegatives++
+		}
+	}
+
+	tp, fp, tn, fn := float64(report.TruePositives), float64(report.FalsePositives), float64(report.TrueNegatives), float64(report.FalseNegatives)
+	report.Precision = ratio(tp, tp+fp)
+	report.Recall = ratio(tp, tp+fn)
+	report.F1 = ratio(2*report.Precision*report.Recall, report.Precision+report.Recall)
+	report.Accuracy = ratio(tp+tn, tp+fp+tn+fn)
+	return report
+}
+
+// ratio is a/b, or 0 when b is 0
+func ratio(a, b float64) float64 {
+	if b == 0 {
+		return 0
+	}
+	return a / b
+}
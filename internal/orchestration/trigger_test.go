@@ -0,0 +1,100 @@
+package orchestration
+
+import (
+	"context"
+	"strings"
+	"sync/atomic"
+	"testing"
+
+	"github.com/spboyer/waza/internal/execution"
+	"github.com/spboyer/waza/internal/models"
+	"github.com/stretchr/testify/require"
+)
+
+// triggerEngine loads the skill for prompts mentioning "explain", fails
+// prompts mentioning "crash" and counts the events it didn't get to send
+type triggerEngine struct {
+	skipped atomic.Int64
+}
+
+func (e *triggerEngine) Initialize(ctx context.Context) error { return nil }
+func (e *triggerEngine) Shutdown(ctx context.Context) error   { return nil }
+
+func (e *triggerEngine) Execute(ctx context.Context, req *execution.ExecutionRequest) (*execution.ExecutionResponse, error) {
+	if err := ctx.Err(); err != nil {
+		return nil, err
+	}
+	if strings.Contains(req.Message, "crash") {
+		return &execution.ExecutionResponse{ErrorMsg: "agent crashed"}, nil
+	}
+
+	events := []execution.SessionEvent{{EventType: "assistant.turn_start"}}
+	if strings.Contains(req.Message, "explain") {
+		events = append(events, execution.SessionEvent{
+			EventType: "tool.execution_start",
+			Payload:   map[string]any{"toolName": execution.SkillTool, "arguments": map[string]any{"skill": req.SkillName}},
+		})
+	}
+	events = append(events,
+		execution.SessionEvent{EventType: "assistant.message"},
+		execution.SessionEvent{EventType: "assistant.turn_end"},
+		execution.SessionEvent{EventType: "session.idle"},
+	)
+
+	resp := &execution.ExecutionResponse{Success: true}
+	for i, evt := range events {
+		resp.Events = append(resp.Events, evt)
+		if req.StopWhen(evt) {
+			e.skipped.Add(int64(len(events) - i - 1))
+			break
+		}
+	}
+	return resp, nil
+}
+
+func TestRunTriggers(t *testing.T) {
+	suite := &models.TriggerSuite{
+		Skill: "code-explainer",
+		ShouldTrigger: []models.TriggerPrompt{
+			{Prompt: "explain this code", Confidence: "high"},
+			{Prompt: "please explain the loop"},
+			{Prompt: "what does this do"},
+			{Prompt: "crash now"},
+		},
+		ShouldNotTrigger: []models.TriggerPrompt{
+			{Prompt: "write a sort function"},
+			{Prompt: "explain your pricing"},
+		},
+	}
+
+	engine := &triggerEngine{}
+	report := RunTriggers(context.Background(), engine, suite, TriggerOptions{Workers: 3})
+
+	require.Equal(t, "code-explainer", report.Skill)
+	require.Len(t, report.Results, 6)
+	require.Equal(t, "explain this code", report.Results[0].Prompt)
+	require.True(t, report.Results[0].Correct())
+	require.Equal(t, "agent crashed", report.Results[3].ErrorMsg)
+
+	require.Equal(t, 2, report.TruePositives)
+	require.Equal(t, 1, report.FalseNegatives)
+	require.Equal(t, 1, report.FalsePositives)
+	require.Equal(t, 1, report.TrueNegatives)
+	require.Equal(t, 1, report.Errors)
+	require.InDelta(t, 2.0/3, report.Precision, 1e-9)
+	require.InDelta(t, 2.0/3, report.Recall, 1e-9)
+	require.InDelta(t, 2.0/3, report.F1, 1e-9)
+	require.InDelta(t, 3.0/5, report.Accuracy, 1e-9)
+
+	// every session stopped at the skill call or the end of the first turn
+	require.Equal(t, int64(11), engine.skipped.Load())
+}
+
+func TestRunTriggers_Canceled(t *testing.T) {
+	ctx, cancel := context.WithCancel(context.Background())
+	cancel()
+
+	suite := &models.TriggerSuite{Skill: "s", ShouldTrigger: []models.TriggerPrompt{{Prompt: "explain"}, {Prompt: "explain more"}}}
+	report := RunTriggers(ctx, &triggerEngine{}, suite, TriggerOptions{})
+	require.Equal(t, 2, report.Errors)
+}
@@ -0,0 +1,544 @@
+package orchestration
+
+import (
+	"context"
+	"errors"
+	"fmt"
+	"os"
+	"path/filepath"
+	"sort"
+	"sync"
+	"time"
+
+	"github.com/spboyer/waza/internal/execution"
+	"github.com/spboyer/waza/internal/graders"
+	"github.com/spboyer/waza/internal/models"
+)
+
+// DefaultWatchInterval is how often Watch looks for changed files
+const DefaultWatchInterval = 500 * time.Millisecond
+
+// ErrSpecChanged is returned by Watch when the spec file itself changed. The
+// spec decides the engine, graders and tasks, so callers reload it and watch
+// again.
+var ErrSpecChanged = errors.New("spec file changed")
+
+// WatchRound is one pass of Watch: the first runs every test, later ones
+// only the tests affected by the files that changed
+type WatchRound struct {
+	Round int
+	// Files are the changed files that started the round
+	Files []string
+	// Outcome holds the latest results of every test, re-run or not
+	Outcome *models.EvaluationOutcome
+	// Rerun and Regraded list the test IDs that were executed again, and
+	// those whose cached sessions were only graded again
+	Rerun    []string
+	Regraded []string
+	// Changes compares each affected test with its previous results
+	Changes []TestChange
+	// Errors are task files that failed to load; their tests are left out
+	// until they are fixed
+	Errors []error
+}
+
+// TestChange is a test's status and score before and after a round. Before
+// is empty for new tests and After for removed ones.
+type TestChange struct {
+	TestID      string
+	DisplayName string
+	Before      string
+	After       string
+	BeforeScore float64
+	AfterScore  float64
+}
+
+// Watch runs the benchmark, then watches the files it depends on and re-runs
+// only what a change affects, calling report after every round. The engine,
+// rate limiter and grader cache stay up and parsed tasks and grader plans
+// stay resident between rounds:
+//   - a changed task file is reloaded and its test re-run
+//   - a changed fixture re-runs the tests that load it
+//   - a changed SKILL.md, next to the spec or one directory up, re-runs
+//     every test
+//   - a changed grader script re-grades the sessions cached from the last
+//     run of the tests that use it, without running the agent again
+//
+// Files are polled every interval. Watch returns nil once ctx is cancelled,
+// and ErrSpecChanged when specPath changes. Multi-model specs aren't
+// supported.
+func (r *TestRunner) Watch(ctx context.Context, specPath string, interval time.Duration, report func(*WatchRound)) error {
+	if len(r.cfg.Spec().Config.Models) > 0 {
+		return fmt.Errorf("watch mode runs a single model; the spec lists %d", len(r.cfg.Spec().Config.Models))
+	}
+	if interval <= 0 {
+		interval = DefaultWatchInterval
+	}
+
+	if err := r.engine.Initialize(ctx); err != nil {
+		return fmt.Errorf("failed to initialize engine: %w", err)
+	}
+	defer func() {
+		if err := r.engine.Shutdown(ctx); err != nil {
+			fmt.Printf("warning: failed to shutdown engine: %v\n", err)
+		}
+	}()
+
+	// grader workers start in the first round, once tasks are loaded
+	cleanup := r.prepare(nil)
+	r.responses = newResponseCache()
+	defer func() {
+		r.responses = nil
+		cleanup()
+	}()
+
+	w := &watch{runner: r, specPath: normPath(specPath), tests: make(map[string]*watchedTest)}
+
+	// the first round loads every task file; files changed while a round
+	// runs are picked up by the next one
+	var changed []string
+	for _, path := range w.poll() {
+		if path != w.specPath {
+			changed = append(changed, path)
+		}
+	}
+	round := w.apply(ctx, changed)
+	if len(w.tests) == 0 && len(round.Errors) == 0 {
+		return fmt.Errorf("no test cases found")
+	}
+
+	for n := 0; ; n++ {
+		if ctx.Err() != nil {
+			return nil
+		}
+		round.Round = n
+		report(round)
+
+		changed, ok := w.wait(ctx, interval)
+		if !ok {
+			return nil
+		}
+		for _, path := range changed {
+			if path == w.specPath {
+				return ErrSpecChanged
+			}
+		}
+		round = w.apply(ctx, changed)
+	}
+}
+
+// watch is the state Watch keeps between rounds
+type watch struct {
+	runner   *TestRunner
+	specPath string
+
+	// tests by task file, and the task files in the spec's order
+	tests map[string]*watchedTest
+	order []string
+
+	// stamps are the watched files as last seen
+	stamps map[string]fileStamp
+	// deps maps a file to the tests that depend on it
+	deps map[string][]dependent
+}
+
+type watchedTest struct {
+	tc      *models.TestCase
+	outcome *models.TestOutcome
+}
+
+// dependent is a test, or every test when test is nil, affected by a file
+type dependent struct {
+	test *watchedTest
+	// regrade is set when re-grading cached sessions is enough
+	regrade bool
+}
+
+type fileStamp struct {
+	modTime int64
+	size    int64
+}
+
+// wait polls until files change and have settled, since editors often save
+// in several steps. It reports false if ctx is cancelled first.
+func (w *watch) wait(ctx context.Context, interval time.Duration) ([]string, bool) {
+	var changed []string
+	for len(changed) == 0 {
+		if !sleepCtx(ctx, interval) {
+			return nil, false
+		}
+		changed = w.poll()
+	}
+
+	for {
+		if !sleepCtx(ctx, interval) {
+			return nil, false
+		}
+		more := w.poll()
+		if len(more) == 0 {
+			return dedupe(changed), true
+		}
+		changed = append(changed, more...)
+	}
+}
+
+// poll stats every watched file, task files newly matching the spec's
+// patterns included, and returns those that changed since the last poll
+func (w *watch) poll() []string {
+	paths := []string{w.specPath}
+	if files, err := w.runner.testFiles(); err == nil {
+		for _, f := range files {
+			paths = append(paths, normPath(f))
+		}
+	}
+	for path := range w.deps {
+		paths = append(paths, path)
+	}
+	for path := range w.stamps {
+		paths = append(paths, path)
+	}
+
+	stamps := make(map[string]fileStamp, len(paths))
+	var changed []string
+	for _, path := range dedupe(paths) {
+		prev, seen := w.stamps[path]
+		info, err := os.Stat(path)
+		if err != nil {
+			if seen {
+				changed = append(changed, path)
+			}
+			continue
+		}
+
+		stamp := fileStamp{modTime: info.ModTime().UnixNano(), size: info.Size()}
+		stamps[path] = stamp
+		if !seen || stamp != prev {
+			changed = append(changed, path)
+		}
+	}
+
+	w.stamps = stamps
+	return changed
+}
+
+// apply reloads changed task files, then re-runs or re-grades the tests the
+// changed files affect
+func (w *watch) apply(ctx context.Context, changed []string) *WatchRound {
+	r := w.runner
+	round := &WatchRound{Files: changed}
+	start := time.Now()
+
+	files, err := r.testFiles()
+	if err != nil {
+		round.Errors = append(round.Errors, err)
+	}
+	isTaskFile := make(map[string]bool, len(files))
+	w.order = w.order[:0]
+	for _, f := range files {
+		path := normPath(f)
+		if !isTaskFile[path] {
+			isTaskFile[path] = true
+			w.order = append(w.order, path)
+		}
+	}
+
+	rerun := make(map[*watchedTest]bool)
+	regrade := make(map[*watchedTest]bool)
+	scriptChanged := false
+	for _, path := range changed {
+		if old, ok := w.tests[path]; ok || isTaskFile[path] {
+			if old != nil {
+				r.forget(old.tc)
+				delete(w.tests, path)
+			}
+			test, err := w.load(path, isTaskFile[path])
+			if err != nil {
+				round.Errors = append(round.Errors, err)
+			}
+			if test != nil {
+				if old != nil {
+					test.outcome = old.outcome
+				}
+				w.tests[path] = test
+				rerun[test] = true
+			} else if old != nil && old.outcome != nil {
+				round.Changes = append(round.Changes, change(old.tc, old.outcome, nil))
+			}
+			continue
+		}
+
+		for _, d := range w.deps[path] {
+			affected := []*watchedTest{d.test}
+			if d.test == nil {
+				affected = w.ordered()
+			}
+			for _, test := range affected {
+				if d.regrade {
+					scriptChanged = true
+					regrade[test] = true
+				} else {
+					rerun[test] = true
+				}
+			}
+		}
+	}
+
+	runsPerTest := r.cfg.Spec().Config.RunsPerTest
+	var toRun, toGrade []*watchedTest
+	for _, test := range w.ordered() {
+		switch {
+		case rerun[test]:
+			toRun = append(toRun, test)
+		case regrade[test] && r.responses.complete(test.tc, runsPerTest):
+			toGrade = append(toGrade, test)
+		case regrade[test]:
+			// some trials have no session to grade, e.g. the engine failed
+			toRun = append(toRun, test)
+		}
+	}
+
+	// cached results are keyed by grader config, not script contents
+	if scriptChanged && r.memo != nil {
+		r.memo = graders.NewMemoCache(r.cfg.Spec().Config.GraderCache)
+	}
+
+	testCases := make([]*models.TestCase, 0, len(w.tests))
+	for _, test := range w.ordered() {
+		testCases = append(testCases, test.tc)
+	}
+	r.startGraderWorkers(testCases)
+
+	if len(toRun) > 0 {
+		cases := make([]*models.TestCase, len(toRun))
+		for i, test := range toRun {
+			r.forget(test.tc)
+			cases[i] = test.tc
+		}
+
+		var outcomes []models.TestOutcome
+		if r.cfg.Spec().Config.Concurrent {
+			outcomes = r.runConcurrent(ctx, cases)
+		} else {
+			outcomes = r.runSequential(ctx, cases)
+		}
+		for i := range outcomes {
+			w.record(round, toRun[i], outcomes[i])
+			round.Rerun = append(round.Rerun, toRun[i].tc.TestID)
+		}
+	}
+
+	for _, test := range toGrade {
+		r.forgetPlan(test.tc)
+		plan := r.plan(test.tc)
+		runs := make([]models.RunResult, 0, runsPerTest)
+		for runNum := 1; runNum <= runsPerTest; runNum++ {
+			resp := r.responses.get(test.tc, runNum)
+			runs = append(runs, r.gradeRun(ctx, test.tc, plan, resp, runNum, time.Now()))
+		}
+		w.record(round, test, r.buildTestOutcome(test.tc, runs))
+		round.Regraded = append(round.Regraded, test.tc.TestID)
+	}
+
+	var outcomes []models.TestOutcome
+	for _, test := range w.ordered() {
+		if test.outcome != nil {
+			outcomes = append(outcomes, *test.outcome)
+		}
+	}
+	round.Outcome = r.buildOutcome(outcomes, start, r.cfg.Spec().Config.ModelID)
+
+	w.index()
+	return round
+}
+
+// load reads the task file at path. It returns no test when the file is
+// gone, no longer matches the spec's patterns, is disabled or fails to load.
+func (w *watch) load(path string, matched bool) (*watchedTest, error) {
+	if !matched {
+		return nil, nil
+	}
+	tc, err := models.LoadTestCase(path)
+	if err != nil {
+		if os.IsNotExist(err) {
+			return nil, nil
+		}
+		return nil, fmt.Errorf("failed to load test case %s: %w", path, err)
+	}
+	if tc.Active != nil && !*tc.Active {
+		return nil, nil
+	}
+	return &watchedTest{tc: tc}, nil
+}
+
+// record stores a test's new outcome and notes how it changed
+func (w *watch) record(round *WatchRound, test *watchedTest, outcome models.TestOutcome) {
+	round.Changes = append(round.Changes, change(test.tc, test.outcome, &outcome))
+	test.outcome = &outcome
+}
+
+func change(tc *models.TestCase, before, after *models.TestOutcome) TestChange {
+	c := TestChange{TestID: tc.TestID, DisplayName: tc.DisplayName}
+	if before != nil {
+		c.Before = before.Status
+		if before.Stats != nil {
+			c.BeforeScore = before.Stats.AvgScore
+		}
+	}
+	if after != nil {
+		c.After = after.Status
+		if after.Stats != nil {
+			c.AfterScore = after.Stats.AvgScore
+		}
+	}
+	return c
+}
+
+// ordered returns the loaded tests in the spec's order
+func (w *watch) ordered() []*watchedTest {
+	tests := make([]*watchedTest, 0, len(w.tests))
+	for _, path := range w.order {
+		if test, ok := w.tests[path]; ok {
+			tests = append(tests, test)
+		}
+	}
+	return tests
+}
+
+// index maps every file the tests depend on, other than their task files,
+// to the tests it affects
+func (w *watch) index() {
+	r := w.runner
+	spec := r.cfg.Spec()
+	w.deps = make(map[string][]dependent)
+	add := func(path string, d dependent) {
+		if path != "" {
+			path = normPath(path)
+			w.deps[path] = append(w.deps[path], d)
+		}
+	}
+
+	specDir := r.cfg.SpecDir()
+	if specDir == "" {
+		specDir = "."
+	}
+	add(filepath.Join(specDir, "SKILL.md"), dependent{})
+	add(filepath.Join(specDir, "..", "SKILL.md"), dependent{})
+
+	for _, vCfg := range spec.Graders {
+		add(graderScript(r.graderParams(vCfg.Parameters, vCfg.ScriptPath, nil)), dependent{regrade: true})
+	}
+
+	for _, test := range w.ordered() {
+		fixtureDir := r.fixtureDir(test.tc)
+		for _, ref := range test.tc.Stimulus.Resources {
+			if ref.Body == "" && ref.Location != "" && fixtureDir != "" && !filepath.IsAbs(ref.Location) {
+				add(filepath.Join(fixtureDir, filepath.Clean(ref.Location)), dependent{test: test})
+			}
+		}
+		for _, vCfg := range test.tc.Validators {
+			add(graderScript(r.graderParams(vCfg.Parameters, "", nil)), dependent{test: test, regrade: true})
+		}
+	}
+
+	// start watching new dependencies from their current state
+	for path := range w.deps {
+		if _, ok := w.stamps[path]; !ok {
+			if info, err := os.Stat(path); err == nil {
+				w.stamps[path] = fileStamp{modTime: info.ModTime().UnixNano(), size: info.Size()}
+			}
+		}
+	}
+}
+
+func graderScript(params map[string]any) string {
+	script, _ := params["script"].(string)
+	return script
+}
+
+// forget drops a test case's plan and cached sessions
+func (r *TestRunner) forget(tc *models.TestCase) {
+	r.forgetPlan(tc)
+	r.responses.drop(tc)
+}
+
+// forgetPlan makes the next trial of tc build a new plan, reading its
+// resource files and creating its graders again
+func (r *TestRunner) forgetPlan(tc *models.TestCase) {
+	r.plansMu.Lock()
+	delete(r.plans, tc)
+	r.plansMu.Unlock()
+}
+
+// responseCache keeps the last session of every trial, by test case and run
+// number
+type responseCache struct {
+	mu   sync.Mutex
+	runs map[*models.TestCase]map[int]*execution.ExecutionResponse
+}
+
+func newResponseCache() *responseCache {
+	return &responseCache{runs: make(map[*models.TestCase]map[int]*execution.ExecutionResponse)}
+}
+
+func (c *responseCache) put(tc *models.TestCase, runNum int, resp *execution.ExecutionResponse) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	if c.runs[tc] == nil {
+		c.runs[tc] = make(map[int]*execution.ExecutionResponse)
+	}
+	c.runs[tc][runNum] = resp
+}
+
+func (c *responseCache) get(tc *models.TestCase, runNum int) *execution.ExecutionResponse {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	return c.runs[tc][runNum]
+}
+
+// complete reports whether every run of tc has a session
+func (c *responseCache) complete(tc *models.TestCase, runs int) bool {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	for runNum := 1; runNum <= runs; runNum++ {
+		if c.runs[tc][runNum] == nil {
+			return false
+		}
+	}
+	return true
+}
+
+func (c *responseCache) drop(tc *models.TestCase) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	delete(c.runs, tc)
+}
+
+func normPath(path string) string {
+	if abs, err := filepath.Abs(path); err == nil {
+		return abs
+	}
+	return filepath.Clean(path)
+}
+
+func dedupe(paths []string) []string {
+	sort.Strings(paths)
+	out := paths[:0]
+	for i, path := range paths {
+		if i == 0 || path != paths[i-1] {
+			out = append(out, path)
+		}
+	}
+	return out
+}
+
+// sleepCtx waits for d and reports false if ctx was cancelled first
+func sleepCtx(ctx context.Context, d time.Duration) bool {
+	timer := time.NewTimer(d)
+	defer timer.Stop()
+	select {
+	case <-timer.C:
+		return true
+	case <-ctx.Done():
+		return false
+	}
+}
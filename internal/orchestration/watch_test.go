@@ -0,0 +1,131 @@
+package orchestration
+
+import (
+	"context"
+	"os"
+	"os/exec"
+	"path/filepath"
+	"sync/atomic"
+	"testing"
+	"time"
+
+	"github.com/spboyer/waza/internal/config"
+	"github.com/spboyer/waza/internal/execution"
+	"github.com/spboyer/waza/internal/models"
+	"github.com/stretchr/testify/require"
+)
+
+// countingEngine counts the sessions it runs
+type countingEngine struct {
+	execution.AgentEngine
+	sessions atomic.Int64
+}
+
+func (e *countingEngine) Execute(ctx context.Context, req *execution.ExecutionRequest) (*execution.ExecutionResponse, error) {
+	e.sessions.Add(1)
+	return e.AgentEngine.Execute(ctx, req)
+}
+
+func writeFile(t *testing.T, path, content string) {
+	t.Helper()
+	require.NoError(t, os.MkdirAll(filepath.Dir(path), 0755))
+	require.NoError(t, os.WriteFile(path, []byte(content), 0644))
+}
+
+func TestWatch(t *testing.T) {
+	if err := exec.Command("python", "--version").Run(); err != nil {
+		t.Skip("Skipping watch test that needs Python")
+	}
+
+	dir := t.TempDir()
+	specPath := filepath.Join(dir, "eval.yaml")
+	writeFile(t, specPath, "name: watched\n")
+	writeFile(t, filepath.Join(dir, "SKILL.md"), "# skill\n")
+	writeFile(t, filepath.Join(dir, "fixtures", "a.py"), "print('a')\n")
+	writeFile(t, filepath.Join(dir, "graders", "check.py"), "def grade(context):\n    return {'score': 1.0, 'passed': True}\n")
+	writeFile(t, filepath.Join(dir, "tasks", "a.yaml"), "id: a\nname: A\ninputs:\n  prompt: explain a\n  files:\n    - path: a.py\n")
+	writeFile(t, filepath.Join(dir, "tasks", "b.yaml"), "id: b\nname: B\ninputs:\n  prompt: explain b\n")
+
+	// a memoized script grader must still see its script's changes
+	memoize := true
+	spec := &models.BenchmarkSpec{
+		SpecIdentity: models.SpecIdentity{Name: "watched"},
+		SkillName:    "test-skill",
+		Config: models.Config{
+			RunsPerTest: 2,
+			TimeoutSec:  10,
+			RateLimit:   &models.RateLimitConfig{RequestsPerMinute: 6000},
+		},
+		Graders: []models.GraderConfig{{Kind: "script", Identifier: "check", ScriptPath: "graders/check.py", Memoize: &memoize}},
+		Tasks:   []string{"tasks/*.yaml"},
+	}
+	engine := &countingEngine{AgentEngine: execution.NewMockEngine("test-model")}
+	cfg := config.NewBenchmarkConfig(spec, config.WithSpecDir(dir), config.WithFixtureDir(filepath.Join(dir, "fixtures")))
+	runner := NewTestRunner(cfg, engine)
+
+	ctx, cancel := context.WithCancel(context.Background())
+	defer cancel()
+
+	rounds := make(chan *WatchRound)
+	done := make(chan error, 1)
+	go func() {
+		done <- runner.Watch(ctx, specPath, 10*time.Millisecond, func(r *WatchRound) { rounds <- r })
+	}()
+
+	next := func() *WatchRound {
+		t.Helper()
+		select {
+		case r := <-rounds:
+			return r
+		case err := <-done:
+			t.Fatalf("watch stopped: %v", err)
+		case <-time.After(10 * time.Second):
+			t.Fatal("no round")
+		}
+		return nil
+	}
+
+	round := next()
+	require.Equal(t, []string{"a", "b"}, round.Rerun)
+	require.Equal(t, 2, round.Outcome.Digest.Succeeded)
+	require.Equal(t, int64(4), engine.sessions.Load())
+	// the rate limit and grader cache apply in watch mode too
+	require.NotNil(t, round.Outcome.Digest.RateLimit)
+	require.NotNil(t, round.Outcome.Digest.GraderCache)
+
+	t.Run("fixture re-runs the tests loading it", func(t *testing.T) {
+		writeFile(t, filepath.Join(dir, "fixtures", "a.py"), "print('a changed')\n")
+		round := next()
+		require.Equal(t, []string{"a"}, round.Rerun)
+		require.Empty(t, round.Regraded)
+		require.Equal(t, int64(6), engine.sessions.Load())
+		require.Equal(t, 2, round.Outcome.Digest.TotalTests)
+	})
+
+	t.Run("grader script re-grades cached sessions", func(t *testing.T) {
+		writeFile(t, filepath.Join(dir, "graders", "check.py"), "def grade(context):\n    return {'score': 0.0, 'passed': False, 'message': 'nope'}\n")
+		round := next()
+		require.Empty(t, round.Rerun)
+		require.Equal(t, []string{"a", "b"}, round.Regraded)
+		require.Equal(t, int64(6), engine.sessions.Load())
+		require.Equal(t, TestChange{TestID: "a", DisplayName: "A", Before: "passed", After: "failed", BeforeScore: 1}, round.Changes[0])
+	})
+
+	t.Run("new and removed task files", func(t *testing.T) {
+		require.NoError(t, os.Remove(filepath.Join(dir, "tasks", "b.yaml")))
+		writeFile(t, filepath.Join(dir, "tasks", "c.yaml"), "id: c\nname: C\ninputs:\n  prompt: explain c\n")
+		round := next()
+		require.Equal(t, []string{"c"}, round.Rerun)
+		require.Len(t, round.Changes, 2)
+		require.Equal(t, 2, round.Outcome.Digest.TotalTests)
+	})
+
+	t.Run("SKILL.md re-runs everything", func(t *testing.T) {
+		writeFile(t, filepath.Join(dir, "SKILL.md"), "# skill, revised\n")
+		round := next()
+		require.Equal(t, []string{"a", "c"}, round.Rerun)
+	})
+
+	writeFile(t, specPath, "name: watched again\n")
+	require.ErrorIs(t, <-done, ErrSpecChanged)
+}
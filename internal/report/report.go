@@ -0,0 +1,361 @@
+// Package report renders evaluation results as a Markdown issue body. The
+// body is written section by section to an io.Writer and never grows past a
+// byte budget, however many tasks the results hold: failures are ranked by
+// severity and whatever doesn't fit is summarized in a closing note.
+package report
+
+import (
+	"bytes"
+	"encoding/json"
+	"fmt"
+	"io"
+	"sort"
+	"strings"
+	"time"
+	"unicode/utf8"
+
+	"github.com/spboyer/waza/internal/models"
+)
+
+// DefaultBudget keeps bodies under GitHub's 65,536 character limit for
+// issues and comments, with room for edits
+const DefaultBudget = 60000
+
+// maxFeedbackBytes caps the feedback shown for each failed grader
+const maxFeedbackBytes = 400
+
+// footerReserve is kept free for the closing overflow note
+const footerReserve = 512
+
+// Options controls what a report includes
+type Options struct {
+	// Budget is the most bytes the body may take; 0 means DefaultBudget
+	Budget int
+	// FailedOnly leaves passing tasks out of the task table
+	FailedOnly bool
+	// ResultsLink is a URL or attachment path for the full results. It is
+	// linked at the end; without it the full JSON is embedded when it fits.
+	ResultsLink string
+}
+
+// Stats describes a rendered body
+type Stats struct {
+	Bytes int
+	// TasksShown and DetailsShown count the task table rows and failure
+	// details that fit in the budget
+	TasksShown   int
+	DetailsShown int
+	// TasksOmitted and DetailsOmitted count those that didn't
+	TasksOmitted   int
+	DetailsOmitted int
+	JSONEmbedded   bool
+}
+
+// Title returns the issue title for an outcome
+func Title(outcome *models.EvaluationOutcome) string {
+	total := len(outcome.TestOutcomes)
+	failed := 0
+	for _, to := range outcome.TestOutcomes {
+		if to.Status != "passed" {
+			failed++
+		}
+	}
+
+	switch {
+	case failed == 0:
+		return fmt.Sprintf("[Eval] %s: All %d tasks passed", outcome.SkillTested, total)
+	case failed == total:
+		return fmt.Sprintf("[Eval] %s: All %d tasks failed", outcome.SkillTested, total)
+	default:
+		return fmt.Sprintf("[Eval] %s: %d/%d tasks failed", outcome.SkillTested, failed, total)
+	}
+}
+
+// Write renders the issue body for outcome to w. The task table lists
+// failures first, most severe first, and may use half of what the summary
+// leaves of the budget; failure details get the rest. Each row and section
+// is rendered into a small reusable buffer and only written once it is
+// known to fit.
+func Write(w io.Writer, outcome *models.EvaluationOutcome, opts Options) (Stats, error) {
+	if opts.Budget <= 0 {
+		opts.Budget = DefaultBudget
+	}
+
+	r := &renderer{out: w, limit: opts.Budget - footerReserve - len(opts.ResultsLink)}
+	if r.limit <= 0 {
+		return Stats{}, fmt.Errorf("budget of %d bytes is too small for a report", opts.Budget)
+	}
+
+	failures, passes := rankTasks(outcome.TestOutcomes)
+
+	r.summary(outcome)
+
+	tasks := failures
+	if !opts.FailedOnly {
+		tasks = append(tasks[:len(tasks):len(tasks)], passes...)
+	}
+	r.taskTable(tasks, r.written+(r.limit-r.written)/2)
+	r.details(failures)
+
+	// what's left of the footer reserve goes to the closing note
+	r.limit = opts.Budget
+	r.footer(outcome, opts)
+
+	r.stats.Bytes = r.written
+	return r.stats, r.err
+}
+
+// renderer writes a body while keeping count of its size
+type renderer struct {
+	out     io.Writer
+	buf     bytes.Buffer
+	limit   int
+	written int
+	err     error
+	stats   Stats
+}
+
+// flush writes the buffer if it fits within max bytes in total, and reports
+// whether it did. The buffer is reset either way.
+func (r *renderer) flush(max int) bool {
+	defer r.buf.Reset()
+	if r.err != nil || r.written+r.buf.Len() > max {
+		return false
+	}
+	n, err := r.out.Write(r.buf.Bytes())
+	r.written += n
+	r.err = err
+	return err == nil
+}
+
+func (r *renderer) summary(outcome *models.EvaluationOutcome) {
+	d := outcome.Digest
+	fmt.Fprintf(&r.buf, "## Eval Results: %s\n\n", outcome.BenchName)
+	fmt.Fprintf(&r.buf, "**Skill:** %s | **Model:** %s | **Run:** %s | **Date:** %s\n\n",
+		outcome.SkillTested, outcome.Setup.ModelID, outcome.RunID, outcome.Timestamp.Format(time.RFC3339))
+
+	r.buf.WriteString("### Summary\n\n| Metric | Value |\n|--------|-------|\n")
+	fmt.Fprintf(&r.buf, "| Pass Rate | %.1f%% (%d/%d) |\n", d.SuccessRate*100, d.Succeeded, d.TotalTests)
+	fmt.Fprintf(&r.buf, "| Failed | %d |\n| Errors | %d |\n", d.Failed, d.Errors)
+	fmt.Fprintf(&r.buf, "| Aggregate Score | %.2f |\n", d.AggregateScore)
+	fmt.Fprintf(&r.buf, "| Duration | %v |\n", time.Duration(d.DurationMs)*time.Millisecond)
+
+	for _, name := range sortedKeys(outcome.Measures) {
+		m := outcome.Measures[name]
+		fmt.Fprintf(&r.buf, "| %s | %.2f (threshold %.2f) %s |\n", cell(name), m.Value, m.Cutoff, statusIcon(m.Passed))
+	}
+	r.buf.WriteString("\n")
+
+	r.flush(r.limit)
+}
+
+func (r *renderer) taskTable(tasks []*models.TestOutcome, max int) {
+	if len(tasks) == 0 {
+		return
+	}
+
+	r.buf.WriteString("### Task Results\n\n| Task | Status | Score | Duration |\n|------|--------|-------|----------|\n")
+	if !r.flush(max) {
+		r.stats.TasksOmitted = len(tasks)
+		return
+	}
+
+	for i, to := range tasks {
+		score, duration := 0.0, int64(0)
+		if to.Stats != nil {
+			score, duration = to.Stats.AvgScore, to.Stats.AvgDurationMs
+		}
+		fmt.Fprintf(&r.buf, "| %s | %s %s | %.2f | %v |\n", cell(taskName(to)), statusIcon(to.Status == "passed"),
+			to.Status, score, time.Duration(duration)*time.Millisecond)
+
+		if !r.flush(max) {
+			r.stats.TasksOmitted = len(tasks) - i
+			break
+		}
+		r.stats.TasksShown++
+	}
+
+	r.buf.WriteString("\n")
+	r.flush(r.limit)
+}
+
+func (r *renderer) details(failures []*models.TestOutcome) {
+	if len(failures) == 0 {
+		return
+	}
+
+	r.buf.WriteString("### Task Details\n\n")
+	if !r.flush(r.limit) {
+		r.stats.DetailsOmitted = len(failures)
+		return
+	}
+
+	for i, to := range failures {
+		writeDetail(&r.buf, to)
+		if !r.flush(r.limit) {
+			r.stats.DetailsOmitted = len(failures) - i
+			return
+		}
+		r.stats.DetailsShown++
+	}
+}
+
+// writeDetail renders one failed task as a collapsible section
+func writeDetail(buf *bytes.Buffer, to *models.TestOutcome) {
+	name := oneLine(taskName(to))
+	fmt.Fprintf(buf, "<details>\n<summary>%s %s — %s</summary>\n\n", statusIcon(false), name, to.Status)
+	fmt.Fprintf(buf, "#### %s\n\n", name)
+	if to.Stats != nil {
+		fmt.Fprintf(buf, "- **Pass rate:** %.0f%% (95%% CI %.0f%%–%.0f%%)\n", to.Stats.PassRate*100,
+			to.Stats.PassRateLow*100, to.Stats.PassRateHigh*100)
+		fmt.Fprintf(buf, "- **Score:** %.2f (min %.2f, max %.2f)\n", to.Stats.AvgScore, to.Stats.MinScore, to.Stats.MaxScore)
+	}
+
+	// the first failing run stands for the rest
+	for _, run := range to.Runs {
+		if run.Status == "passed" {
+			continue
+		}
+		fmt.Fprintf(buf, "- **Run %d:** %s\n", run.RunNumber, run.Status)
+		if run.ErrorMsg != "" {
+			fmt.Fprintf(buf, "  - Error: %s\n", oneLine(run.ErrorMsg))
+		}
+		for _, name := range sortedKeys(run.Validations) {
+			if v := run.Validations[name]; !v.Passed {
+				fmt.Fprintf(buf, "  - `%s`: %s\n", name, oneLine(v.Feedback))
+			}
+		}
+		break
+	}
+
+	buf.WriteString("\n</details>\n\n")
+}
+
+func (r *renderer) footer(outcome *models.EvaluationOutcome, opts Options) {
+	if r.stats.TasksOmitted > 0 || r.stats.DetailsOmitted > 0 {
+		fmt.Fprintf(&r.buf, "> **Note:** %d task row(s) and %d failure detail(s) were left out to keep this report under %d bytes.\n\n",
+			r.stats.TasksOmitted, r.stats.DetailsOmitted, opts.Budget)
+		r.flush(r.limit)
+	}
+
+	if opts.ResultsLink != "" {
+		fmt.Fprintf(&r.buf, "Full results: %s\n", opts.ResultsLink)
+		r.flush(r.limit)
+		return
+	}
+
+	r.embedJSON(outcome)
+}
+
+// embedJSON appends the full results when they fit. They are encoded once
+// to measure them, and only written, encoded a second time, if they fit, so
+// the JSON is never held in memory.
+func (r *renderer) embedJSON(outcome *models.EvaluationOutcome) {
+	const (
+		opening = "<details>\n<summary>Full JSON Results</summary>\n\n```json\n"
+		closing = "```\n\n</details>\n"
+	)
+
+	var size countingWriter
+	if err := json.NewEncoder(&size).Encode(outcome); err != nil {
+		return
+	}
+	if r.written+len(opening)+int(size)+len(closing) > r.limit {
+		return
+	}
+
+	r.buf.WriteString(opening)
+	if !r.flush(r.limit) {
+		return
+	}
+	counted := new(countingWriter)
+	if r.err = json.NewEncoder(io.MultiWriter(r.out, counted)).Encode(outcome); r.err != nil {
+		return
+	}
+	r.written += int(*counted)
+	r.buf.WriteString(closing)
+	r.stats.JSONEmbedded = r.flush(r.limit)
+}
+
+type countingWriter int
+
+func (c *countingWriter) Write(p []byte) (int, error) {
+	*c += countingWriter(len(p))
+	return len(p), nil
+}
+
+// rankTasks splits tasks into failures, most severe first, and passes in
+// their original order. Errors outrank failures, then lower pass rates and
+// lower scores come first.
+func rankTasks(tasks []models.TestOutcome) (failures, passes []*models.TestOutcome) {
+	for i := range tasks {
+		if tasks[i].Status == "passed" {
+			passes = append(passes, &tasks[i])
+		} else {
+			failures = append(failures, &tasks[i])
+		}
+	}
+
+	sort.SliceStable(failures, func(i, j int) bool {
+		a, b := failures[i], failures[j]
+		if ae, be := a.Status == "error", b.Status == "error"; ae != be {
+			return ae
+		}
+		ap, as := taskStats(a)
+		bp, bs := taskStats(b)
+		if ap != bp {
+			return ap < bp
+		}
+		return as < bs
+	})
+
+	return failures, passes
+}
+
+func taskStats(to *models.TestOutcome) (passRate, score float64) {
+	if to.Stats == nil {
+		return 0, 0
+	}
+	return to.Stats.PassRate, to.Stats.AvgScore
+}
+
+func taskName(to *models.TestOutcome) string {
+	if to.DisplayName != "" {
+		return to.DisplayName
+	}
+	return to.TestID
+}
+
+func statusIcon(passed bool) string {
+	if passed {
+		return "✅"
+	}
+	return "❌"
+}
+
+// cell makes text safe for a Markdown table cell
+func cell(s string) string {
+	return strings.ReplaceAll(oneLine(s), "|", `\|`)
+}
+
+// oneLine flattens text onto a single line of at most maxFeedbackBytes
+func oneLine(s string) string {
+	s = strings.Join(strings.Fields(s), " ")
+	if len(s) <= maxFeedbackBytes {
+		return s
+	}
+	cut := maxFeedbackBytes
+	for cut > 0 && !utf8.RuneStart(s[cut]) {
+		cut--
+	}
+	return s[:cut] + "…"
+}
+
+func sortedKeys[V any](m map[string]V) []string {
+	keys := make([]string, 0, len(m))
+	for k := range m {
+		keys = append(keys, k)
+	}
+	sort.Strings(keys)
+	return keys
+}
@@ -0,0 +1,155 @@
+package report
+
+import (
+	"bytes"
+	"fmt"
+	"strings"
+	"testing"
+	"time"
+
+	"github.com/spboyer/waza/internal/models"
+	"github.com/stretchr/testify/require"
+)
+
+func task(id, status string, passRate float64) models.TestOutcome {
+	passed := status == "passed"
+	return models.TestOutcome{
+		TestID:      id,
+		DisplayName: "Task " + id,
+		Status:      status,
+		Runs: []models.RunResult{{
+			RunNumber: 1,
+			Status:    status,
+			Validations: map[string]models.GraderResults{
+				"check": {Name: "check", Passed: passed, Feedback: "Test failure in " + id},
+			},
+		}},
+		Stats: &models.TestStats{PassRate: passRate, AvgScore: passRate, AvgDurationMs: 1200},
+	}
+}
+
+func outcome(tasks ...models.TestOutcome) *models.EvaluationOutcome {
+	o := &models.EvaluationOutcome{
+		RunID:        "run-1",
+		SkillTested:  "test-skill",
+		BenchName:    "test-eval",
+		Timestamp:    time.Date(2026, 1, 31, 12, 0, 0, 0, time.UTC),
+		TestOutcomes: tasks,
+	}
+	for _, to := range tasks {
+		if to.Status == "passed" {
+			o.Digest.Succeeded++
+		} else {
+			o.Digest.Failed++
+		}
+	}
+	o.Digest.TotalTests = len(tasks)
+	return o
+}
+
+func TestTitle(t *testing.T) {
+	require.Equal(t, "[Eval] test-skill: All 1 tasks passed", Title(outcome(task("1", "passed", 1))))
+	require.Equal(t, "[Eval] test-skill: All 1 tasks failed", Title(outcome(task("1", "failed", 0))))
+	require.Equal(t, "[Eval] test-skill: 1/2 tasks failed", Title(outcome(task("1", "passed", 1), task("2", "failed", 0))))
+}
+
+func TestWrite_Structure(t *testing.T) {
+	var buf bytes.Buffer
+	stats, err := Write(&buf, outcome(task("1", "failed", 0), task("2", "passed", 1)), Options{})
+	require.NoError(t, err)
+
+	body := buf.String()
+	require.Equal(t, len(body), stats.Bytes)
+	for _, want := range []string{
+		"## Eval Results: test-eval",
+		"**Skill:** test-skill",
+		"### Summary",
+		"Pass Rate",
+		"### Task Results",
+		"| Task | Status | Score | Duration |",
+		"### Task Details",
+		"#### Task 1",
+		"Test failure in 1",
+		"<details>",
+		"Full JSON Results",
+	} {
+		require.Contains(t, body, want)
+	}
+	require.NotContains(t, body, "#### Task 2", "passing tasks have no details")
+	require.True(t, stats.JSONEmbedded)
+}
+
+func TestWrite_FailedOnly(t *testing.T) {
+	var buf bytes.Buffer
+	_, err := Write(&buf, outcome(task("1", "failed", 0), task("2", "passed", 1)), Options{FailedOnly: true})
+	require.NoError(t, err)
+	require.Contains(t, buf.String(), "| Task 1 |")
+	require.NotContains(t, buf.String(), "| Task 2 |")
+}
+
+func TestWrite_Budget(t *testing.T) {
+	var tasks []models.TestOutcome
+	for i := 0; i < 5000; i++ {
+		switch {
+		case i%10 == 0:
+			tasks = append(tasks, task(fmt.Sprint(i), "failed", 0.5))
+		default:
+			tasks = append(tasks, task(fmt.Sprint(i), "passed", 1))
+		}
+	}
+	// the most severe failures sit at the end of the input
+	tasks = append(tasks, task("worst", "error", 0), task("bad", "failed", 0))
+
+	var buf bytes.Buffer
+	stats, err := Write(&buf, outcome(tasks...), Options{Budget: 20000, ResultsLink: "https://example.com/results.json"})
+	require.NoError(t, err)
+
+	body := buf.String()
+	require.LessOrEqual(t, len(body), 20000)
+	require.Equal(t, len(body), stats.Bytes)
+	require.False(t, stats.JSONEmbedded)
+	require.Greater(t, stats.TasksOmitted, 0)
+	require.Greater(t, stats.DetailsOmitted, 0)
+	require.Equal(t, len(tasks), stats.TasksShown+stats.TasksOmitted)
+	require.Equal(t, 502, stats.DetailsShown+stats.DetailsOmitted)
+
+	require.Less(t, strings.Index(body, "| Task worst |"), strings.Index(body, "| Task bad |"), "errors rank first")
+	require.Less(t, strings.Index(body, "| Task bad |"), strings.Index(body, "| Task 0 |"), "then lower pass rates")
+	require.Contains(t, body, "#### Task worst")
+	require.Contains(t, body, "were left out to keep this report under 20000 bytes")
+	require.True(t, strings.HasSuffix(body, "Full results: https://example.com/results.json\n"))
+}
+
+func TestWrite_TinyBudget(t *testing.T) {
+	_, err := Write(&bytes.Buffer{}, outcome(), Options{Budget: 100})
+	require.ErrorContains(t, err, "too small")
+}
+
+func TestOneLine(t *testing.T) {
+	require.Equal(t, "a b c", oneLine("a\n b\tc "))
+
+	long := oneLine(strings.Repeat("é", maxFeedbackBytes))
+	require.LessOrEqual(t, len(long), maxFeedbackBytes+len("…"))
+	require.True(t, strings.HasSuffix(long, "…"))
+	require.True(t, strings.HasPrefix(long, "éé"))
+}
+
+func BenchmarkWrite(b *testing.B) {
+	var tasks []models.TestOutcome
+	for i := 0; i < 10000; i++ {
+		tasks = append(tasks, task(fmt.Sprint(i), "failed", float64(i%7)/7))
+	}
+	o := outcome(tasks...)
+
+	b.ReportAllocs()
+	b.ResetTimer()
+	for i := 0; i < b.N; i++ {
+		if _, err := Write(discard{}, o, Options{ResultsLink: "results.json"}); err != nil {
+			b.Fatal(err)
+		}
+	}
+}
+
+type discard struct{}
+
+func (discard) Write(p []byte) (int, error) { return len(p), nil }
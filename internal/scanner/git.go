@@ -0,0 +1,227 @@
+package scanner
+
+import (
+	"bufio"
+	"bytes"
+	"context"
+	"errors"
+	"fmt"
+	"io"
+	"os/exec"
+	"path"
+	"path/filepath"
+	"strconv"
+	"strings"
+)
+
+// gitBlob is a SKILL.md in a git tree
+type gitBlob struct {
+	sha string
+	dir string // the skill's directory, "." at the top of the tree
+}
+
+// ScanGit returns every skill in a git repository at ref, sorted by path.
+// The repository may be bare, a mirror or a working copy; SKILL.md files are
+// read straight from its object store with one batched git cat-file, and
+// nothing is checked out. Parsed files are cached by blob SHA, so scanning
+// another ref only reads the SKILL.md files that differ. As with Scan,
+// malformed files are returned together as the error, next to the skills
+// that were found.
+func (s *Scanner) ScanGit(ctx context.Context, repo, ref string) ([]SkillInfo, error) {
+	blobs, err := s.listSkillBlobs(ctx, repo, ref)
+	if err != nil {
+		return nil, err
+	}
+
+	var missing []string
+	seen := make(map[string]bool)
+	s.mu.Lock()
+	for _, b := range blobs {
+		if _, ok := s.blobs[b.sha]; !ok && !seen[b.sha] {
+			missing = append(missing, b.sha)
+			seen[b.sha] = true
+		}
+	}
+	s.mu.Unlock()
+
+	var errs []error
+	if len(missing) > 0 {
+		parsed, err := readSkillBlobs(ctx, repo, missing)
+		if err != nil {
+			errs = append(errs, err)
+		}
+
+		s.mu.Lock()
+		for sha, skill := range parsed {
+			s.blobs[sha] = skill
+		}
+		s.mu.Unlock()
+	}
+
+	// a skill at the top of the tree is named after the repository
+	repoName := strings.TrimSuffix(filepath.Base(repo), ".git")
+	if abs, err := filepath.Abs(repo); err == nil {
+		repoName = strings.TrimSuffix(filepath.Base(abs), ".git")
+	}
+
+	skills := make([]SkillInfo, 0, len(blobs))
+	s.mu.Lock()
+	for _, b := range blobs {
+		skill, ok := s.blobs[b.sha]
+		if !ok {
+			continue
+		}
+		name := path.Base(b.dir)
+		if b.dir == "." {
+			name = repoName
+		}
+		skills = append(skills, located(skill, b.dir, name))
+	}
+	s.mu.Unlock()
+
+	sortSkills(skills)
+	return skills, errors.Join(errs...)
+}
+
+// listSkillBlobs lists the SKILL.md blobs in the tree of ref, leaving out
+// those under a skipped directory
+func (s *Scanner) listSkillBlobs(ctx context.Context, repo, ref string) (blobs []gitBlob, err error) {
+	var stderr bytes.Buffer
+	cmd := exec.CommandContext(ctx, "git", "-C", repo, "ls-tree", "-r", "-z", "--full-tree", ref)
+	cmd.Stderr = &stderr
+
+	stdout, err := cmd.StdoutPipe()
+	if err != nil {
+		return nil, err
+	}
+	if err := cmd.Start(); err != nil {
+		return nil, fmt.Errorf("failed to start git: %w", err)
+	}
+	defer func() {
+		if waitErr := cmd.Wait(); waitErr != nil && err == nil {
+			err = fmt.Errorf("git ls-tree %s failed: %w: %s", ref, waitErr, strings.TrimSpace(stderr.String()))
+		}
+	}()
+
+	r := bufio.NewReader(stdout)
+	for {
+		entry, readErr := r.ReadString(0)
+		if readErr == io.EOF {
+			return blobs, nil
+		}
+		if readErr != nil {
+			return nil, readErr
+		}
+
+		// <mode> SP <type> SP <sha> TAB <path> NUL
+		meta, file, ok := strings.Cut(strings.TrimSuffix(entry, "\x00"), "\t")
+		fields := strings.Fields(meta)
+		if !ok || len(fields) != 3 || fields[1] != "blob" || path.Base(file) != SkillFile {
+			continue
+		}
+
+		dir := path.Dir(file)
+		if s.skipped(dir) {
+			continue
+		}
+		blobs = append(blobs, gitBlob{sha: fields[2], dir: dir})
+	}
+}
+
+// skipped reports whether any directory of a slash separated path is in the
+// skip list
+func (s *Scanner) skipped(dir string) bool {
+	for _, name := range strings.Split(dir, "/") {
+		if s.skipDirs[name] {
+			return true
+		}
+	}
+	return false
+}
+
+// readSkillBlobs parses the frontmatter of every blob through a single git
+// cat-file --batch. Only the frontmatter of each blob is parsed; the rest is
+// skipped over in the stream.
+func readSkillBlobs(ctx context.Context, repo string, shas []string) (map[string]SkillInfo, error) {
+	var stderr bytes.Buffer
+	cmd := exec.CommandContext(ctx, "git", "-C", repo, "cat-file", "--batch")
+	cmd.Stderr = &stderr
+
+	stdin, err := cmd.StdinPipe()
+	if err != nil {
+		return nil, err
+	}
+	stdout, err := cmd.StdoutPipe()
+	if err != nil {
+		return nil, err
+	}
+	if err := cmd.Start(); err != nil {
+		return nil, fmt.Errorf("failed to start git: %w", err)
+	}
+
+	// git answers while we're still asking, so requests go out concurrently
+	written := make(chan error, 1)
+	go func() {
+		w := bufio.NewWriter(stdin)
+		for _, sha := range shas {
+			if _, err := w.WriteString(sha + "\n"); err != nil {
+				break
+			}
+		}
+		written <- errors.Join(w.Flush(), stdin.Close())
+	}()
+
+	parsed := make(map[string]SkillInfo, len(shas))
+	readErr := readBatch(bufio.NewReader(stdout), shas, parsed)
+
+	if readErr != nil && cmd.Process != nil {
+		// stop git rather than wait for it to write what we won't read
+		_ = cmd.Process.Kill()
+	}
+
+	errs := []error{readErr, <-written}
+	if err := cmd.Wait(); err != nil && readErr == nil {
+		errs = append(errs, fmt.Errorf("git cat-file failed: %w: %s", err, strings.TrimSpace(stderr.String())))
+	}
+	return parsed, errors.Join(errs...)
+}
+
+// readBatch reads one git cat-file --batch response per requested SHA.
+// Blobs that can't be parsed are reported but don't stop the batch.
+func readBatch(r *bufio.Reader, shas []string, parsed map[string]SkillInfo) error {
+	var errs []error
+	for _, sha := range shas {
+		header, err := r.ReadString('\n')
+		if err != nil {
+			return errors.Join(append(errs, fmt.Errorf("reading blob %s: %w", sha, err))...)
+		}
+
+		// <sha> SP <type> SP <size> LF <contents> LF, or <sha> SP missing LF
+		fields := strings.Fields(header)
+		if len(fields) == 2 && fields[1] == "missing" {
+			errs = append(errs, fmt.Errorf("blob %s is missing", sha))
+			continue
+		}
+		if len(fields) != 3 {
+			return errors.Join(append(errs, fmt.Errorf("unexpected git cat-file output %q", header))...)
+		}
+		size, err := strconv.ParseInt(fields[2], 10, 64)
+		if err != nil {
+			return errors.Join(append(errs, fmt.Errorf("unexpected git cat-file output %q", header))...)
+		}
+
+		body := &io.LimitedReader{R: r, N: size}
+		skill, parseErr := ParseSkill(body)
+		if parseErr != nil {
+			errs = append(errs, fmt.Errorf("blob %s: %w", sha, parseErr))
+		} else {
+			parsed[sha] = skill
+		}
+
+		// skip the rest of the blob and its trailing newline
+		if _, err := r.Discard(int(body.N) + 1); err != nil {
+			return errors.Join(append(errs, fmt.Errorf("reading blob %s: %w", sha, err))...)
+		}
+	}
+	return errors.Join(errs...)
+}
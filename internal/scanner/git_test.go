@@ -0,0 +1,72 @@
+package scanner
+
+import (
+	"context"
+	"os/exec"
+	"path/filepath"
+	"testing"
+
+	"github.com/stretchr/testify/require"
+)
+
+func git(t *testing.T, dir string, args ...string) {
+	t.Helper()
+	cmd := exec.Command("git", append([]string{"-C", dir}, args...)...)
+	cmd.Env = append(cmd.Environ(),
+		"GIT_AUTHOR_NAME=test", "GIT_AUTHOR_EMAIL=test@example.com",
+		"GIT_COMMITTER_NAME=test", "GIT_COMMITTER_EMAIL=test@example.com",
+	)
+	out, err := cmd.CombinedOutput()
+	require.NoError(t, err, string(out))
+}
+
+func TestScanGit(t *testing.T) {
+	if _, err := exec.LookPath("git"); err != nil {
+		t.Skip("git is not installed")
+	}
+
+	work := t.TempDir()
+	git(t, work, "init", "-q", "-b", "main")
+	writeFile(t, work, "skills/alpha/SKILL.md", skillMD("alpha", "first skill"))
+	writeFile(t, work, "skills/beta/SKILL.md", skillMD("beta", "second skill"))
+	writeFile(t, work, "web/node_modules/dep/SKILL.md", skillMD("dep", "skipped"))
+	git(t, work, "add", "-A")
+	git(t, work, "commit", "-q", "-m", "v1")
+	git(t, work, "tag", "v1")
+
+	writeFile(t, work, "skills/beta/SKILL.md", skillMD("beta", "second skill, revised"))
+	writeFile(t, work, "skills/gamma/SKILL.md", "---\nname: [broken\n---\n")
+	git(t, work, "add", "-A")
+	git(t, work, "commit", "-q", "-m", "v2")
+
+	bare := filepath.Join(t.TempDir(), "skills.git")
+	git(t, work, "clone", "-q", "--mirror", work, bare)
+
+	s := New()
+	ctx := context.Background()
+
+	skills, err := s.ScanGit(ctx, bare, "v1")
+	require.NoError(t, err)
+	require.Equal(t, []SkillInfo{
+		{Name: "alpha", Description: "first skill", Path: "skills/alpha"},
+		{Name: "beta", Description: "second skill", Path: "skills/beta"},
+	}, skills)
+	require.Len(t, s.blobs, 2)
+
+	// only the changed and new SKILL.md blobs are read for the next ref
+	skills, err = s.ScanGit(ctx, bare, "main")
+	require.ErrorContains(t, err, "invalid frontmatter")
+	require.Equal(t, []SkillInfo{
+		{Name: "alpha", Description: "first skill", Path: "skills/alpha"},
+		{Name: "beta", Description: "second skill, revised", Path: "skills/beta"},
+	}, skills)
+	require.Len(t, s.blobs, 3)
+
+	_, err = s.ScanGit(ctx, bare, "no-such-ref")
+	require.ErrorContains(t, err, "git ls-tree no-such-ref failed")
+}
+
+func TestReadSkillBlobs_NotARepository(t *testing.T) {
+	_, err := readSkillBlobs(context.Background(), t.TempDir(), []string{"0000000000000000000000000000000000000000"})
+	require.Error(t, err, "not a repository")
+}
@@ -0,0 +1,171 @@
+package scanner
+
+import (
+	"bufio"
+	"errors"
+	"os"
+	"path/filepath"
+	"regexp"
+	"strings"
+)
+
+// DefaultSkipDirs are directory names the scanner never descends into,
+// whatever the .gitignore files say
+var DefaultSkipDirs = []string{
+	".git",
+	".hg",
+	".svn",
+	".venv",
+	".waza",
+	"__pycache__",
+	"node_modules",
+	"venv",
+}
+
+// ignoreRule is one pattern of a .gitignore file
+type ignoreRule struct {
+	re      *regexp.Regexp
+	negate  bool
+	dirOnly bool
+}
+
+// ignoreRules are the patterns of one .gitignore file, matched against
+// paths relative to the directory holding it
+type ignoreRules struct {
+	base  string // slash separated, relative to the scan root; "" for the root
+	rules []ignoreRule
+}
+
+// ignoreStack is every .gitignore between the scan root and a directory,
+// outermost first. Stacks are shared between sibling directories and never
+// modified, only extended.
+type ignoreStack []*ignoreRules
+
+// ignored reports whether rel, a slash separated path relative to the scan
+// root, is excluded. As in git, the last matching pattern wins and deeper
+// files override shallower ones.
+func (s ignoreStack) ignored(rel string, isDir bool) bool {
+	ignored := false
+	for _, rules := range s {
+		sub := rel
+		if rules.base != "" {
+			sub = strings.TrimPrefix(rel, rules.base+"/")
+		}
+		for _, rule := range rules.rules {
+			if rule.dirOnly && !isDir {
+				continue
+			}
+			if rule.re.MatchString(sub) {
+				ignored = !rule.negate
+			}
+		}
+	}
+	return ignored
+}
+
+// with returns the stack extended by the .gitignore in dir, if any
+func (s ignoreStack) with(dir, rel string) ignoreStack {
+	rules, err := loadIgnoreFile(filepath.Join(dir, ".gitignore"), rel)
+	if err != nil || len(rules.rules) == 0 {
+		return s
+	}
+
+	extended := make(ignoreStack, len(s), len(s)+1)
+	copy(extended, s)
+	return append(extended, rules)
+}
+
+func loadIgnoreFile(path, base string) (rules *ignoreRules, err error) {
+	f, err := os.Open(path)
+	if err != nil {
+		return nil, err
+	}
+	defer func() { err = errors.Join(err, f.Close()) }()
+
+	rules = &ignoreRules{base: base}
+	lines := bufio.NewScanner(f)
+	for lines.Scan() {
+		if rule, ok := parseIgnoreRule(lines.Text()); ok {
+			rules.rules = append(rules.rules, rule)
+		}
+	}
+	return rules, lines.Err()
+}
+
+// parseIgnoreRule compiles one .gitignore line. Blank lines and comments
+// give no rule.
+func parseIgnoreRule(line string) (ignoreRule, bool) {
+	line = strings.TrimRight(line, " \t\r")
+	if line == "" || strings.HasPrefix(line, "#") {
+		return ignoreRule{}, false
+	}
+
+	var rule ignoreRule
+	if strings.HasPrefix(line, "!") {
+		rule.negate = true
+		line = line[1:]
+	}
+	line = strings.TrimPrefix(line, `\`)
+
+	if strings.HasSuffix(line, "/") {
+		rule.dirOnly = true
+		line = strings.TrimSuffix(line, "/")
+	}
+	if line == "" {
+		return ignoreRule{}, false
+	}
+
+	// a slash anywhere but the end anchors the pattern to the .gitignore's
+	// directory; otherwise it matches a name at any depth
+	anchored := strings.Contains(line, "/")
+	line = strings.TrimPrefix(line, "/")
+
+	prefix := "^(?:.*/)?"
+	if anchored {
+		prefix = "^"
+	}
+
+	// a match also covers everything below the matched directory
+	re, err := regexp.Compile(prefix + globToRegexp(line) + "(?:/.*)?$")
+	if err != nil {
+		return ignoreRule{}, false
+	}
+	rule.re = re
+	return rule, true
+}
+
+// globToRegexp translates gitignore glob syntax: * and ? stay within one
+// path segment, ** spans any number of them
+func globToRegexp(glob string) string {
+	var b strings.Builder
+	for i := 0; i < len(glob); i++ {
+		c := glob[i]
+		switch {
+		case strings.HasPrefix(glob[i:], "**/"):
+			b.WriteString("(?:.*/)?")
+			i += 2
+		case strings.HasPrefix(glob[i:], "**"):
+			b.WriteString(".*")
+			i++
+		case c == '*':
+			b.WriteString("[^/]*")
+		case c == '?':
+			b.WriteString("[^/]")
+		case c == '[':
+			end := strings.IndexByte(glob[i+1:], ']')
+			if end < 0 {
+				b.WriteString(`\[`)
+				continue
+			}
+			class := glob[i+1 : i+1+end]
+			if strings.HasPrefix(class, "!") {
+				class = "^" + class[1:]
+			}
+			b.WriteString("[" + class + "]")
+			i += end + 1
+		default:
+			b.WriteString(regexp.QuoteMeta(string(c)))
+		}
+	}
+	return b.String()
+}
@@ -0,0 +1,421 @@
+// Package scanner finds skills, directories holding a SKILL.md file, and
+// reads their name and description from its YAML frontmatter.
+package scanner
+
+import (
+	"bufio"
+	"bytes"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"io"
+	"os"
+	"path"
+	"path/filepath"
+	"runtime"
+	"sort"
+	"strings"
+	"sync"
+
+	"gopkg.in/yaml.v3"
+)
+
+// SkillFile is the file that marks a directory as a skill
+const SkillFile = "SKILL.md"
+
+// maxFrontmatterBytes bounds how much of a SKILL.md is read looking for the
+// end of its frontmatter
+const maxFrontmatterBytes = 64 * 1024
+
+// SkillInfo describes one skill
+type SkillInfo struct {
+	Name        string `json:"name"`
+	Description string `json:"description"`
+	// Path is the skill's directory, slash separated and relative to the
+	// scanned root; "." for a skill at the root itself
+	Path string `json:"path"`
+}
+
+// String returns the name, followed by the description cut to one short line
+func (s SkillInfo) String() string {
+	if s.Description == "" {
+		return s.Name
+	}
+
+	desc := s.Description
+	if len(desc) > 60 {
+		desc = strings.TrimSpace(desc[:57]) + "..."
+	}
+	return s.Name + " - " + desc
+}
+
+// Scanner finds skills in a directory tree. It is safe for concurrent use;
+// scans share a cache of parsed SKILL.md files keyed by path, modification
+// time and size, so repeat scans only read files that changed.
+type Scanner struct {
+	workers  int
+	skipDirs map[string]bool
+
+	mu    sync.Mutex
+	cache map[string]cacheEntry
+	// blobs caches SKILL.md frontmatter read from git, by blob SHA
+	blobs map[string]SkillInfo
+}
+
+// cacheFile is the on-disk form of a scanner's caches
+type cacheFile struct {
+	Files map[string]cacheEntry `json:"files"`
+	Blobs map[string]SkillInfo  `json:"blobs"`
+}
+
+type cacheEntry struct {
+	ModTime int64     `json:"mod_time"`
+	Size    int64     `json:"size"`
+	Skill   SkillInfo `json:"skill"`
+}
+
+// Option configures a Scanner
+type Option func(*Scanner)
+
+// WithWorkers sets how many directories are read in parallel; 0 means one
+// per CPU
+func WithWorkers(n int) Option {
+	return func(s *Scanner) {
+		s.workers = n
+	}
+}
+
+// WithSkipDirs replaces DefaultSkipDirs
+func WithSkipDirs(names ...string) Option {
+	return func(s *Scanner) {
+		s.skipDirs = toSet(names)
+	}
+}
+
+// New creates a scanner
+func New(opts ...Option) *Scanner {
+	s := &Scanner{
+		skipDirs: toSet(DefaultSkipDirs),
+		cache:    make(map[string]cacheEntry),
+		blobs:    make(map[string]SkillInfo),
+	}
+	for _, opt := range opts {
+		opt(s)
+	}
+	if s.workers <= 0 {
+		s.workers = runtime.NumCPU()
+	}
+	return s
+}
+
+// Scan returns every skill under root, sorted by path. Directories in the
+// skip list or excluded by a .gitignore are not entered. Unreadable
+// directories and malformed SKILL.md files don't stop the scan; they are
+// returned together as the error, next to the skills that were found.
+func (s *Scanner) Scan(root string) ([]SkillInfo, error) {
+	root, err := filepath.Abs(root)
+	if err != nil {
+		return nil, err
+	}
+
+	info, err := os.Stat(root)
+	if err != nil {
+		if os.IsNotExist(err) {
+			return nil, fmt.Errorf("path does not exist: %s", root)
+		}
+		return nil, err
+	}
+	if !info.IsDir() {
+		return nil, fmt.Errorf("not a directory: %s", root)
+	}
+
+	w := &walk{scanner: s, skills: []SkillInfo{}}
+	w.cond = sync.NewCond(&w.mu)
+	w.push([]dirTask{{dir: root, ignores: ignoreStack(nil).with(root, "")}})
+
+	var wg sync.WaitGroup
+	for i := 0; i < s.workers; i++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			w.work()
+		}()
+	}
+	wg.Wait()
+
+	sortSkills(w.skills)
+	return w.skills, errors.Join(w.errs...)
+}
+
+func sortSkills(skills []SkillInfo) {
+	sort.Slice(skills, func(i, j int) bool { return skills[i].Path < skills[j].Path })
+}
+
+// LoadCache merges a cache written by SaveCache into the scanner's. A
+// missing file is not an error.
+func (s *Scanner) LoadCache(path string) error {
+	data, err := os.ReadFile(path)
+	if err != nil {
+		if os.IsNotExist(err) {
+			return nil
+		}
+		return err
+	}
+
+	var cached cacheFile
+	if err := json.Unmarshal(data, &cached); err != nil {
+		return fmt.Errorf("failed to parse scan cache %s: %w", path, err)
+	}
+
+	s.mu.Lock()
+	defer s.mu.Unlock()
+	for k, v := range cached.Files {
+		s.cache[k] = v
+	}
+	for k, v := range cached.Blobs {
+		s.blobs[k] = v
+	}
+	return nil
+}
+
+// SaveCache writes the scanner's cache to path
+func (s *Scanner) SaveCache(path string) error {
+	s.mu.Lock()
+	data, err := json.Marshal(cacheFile{Files: s.cache, Blobs: s.blobs})
+	s.mu.Unlock()
+	if err != nil {
+		return err
+	}
+
+	if err := os.MkdirAll(filepath.Dir(path), 0755); err != nil {
+		return err
+	}
+	return os.WriteFile(path, data, 0644)
+}
+
+// readSkill returns the frontmatter of the SKILL.md at file, from the cache
+// when the file hasn't changed since it was last parsed
+func (s *Scanner) readSkill(file string) (SkillInfo, error) {
+	info, err := os.Stat(file)
+	if err != nil {
+		return SkillInfo{}, err
+	}
+
+	key, err := filepath.Abs(file)
+	if err != nil {
+		return SkillInfo{}, err
+	}
+
+	s.mu.Lock()
+	entry, ok := s.cache[key]
+	s.mu.Unlock()
+	if ok && entry.ModTime == info.ModTime().UnixNano() && entry.Size == info.Size() {
+		return entry.Skill, nil
+	}
+
+	skill, err := readSkillFile(file)
+	if err != nil {
+		return SkillInfo{}, err
+	}
+
+	s.mu.Lock()
+	s.cache[key] = cacheEntry{ModTime: info.ModTime().UnixNano(), Size: info.Size(), Skill: skill}
+	s.mu.Unlock()
+
+	return skill, nil
+}
+
+func readSkillFile(file string) (skill SkillInfo, err error) {
+	f, err := os.Open(file)
+	if err != nil {
+		return SkillInfo{}, err
+	}
+	defer func() { err = errors.Join(err, f.Close()) }()
+
+	skill, err = ParseSkill(f)
+	if err != nil {
+		return SkillInfo{}, fmt.Errorf("%s: %w", file, err)
+	}
+	return skill, nil
+}
+
+// ParseSkill reads a skill's name and description from the YAML
+// frontmatter of a SKILL.md, and stops reading at the frontmatter's closing
+// ---. Both are left empty when the file has no frontmatter; Path is never
+// set.
+func ParseSkill(r io.Reader) (SkillInfo, error) {
+	var skill SkillInfo
+
+	front, err := readFrontmatter(r)
+	if err != nil || front == nil {
+		return skill, err
+	}
+
+	var meta struct {
+		Name        string `yaml:"name"`
+		Description string `yaml:"description"`
+	}
+	if err := yaml.Unmarshal(front, &meta); err != nil {
+		return SkillInfo{}, fmt.Errorf("invalid frontmatter: %w", err)
+	}
+
+	skill.Name = strings.TrimSpace(meta.Name)
+	skill.Description = strings.TrimSpace(meta.Description)
+	return skill, nil
+}
+
+// located completes parsed frontmatter with the skill's directory, which
+// also names skills whose frontmatter doesn't
+func located(skill SkillInfo, dir, fallbackName string) SkillInfo {
+	skill.Path = dir
+	if skill.Name == "" {
+		skill.Name = fallbackName
+	}
+	return skill
+}
+
+// readFrontmatter returns the text between an opening --- on the first line
+// and the next ---, or nil when the file doesn't start with one
+func readFrontmatter(r io.Reader) ([]byte, error) {
+	br := bufio.NewReader(io.LimitReader(r, maxFrontmatterBytes))
+
+	first, err := br.ReadString('\n')
+	if strings.TrimRight(first, "\r\n") != "---" {
+		if err != nil && err != io.EOF {
+			return nil, err
+		}
+		return nil, nil
+	}
+
+	var front bytes.Buffer
+	for {
+		line, err := br.ReadString('\n')
+		if strings.TrimRight(line, " \t\r\n") == "---" {
+			return front.Bytes(), nil
+		}
+		front.WriteString(line)
+
+		if err == io.EOF {
+			return nil, fmt.Errorf("frontmatter is not closed within %d bytes", maxFrontmatterBytes)
+		}
+		if err != nil {
+			return nil, err
+		}
+	}
+}
+
+// dirTask is a directory waiting to be read
+type dirTask struct {
+	dir     string
+	rel     string
+	ignores ignoreStack
+}
+
+// walk is one scan: a queue of directories shared by the workers
+type walk struct {
+	scanner *Scanner
+
+	mu      sync.Mutex
+	cond    *sync.Cond
+	queue   []dirTask
+	pending int // queued plus in-progress directories
+
+	skills []SkillInfo
+	errs   []error
+}
+
+func (w *walk) push(tasks []dirTask) {
+	w.mu.Lock()
+	w.queue = append(w.queue, tasks...)
+	w.pending += len(tasks)
+	w.mu.Unlock()
+	w.cond.Broadcast()
+}
+
+// work reads directories until none are queued or in progress
+func (w *walk) work() {
+	for {
+		w.mu.Lock()
+		for len(w.queue) == 0 && w.pending > 0 {
+			w.cond.Wait()
+		}
+		if w.pending == 0 {
+			w.mu.Unlock()
+			return
+		}
+		task := w.queue[len(w.queue)-1]
+		w.queue = w.queue[:len(w.queue)-1]
+		w.mu.Unlock()
+
+		w.readDir(task)
+
+		w.mu.Lock()
+		w.pending--
+		done := w.pending == 0
+		w.mu.Unlock()
+		if done {
+			w.cond.Broadcast()
+		}
+	}
+}
+
+func (w *walk) readDir(task dirTask) {
+	entries, err := os.ReadDir(task.dir)
+	if err != nil {
+		w.fail(err)
+		return
+	}
+
+	var subdirs []dirTask
+	for _, entry := range entries {
+		name := entry.Name()
+		rel := path.Join(task.rel, name)
+
+		if entry.IsDir() {
+			if w.scanner.skipDirs[name] || task.ignores.ignored(rel, true) {
+				continue
+			}
+			dir := filepath.Join(task.dir, name)
+			subdirs = append(subdirs, dirTask{dir: dir, rel: rel, ignores: task.ignores.with(dir, rel)})
+			continue
+		}
+
+		if name != SkillFile || !entry.Type().IsRegular() || task.ignores.ignored(rel, false) {
+			continue
+		}
+
+		skill, err := w.scanner.readSkill(filepath.Join(task.dir, name))
+		if err != nil {
+			w.fail(err)
+			continue
+		}
+
+		dir := task.rel
+		if dir == "" {
+			dir = "."
+		}
+		skill = located(skill, dir, filepath.Base(task.dir))
+
+		w.mu.Lock()
+		w.skills = append(w.skills, skill)
+		w.mu.Unlock()
+	}
+
+	if len(subdirs) > 0 {
+		w.push(subdirs)
+	}
+}
+
+func (w *walk) fail(err error) {
+	w.mu.Lock()
+	w.errs = append(w.errs, err)
+	w.mu.Unlock()
+}
+
+func toSet(names []string) map[string]bool {
+	set := make(map[string]bool, len(names))
+	for _, name := range names {
+		set[name] = true
+	}
+	return set
+}
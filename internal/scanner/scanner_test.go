@@ -0,0 +1,159 @@
+package scanner
+
+import (
+	"os"
+	"path/filepath"
+	"strings"
+	"testing"
+	"time"
+
+	"github.com/stretchr/testify/require"
+)
+
+func writeFile(t *testing.T, root, rel, content string) string {
+	t.Helper()
+	path := filepath.Join(root, filepath.FromSlash(rel))
+	require.NoError(t, os.MkdirAll(filepath.Dir(path), 0755))
+	require.NoError(t, os.WriteFile(path, []byte(content), 0644))
+	return path
+}
+
+func skillMD(name, description string) string {
+	return "---\nname: " + name + "\ndescription: " + description + "\n---\n\n# " + name + "\n"
+}
+
+func TestScan(t *testing.T) {
+	root := t.TempDir()
+	writeFile(t, root, "test-skill/SKILL.md", skillMD("test-skill", "A test skill for testing"))
+	writeFile(t, root, "nested/deep/other/SKILL.md", skillMD("other", "Another skill"))
+	writeFile(t, root, "plain/SKILL.md", "# No frontmatter\n")
+	writeFile(t, root, "web/node_modules/pkg/SKILL.md", skillMD("dependency", "skipped by default"))
+	writeFile(t, root, "build/SKILL.md", skillMD("built", "ignored by .gitignore"))
+	writeFile(t, root, "nested/generated/SKILL.md", skillMD("generated", "ignored by a nested .gitignore"))
+	writeFile(t, root, "nested/keep/SKILL.md", skillMD("keep", "not ignored"))
+	writeFile(t, root, ".gitignore", "# build output\nbuild/\n")
+	writeFile(t, root, "nested/.gitignore", "generated\n")
+
+	skills, err := New(WithWorkers(3)).Scan(root)
+	require.NoError(t, err)
+	require.Equal(t, []SkillInfo{
+		{Name: "other", Description: "Another skill", Path: "nested/deep/other"},
+		{Name: "keep", Description: "not ignored", Path: "nested/keep"},
+		{Name: "plain", Path: "plain"},
+		{Name: "test-skill", Description: "A test skill for testing", Path: "test-skill"},
+	}, skills)
+}
+
+func TestScan_Errors(t *testing.T) {
+	_, err := New().Scan("/nonexistent/path")
+	require.ErrorContains(t, err, "path does not exist")
+
+	root := t.TempDir()
+	writeFile(t, root, "good/SKILL.md", skillMD("good", "fine"))
+	writeFile(t, root, "open/SKILL.md", "---\nname: open\n")
+	writeFile(t, root, "bad/SKILL.md", "---\nname: [unclosed\n---\n")
+
+	skills, err := New().Scan(root)
+	require.Len(t, skills, 1, "malformed skills don't stop the scan")
+	require.ErrorContains(t, err, "invalid frontmatter")
+	require.ErrorContains(t, err, "not closed")
+}
+
+func TestScan_StopsAtFrontmatter(t *testing.T) {
+	body := strings.Repeat("lots of markdown\n", 10000)
+	r := strings.NewReader(skillMD("big", "a long skill") + body)
+
+	skill, err := ParseSkill(r)
+	require.NoError(t, err)
+	require.Equal(t, "big", skill.Name)
+	require.Greater(t, r.Len(), len(body)-maxFrontmatterBytes, "the body is left mostly unread")
+}
+
+func TestScan_Cache(t *testing.T) {
+	root := t.TempDir()
+	path := writeFile(t, root, "s/SKILL.md", skillMD("first", "v1"))
+
+	info, err := os.Stat(path)
+	require.NoError(t, err)
+	modTime := info.ModTime()
+
+	s := New()
+	skills, err := s.Scan(root)
+	require.NoError(t, err)
+	require.Equal(t, "first", skills[0].Name)
+
+	// same size and modification time: served from the cache, unread
+	writeFile(t, root, "s/SKILL.md", skillMD("third", "v3"))
+	require.NoError(t, os.Chtimes(path, modTime, modTime))
+
+	skills, err = s.Scan(root)
+	require.NoError(t, err)
+	require.Equal(t, "first", skills[0].Name)
+
+	// a newer file is parsed again
+	later := modTime.Add(time.Minute)
+	require.NoError(t, os.Chtimes(path, later, later))
+
+	skills, err = s.Scan(root)
+	require.NoError(t, err)
+	require.Equal(t, "third", skills[0].Name)
+
+	// a new scanner picks the cache up from disk
+	cachePath := filepath.Join(t.TempDir(), "cache.json")
+	require.NoError(t, s.SaveCache(cachePath))
+
+	writeFile(t, root, "s/SKILL.md", skillMD("fifth", "v5"))
+	require.NoError(t, os.Chtimes(path, later, later))
+
+	fresh := New()
+	require.NoError(t, fresh.LoadCache(cachePath))
+	skills, err = fresh.Scan(root)
+	require.NoError(t, err)
+	require.Equal(t, "third", skills[0].Name)
+
+	require.NoError(t, New().LoadCache(filepath.Join(root, "missing.json")))
+}
+
+func TestSkillInfo_String(t *testing.T) {
+	require.Equal(t, "test-skill", SkillInfo{Name: "test-skill"}.String())
+	require.Equal(t, "test-skill - Short description", SkillInfo{Name: "test-skill", Description: "Short description"}.String())
+
+	long := SkillInfo{Name: "test-skill", Description: strings.Repeat("word ", 20)}
+	require.True(t, strings.HasSuffix(long.String(), "..."))
+}
+
+func TestIgnoreRules(t *testing.T) {
+	rules := &ignoreRules{}
+	for _, line := range []string{"*.log", "/dist", "docs/**/drafts", "tmp/", "!keep.log", "[ab]c"} {
+		rule, ok := parseIgnoreRule(line)
+		require.True(t, ok, line)
+		rules.rules = append(rules.rules, rule)
+	}
+	stack := ignoreStack{rules}
+
+	tests := []struct {
+		path    string
+		isDir   bool
+		ignored bool
+	}{
+		{"app.log", false, true},
+		{"sub/app.log", false, true},
+		{"sub/keep.log", false, false},
+		{"dist", true, true},
+		{"sub/dist", true, false},
+		{"docs/drafts", true, true},
+		{"docs/a/b/drafts", true, true},
+		{"tmp", true, true},
+		{"tmp", false, false},
+		{"ac", false, true},
+		{"cc", false, false},
+	}
+	for _, tt := range tests {
+		require.Equal(t, tt.ignored, stack.ignored(tt.path, tt.isDir), tt.path)
+	}
+
+	_, ok := parseIgnoreRule("# comment")
+	require.False(t, ok)
+	_, ok = parseIgnoreRule("   ")
+	require.False(t, ok)
+}
@@ -0,0 +1,82 @@
+package server
+
+import (
+	"crypto/rand"
+	"crypto/subtle"
+	"encoding/hex"
+	"errors"
+	"fmt"
+	"net/http"
+	"os"
+	"path/filepath"
+	"strings"
+)
+
+// DefaultTokenFile is where a server listening on TCP keeps its bearer token
+// when given none, and where clients look for it
+var DefaultTokenFile = defaultTokenFile()
+
+func defaultTokenFile() string {
+	dir, err := os.UserConfigDir()
+	if err != nil {
+		dir = os.TempDir()
+	}
+	return filepath.Join(dir, "waza", "serve.token")
+}
+
+// LoadOrCreateToken returns the token in path, first writing a new random one
+// readable only by the current user if there is none
+func LoadOrCreateToken(path string) (string, error) {
+	token, err := ReadToken(path)
+	if err == nil || !errors.Is(err, os.ErrNotExist) {
+		return token, err
+	}
+
+	var b [32]byte
+	if _, err := rand.Read(b[:]); err != nil {
+		return "", err
+	}
+	token = hex.EncodeToString(b[:])
+
+	if err := os.MkdirAll(filepath.Dir(path), 0700); err != nil {
+		return "", fmt.Errorf("failed to create token file: %w", err)
+	}
+	f, err := os.OpenFile(path, os.O_WRONLY|os.O_CREATE|os.O_EXCL, 0600)
+	if errors.Is(err, os.ErrExist) {
+		// another server wrote one first
+		return ReadToken(path)
+	}
+	if err != nil {
+		return "", fmt.Errorf("failed to create token file: %w", err)
+	}
+	_, err = f.WriteString(token + "\n")
+	return token, errors.Join(err, f.Close())
+}
+
+// ReadToken reads the token in path
+func ReadToken(path string) (string, error) {
+	data, err := os.ReadFile(path)
+	if err != nil {
+		return "", err
+	}
+	token := strings.TrimSpace(string(data))
+	if token == "" {
+		return "", fmt.Errorf("token file %s is empty", path)
+	}
+	return token, nil
+}
+
+// requireToken rejects requests without the bearer token, when there is one
+func (s *Server) requireToken(next http.Handler) http.Handler {
+	if s.token == "" {
+		return next
+	}
+	want := []byte("Bearer " + s.token)
+	return http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		if subtle.ConstantTimeCompare([]byte(r.Header.Get("Authorization")), want) != 1 {
+			http.Error(w, "missing or invalid bearer token", http.StatusUnauthorized)
+			return
+		}
+		next.ServeHTTP(w, r)
+	})
+}
@@ -0,0 +1,141 @@
+package server
+
+import (
+	"bufio"
+	"bytes"
+	"context"
+	"encoding/json"
+	"fmt"
+	"io"
+	"net"
+	"net/http"
+	"strings"
+)
+
+// maxEventBytes bounds one line of an event stream; result events carry
+// whole outcomes, transcripts included
+const maxEventBytes = 256 << 20
+
+// Client talks to a server
+type Client struct {
+	http  *http.Client
+	base  string
+	token string
+}
+
+// ClientOption configures a Client
+type ClientOption func(*Client)
+
+// WithBearerToken sends token with every request, for servers started with
+// WithToken
+func WithBearerToken(token string) ClientOption {
+	return func(c *Client) {
+		c.token = token
+	}
+}
+
+// NewClient creates a client for the server at addr, given as to Listen
+func NewClient(addr string, opts ...ClientOption) *Client {
+	c := newClient(addr)
+	for _, opt := range opts {
+		opt(c)
+	}
+	return c
+}
+
+func newClient(addr string) *Client {
+	network, address := splitAddr(addr)
+	if network == "tcp" {
+		return &Client{http: &http.Client{}, base: "http://" + address}
+	}
+
+	transport := &http.Transport{
+		DialContext: func(ctx context.Context, _, _ string) (net.Conn, error) {
+			var d net.Dialer
+			return d.DialContext(ctx, "unix", address)
+		},
+	}
+	return &Client{http: &http.Client{Transport: transport}, base: "http://waza"}
+}
+
+// Submit queues a job
+func (c *Client) Submit(ctx context.Context, req JobRequest) (JobStatus, error) {
+	body, err := json.Marshal(req)
+	if err != nil {
+		return JobStatus{}, err
+	}
+
+	var status JobStatus
+	err = c.do(ctx, http.MethodPost, "/v1/jobs", bytes.NewReader(body), func(resp *http.Response) error {
+		return json.NewDecoder(resp.Body).Decode(&status)
+	})
+	return status, err
+}
+
+// Cancel cancels a job
+func (c *Client) Cancel(ctx context.Context, id string) error {
+	return c.do(ctx, http.MethodDelete, "/v1/jobs/"+id, nil, nil)
+}
+
+// Jobs lists the server's jobs
+func (c *Client) Jobs(ctx context.Context) ([]JobStatus, error) {
+	var statuses []JobStatus
+	err := c.do(ctx, http.MethodGet, "/v1/jobs", nil, func(resp *http.Response) error {
+		return json.NewDecoder(resp.Body).Decode(&statuses)
+	})
+	return statuses, err
+}
+
+// Events calls fn with each of a job's events, from the first, until the
+// job finishes. It returns the final result or error event.
+func (c *Client) Events(ctx context.Context, id string, fn func(Event)) (Event, error) {
+	var last Event
+	err := c.do(ctx, http.MethodGet, "/v1/jobs/"+id+"/events", nil, func(resp *http.Response) error {
+		lines := bufio.NewScanner(resp.Body)
+		lines.Buffer(make([]byte, 0, 64*1024), maxEventBytes)
+		for lines.Scan() {
+			var event Event
+			if err := json.Unmarshal(lines.Bytes(), &event); err != nil {
+				return fmt.Errorf("invalid event: %w", err)
+			}
+			fn(event)
+			last = event
+		}
+		return lines.Err()
+	})
+	if err != nil {
+		return Event{}, err
+	}
+	if last.Type != EventResult && last.Type != EventError {
+		return Event{}, fmt.Errorf("event stream of job %s ended early", id)
+	}
+	return last, nil
+}
+
+func (c *Client) do(ctx context.Context, method, path string, body io.Reader, read func(*http.Response) error) error {
+	req, err := http.NewRequestWithContext(ctx, method, c.base+path, body)
+	if err != nil {
+		return err
+	}
+	if body != nil {
+		req.Header.Set("Content-Type", "application/json")
+	}
+	if c.token != "" {
+		req.Header.Set("Authorization", "Bearer "+c.token)
+	}
+
+	resp, err := c.http.Do(req)
+	if err != nil {
+		return fmt.Errorf("failed to reach waza server: %w", err)
+	}
+	defer resp.Body.Close()
+
+	if resp.StatusCode >= 300 {
+		msg, _ := io.ReadAll(io.LimitReader(resp.Body, 4096))
+		return fmt.Errorf("waza server: %s: %s", resp.Status, strings.TrimSpace(string(msg)))
+	}
+	if read == nil {
+		return nil
+	}
+	return read(resp)
+}
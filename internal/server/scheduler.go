@@ -0,0 +1,183 @@
+package server
+
+import (
+	"context"
+	"fmt"
+	"sync"
+
+	"github.com/spboyer/waza/internal/execution"
+)
+
+// scheduler hands out a fixed number of session slots to jobs. When slots
+// are contended, the next free one goes to the waiting job with the fewest
+// sessions running, oldest waiter first, so a large job can't starve a small
+// one submitted after it.
+type scheduler struct {
+	mu      sync.Mutex
+	free    int
+	waiting []*waiter
+	running map[*job]int
+}
+
+type waiter struct {
+	job   *job
+	ready chan struct{}
+}
+
+func newScheduler(slots int) *scheduler {
+	return &scheduler{free: slots, running: make(map[*job]int)}
+}
+
+// acquire blocks until j holds a slot, or ctx is done
+func (s *scheduler) acquire(ctx context.Context, j *job) error {
+	s.mu.Lock()
+	if s.free > 0 && len(s.waiting) == 0 {
+		s.free--
+		s.running[j]++
+		s.mu.Unlock()
+		return nil
+	}
+	w := &waiter{job: j, ready: make(chan struct{})}
+	s.waiting = append(s.waiting, w)
+	s.mu.Unlock()
+
+	select {
+	case <-w.ready:
+		return nil
+	case <-ctx.Done():
+	}
+
+	s.mu.Lock()
+	defer s.mu.Unlock()
+	for i, other := range s.waiting {
+		if other == w {
+			s.waiting = append(s.waiting[:i], s.waiting[i+1:]...)
+			return ctx.Err()
+		}
+	}
+	// granted while giving up; hand the slot on
+	s.releaseLocked(j)
+	return ctx.Err()
+}
+
+// release returns a slot held by j
+func (s *scheduler) release(j *job) {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+	s.releaseLocked(j)
+}
+
+func (s *scheduler) releaseLocked(j *job) {
+	if s.running[j]--; s.running[j] == 0 {
+		delete(s.running, j)
+	}
+	s.free++
+
+	for s.free > 0 && len(s.waiting) > 0 {
+		next := 0
+		for i, w := range s.waiting {
+			if s.running[w.job] < s.running[s.waiting[next].job] {
+				next = i
+			}
+		}
+		w := s.waiting[next]
+		s.waiting = append(s.waiting[:next], s.waiting[next+1:]...)
+		s.free--
+		s.running[w.job]++
+		close(w.ready)
+	}
+}
+
+// enginePool keeps initialized engines between sessions and jobs. Engines
+// are keyed by what configures them, and each is used by one session at a
+// time.
+type enginePool struct {
+	mu   sync.Mutex
+	idle map[string][]execution.AgentEngine
+	all  []execution.AgentEngine
+}
+
+func newEnginePool() *enginePool {
+	return &enginePool{idle: make(map[string][]execution.AgentEngine)}
+}
+
+// get returns an idle engine for key, or creates and initializes one
+func (p *enginePool) get(ctx context.Context, key string, create func() (execution.AgentEngine, error)) (execution.AgentEngine, error) {
+	p.mu.Lock()
+	if idle := p.idle[key]; len(idle) > 0 {
+		engine := idle[len(idle)-1]
+		p.idle[key] = idle[:len(idle)-1]
+		p.mu.Unlock()
+		return engine, nil
+	}
+	p.mu.Unlock()
+
+	engine, err := create()
+	if err != nil {
+		return nil, err
+	}
+	if err := engine.Initialize(ctx); err != nil {
+		return nil, fmt.Errorf("failed to initialize engine: %w", err)
+	}
+
+	p.mu.Lock()
+	p.all = append(p.all, engine)
+	p.mu.Unlock()
+	return engine, nil
+}
+
+// put makes an engine taken with get available again
+func (p *enginePool) put(key string, engine execution.AgentEngine) {
+	p.mu.Lock()
+	defer p.mu.Unlock()
+	p.idle[key] = append(p.idle[key], engine)
+}
+
+// size returns how many engines the pool has created
+func (p *enginePool) size() int {
+	p.mu.Lock()
+	defer p.mu.Unlock()
+	return len(p.all)
+}
+
+// shutdown stops every engine the pool created
+func (p *enginePool) shutdown(ctx context.Context) {
+	p.mu.Lock()
+	engines := p.all
+	p.all, p.idle = nil, make(map[string][]execution.AgentEngine)
+	p.mu.Unlock()
+
+	for _, engine := range engines {
+		if err := engine.Shutdown(ctx); err != nil {
+			fmt.Printf("warning: failed to shutdown engine: %v\n", err)
+		}
+	}
+}
+
+// jobEngine is the engine a job's runner sees. Each session waits for a
+// slot from the server's scheduler and runs on a pooled engine; the pool,
+// not the runner, owns the engines' lifecycle.
+type jobEngine struct {
+	server *Server
+	job    *job
+	key    string
+	create func() (execution.AgentEngine, error)
+}
+
+func (e *jobEngine) Initialize(ctx context.Context) error { return nil }
+func (e *jobEngine) Shutdown(ctx context.Context) error   { return nil }
+
+func (e *jobEngine) Execute(ctx context.Context, req *execution.ExecutionRequest) (*execution.ExecutionResponse, error) {
+	if err := e.server.sched.acquire(ctx, e.job); err != nil {
+		return nil, err
+	}
+	defer e.server.sched.release(e.job)
+
+	engine, err := e.server.engines.get(ctx, e.key, e.create)
+	if err != nil {
+		return nil, err
+	}
+	defer e.server.engines.put(e.key, engine)
+
+	return engine.Execute(ctx, req)
+}
@@ -0,0 +1,647 @@
+// Package server runs benchmarks for many clients from one long-lived
+// process. Jobs are submitted over HTTP, on a unix socket or a local port,
+// and queued; running jobs share one pool of session slots, scheduled
+// fairly between them, along with warm engines and Python grader workers.
+// Each job's progress is streamed back as JSON lines.
+package server
+
+import (
+	"context"
+	"crypto/rand"
+	"encoding/hex"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"net"
+	"net/http"
+	"os"
+	"path/filepath"
+	"runtime"
+	"strings"
+	"sync"
+	"time"
+
+	"github.com/spboyer/waza/internal/config"
+	"github.com/spboyer/waza/internal/execution"
+	"github.com/spboyer/waza/internal/graders"
+	"github.com/spboyer/waza/internal/models"
+	"github.com/spboyer/waza/internal/orchestration"
+)
+
+// Server defaults
+const (
+	DefaultMaxJobs = 4
+	// keepFinished is how many finished jobs are kept for status queries
+	keepFinished = 100
+)
+
+// DefaultSocket is where the server listens when given no address
+var DefaultSocket = filepath.Join(os.TempDir(), "waza.sock")
+
+// Job states
+const (
+	StateQueued    = "queued"
+	StateRunning   = "running"
+	StateSucceeded = "succeeded"
+	StateFailed    = "failed"
+	StateCancelled = "cancelled"
+)
+
+// Event types streamed for a job
+const (
+	EventProgress = "progress"
+	EventResult   = "result"
+	EventError    = "error"
+)
+
+// JobRequest submits a benchmark. Paths are read by the server, so they
+// should be absolute.
+type JobRequest struct {
+	SpecPath   string `json:"spec_path"`
+	ContextDir string `json:"context_dir,omitempty"`
+	// Overrides of the spec's config
+	Model       string `json:"model,omitempty"`
+	RunsPerTest int    `json:"runs_per_test,omitempty"`
+	TimeoutSec  int    `json:"timeout_seconds,omitempty"`
+	// Workers caps the job's sessions in flight and runs its trials
+	// concurrently; 0 keeps the spec's setting. The server's own slot limit
+	// applies on top.
+	Workers int `json:"workers,omitempty"`
+}
+
+// JobStatus describes a job
+type JobStatus struct {
+	ID        string     `json:"id"`
+	State     string     `json:"state"`
+	SpecPath  string     `json:"spec_path"`
+	Submitted time.Time  `json:"submitted"`
+	Started   *time.Time `json:"started,omitempty"`
+	Finished  *time.Time `json:"finished,omitempty"`
+	Error     string     `json:"error,omitempty"`
+}
+
+// Event is one line of a job's event stream. The stream ends with a result
+// or an error event.
+type Event struct {
+	Type     string                       `json:"type"`
+	Progress *orchestration.ProgressEvent `json:"progress,omitempty"`
+	// Outcome is the result of a single-model benchmark, Matrix of a
+	// multi-model one
+	Outcome *models.EvaluationOutcome `json:"outcome,omitempty"`
+	Matrix  *models.MatrixOutcome     `json:"matrix,omitempty"`
+	Error   string                    `json:"error,omitempty"`
+}
+
+// EngineFactory creates an engine for a spec and model
+type EngineFactory func(spec *models.BenchmarkSpec, modelID string) (execution.AgentEngine, error)
+
+// Server queues and runs benchmark jobs
+type Server struct {
+	newEngine     EngineFactory
+	workers       int
+	maxJobs       int
+	graderWorkers int
+	// token, if set, must be sent as a bearer token with every request
+	token string
+
+	sched    *scheduler
+	engines  *enginePool
+	graders  *graders.PythonWorkerPool
+	jobSlots chan struct{}
+
+	mu   sync.Mutex
+	jobs map[string]*job
+	// order lists job IDs by submission, for listing and expiry
+	order []string
+	wg    sync.WaitGroup
+}
+
+// Option configures a Server
+type Option func(*Server)
+
+// WithWorkers sets how many sessions run at once across all jobs; 0 means
+// one per CPU
+func WithWorkers(n int) Option {
+	return func(s *Server) {
+		s.workers = n
+	}
+}
+
+// WithMaxJobs sets how many jobs run at once; the rest wait in order of
+// submission
+func WithMaxJobs(n int) Option {
+	return func(s *Server) {
+		s.maxJobs = n
+	}
+}
+
+// WithGraderWorkers sets the size of the shared Python grader pool; 0 means
+// one per CPU
+func WithGraderWorkers(n int) Option {
+	return func(s *Server) {
+		s.graderWorkers = n
+	}
+}
+
+// WithToken makes the server require token as a bearer token on every
+// request. Servers listening on TCP need one.
+func WithToken(token string) Option {
+	return func(s *Server) {
+		s.token = token
+	}
+}
+
+// New creates a server that creates engines with newEngine
+func New(newEngine EngineFactory, opts ...Option) *Server {
+	s := &Server{
+		newEngine: newEngine,
+		maxJobs:   DefaultMaxJobs,
+		engines:   newEnginePool(),
+		jobs:      make(map[string]*job),
+	}
+	for _, opt := range opts {
+		opt(s)
+	}
+	if s.workers <= 0 {
+		s.workers = runtime.NumCPU()
+	}
+	if s.maxJobs <= 0 {
+		s.maxJobs = DefaultMaxJobs
+	}
+	if s.graderWorkers <= 0 {
+		s.graderWorkers = runtime.NumCPU()
+	}
+
+	s.sched = newScheduler(s.workers)
+	s.graders = graders.NewPythonWorkerPool(s.graderWorkers)
+	s.jobSlots = make(chan struct{}, s.maxJobs)
+	return s
+}
+
+// Listen opens the listener for addr: a unix socket path, optionally
+// prefixed with unix://, or a host:port, optionally prefixed with http://.
+// Jobs run grader code and read specs and fixtures as the server's user, so
+// a socket is only accessible to that user, and a host:port must be on a
+// loopback address and served with a token (see WithToken). A stale socket
+// file is replaced, but a live server's socket or any other file isn't.
+func Listen(addr string) (net.Listener, error) {
+	network, address := splitAddr(addr)
+	if network == "tcp" {
+		if err := checkLoopback(address); err != nil {
+			return nil, err
+		}
+		return net.Listen(network, address)
+	}
+
+	if err := removeStaleSocket(address); err != nil {
+		return nil, err
+	}
+	var l net.Listener
+	err := withUmask(0o077, func() error {
+		var err error
+		l, err = net.Listen(network, address)
+		return err
+	})
+	if err != nil {
+		return nil, err
+	}
+	if err := os.Chmod(address, 0o600); err != nil {
+		return nil, errors.Join(err, l.Close())
+	}
+	return l, nil
+}
+
+// removeStaleSocket removes the socket at path if no server answers on it
+func removeStaleSocket(path string) error {
+	info, err := os.Lstat(path)
+	if os.IsNotExist(err) {
+		return nil
+	}
+	if err != nil {
+		return err
+	}
+	if info.Mode()&os.ModeSocket == 0 {
+		return fmt.Errorf("%s exists and is not a socket", path)
+	}
+
+	if conn, err := net.DialTimeout("unix", path, time.Second); err == nil {
+		conn.Close()
+		return fmt.Errorf("a waza server is already running on %s", path)
+	}
+	return os.Remove(path)
+}
+
+// IsTCP reports whether addr, given as to Listen, is a TCP address
+func IsTCP(addr string) bool {
+	network, _ := splitAddr(addr)
+	return network == "tcp"
+}
+
+// checkLoopback returns an error unless every address host resolves to is a
+// loopback address
+func checkLoopback(address string) error {
+	host, _, err := net.SplitHostPort(address)
+	if err != nil {
+		return err
+	}
+	if host == "" {
+		return fmt.Errorf("%q listens on every interface; use a loopback address such as 127.0.0.1", address)
+	}
+
+	ips, err := net.LookupIP(host)
+	if err != nil {
+		return err
+	}
+	for _, ip := range ips {
+		if !ip.IsLoopback() {
+			return fmt.Errorf("%q is not a loopback address; the server only listens on the local machine", host)
+		}
+	}
+	return nil
+}
+
+func splitAddr(addr string) (network, address string) {
+	switch {
+	case addr == "":
+		return "unix", DefaultSocket
+	case strings.HasPrefix(addr, "unix://"):
+		return "unix", strings.TrimPrefix(addr, "unix://")
+	case strings.HasPrefix(addr, "http://"):
+		return "tcp", strings.TrimPrefix(addr, "http://")
+	case strings.Contains(addr, "/") || strings.HasSuffix(addr, ".sock"):
+		return "unix", addr
+	default:
+		return "tcp", addr
+	}
+}
+
+// Serve handles requests on l until ctx is cancelled, then cancels running
+// jobs, waits for them and stops the shared engines and grader workers
+func (s *Server) Serve(ctx context.Context, l net.Listener) error {
+	if l.Addr().Network() == "tcp" && s.token == "" {
+		return errors.New("a server listening on TCP needs a token")
+	}
+	srv := &http.Server{Handler: s.requireToken(s.Handler())}
+
+	errc := make(chan error, 1)
+	go func() { errc <- srv.Serve(l) }()
+
+	var err error
+	select {
+	case err = <-errc:
+	case <-ctx.Done():
+	}
+
+	s.cancelAll()
+	shutdownCtx, cancel := context.WithTimeout(context.Background(), 10*time.Second)
+	defer cancel()
+	err = errors.Join(ignoreClosed(err), ignoreClosed(srv.Shutdown(shutdownCtx)))
+
+	s.wg.Wait()
+	s.engines.shutdown(shutdownCtx)
+	return errors.Join(err, s.graders.Close())
+}
+
+func ignoreClosed(err error) error {
+	if errors.Is(err, http.ErrServerClosed) {
+		return nil
+	}
+	return err
+}
+
+// Handler serves the job API:
+//
+//	POST   /v1/jobs              submit a JobRequest, returns its JobStatus
+//	GET    /v1/jobs              list jobs
+//	GET    /v1/jobs/{id}         a job's status
+//	GET    /v1/jobs/{id}/events  stream a job's events as JSON lines
+//	DELETE /v1/jobs/{id}         cancel a job
+func (s *Server) Handler() http.Handler {
+	return http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		rest, ok := strings.CutPrefix(r.URL.Path, "/v1/jobs")
+		if !ok {
+			http.NotFound(w, r)
+			return
+		}
+
+		id, sub, _ := strings.Cut(strings.Trim(rest, "/"), "/")
+		switch {
+		case id == "" && r.Method == http.MethodPost:
+			s.handleSubmit(w, r)
+		case id == "" && r.Method == http.MethodGet:
+			writeJSON(w, http.StatusOK, s.list())
+		case id != "" && sub == "" && r.Method == http.MethodGet:
+			s.withJob(w, id, func(j *job) { writeJSON(w, http.StatusOK, j.status()) })
+		case id != "" && sub == "" && r.Method == http.MethodDelete:
+			s.withJob(w, id, func(j *job) {
+				j.cancel()
+				writeJSON(w, http.StatusOK, j.status())
+			})
+		case id != "" && sub == "events" && r.Method == http.MethodGet:
+			s.withJob(w, id, func(j *job) { s.handleEvents(w, r, j) })
+		default:
+			http.Error(w, "not found", http.StatusNotFound)
+		}
+	})
+}
+
+func (s *Server) handleSubmit(w http.ResponseWriter, r *http.Request) {
+	var req JobRequest
+	if err := json.NewDecoder(r.Body).Decode(&req); err != nil {
+		http.Error(w, "invalid job request: "+err.Error(), http.StatusBadRequest)
+		return
+	}
+	if req.SpecPath == "" {
+		http.Error(w, "spec_path is required", http.StatusBadRequest)
+		return
+	}
+	if !filepath.IsAbs(req.SpecPath) || (req.ContextDir != "" && !filepath.IsAbs(req.ContextDir)) {
+		http.Error(w, "spec_path and context_dir must be absolute", http.StatusBadRequest)
+		return
+	}
+
+	writeJSON(w, http.StatusAccepted, s.Submit(req))
+}
+
+// handleEvents replays a job's events and follows it until it finishes or
+// the client goes away
+func (s *Server) handleEvents(w http.ResponseWriter, r *http.Request, j *job) {
+	w.Header().Set("Content-Type", "application/x-ndjson")
+	w.WriteHeader(http.StatusOK)
+	flusher, _ := w.(http.Flusher)
+	enc := json.NewEncoder(w)
+
+	for next := 0; ; {
+		events, wake, done := j.since(next)
+		for i := range events {
+			if err := enc.Encode(&events[i]); err != nil {
+				return
+			}
+		}
+		next += len(events)
+		if flusher != nil {
+			flusher.Flush()
+		}
+		if done {
+			return
+		}
+
+		select {
+		case <-wake:
+		case <-r.Context().Done():
+			return
+		}
+	}
+}
+
+func (s *Server) withJob(w http.ResponseWriter, id string, fn func(*job)) {
+	s.mu.Lock()
+	j := s.jobs[id]
+	s.mu.Unlock()
+	if j == nil {
+		http.Error(w, "no such job: "+id, http.StatusNotFound)
+		return
+	}
+	fn(j)
+}
+
+func (s *Server) list() []JobStatus {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+	statuses := make([]JobStatus, 0, len(s.order))
+	for _, id := range s.order {
+		statuses = append(statuses, s.jobs[id].status())
+	}
+	return statuses
+}
+
+func writeJSON(w http.ResponseWriter, code int, v any) {
+	w.Header().Set("Content-Type", "application/json")
+	w.WriteHeader(code)
+	_ = json.NewEncoder(w).Encode(v)
+}
+
+// Submit queues a job and returns its status
+func (s *Server) Submit(req JobRequest) JobStatus {
+	ctx, cancel := context.WithCancel(context.Background())
+	j := newJob(newJobID(), req, cancel)
+
+	s.mu.Lock()
+	s.jobs[j.id] = j
+	s.order = append(s.order, j.id)
+	s.expireLocked()
+	s.mu.Unlock()
+
+	s.wg.Add(1)
+	go func() {
+		defer s.wg.Done()
+		defer cancel()
+		s.run(ctx, j)
+	}()
+	return j.status()
+}
+
+// expireLocked forgets the oldest finished jobs beyond keepFinished
+func (s *Server) expireLocked() {
+	finished := 0
+	for _, id := range s.order {
+		if s.jobs[id].finished() {
+			finished++
+		}
+	}
+
+	kept := s.order[:0]
+	for _, id := range s.order {
+		if finished > keepFinished && s.jobs[id].finished() {
+			delete(s.jobs, id)
+			finished--
+			continue
+		}
+		kept = append(kept, id)
+	}
+	s.order = kept
+}
+
+func (s *Server) cancelAll() {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+	for _, j := range s.jobs {
+		j.cancel()
+	}
+}
+
+// run waits for a job slot, then runs the job's benchmark
+func (s *Server) run(ctx context.Context, j *job) {
+	select {
+	case s.jobSlots <- struct{}{}:
+		defer func() { <-s.jobSlots }()
+	case <-ctx.Done():
+		j.finish(Event{Type: EventError, Error: "job cancelled before it started"}, StateCancelled)
+		return
+	}
+	j.start()
+
+	event, err := s.runBenchmark(ctx, j)
+	switch {
+	case ctx.Err() != nil:
+		j.finish(Event{Type: EventError, Error: "job cancelled"}, StateCancelled)
+	case err != nil:
+		j.finish(Event{Type: EventError, Error: err.Error()}, StateFailed)
+	default:
+		j.finish(event, StateSucceeded)
+	}
+}
+
+func (s *Server) runBenchmark(ctx context.Context, j *job) (Event, error) {
+	req := j.req
+	spec, err := models.LoadBenchmarkSpec(req.SpecPath)
+	if err != nil {
+		return Event{}, fmt.Errorf("failed to load spec: %w", err)
+	}
+	if req.Model != "" {
+		spec.Config.ModelID = req.Model
+		spec.Config.Models = nil
+	}
+	if req.RunsPerTest > 0 {
+		spec.Config.RunsPerTest = req.RunsPerTest
+	}
+	if req.TimeoutSec > 0 {
+		spec.Config.TimeoutSec = req.TimeoutSec
+	}
+	if req.Workers > 0 {
+		spec.Config.Workers = req.Workers
+		spec.Config.Concurrent = true
+	}
+
+	specDir := filepath.Dir(req.SpecPath)
+	fixtureDir := req.ContextDir
+	if fixtureDir == "" {
+		fixtureDir = filepath.Join(specDir, "fixtures")
+	}
+	cfg := config.NewBenchmarkConfig(spec,
+		config.WithSpecDir(specDir),
+		config.WithFixtureDir(fixtureDir),
+	)
+
+	runner := orchestration.NewTestRunner(cfg, s.engineFor(j, spec, spec.Config.ModelID),
+		orchestration.WithEngineFactory(func(modelID string) (execution.AgentEngine, error) {
+			return s.engineFor(j, spec, modelID), nil
+		}),
+		orchestration.WithPythonPool(s.graders),
+	)
+	runner.OnProgress(func(event orchestration.ProgressEvent) {
+		j.emit(Event{Type: EventProgress, Progress: &event})
+	})
+
+	if len(spec.Config.Models) > 0 {
+		matrix, err := runner.RunMatrix(ctx)
+		return Event{Type: EventResult, Matrix: matrix}, err
+	}
+	outcome, err := runner.RunBenchmark(ctx)
+	return Event{Type: EventResult, Outcome: outcome}, err
+}
+
+// engineFor returns the engine a job uses for one model. Engines are pooled
+// by executor, model and mock settings, so jobs with the same ones share
+// them.
+func (s *Server) engineFor(j *job, spec *models.BenchmarkSpec, modelID string) execution.AgentEngine {
+	mock, _ := json.Marshal(spec.Config.Mock)
+	return &jobEngine{
+		server: s,
+		job:    j,
+		key:    spec.Config.EngineType + "\x00" + modelID + "\x00" + string(mock),
+		create: func() (execution.AgentEngine, error) { return s.newEngine(spec, modelID) },
+	}
+}
+
+func newJobID() string {
+	var b [6]byte
+	if _, err := rand.Read(b[:]); err != nil {
+		return fmt.Sprintf("%x", time.Now().UnixNano())
+	}
+	return hex.EncodeToString(b[:])
+}
+
+// job is a submitted benchmark and the events it has produced so far
+type job struct {
+	id     string
+	req    JobRequest
+	cancel context.CancelFunc
+
+	mu        sync.Mutex
+	state     string
+	submitted time.Time
+	started   *time.Time
+	ended     *time.Time
+	errMsg    string
+	events    []Event
+	// wake is closed and replaced whenever an event is added
+	wake chan struct{}
+}
+
+func newJob(id string, req JobRequest, cancel context.CancelFunc) *job {
+	return &job{
+		id:        id,
+		req:       req,
+		cancel:    cancel,
+		state:     StateQueued,
+		submitted: time.Now(),
+		wake:      make(chan struct{}),
+	}
+}
+
+func (j *job) start() {
+	j.mu.Lock()
+	defer j.mu.Unlock()
+	now := time.Now()
+	j.state, j.started = StateRunning, &now
+}
+
+func (j *job) emit(event Event) {
+	j.mu.Lock()
+	defer j.mu.Unlock()
+	j.emitLocked(event)
+}
+
+func (j *job) emitLocked(event Event) {
+	j.events = append(j.events, event)
+	close(j.wake)
+	j.wake = make(chan struct{})
+}
+
+// finish records the job's last event and final state
+func (j *job) finish(event Event, state string) {
+	j.mu.Lock()
+	defer j.mu.Unlock()
+	now := time.Now()
+	j.state, j.ended, j.errMsg = state, &now, event.Error
+	j.emitLocked(event)
+}
+
+func (j *job) finished() bool {
+	j.mu.Lock()
+	defer j.mu.Unlock()
+	return j.ended != nil
+}
+
+// since returns the events from index from on, a channel closed when more
+// arrive, and whether the job has finished
+func (j *job) since(from int) ([]Event, <-chan struct{}, bool) {
+	j.mu.Lock()
+	defer j.mu.Unlock()
+	return j.events[from:len(j.events):len(j.events)], j.wake, j.ended != nil
+}
+
+func (j *job) status() JobStatus {
+	j.mu.Lock()
+	defer j.mu.Unlock()
+	return JobStatus{
+		ID:        j.id,
+		State:     j.state,
+		SpecPath:  j.req.SpecPath,
+		Submitted: j.submitted,
+		Started:   j.started,
+		Finished:  j.ended,
+		Error:     j.errMsg,
+	}
+}
@@ -0,0 +1,264 @@
+package server
+
+import (
+	"context"
+	"net"
+	"os"
+	"path/filepath"
+	"testing"
+	"time"
+
+	"github.com/spboyer/waza/internal/execution"
+	"github.com/spboyer/waza/internal/models"
+	"github.com/spboyer/waza/internal/orchestration"
+	"github.com/stretchr/testify/require"
+)
+
+func TestScheduler_FewestRunningFirst(t *testing.T) {
+	sched := newScheduler(2)
+	big, small := &job{id: "big"}, &job{id: "small"}
+	ctx := context.Background()
+
+	require.NoError(t, sched.acquire(ctx, big))
+	require.NoError(t, sched.acquire(ctx, big))
+
+	granted := make(chan string, 2)
+	queue := func(j *job) {
+		go func() {
+			if sched.acquire(ctx, j) == nil {
+				granted <- j.id
+			}
+		}()
+		require.Eventually(t, func() bool {
+			sched.mu.Lock()
+			defer sched.mu.Unlock()
+			return len(sched.waiting) > 0 && sched.waiting[len(sched.waiting)-1].job == j
+		}, time.Second, time.Millisecond)
+	}
+	queue(big)
+	queue(small)
+
+	// big still runs one session, small none: small goes first although
+	// big has waited longer
+	sched.release(big)
+	require.Equal(t, "small", <-granted)
+	sched.release(big)
+	require.Equal(t, "big", <-granted)
+}
+
+func TestScheduler_CancelWhileWaiting(t *testing.T) {
+	sched := newScheduler(1)
+	a, b := &job{id: "a"}, &job{id: "b"}
+	require.NoError(t, sched.acquire(context.Background(), a))
+
+	ctx, cancel := context.WithTimeout(context.Background(), 10*time.Millisecond)
+	defer cancel()
+	require.ErrorIs(t, sched.acquire(ctx, b), context.DeadlineExceeded)
+
+	sched.release(a)
+	require.NoError(t, sched.acquire(context.Background(), b))
+}
+
+func writeSpec(t *testing.T, dir, mock string) string {
+	t.Helper()
+	spec := "name: served\nskill: test-skill\nconfig:\n  trials_per_task: 2\n  timeout_seconds: 30\n  executor: mock\n  model: test-model\n" +
+		mock + "tasks:\n  - tasks/*.yaml\n"
+	files := map[string]string{
+		"eval.yaml":    spec,
+		"tasks/a.yaml": "id: a\nname: A\ninputs:\n  prompt: explain a\n",
+		"tasks/b.yaml": "id: b\nname: B\ninputs:\n  prompt: explain b\n",
+	}
+	for name, content := range files {
+		path := filepath.Join(dir, name)
+		require.NoError(t, os.MkdirAll(filepath.Dir(path), 0755))
+		require.NoError(t, os.WriteFile(path, []byte(content), 0644))
+	}
+	return filepath.Join(dir, "eval.yaml")
+}
+
+func startServer(t *testing.T, opts ...Option) (*Server, *Client) {
+	t.Helper()
+	srv := New(func(spec *models.BenchmarkSpec, modelID string) (execution.AgentEngine, error) {
+		return execution.NewMockEngine(modelID, execution.WithMockConfig(spec.Config.Mock)), nil
+	}, opts...)
+
+	// Socket paths are limited to about 100 bytes, too short for t.TempDir
+	dir, err := os.MkdirTemp("", "waza")
+	require.NoError(t, err)
+	t.Cleanup(func() { os.RemoveAll(dir) })
+	addr := filepath.Join(dir, "waza.sock")
+	l, err := Listen(addr)
+	require.NoError(t, err)
+
+	ctx, cancel := context.WithCancel(context.Background())
+	done := make(chan error, 1)
+	go func() { done <- srv.Serve(ctx, l) }()
+	t.Cleanup(func() {
+		cancel()
+		require.NoError(t, <-done)
+	})
+	return srv, NewClient(addr)
+}
+
+func TestServer_RunsJobs(t *testing.T) {
+	srv, client := startServer(t, WithWorkers(2))
+	ctx := context.Background()
+	specPath := writeSpec(t, t.TempDir(), "")
+
+	for i := 0; i < 2; i++ {
+		status, err := client.Submit(ctx, JobRequest{SpecPath: specPath})
+		require.NoError(t, err)
+
+		var progress []orchestration.EventType
+		final, err := client.Events(ctx, status.ID, func(e Event) {
+			if e.Type == EventProgress {
+				progress = append(progress, e.Progress.EventType)
+			}
+		})
+		require.NoError(t, err)
+		require.Equal(t, EventResult, final.Type)
+		require.Equal(t, 2, final.Outcome.Digest.TotalTests)
+		require.Equal(t, orchestration.EventBenchmarkStart, progress[0])
+		require.Equal(t, orchestration.EventBenchmarkComplete, progress[len(progress)-1])
+
+		// Replaying a finished job's events gives the same result
+		again, err := client.Events(ctx, status.ID, func(Event) {})
+		require.NoError(t, err)
+		require.Equal(t, final.Outcome.Digest, again.Outcome.Digest)
+	}
+
+	// Both jobs ran on the same engines, at most one per slot
+	require.LessOrEqual(t, srv.engines.size(), 2)
+
+	statuses, err := client.Jobs(ctx)
+	require.NoError(t, err)
+	require.Len(t, statuses, 2)
+	for _, s := range statuses {
+		require.Equal(t, StateSucceeded, s.State)
+	}
+}
+
+func TestServer_CancelJob(t *testing.T) {
+	_, client := startServer(t, WithWorkers(1))
+	ctx := context.Background()
+	specPath := writeSpec(t, t.TempDir(), "  mock:\n    latency:\n      mean_ms: 60000\n")
+
+	status, err := client.Submit(ctx, JobRequest{SpecPath: specPath})
+	require.NoError(t, err)
+	require.NoError(t, client.Cancel(ctx, status.ID))
+
+	final, err := client.Events(ctx, status.ID, func(Event) {})
+	require.NoError(t, err)
+	require.Equal(t, EventError, final.Type)
+
+	statuses, err := client.Jobs(ctx)
+	require.NoError(t, err)
+	require.Equal(t, StateCancelled, statuses[0].State)
+}
+
+func TestServer_RejectsRelativeSpec(t *testing.T) {
+	_, client := startServer(t)
+	_, err := client.Submit(context.Background(), JobRequest{SpecPath: "eval.yaml"})
+	require.ErrorContains(t, err, "must be absolute")
+}
+
+func TestSplitAddr(t *testing.T) {
+	for addr, want := range map[string][2]string{
+		"":                     {"unix", DefaultSocket},
+		"/tmp/w.sock":          {"unix", "/tmp/w.sock"},
+		"unix://relative.sock": {"unix", "relative.sock"},
+		"localhost:7070":       {"tcp", "localhost:7070"},
+		"http://127.0.0.1:80":  {"tcp", "127.0.0.1:80"},
+	} {
+		network, address := splitAddr(addr)
+		require.Equal(t, want, [2]string{network, address}, addr)
+	}
+}
+
+func TestListen_OnlyLoopback(t *testing.T) {
+	l, err := Listen("127.0.0.1:0")
+	require.NoError(t, err)
+	require.NoError(t, l.Close())
+
+	for _, addr := range []string{":0", "0.0.0.0:0", "http://[::]:0", "192.0.2.1:0"} {
+		_, err := Listen(addr)
+		require.Error(t, err, addr)
+	}
+}
+
+func TestListen_Socket(t *testing.T) {
+	dir, err := os.MkdirTemp("", "waza")
+	require.NoError(t, err)
+	t.Cleanup(func() { os.RemoveAll(dir) })
+	addr := filepath.Join(dir, "waza.sock")
+
+	l, err := Listen(addr)
+	require.NoError(t, err)
+	info, err := os.Stat(addr)
+	require.NoError(t, err)
+	require.Equal(t, os.FileMode(0o600), info.Mode().Perm())
+
+	// a live server's socket is left alone
+	_, err = Listen(addr)
+	require.ErrorContains(t, err, "already running")
+
+	// a stale one is replaced, once nothing answers on it
+	l.(*net.UnixListener).SetUnlinkOnClose(false)
+	require.NoError(t, l.Close())
+	l, err = Listen(addr)
+	require.NoError(t, err)
+	require.NoError(t, l.Close())
+
+	// other files are never removed
+	file := filepath.Join(dir, "notes.txt")
+	require.NoError(t, os.WriteFile(file, []byte("keep"), 0o644))
+	_, err = Listen(file)
+	require.ErrorContains(t, err, "is not a socket")
+	require.FileExists(t, file)
+}
+
+func TestServer_TCPNeedsToken(t *testing.T) {
+	newServer := func(opts ...Option) *Server {
+		return New(func(spec *models.BenchmarkSpec, modelID string) (execution.AgentEngine, error) {
+			return execution.NewMockEngine(modelID), nil
+		}, opts...)
+	}
+
+	l, err := Listen("127.0.0.1:0")
+	require.NoError(t, err)
+	require.ErrorContains(t, newServer().Serve(context.Background(), l), "needs a token")
+	require.NoError(t, l.Close())
+
+	l, err = Listen("127.0.0.1:0")
+	require.NoError(t, err)
+	ctx, cancel := context.WithCancel(context.Background())
+	done := make(chan error, 1)
+	go func() { done <- newServer(WithToken("secret")).Serve(ctx, l) }()
+	t.Cleanup(func() {
+		cancel()
+		require.NoError(t, <-done)
+	})
+
+	addr := l.Addr().String()
+	_, err = NewClient(addr).Jobs(ctx)
+	require.ErrorContains(t, err, "401")
+	_, err = NewClient(addr, WithBearerToken("wrong")).Jobs(ctx)
+	require.ErrorContains(t, err, "401")
+	_, err = NewClient(addr, WithBearerToken("secret")).Jobs(ctx)
+	require.NoError(t, err)
+}
+
+func TestLoadOrCreateToken(t *testing.T) {
+	path := filepath.Join(t.TempDir(), "waza", "serve.token")
+
+	token, err := LoadOrCreateToken(path)
+	require.NoError(t, err)
+	require.Len(t, token, 64)
+	info, err := os.Stat(path)
+	require.NoError(t, err)
+	require.Equal(t, os.FileMode(0o600), info.Mode().Perm())
+
+	again, err := LoadOrCreateToken(path)
+	require.NoError(t, err)
+	require.Equal(t, token, again)
+}
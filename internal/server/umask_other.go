@@ -0,0 +1,5 @@
+//go:build !unix
+
+package server
+
+func withUmask(_ int, fn func() error) error { return fn() }
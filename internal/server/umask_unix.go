@@ -0,0 +1,14 @@
+//go:build unix
+
+package server
+
+import "syscall"
+
+// withUmask runs fn with the process umask set to mask, so files it creates
+// never start out with looser permissions. The umask is process-wide; the
+// server only changes it while creating its socket.
+func withUmask(mask int, fn func() error) error {
+	old := syscall.Umask(mask)
+	defer syscall.Umask(old)
+	return fn()
+}
@@ -0,0 +1,133 @@
+package stats
+
+import (
+	"fmt"
+	"math"
+	"sort"
+)
+
+// DefaultAccuracy is the relative accuracy of sketches made by callers that
+// don't need a specific one
+const DefaultAccuracy = 0.01
+
+// Sketch summarizes the distribution of non-negative values, such as
+// durations, in space that grows with the log of their range rather than
+// their count. Quantiles are within a relative error of the accuracy it was
+// made with. Sketches with the same accuracy merge exactly, so partial
+// sketches built in parallel combine into the one a single pass would give.
+//
+// Values are counted in buckets whose bounds grow geometrically (as in
+// DDSketch); negative values are counted as zero.
+type Sketch struct {
+	Accuracy float64        `json:"accuracy"`
+	Count    uint64         `json:"count"`
+	Zeros    uint64         `json:"zeros"`
+	Min      float64        `json:"min"`
+	Max      float64        `json:"max"`
+	Bins     map[int]uint64 `json:"bins"`
+
+	logGamma float64
+}
+
+// NewSketch creates an empty sketch with the given relative accuracy, e.g.
+// 0.01 for quantiles within 1%
+func NewSketch(accuracy float64) *Sketch {
+	return &Sketch{Accuracy: accuracy, Bins: make(map[int]uint64)}
+}
+
+// Add counts one value
+func (s *Sketch) Add(v float64) {
+	if v < 0 || math.IsNaN(v) {
+		v = 0
+	}
+
+	if s.Count == 0 || v < s.Min {
+		s.Min = v
+	}
+	if s.Count == 0 || v > s.Max {
+		s.Max = v
+	}
+	s.Count++
+
+	if v == 0 {
+		s.Zeros++
+		return
+	}
+	if s.Bins == nil {
+		s.Bins = make(map[int]uint64)
+	}
+	s.Bins[int(math.Ceil(math.Log(v)/s.gamma()))]++
+}
+
+// Merge adds every value counted by o
+func (s *Sketch) Merge(o *Sketch) error {
+	if o == nil || o.Count == 0 {
+		return nil
+	}
+	if s.Accuracy != o.Accuracy {
+		return fmt.Errorf("cannot merge sketches with accuracy %g and %g", s.Accuracy, o.Accuracy)
+	}
+
+	if s.Count == 0 || o.Min < s.Min {
+		s.Min = o.Min
+	}
+	if s.Count == 0 || o.Max > s.Max {
+		s.Max = o.Max
+	}
+	s.Count += o.Count
+	s.Zeros += o.Zeros
+
+	if s.Bins == nil {
+		s.Bins = make(map[int]uint64, len(o.Bins))
+	}
+	for k, n := range o.Bins {
+		s.Bins[k] += n
+	}
+	return nil
+}
+
+// Quantile returns the q-quantile (0 ≤ q ≤ 1) of the counted values, or 0
+// when there are none
+func (s *Sketch) Quantile(q float64) float64 {
+	if s.Count == 0 {
+		return 0
+	}
+	if q <= 0 {
+		return s.Min
+	}
+	if q >= 1 {
+		return s.Max
+	}
+
+	rank := uint64(q * float64(s.Count-1))
+	if rank < s.Zeros {
+		return 0
+	}
+	seen := s.Zeros
+
+	keys := make([]int, 0, len(s.Bins))
+	for k := range s.Bins {
+		keys = append(keys, k)
+	}
+	sort.Ints(keys)
+
+	gamma := math.Exp(s.gamma())
+	for _, k := range keys {
+		seen += s.Bins[k]
+		if seen > rank {
+			// the bucket (gamma^(k-1), gamma^k] is represented by the point
+			// with equal relative error to both bounds
+			v := 2 * math.Pow(gamma, float64(k)) / (gamma + 1)
+			return math.Max(s.Min, math.Min(s.Max, v))
+		}
+	}
+	return s.Max
+}
+
+// gamma returns the log of the ratio between bucket bounds
+func (s *Sketch) gamma() float64 {
+	if s.logGamma == 0 {
+		s.logGamma = math.Log((1 + s.Accuracy) / (1 - s.Accuracy))
+	}
+	return s.logGamma
+}
@@ -0,0 +1,187 @@
+// Package stats computes summary statistics over flat result slices: pass
+// rate intervals, bootstrap intervals and paired comparisons. Functions take
+// whole columns of values rather than result structs, so they can run over
+// tens of thousands of trials without allocating per trial.
+package stats
+
+import (
+	"math"
+	"math/rand"
+	"sort"
+)
+
+// DefaultResamples is the number of bootstrap resamples used by callers that
+// don't need a specific count
+const DefaultResamples = 2000
+
+// DefaultConfidence is the confidence level of reported intervals
+const DefaultConfidence = 0.95
+
+// Interval is a confidence interval
+type Interval struct {
+	Low  float64 `json:"low"`
+	High float64 `json:"high"`
+}
+
+// Mean returns the arithmetic mean of values, or 0 when there are none
+func Mean(values []float64) float64 {
+	if len(values) == 0 {
+		return 0
+	}
+	sum := 0.0
+	for _, v := range values {
+		sum += v
+	}
+	return sum / float64(len(values))
+}
+
+// WeightedMean returns the mean of values weighted by weights. Values with a
+// non-positive weight are ignored.
+func WeightedMean(values, weights []float64) float64 {
+	sum, total := 0.0, 0.0
+	for i, v := range values {
+		if w := weights[i]; w > 0 {
+			sum += v * w
+			total += w
+		}
+	}
+	if total == 0 {
+		return 0
+	}
+	return sum / total
+}
+
+// Z returns the two-sided standard normal critical value for a confidence
+// level, e.g. 1.96 for 0.95
+func Z(confidence float64) float64 {
+	return math.Sqrt2 * math.Erfinv(confidence)
+}
+
+// Wilson returns the Wilson score interval for a pass rate of successes out
+// of n. Unlike the normal approximation it stays inside [0, 1] and behaves
+// well for the small trial counts typical of evals.
+func Wilson(successes, n int, confidence float64) Interval {
+	if n == 0 {
+		return Interval{Low: 0, High: 1}
+	}
+
+	z := Z(confidence)
+	p := float64(successes) / float64(n)
+	nf := float64(n)
+
+	denom := 1 + z*z/nf
+	center := (p + z*z/(2*nf)) / denom
+	margin := z * math.Sqrt(p*(1-p)/nf+z*z/(4*nf*nf)) / denom
+
+	return Interval{
+		Low:  math.Max(0, center-margin),
+		High: math.Min(1, center+margin),
+	}
+}
+
+// BootstrapMean returns a percentile bootstrap interval for the mean of
+// values. The same seed always gives the same interval.
+func BootstrapMean(values []float64, resamples int, confidence float64, seed int64) Interval {
+	n := len(values)
+	if n == 0 {
+		return Interval{}
+	}
+	if resamples <= 0 {
+		resamples = DefaultResamples
+	}
+
+	rng := rand.New(rand.NewSource(seed))
+	means := make([]float64, resamples)
+
+	for i := range means {
+		sum := 0.0
+		for j := 0; j < n; j++ {
+			sum += values[rng.Intn(n)]
+		}
+		means[i] = sum / float64(n)
+	}
+
+	return percentileInterval(means, confidence)
+}
+
+// PairedResult compares two sets of paired observations, such as the scores
+// of two models on the same tests
+type PairedResult struct {
+	N        int      `json:"n"`
+	MeanDiff float64  `json:"mean_diff"`
+	Interval Interval `json:"interval"`
+	// PValue is the two-sided sign-flip permutation p-value for a mean
+	// difference of zero
+	PValue float64 `json:"p_value"`
+}
+
+// Paired compares a[i] against b[i] for every i. The interval is a bootstrap
+// interval of the mean difference a-b; the p-value comes from randomly
+// flipping the sign of each difference, which assumes nothing about their
+// distribution.
+func Paired(a, b []float64, resamples int, confidence float64, seed int64) PairedResult {
+	n := len(a)
+	if len(b) < n {
+		n = len(b)
+	}
+	if n == 0 {
+		return PairedResult{PValue: 1}
+	}
+	if resamples <= 0 {
+		resamples = DefaultResamples
+	}
+
+	diffs := make([]float64, n)
+	for i := range diffs {
+		diffs[i] = a[i] - b[i]
+	}
+	observed := Mean(diffs)
+
+	rng := rand.New(rand.NewSource(seed))
+	extreme := 0
+	for i := 0; i < resamples; i++ {
+		sum := 0.0
+		for _, d := range diffs {
+			if rng.Intn(2) == 0 {
+				sum += d
+			} else {
+				sum -= d
+			}
+		}
+		// small tolerance so ties with the observed value count as extreme
+		if math.Abs(sum/float64(n)) >= math.Abs(observed)-1e-12 {
+			extreme++
+		}
+	}
+
+	return PairedResult{
+		N:        n,
+		MeanDiff: observed,
+		Interval: BootstrapMean(diffs, resamples, confidence, seed+1),
+		// add-one so an observed difference is never reported as impossible
+		PValue: float64(extreme+1) / float64(resamples+1),
+	}
+}
+
+// percentileInterval sorts samples in place and returns the central interval
+// holding the given share of them
+func percentileInterval(samples []float64, confidence float64) Interval {
+	sort.Float64s(samples)
+	alpha := (1 - confidence) / 2
+	return Interval{
+		Low:  quantile(samples, alpha),
+		High: quantile(samples, 1-alpha),
+	}
+}
+
+// quantile linearly interpolates the q-quantile of sorted values
+func quantile(sorted []float64, q float64) float64 {
+	if len(sorted) == 0 {
+		return 0
+	}
+	pos := q * float64(len(sorted)-1)
+	lo := int(math.Floor(pos))
+	hi := int(math.Ceil(pos))
+	frac := pos - float64(lo)
+	return sorted[lo] + (sorted[hi]-sorted[lo])*frac
+}
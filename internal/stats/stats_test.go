@@ -0,0 +1,128 @@
+package stats
+
+import (
+	"math"
+	"testing"
+
+	"github.com/stretchr/testify/require"
+)
+
+func TestZ(t *testing.T) {
+	require.InDelta(t, 1.959964, Z(0.95), 1e-6)
+	require.InDelta(t, 2.575829, Z(0.99), 1e-6)
+}
+
+func TestWilson(t *testing.T) {
+	// reference values from statsmodels proportion_confint(method="wilson")
+	ci := Wilson(8, 10, 0.95)
+	require.InDelta(t, 0.4902, ci.Low, 1e-4)
+	require.InDelta(t, 0.9433, ci.High, 1e-4)
+
+	ci = Wilson(0, 5, 0.95)
+	require.Equal(t, 0.0, ci.Low)
+	require.InDelta(t, 0.4345, ci.High, 1e-4)
+
+	ci = Wilson(5, 5, 0.95)
+	require.InDelta(t, 0.5655, ci.Low, 1e-4)
+	require.Equal(t, 1.0, ci.High)
+
+	require.Equal(t, Interval{Low: 0, High: 1}, Wilson(0, 0, 0.95))
+}
+
+func TestMeans(t *testing.T) {
+	require.Equal(t, 0.0, Mean(nil))
+	require.Equal(t, 2.0, Mean([]float64{1, 2, 3}))
+
+	require.Equal(t, 2.5, WeightedMean([]float64{1, 3}, []float64{1, 3}))
+	require.Equal(t, 1.0, WeightedMean([]float64{1, 3}, []float64{1, 0}))
+	require.Equal(t, 0.0, WeightedMean([]float64{1}, []float64{0}))
+}
+
+func TestBootstrapMean(t *testing.T) {
+	values := make([]float64, 200)
+	for i := range values {
+		values[i] = float64(i % 2)
+	}
+
+	ci := BootstrapMean(values, 1000, 0.95, 7)
+	require.Less(t, ci.Low, 0.5)
+	require.Greater(t, ci.High, 0.5)
+	// close to the normal approximation 0.5 ± 1.96 * 0.5 / sqrt(200)
+	require.InDelta(t, 0.139, ci.High-ci.Low, 0.02)
+
+	require.Equal(t, ci, BootstrapMean(values, 1000, 0.95, 7), "same seed, same interval")
+	require.Equal(t, Interval{}, BootstrapMean(nil, 100, 0.95, 1))
+
+	constant := BootstrapMean([]float64{0.7, 0.7, 0.7}, 100, 0.95, 1)
+	require.InDelta(t, 0.7, constant.Low, 1e-12)
+	require.InDelta(t, 0.7, constant.High, 1e-12)
+}
+
+func TestPaired(t *testing.T) {
+	better := make([]float64, 30)
+	worse := make([]float64, 30)
+	for i := range better {
+		better[i] = 0.8 + 0.01*float64(i%5)
+		worse[i] = 0.5 + 0.01*float64(i%7)
+	}
+
+	result := Paired(better, worse, 2000, 0.95, 1)
+	require.Equal(t, 30, result.N)
+	require.Greater(t, result.MeanDiff, 0.2)
+	require.Less(t, result.PValue, 0.01)
+	require.Greater(t, result.Interval.Low, 0.0)
+
+	same := Paired(better, better, 2000, 0.95, 1)
+	require.Equal(t, 0.0, same.MeanDiff)
+	require.Equal(t, 1.0, same.PValue)
+
+	require.Equal(t, 1.0, Paired(nil, nil, 10, 0.95, 1).PValue)
+}
+
+func TestQuantile(t *testing.T) {
+	sorted := []float64{1, 2, 3, 4}
+	require.Equal(t, 1.0, quantile(sorted, 0))
+	require.Equal(t, 4.0, quantile(sorted, 1))
+	require.Equal(t, 2.5, quantile(sorted, 0.5))
+	require.True(t, math.Abs(quantile(sorted, 0.25)-1.75) < 1e-12)
+}
+
+func TestSketch(t *testing.T) {
+	s := NewSketch(0.01)
+	require.Equal(t, 0.0, s.Quantile(0.5))
+
+	for i := 1; i <= 10000; i++ {
+		s.Add(float64(i))
+	}
+	s.Add(0)
+
+	require.Equal(t, uint64(10001), s.Count)
+	require.Equal(t, 0.0, s.Quantile(0))
+	require.Equal(t, 10000.0, s.Quantile(1))
+	for _, q := range []float64{0.5, 0.9, 0.95, 0.99} {
+		want := q * 10000
+		require.InDelta(t, want, s.Quantile(q), want*0.011, "q=%v", q)
+	}
+}
+
+func TestSketch_Merge(t *testing.T) {
+	whole := NewSketch(0.02)
+	parts := []*Sketch{NewSketch(0.02), NewSketch(0.02), NewSketch(0.02)}
+	for i := 0; i < 3000; i++ {
+		v := math.Exp(float64(i%97) / 10)
+		whole.Add(v)
+		parts[i%3].Add(v)
+	}
+
+	merged := NewSketch(0.02)
+	for _, p := range parts {
+		require.NoError(t, merged.Merge(p))
+	}
+	require.Equal(t, whole.Count, merged.Count)
+	require.Equal(t, whole.Bins, merged.Bins)
+	require.Equal(t, whole.Quantile(0.95), merged.Quantile(0.95))
+
+	other := NewSketch(0.01)
+	other.Add(1)
+	require.Error(t, merged.Merge(other))
+}
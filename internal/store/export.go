@@ -0,0 +1,235 @@
+package store
+
+import (
+	"archive/zip"
+	"bufio"
+	"encoding/binary"
+	"fmt"
+	"io"
+	"math"
+	"strings"
+	"unicode/utf8"
+
+	"github.com/spboyer/waza/internal/models"
+)
+
+// Columns holds results flattened into one row per (trial, grader). Trials
+// without graders get a single row with an empty grader name and a NaN
+// score. String columns are dictionary encoded: each row stores an index
+// into the column's list of distinct values.
+type Columns struct {
+	runID      dictColumn
+	skill      dictColumn
+	model      dictColumn
+	testID     dictColumn
+	grader     dictColumn
+	graderType dictColumn
+	status     dictColumn
+
+	timestampMs      []int64
+	runNumber        []int32
+	score            []float64
+	passed           []bool
+	trialPassed      []bool
+	graderDurationMs []int64
+	durationMs       []int64
+	tokensTotal      []int64
+	toolCalls        []int32
+}
+
+// NewColumns creates an empty set of columns
+func NewColumns() *Columns {
+	return &Columns{}
+}
+
+// Len returns the number of rows
+func (c *Columns) Len() int { return len(c.score) }
+
+// Add appends the rows of one trial
+func (c *Columns) Add(run RunRecord, t TrialRecord) {
+	if len(t.Graders) == 0 {
+		c.addRow(run, t, GraderRecord{Score: math.NaN(), Passed: t.Status == "passed"})
+		return
+	}
+	for _, g := range t.Graders {
+		c.addRow(run, t, g)
+	}
+}
+
+// AddOutcome appends the rows of every trial in an evaluation outcome
+func (c *Columns) AddOutcome(outcome *models.EvaluationOutcome) {
+	run := newRunRecord(outcome)
+	for _, to := range outcome.TestOutcomes {
+		for _, r := range to.Runs {
+			c.Add(run, newTrialRecord(outcome.RunID, to, r))
+		}
+	}
+}
+
+func (c *Columns) addRow(run RunRecord, t TrialRecord, g GraderRecord) {
+	c.runID.add(run.RunID)
+	c.skill.add(run.Skill)
+	c.model.add(run.Model)
+	c.testID.add(t.TestID)
+	c.grader.add(g.Name)
+	c.graderType.add(g.Type)
+	c.status.add(t.Status)
+
+	c.timestampMs = append(c.timestampMs, run.Timestamp.UnixMilli())
+	c.runNumber = append(c.runNumber, int32(t.RunNumber))
+	c.score = append(c.score, g.Score)
+	c.passed = append(c.passed, g.Passed)
+	c.trialPassed = append(c.trialPassed, t.Status == "passed")
+	c.graderDurationMs = append(c.graderDurationMs, g.DurationMs)
+	c.durationMs = append(c.durationMs, t.DurationMs)
+	c.tokensTotal = append(c.tokensTotal, int64(t.TokensTotal))
+	c.toolCalls = append(c.toolCalls, int32(t.ToolCalls))
+}
+
+// Export collects the trials matching f into columns
+func (s *Store) Export(f Filter) (*Columns, error) {
+	c := NewColumns()
+	err := s.Trials(f, func(run RunRecord, t TrialRecord) error {
+		c.Add(run, t)
+		return nil
+	})
+	if err != nil {
+		return nil, err
+	}
+	return c, nil
+}
+
+// WriteNPZ writes the columns as a NumPy .npz archive, one .npy array per
+// column. Dictionary encoded columns are written as int32 codes, with their
+// values in a "<name>_values" string array, so np.load(path)["model_values"][
+// np.load(path)["model"]] decodes a column in one vectorized step.
+func (c *Columns) WriteNPZ(w io.Writer) error {
+	archive := zip.NewWriter(w)
+
+	dicts := []struct {
+		name string
+		col  *dictColumn
+	}{
+		{"run_id", &c.runID},
+		{"skill", &c.skill},
+		{"model", &c.model},
+		{"test_id", &c.testID},
+		{"grader", &c.grader},
+		{"grader_type", &c.graderType},
+		{"status", &c.status},
+	}
+
+	for _, d := range dicts {
+		if err := writeNPYEntry(archive, d.name, "<i4", len(d.col.codes), d.col.codes); err != nil {
+			return err
+		}
+		if err := writeStringsEntry(archive, d.name+"_values", d.col.values); err != nil {
+			return err
+		}
+	}
+
+	n := c.Len()
+	numeric := []struct {
+		name  string
+		descr string
+		data  any
+	}{
+		{"timestamp_ms", "<i8", c.timestampMs},
+		{"run_number", "<i4", c.runNumber},
+		{"score", "<f8", c.score},
+		{"passed", "|b1", c.passed},
+		{"trial_passed", "|b1", c.trialPassed},
+		{"grader_duration_ms", "<i8", c.graderDurationMs},
+		{"duration_ms", "<i8", c.durationMs},
+		{"tokens_total", "<i8", c.tokensTotal},
+		{"tool_calls", "<i4", c.toolCalls},
+	}
+
+	for _, col := range numeric {
+		if err := writeNPYEntry(archive, col.name, col.descr, n, col.data); err != nil {
+			return err
+		}
+	}
+
+	return archive.Close()
+}
+
+type dictColumn struct {
+	codes  []int32
+	values []string
+	index  map[string]int32
+}
+
+func (d *dictColumn) add(value string) {
+	if d.index == nil {
+		d.index = map[string]int32{}
+	}
+	code, ok := d.index[value]
+	if !ok {
+		code = int32(len(d.values))
+		d.index[value] = code
+		d.values = append(d.values, value)
+	}
+	d.codes = append(d.codes, code)
+}
+
+// writeNPYEntry adds name.npy holding a 1-d array of fixed size values
+func writeNPYEntry(archive *zip.Writer, name, descr string, n int, data any) error {
+	f, err := archive.CreateHeader(&zip.FileHeader{Name: name + ".npy", Method: zip.Store})
+	if err != nil {
+		return err
+	}
+
+	buf := bufio.NewWriter(f)
+	if err := writeNPYHeader(buf, descr, n); err != nil {
+		return err
+	}
+	if err := binary.Write(buf, binary.LittleEndian, data); err != nil {
+		return fmt.Errorf("failed to write column %s: %w", name, err)
+	}
+	return buf.Flush()
+}
+
+// writeStringsEntry adds name.npy holding a fixed width unicode array, which
+// NumPy stores as UTF-32 code points padded with zeros
+func writeStringsEntry(archive *zip.Writer, name string, values []string) error {
+	width := 1
+	for _, v := range values {
+		if n := utf8.RuneCountInString(v); n > width {
+			width = n
+		}
+	}
+
+	codepoints := make([]uint32, 0, width*len(values))
+	for _, v := range values {
+		count := 0
+		for _, r := range v {
+			codepoints = append(codepoints, uint32(r))
+			count++
+		}
+		for ; count < width; count++ {
+			codepoints = append(codepoints, 0)
+		}
+	}
+
+	return writeNPYEntry(archive, name, fmt.Sprintf("<U%d", width), len(values), codepoints)
+}
+
+// writeNPYHeader writes a version 1.0 .npy header for a 1-d array
+func writeNPYHeader(w io.Writer, descr string, n int) error {
+	header := fmt.Sprintf("{'descr': '%s', 'fortran_order': False, 'shape': (%d,), }", descr, n)
+
+	// magic (6) + version (2) + header length (2) + header + newline must be
+	// a multiple of 64 so the array data is aligned
+	total := 10 + len(header) + 1
+	header += strings.Repeat(" ", (64-total%64)%64) + "\n"
+
+	if _, err := w.Write([]byte("\x93NUMPY\x01\x00")); err != nil {
+		return err
+	}
+	if err := binary.Write(w, binary.LittleEndian, uint16(len(header))); err != nil {
+		return err
+	}
+	_, err := io.WriteString(w, header)
+	return err
+}
@@ -0,0 +1,165 @@
+package store
+
+import (
+	"archive/zip"
+	"bytes"
+	"encoding/binary"
+	"encoding/json"
+	"io"
+	"math"
+	"os"
+	"os/exec"
+	"path/filepath"
+	"strings"
+	"testing"
+	"time"
+
+	"github.com/stretchr/testify/require"
+)
+
+// readNPY returns the header and data of one array in an .npz archive
+func readNPY(t *testing.T, archive *zip.Reader, name string) (string, []byte) {
+	t.Helper()
+
+	f, err := archive.Open(name + ".npy")
+	require.NoError(t, err)
+	defer func() { require.NoError(t, f.Close()) }()
+
+	raw, err := io.ReadAll(f)
+	require.NoError(t, err)
+	require.Equal(t, "\x93NUMPY\x01\x00", string(raw[:8]))
+
+	headerLen := int(binary.LittleEndian.Uint16(raw[8:10]))
+	require.Zero(t, (10+headerLen)%64, "array data must be aligned")
+
+	return strings.TrimSpace(string(raw[10 : 10+headerLen])), raw[10+headerLen:]
+}
+
+func TestColumns_WriteNPZ(t *testing.T) {
+	at := time.Date(2026, 3, 2, 10, 0, 0, 0, time.UTC)
+
+	c := NewColumns()
+	c.AddOutcome(testOutcome("run-1", "gpt-4o", at, "passed", "failed"))
+	c.Add(RunRecord{RunID: "run-2", Model: "modèle", Timestamp: at}, TrialRecord{TestID: "bare", Status: "error"})
+
+	// two graders for each of the two trials, and one row for the bare trial
+	require.Equal(t, 5, c.Len())
+
+	var buf bytes.Buffer
+	require.NoError(t, c.WriteNPZ(&buf))
+
+	archive, err := zip.NewReader(bytes.NewReader(buf.Bytes()), int64(buf.Len()))
+	require.NoError(t, err)
+
+	header, data := readNPY(t, archive, "score")
+	require.Equal(t, "{'descr': '<f8', 'fortran_order': False, 'shape': (5,), }", header)
+	scores := make([]float64, 5)
+	require.NoError(t, binary.Read(bytes.NewReader(data), binary.LittleEndian, scores))
+	require.Equal(t, []float64{1, 0, 1, 0}, scores[:4])
+	require.True(t, math.IsNaN(scores[4]))
+
+	header, data = readNPY(t, archive, "passed")
+	require.Contains(t, header, "'descr': '|b1'")
+	require.Equal(t, []byte{1, 1, 1, 0, 0}, data)
+
+	header, data = readNPY(t, archive, "model")
+	require.Contains(t, header, "'descr': '<i4'")
+	codes := make([]int32, 5)
+	require.NoError(t, binary.Read(bytes.NewReader(data), binary.LittleEndian, codes))
+	require.Equal(t, []int32{0, 0, 0, 0, 1}, codes)
+
+	// values are UTF-32 padded to the longest one
+	header, data = readNPY(t, archive, "model_values")
+	require.Equal(t, "{'descr': '<U6', 'fortran_order': False, 'shape': (2,), }", header)
+	runes := make([]uint32, 12)
+	require.NoError(t, binary.Read(bytes.NewReader(data), binary.LittleEndian, runes))
+	require.Equal(t, uint32('è'), runes[6+3])
+
+	require.Len(t, archive.File, 23)
+}
+
+func TestStore_Export(t *testing.T) {
+	s, err := Open(t.TempDir())
+	require.NoError(t, err)
+
+	at := time.Date(2026, 3, 2, 10, 0, 0, 0, time.UTC)
+	require.NoError(t, s.Save(testOutcome("run-1", "gpt-4o", at, "passed", "failed")))
+	require.NoError(t, s.Save(testOutcome("run-2", "claude", at, "passed")))
+
+	c, err := s.Export(Filter{Model: "claude"})
+	require.NoError(t, err)
+	require.Equal(t, 2, c.Len())
+	require.Equal(t, []string{"run-2"}, c.runID.values)
+}
+
+// TestColumns_LoadResultsScript reads an export back with the Python loader
+// shipped in examples, so the format is checked from the reading side too
+func TestColumns_LoadResultsScript(t *testing.T) {
+	if err := exec.Command("python", "-c", "import numpy").Run(); err != nil {
+		t.Skip("Skipping loader test that needs Python with NumPy")
+	}
+
+	at := time.Date(2026, 3, 2, 10, 0, 0, 0, time.UTC)
+
+	c := NewColumns()
+	c.AddOutcome(testOutcome("run-1", "gpt-4o", at, "passed", "failed"))
+	c.Add(RunRecord{RunID: "run-2", Model: "modèle", Timestamp: at}, TrialRecord{TestID: "bare", Status: "error"})
+
+	var buf bytes.Buffer
+	require.NoError(t, c.WriteNPZ(&buf))
+	path := filepath.Join(t.TempDir(), "results.npz")
+	require.NoError(t, os.WriteFile(path, buf.Bytes(), 0644))
+
+	script := filepath.Join("..", "..", "examples", "export", "load_results.py")
+	out, err := exec.Command("python", script, "--json", path).Output()
+	require.NoError(t, err)
+
+	var loaded struct {
+		Rows    int               `json:"rows"`
+		Dtypes  map[string]string `json:"dtypes"`
+		Columns struct {
+			Model       []string   `json:"model"`
+			Grader      []string   `json:"grader"`
+			Status      []string   `json:"status"`
+			TimestampMs []int64    `json:"timestamp_ms"`
+			Score       []*float64 `json:"score"`
+			Passed      []bool     `json:"passed"`
+			TrialPassed []bool     `json:"trial_passed"`
+			DurationMs  []int64    `json:"duration_ms"`
+		} `json:"columns"`
+	}
+	require.NoError(t, json.Unmarshal(out, &loaded))
+	require.Equal(t, 5, loaded.Rows)
+
+	// string columns come back decoded, the rest with their documented dtypes
+	strs := []string{"run_id", "skill", "model", "test_id", "grader", "grader_type", "status"}
+	for _, name := range strs {
+		require.True(t, strings.HasPrefix(loaded.Dtypes[name], "<U"), "%s is %s", name, loaded.Dtypes[name])
+		delete(loaded.Dtypes, name)
+	}
+	require.Equal(t, map[string]string{
+		"timestamp_ms":       "<i8",
+		"run_number":         "<i4",
+		"score":              "<f8",
+		"passed":             "|b1",
+		"trial_passed":       "|b1",
+		"grader_duration_ms": "<i8",
+		"duration_ms":        "<i8",
+		"tokens_total":       "<i8",
+		"tool_calls":         "<i4",
+	}, loaded.Dtypes)
+
+	cols := loaded.Columns
+	require.Equal(t, []string{"gpt-4o", "gpt-4o", "gpt-4o", "gpt-4o", "modèle"}, cols.Model)
+	require.Equal(t, []string{"has_output", "quality", "has_output", "quality", ""}, cols.Grader)
+	require.Equal(t, []string{"passed", "passed", "failed", "failed", "error"}, cols.Status)
+	require.Equal(t, []bool{true, true, true, false, false}, cols.Passed)
+	require.Equal(t, []bool{true, true, false, false, false}, cols.TrialPassed)
+	require.Equal(t, []int64{100, 100, 200, 200, 0}, cols.DurationMs)
+	for _, ms := range cols.TimestampMs {
+		require.Equal(t, at.UnixMilli(), ms)
+	}
+
+	one, zero := 1.0, 0.0
+	require.Equal(t, []*float64{&one, &zero, &one, &zero, nil}, cols.Score, "a trial without graders has a NaN score")
+}
@@ -0,0 +1,225 @@
+package store
+
+import (
+	"math"
+	"sort"
+	"time"
+
+	"github.com/spboyer/waza/internal/models"
+)
+
+// GroupBy names the dimension trials are aggregated over
+type GroupBy string
+
+const (
+	GroupByTest   GroupBy = "test"
+	GroupByModel  GroupBy = "model"
+	GroupBySkill  GroupBy = "skill"
+	GroupByGrader GroupBy = "grader"
+)
+
+// Summary aggregates the trials, or grader results, of one group
+type Summary struct {
+	Key         string    `json:"key"`
+	Trials      int       `json:"trials"`
+	Passed      int       `json:"passed"`
+	PassRate    float64   `json:"pass_rate"`
+	MeanMs      float64   `json:"mean_ms"`
+	P50Ms       int64     `json:"p50_ms"`
+	P95Ms       int64     `json:"p95_ms"`
+	TokensTotal int       `json:"tokens_total"`
+	FirstSeen   time.Time `json:"first_seen"`
+	LastSeen    time.Time `json:"last_seen"`
+}
+
+// TrendPoint is a group's summary over one period
+type TrendPoint struct {
+	Period time.Time `json:"period"`
+	Summary
+}
+
+// Summarize aggregates the trials matching f by the given dimension. Grouped
+// by grader, each grader result counts as one trial.
+func (s *Store) Summarize(f Filter, by GroupBy) ([]Summary, error) {
+	groups := map[string]*accumulator{}
+
+	err := s.eachSample(f, by, func(key string, run RunRecord, sample sample) {
+		acc, ok := groups[key]
+		if !ok {
+			acc = &accumulator{}
+			groups[key] = acc
+		}
+		acc.add(run.Timestamp, sample)
+	})
+	if err != nil {
+		return nil, err
+	}
+
+	summaries := make([]Summary, 0, len(groups))
+	for key, acc := range groups {
+		summaries = append(summaries, acc.summary(key))
+	}
+	sort.Slice(summaries, func(i, j int) bool { return summaries[i].Key < summaries[j].Key })
+
+	return summaries, nil
+}
+
+// Trend aggregates the trials matching f per period and group, ordered by
+// period then group. Periods start at midnight UTC; weekly periods on Monday.
+func (s *Store) Trend(f Filter, by GroupBy, period time.Duration) ([]TrendPoint, error) {
+	type bucket struct {
+		period time.Time
+		key    string
+	}
+	groups := map[bucket]*accumulator{}
+
+	err := s.eachSample(f, by, func(key string, run RunRecord, sample sample) {
+		b := bucket{period: truncatePeriod(run.Timestamp, period), key: key}
+		acc, ok := groups[b]
+		if !ok {
+			acc = &accumulator{}
+			groups[b] = acc
+		}
+		acc.add(run.Timestamp, sample)
+	})
+	if err != nil {
+		return nil, err
+	}
+
+	points := make([]TrendPoint, 0, len(groups))
+	for b, acc := range groups {
+		points = append(points, TrendPoint{Period: b.period, Summary: acc.summary(b.key)})
+	}
+	sort.Slice(points, func(i, j int) bool {
+		if !points[i].Period.Equal(points[j].Period) {
+			return points[i].Period.Before(points[j].Period)
+		}
+		return points[i].Key < points[j].Key
+	})
+
+	return points, nil
+}
+
+type sample struct {
+	passed     bool
+	durationMs int64
+	tokens     int
+}
+
+func (s *Store) eachSample(f Filter, by GroupBy, fn func(key string, run RunRecord, sample sample)) error {
+	return s.Trials(f, func(run RunRecord, t TrialRecord) error {
+		if by == GroupByGrader {
+			for _, g := range t.Graders {
+				fn(g.Name, run, sample{passed: g.Passed, durationMs: g.DurationMs})
+			}
+			return nil
+		}
+
+		var key string
+		switch by {
+		case GroupByModel:
+			key = run.Model
+		case GroupBySkill:
+			key = run.Skill
+		default:
+			key = t.TestID
+		}
+
+		fn(key, run, sample{
+			passed:     t.Status == "passed",
+			durationMs: t.DurationMs,
+			tokens:     t.TokensTotal,
+		})
+		return nil
+	})
+}
+
+type accumulator struct {
+	passed    int
+	tokens    int
+	durations []int64
+	first     time.Time
+	last      time.Time
+}
+
+func (a *accumulator) add(at time.Time, s sample) {
+	if s.passed {
+		a.passed++
+	}
+	a.tokens += s.tokens
+	a.durations = append(a.durations, s.durationMs)
+
+	if a.first.IsZero() || at.Before(a.first) {
+		a.first = at
+	}
+	if at.After(a.last) {
+		a.last = at
+	}
+}
+
+func (a *accumulator) summary(key string) Summary {
+	n := len(a.durations)
+	sorted := append([]int64(nil), a.durations...)
+	sort.Slice(sorted, func(i, j int) bool { return sorted[i] < sorted[j] })
+
+	var total int64
+	for _, d := range sorted {
+		total += d
+	}
+
+	s := Summary{
+		Key:         key,
+		Trials:      n,
+		Passed:      a.passed,
+		TokensTotal: a.tokens,
+		FirstSeen:   a.first,
+		LastSeen:    a.last,
+	}
+	if n > 0 {
+		s.PassRate = float64(a.passed) / float64(n)
+		s.MeanMs = float64(total) / float64(n)
+		s.P50Ms = percentile(sorted, 0.50)
+		s.P95Ms = percentile(sorted, 0.95)
+	}
+	return s
+}
+
+// percentile returns the nearest-rank percentile of sorted values
+func percentile(sorted []int64, p float64) int64 {
+	if len(sorted) == 0 {
+		return 0
+	}
+	rank := int(math.Ceil(p*float64(len(sorted)))) - 1
+	if rank < 0 {
+		rank = 0
+	}
+	if rank >= len(sorted) {
+		rank = len(sorted) - 1
+	}
+	return sorted[rank]
+}
+
+func truncatePeriod(t time.Time, period time.Duration) time.Time {
+	t = t.UTC()
+	day := time.Date(t.Year(), t.Month(), t.Day(), 0, 0, 0, 0, time.UTC)
+
+	switch {
+	case period >= 7*24*time.Hour:
+		// weeks start on Monday
+		offset := (int(day.Weekday()) + 6) % 7
+		return day.AddDate(0, 0, -offset)
+	case period >= 24*time.Hour:
+		return day
+	default:
+		return t.Truncate(period)
+	}
+}
+
+func sortedValidations(validations map[string]models.GraderResults) []models.GraderResults {
+	results := make([]models.GraderResults, 0, len(validations))
+	for _, v := range validations {
+		results = append(results, v)
+	}
+	sort.Slice(results, func(i, j int) bool { return results[i].Name < results[j].Name })
+	return results
+}
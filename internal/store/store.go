@@ -0,0 +1,362 @@
+// Package store keeps evaluation results across runs so they can be queried
+// without re-reading every JSON output. Results are written as JSON lines:
+//
+//	runs.jsonl               one summary line per run; the index queries scan first
+//	trials/<run>.jsonl       one line per trial, with its grader results
+//	transcripts/<run>.jsonl  transcripts, kept out of line so queries never read them
+//
+// Queries filter runs on the index, so they only open the trial files of the
+// runs that match. Every file is read one line at a time.
+package store
+
+import (
+	"bufio"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"io"
+	"os"
+	"path/filepath"
+	"strings"
+	"time"
+
+	"github.com/spboyer/waza/internal/models"
+)
+
+// DefaultDir is where results are stored when no directory is given
+const DefaultDir = ".waza/results"
+
+const (
+	indexFile      = "runs.jsonl"
+	trialsDir      = "trials"
+	transcriptsDir = "transcripts"
+)
+
+// RunRecord is the index entry for one evaluation run
+type RunRecord struct {
+	RunID          string    `json:"run_id"`
+	Skill          string    `json:"skill"`
+	EvalName       string    `json:"eval_name"`
+	Model          string    `json:"model"`
+	Engine         string    `json:"engine"`
+	Timestamp      time.Time `json:"timestamp"`
+	TotalTests     int       `json:"total_tests"`
+	Succeeded      int       `json:"succeeded"`
+	Failed         int       `json:"failed"`
+	Errors         int       `json:"errors"`
+	SuccessRate    float64   `json:"success_rate"`
+	AggregateScore float64   `json:"aggregate_score"`
+	DurationMs     int64     `json:"duration_ms"`
+}
+
+// TrialRecord is one run of one test
+type TrialRecord struct {
+	RunID       string         `json:"run_id"`
+	TestID      string         `json:"test_id"`
+	DisplayName string         `json:"display_name"`
+	RunNumber   int            `json:"run_number"`
+	Status      string         `json:"status"`
+	DurationMs  int64          `json:"duration_ms"`
+	ToolCalls   int            `json:"tool_calls"`
+	TokensTotal int            `json:"tokens_total"`
+	ErrorMsg    string         `json:"error_msg,omitempty"`
+	Graders     []GraderRecord `json:"graders,omitempty"`
+}
+
+// GraderRecord is one grader's result for a trial
+type GraderRecord struct {
+	Name       string  `json:"name"`
+	Type       string  `json:"type"`
+	Score      float64 `json:"score"`
+	Passed     bool    `json:"passed"`
+	DurationMs int64   `json:"duration_ms"`
+}
+
+type transcriptRecord struct {
+	TestID     string                   `json:"test_id"`
+	RunNumber  int                      `json:"run_number"`
+	Transcript []models.TranscriptEntry `json:"transcript"`
+}
+
+// Filter selects runs and trials. Empty fields match everything.
+type Filter struct {
+	RunID  string
+	Skill  string
+	Model  string
+	TestID string
+	Grader string
+	Since  time.Time
+	Until  time.Time
+}
+
+func (f Filter) matchRun(r RunRecord) bool {
+	switch {
+	case f.RunID != "" && r.RunID != f.RunID:
+		return false
+	case f.Skill != "" && r.Skill != f.Skill:
+		return false
+	case f.Model != "" && r.Model != f.Model:
+		return false
+	case !f.Since.IsZero() && r.Timestamp.Before(f.Since):
+		return false
+	case !f.Until.IsZero() && !r.Timestamp.Before(f.Until):
+		return false
+	}
+	return true
+}
+
+// Store is a results store rooted at a directory
+type Store struct {
+	dir string
+}
+
+// Open opens the store in dir, creating it if needed
+func Open(dir string) (*Store, error) {
+	for _, d := range []string{dir, filepath.Join(dir, trialsDir), filepath.Join(dir, transcriptsDir)} {
+		if err := os.MkdirAll(d, 0755); err != nil {
+			return nil, fmt.Errorf("failed to create results store: %w", err)
+		}
+	}
+	return &Store{dir: dir}, nil
+}
+
+// Dir returns the store's directory
+func (s *Store) Dir() string { return s.dir }
+
+// Save adds an evaluation outcome to the store. The index line is written
+// last, so a run only becomes visible once its trials are on disk. A run ID
+// already in the store is rejected: its trial partition is created
+// exclusively, so of two saves racing with the same ID only one succeeds.
+func (s *Store) Save(outcome *models.EvaluationOutcome) error {
+	if outcome.RunID == "" {
+		return errors.New("outcome has no run ID")
+	}
+
+	if err := s.writeTrials(outcome); err != nil {
+		return err
+	}
+
+	index, err := newLineWriter(filepath.Join(s.dir, indexFile), os.O_APPEND)
+	if err != nil {
+		return err
+	}
+	if err := index.write(newRunRecord(outcome)); err != nil {
+		return errors.Join(err, index.Close())
+	}
+	return index.Close()
+}
+
+// writeTrials writes the run's trial and transcript partitions
+func (s *Store) writeTrials(outcome *models.EvaluationOutcome) (err error) {
+	trials, err := newLineWriter(s.runFile(trialsDir, outcome.RunID), os.O_EXCL)
+	if errors.Is(err, os.ErrExist) {
+		return fmt.Errorf("run %s is already in the results store", outcome.RunID)
+	}
+	if err != nil {
+		return err
+	}
+	defer func() { err = errors.Join(err, trials.Close()) }()
+
+	transcripts, err := newLineWriter(s.runFile(transcriptsDir, outcome.RunID), os.O_TRUNC)
+	if err != nil {
+		return err
+	}
+	defer func() { err = errors.Join(err, transcripts.Close()) }()
+
+	for _, to := range outcome.TestOutcomes {
+		for _, run := range to.Runs {
+			if err := trials.write(newTrialRecord(outcome.RunID, to, run)); err != nil {
+				return err
+			}
+
+			if len(run.Transcript) == 0 {
+				continue
+			}
+			err := transcripts.write(transcriptRecord{
+				TestID:     to.TestID,
+				RunNumber:  run.RunNumber,
+				Transcript: run.Transcript,
+			})
+			if err != nil {
+				return err
+			}
+		}
+	}
+
+	return nil
+}
+
+// Runs calls fn for every run that matches f, in the order they were saved
+func (s *Store) Runs(f Filter, fn func(RunRecord) error) error {
+	return scanLines(filepath.Join(s.dir, indexFile), func(line []byte) error {
+		var r RunRecord
+		if err := json.Unmarshal(line, &r); err != nil {
+			return err
+		}
+		if !f.matchRun(r) {
+			return nil
+		}
+		return fn(r)
+	})
+}
+
+// Trials calls fn for every trial of the runs that match f. When f names a
+// grader, trials without it are skipped and only that grader's result is kept.
+func (s *Store) Trials(f Filter, fn func(RunRecord, TrialRecord) error) error {
+	return s.Runs(f, func(run RunRecord) error {
+		return scanLines(s.runFile(trialsDir, run.RunID), func(line []byte) error {
+			var t TrialRecord
+			if err := json.Unmarshal(line, &t); err != nil {
+				return err
+			}
+			if f.TestID != "" && t.TestID != f.TestID {
+				return nil
+			}
+			if f.Grader != "" {
+				var kept []GraderRecord
+				for _, g := range t.Graders {
+					if g.Name == f.Grader {
+						kept = append(kept, g)
+					}
+				}
+				if len(kept) == 0 {
+					return nil
+				}
+				t.Graders = kept
+			}
+			return fn(run, t)
+		})
+	})
+}
+
+// Transcript returns the stored transcript of one trial
+func (s *Store) Transcript(runID, testID string, runNumber int) ([]models.TranscriptEntry, error) {
+	var found []models.TranscriptEntry
+
+	err := scanLines(s.runFile(transcriptsDir, runID), func(line []byte) error {
+		var t transcriptRecord
+		if err := json.Unmarshal(line, &t); err != nil {
+			return err
+		}
+		if t.TestID == testID && t.RunNumber == runNumber {
+			found = t.Transcript
+			return errStop
+		}
+		return nil
+	})
+	if err != nil {
+		return nil, err
+	}
+	if found == nil {
+		return nil, fmt.Errorf("no transcript stored for %s run %d of %s", testID, runNumber, runID)
+	}
+	return found, nil
+}
+
+func (s *Store) runFile(kind, runID string) string {
+	// run IDs become file names, so keep them inside the store
+	name := strings.NewReplacer("/", "_", "\\", "_", "..", "_").Replace(runID)
+	return filepath.Join(s.dir, kind, name+".jsonl")
+}
+
+func newRunRecord(outcome *models.EvaluationOutcome) RunRecord {
+	return RunRecord{
+		RunID:          outcome.RunID,
+		Skill:          outcome.SkillTested,
+		EvalName:       outcome.BenchName,
+		Model:          outcome.Setup.ModelID,
+		Engine:         outcome.Setup.EngineType,
+		Timestamp:      outcome.Timestamp,
+		TotalTests:     outcome.Digest.TotalTests,
+		Succeeded:      outcome.Digest.Succeeded,
+		Failed:         outcome.Digest.Failed,
+		Errors:         outcome.Digest.Errors,
+		SuccessRate:    outcome.Digest.SuccessRate,
+		AggregateScore: outcome.Digest.AggregateScore,
+		DurationMs:     outcome.Digest.DurationMs,
+	}
+}
+
+func newTrialRecord(runID string, to models.TestOutcome, run models.RunResult) TrialRecord {
+	t := TrialRecord{
+		RunID:       runID,
+		TestID:      to.TestID,
+		DisplayName: to.DisplayName,
+		RunNumber:   run.RunNumber,
+		Status:      run.Status,
+		DurationMs:  run.DurationMs,
+		ToolCalls:   run.SessionDigest.ToolCallCount,
+		TokensTotal: run.SessionDigest.TokensTotal,
+		ErrorMsg:    run.ErrorMsg,
+	}
+
+	for _, g := range sortedValidations(run.Validations) {
+		t.Graders = append(t.Graders, GraderRecord{
+			Name:       g.Name,
+			Type:       g.Type,
+			Score:      g.Score,
+			Passed:     g.Passed,
+			DurationMs: g.DurationMs,
+		})
+	}
+
+	return t
+}
+
+// errStop ends a scan early without reporting an error
+var errStop = errors.New("stop scanning")
+
+// scanLines calls fn for each non-empty line of path. A missing file has no
+// lines.
+func scanLines(path string, fn func(line []byte) error) (err error) {
+	f, err := os.Open(path)
+	if errors.Is(err, os.ErrNotExist) {
+		return nil
+	}
+	if err != nil {
+		return err
+	}
+	defer func() { err = errors.Join(err, f.Close()) }()
+
+	reader := bufio.NewReader(f)
+	for {
+		line, err := reader.ReadBytes('\n')
+		if len(line) > 0 && strings.TrimSpace(string(line)) != "" {
+			if ferr := fn(line); ferr != nil {
+				if errors.Is(ferr, errStop) {
+					return nil
+				}
+				return fmt.Errorf("%s: %w", path, ferr)
+			}
+		}
+		if errors.Is(err, io.EOF) {
+			return nil
+		}
+		if err != nil {
+			return err
+		}
+	}
+}
+
+type lineWriter struct {
+	f   *os.File
+	buf *bufio.Writer
+	enc *json.Encoder
+}
+
+func newLineWriter(path string, mode int) (*lineWriter, error) {
+	f, err := os.OpenFile(path, os.O_CREATE|os.O_WRONLY|mode, 0644)
+	if err != nil {
+		return nil, err
+	}
+	buf := bufio.NewWriter(f)
+	return &lineWriter{f: f, buf: buf, enc: json.NewEncoder(buf)}, nil
+}
+
+func (w *lineWriter) write(v any) error {
+	return w.enc.Encode(v)
+}
+
+func (w *lineWriter) Close() error {
+	return errors.Join(w.buf.Flush(), w.f.Close())
+}
@@ -0,0 +1,167 @@
+package store
+
+import (
+	"fmt"
+	"testing"
+	"time"
+
+	"github.com/spboyer/waza/internal/models"
+	"github.com/stretchr/testify/require"
+)
+
+func testOutcome(runID, model string, at time.Time, statuses ...string) *models.EvaluationOutcome {
+	outcome := &models.EvaluationOutcome{
+		RunID:       runID,
+		SkillTested: "code-explainer",
+		BenchName:   "bench",
+		Timestamp:   at,
+		Setup:       models.OutcomeSetup{ModelID: model, EngineType: "mock"},
+	}
+
+	for i, status := range statuses {
+		testID := fmt.Sprintf("test-%d", i)
+		outcome.TestOutcomes = append(outcome.TestOutcomes, models.TestOutcome{
+			TestID:      testID,
+			DisplayName: testID,
+			Status:      status,
+			Runs: []models.RunResult{{
+				RunNumber:  1,
+				Status:     status,
+				DurationMs: int64(100 * (i + 1)),
+				Validations: map[string]models.GraderResults{
+					"has_output": {Name: "has_output", Type: "code", Score: 1, Passed: true},
+					"quality":    {Name: "quality", Type: "regex", Passed: status == "passed"},
+				},
+				SessionDigest: models.SessionDigest{TokensTotal: 10},
+				Transcript: []models.TranscriptEntry{
+					{Type: "assistant.message", Data: map[string]any{"content": runID + "/" + testID}},
+				},
+			}},
+		})
+	}
+
+	return outcome
+}
+
+func TestStore_ConcurrentSavesOfOneRun(t *testing.T) {
+	s, err := Open(t.TempDir())
+	require.NoError(t, err)
+
+	at := time.Date(2026, 3, 2, 10, 0, 0, 0, time.UTC)
+	errs := make(chan error, 4)
+	for i := 0; i < cap(errs); i++ {
+		go func() { errs <- s.Save(testOutcome("run-1", "gpt-4o", at, "passed")) }()
+	}
+
+	saved := 0
+	for i := 0; i < cap(errs); i++ {
+		if err := <-errs; err == nil {
+			saved++
+		} else {
+			require.ErrorContains(t, err, "already in the results store")
+		}
+	}
+	require.Equal(t, 1, saved)
+
+	runs := 0
+	require.NoError(t, s.Runs(Filter{}, func(RunRecord) error {
+		runs++
+		return nil
+	}))
+	require.Equal(t, 1, runs)
+}
+
+func TestStore_SaveAndQuery(t *testing.T) {
+	s, err := Open(t.TempDir())
+	require.NoError(t, err)
+
+	monday := time.Date(2026, 3, 2, 10, 0, 0, 0, time.UTC)
+
+	require.NoError(t, s.Save(testOutcome("run-1", "gpt-4o", monday, "passed", "failed")))
+	require.NoError(t, s.Save(testOutcome("run-2", "gpt-4o", monday.AddDate(0, 0, 1), "passed", "passed")))
+	require.NoError(t, s.Save(testOutcome("run-3", "claude", monday.AddDate(0, 0, 8), "failed", "failed")))
+
+	require.ErrorContains(t, s.Save(testOutcome("run-1", "gpt-4o", monday)), "already in the results store")
+
+	t.Run("runs", func(t *testing.T) {
+		var ids []string
+		require.NoError(t, s.Runs(Filter{Model: "gpt-4o"}, func(r RunRecord) error {
+			ids = append(ids, r.RunID)
+			return nil
+		}))
+		require.Equal(t, []string{"run-1", "run-2"}, ids)
+	})
+
+	t.Run("summarize by test", func(t *testing.T) {
+		summaries, err := s.Summarize(Filter{Model: "gpt-4o"}, GroupByTest)
+		require.NoError(t, err)
+		require.Len(t, summaries, 2)
+
+		require.Equal(t, "test-1", summaries[1].Key)
+		require.Equal(t, 2, summaries[1].Trials)
+		require.Equal(t, 0.5, summaries[1].PassRate)
+		require.Equal(t, int64(200), summaries[1].P95Ms)
+		require.Equal(t, 20, summaries[1].TokensTotal)
+	})
+
+	t.Run("summarize by grader", func(t *testing.T) {
+		summaries, err := s.Summarize(Filter{Grader: "quality"}, GroupByGrader)
+		require.NoError(t, err)
+		require.Len(t, summaries, 1)
+		require.Equal(t, 6, summaries[0].Trials)
+		require.Equal(t, 3, summaries[0].Passed)
+	})
+
+	t.Run("filters", func(t *testing.T) {
+		summaries, err := s.Summarize(Filter{
+			TestID: "test-0",
+			Since:  monday.AddDate(0, 0, 1),
+		}, GroupByModel)
+		require.NoError(t, err)
+		require.Len(t, summaries, 2)
+		require.Equal(t, "claude", summaries[0].Key)
+		require.Equal(t, 0.0, summaries[0].PassRate)
+		require.Equal(t, "gpt-4o", summaries[1].Key)
+		require.Equal(t, 1, summaries[1].Trials)
+	})
+
+	t.Run("trend", func(t *testing.T) {
+		points, err := s.Trend(Filter{}, GroupBySkill, 7*24*time.Hour)
+		require.NoError(t, err)
+		require.Len(t, points, 2)
+		require.Equal(t, monday.Truncate(24*time.Hour), points[0].Period)
+		require.Equal(t, 0.75, points[0].PassRate)
+		require.Equal(t, monday.AddDate(0, 0, 7).Truncate(24*time.Hour), points[1].Period)
+		require.Equal(t, 0.0, points[1].PassRate)
+
+		daily, err := s.Trend(Filter{}, GroupByModel, 24*time.Hour)
+		require.NoError(t, err)
+		require.Len(t, daily, 3)
+	})
+
+	t.Run("transcripts", func(t *testing.T) {
+		transcript, err := s.Transcript("run-2", "test-1", 1)
+		require.NoError(t, err)
+		require.Equal(t, "run-2/test-1", transcript[0].Data["content"])
+
+		_, err = s.Transcript("run-2", "test-9", 1)
+		require.Error(t, err)
+	})
+}
+
+func TestStore_Empty(t *testing.T) {
+	s, err := Open(t.TempDir())
+	require.NoError(t, err)
+
+	summaries, err := s.Summarize(Filter{}, GroupByTest)
+	require.NoError(t, err)
+	require.Empty(t, summaries)
+}
+
+func TestPercentile(t *testing.T) {
+	values := []int64{10, 20, 30, 40, 50, 60, 70, 80, 90, 100}
+	require.Equal(t, int64(50), percentile(values, 0.5))
+	require.Equal(t, int64(100), percentile(values, 0.95))
+	require.Equal(t, int64(10), percentile(values, 0))
+	require.Equal(t, int64(0), percentile(nil, 0.5))
+}
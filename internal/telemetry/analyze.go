@@ -0,0 +1,666 @@
+package telemetry
+
+import (
+	"bufio"
+	"bytes"
+	"compress/gzip"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"io"
+	"io/fs"
+	"os"
+	"path/filepath"
+	"runtime"
+	"sort"
+	"strings"
+	"sync"
+	"time"
+
+	"github.com/spboyer/waza/internal/stats"
+)
+
+// Counts is a mergeable summary of sessions. Durations are only known for
+// ended sessions.
+type Counts struct {
+	Sessions   int64         `json:"sessions"`
+	Succeeded  int64         `json:"succeeded"`
+	ToolCalls  int64         `json:"tool_calls"`
+	Timed      int64         `json:"timed"`
+	DurationMs float64       `json:"duration_ms"`
+	Durations  *stats.Sketch `json:"durations"`
+}
+
+func newCounts() *Counts {
+	return &Counts{Durations: stats.NewSketch(stats.DefaultAccuracy)}
+}
+
+func (c *Counts) add(rec *sessionRecord) {
+	c.Sessions++
+	if rec.Success {
+		c.Succeeded++
+	}
+	c.ToolCalls += int64(len(rec.ToolCalls))
+	if rec.EndTime != nil && !rec.StartTime.IsZero() {
+		ms := float64(rec.EndTime.Sub(rec.StartTime.Time)) / float64(time.Millisecond)
+		c.Timed++
+		c.DurationMs += ms
+		c.Durations.Add(ms)
+	}
+}
+
+func (c *Counts) merge(o *Counts) error {
+	c.Sessions += o.Sessions
+	c.Succeeded += o.Succeeded
+	c.ToolCalls += o.ToolCalls
+	c.Timed += o.Timed
+	c.DurationMs += o.DurationMs
+	return c.Durations.Merge(o.Durations)
+}
+
+// Metrics are the reported figures for a set of sessions
+type Metrics struct {
+	Sessions               int64   `json:"sessions"`
+	SuccessRate            float64 `json:"success_rate"`
+	AvgDurationMs          float64 `json:"avg_duration_ms"`
+	P50DurationMs          float64 `json:"p50_duration_ms"`
+	P95DurationMs          float64 `json:"p95_duration_ms"`
+	P99DurationMs          float64 `json:"p99_duration_ms"`
+	TotalToolCalls         int64   `json:"total_tool_calls"`
+	AvgToolCallsPerSession float64 `json:"avg_tool_calls_per_session"`
+}
+
+// Metrics computes the reported figures
+func (c *Counts) Metrics() Metrics {
+	m := Metrics{
+		Sessions:       c.Sessions,
+		TotalToolCalls: c.ToolCalls,
+		P50DurationMs:  c.Durations.Quantile(0.5),
+		P95DurationMs:  c.Durations.Quantile(0.95),
+		P99DurationMs:  c.Durations.Quantile(0.99),
+	}
+	if c.Sessions > 0 {
+		m.SuccessRate = float64(c.Succeeded) / float64(c.Sessions)
+		m.AvgToolCallsPerSession = float64(c.ToolCalls) / float64(c.Sessions)
+	}
+	if c.Timed > 0 {
+		m.AvgDurationMs = c.DurationMs / float64(c.Timed)
+	}
+	return m
+}
+
+// Aggregate summarizes sessions overall and per skill. Aggregates of
+// disjoint sets of sessions merge into the aggregate of their union.
+type Aggregate struct {
+	Counts
+	Skills map[string]*Counts `json:"skills"`
+	// Malformed counts lines that weren't valid session JSON
+	Malformed int64 `json:"malformed"`
+}
+
+// NewAggregate creates an empty aggregate
+func NewAggregate() *Aggregate {
+	return &Aggregate{Counts: *newCounts(), Skills: make(map[string]*Counts)}
+}
+
+func (a *Aggregate) add(rec *sessionRecord) {
+	a.Counts.add(rec)
+
+	name := rec.SkillName
+	skill, ok := a.Skills[name]
+	if !ok {
+		skill = newCounts()
+		a.Skills[name] = skill
+	}
+	skill.add(rec)
+}
+
+// Merge adds the sessions summarized by o
+func (a *Aggregate) Merge(o *Aggregate) error {
+	a.Malformed += o.Malformed
+	if err := a.Counts.merge(&o.Counts); err != nil {
+		return err
+	}
+	for name, counts := range o.Skills {
+		skill, ok := a.Skills[name]
+		if !ok {
+			skill = newCounts()
+			a.Skills[name] = skill
+		}
+		if err := skill.merge(counts); err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
+// SkillNames returns the named skills seen, sorted
+func (a *Aggregate) SkillNames() []string {
+	names := make([]string, 0, len(a.Skills))
+	for name := range a.Skills {
+		if name != "" {
+			names = append(names, name)
+		}
+	}
+	sort.Strings(names)
+	return names
+}
+
+// Report is an aggregate's metrics, overall and per skill
+type Report struct {
+	Metrics
+	Skills    map[string]Metrics `json:"skills"`
+	Malformed int64              `json:"malformed,omitempty"`
+}
+
+// Report computes the metrics of the aggregate
+func (a *Aggregate) Report() Report {
+	r := Report{Metrics: a.Metrics(), Skills: make(map[string]Metrics, len(a.Skills)), Malformed: a.Malformed}
+	for name, counts := range a.Skills {
+		r.Skills[name] = counts.Metrics()
+	}
+	return r
+}
+
+// sessionRecord is the part of a session the analyzer reads; events and
+// other large fields are skipped by the decoder
+type sessionRecord struct {
+	StartTime timestamp  `json:"start_time"`
+	EndTime   *timestamp `json:"end_time"`
+	SkillName string     `json:"skill_name"`
+	Success   bool       `json:"success"`
+	ToolCalls []struct{} `json:"tool_calls"`
+}
+
+// timestamp accepts RFC 3339 times and the zoneless ISO 8601 times written by
+// Python's datetime.isoformat, which are taken as UTC
+type timestamp struct {
+	time.Time
+}
+
+func (t *timestamp) UnmarshalJSON(data []byte) error {
+	if string(data) == "null" {
+		return nil
+	}
+
+	// timestamps never need unescaping
+	if len(data) < 2 || data[0] != '"' || data[len(data)-1] != '"' {
+		return fmt.Errorf("invalid timestamp %s", data)
+	}
+	s := string(data[1 : len(data)-1])
+	for _, layout := range []string{time.RFC3339Nano, "2006-01-02T15:04:05.999999999"} {
+		if parsed, err := time.Parse(layout, s); err == nil {
+			t.Time = parsed
+			return nil
+		}
+	}
+	return fmt.Errorf("invalid timestamp %q", s)
+}
+
+// Analyzer summarizes telemetry files: JSON lines as written by a Sink,
+// plain or gzipped, and JSON arrays as written by Collector.Export. Files
+// are decoded one record at a time, in parallel.
+type Analyzer struct {
+	skill   string
+	needle  []byte
+	workers int
+}
+
+// AnalyzerOption configures an Analyzer
+type AnalyzerOption func(*Analyzer)
+
+// WithSkill only summarizes sessions of the named skill. Records that don't
+// mention the name are skipped without being decoded.
+func WithSkill(name string) AnalyzerOption {
+	return func(a *Analyzer) {
+		a.skill = name
+	}
+}
+
+// WithParallelism sets how many files are read at once; 0 means one per CPU
+func WithParallelism(n int) AnalyzerOption {
+	return func(a *Analyzer) {
+		a.workers = n
+	}
+}
+
+// NewAnalyzer creates an analyzer
+func NewAnalyzer(opts ...AnalyzerOption) *Analyzer {
+	a := &Analyzer{}
+	for _, opt := range opts {
+		opt(a)
+	}
+	if a.workers <= 0 {
+		a.workers = runtime.NumCPU()
+	}
+	if a.skill != "" {
+		a.needle, _ = json.Marshal(a.skill)
+	}
+	return a
+}
+
+// Analyze summarizes the telemetry files at paths, and the files under those
+// that are directories
+func (a *Analyzer) Analyze(paths ...string) (*Aggregate, error) {
+	state := NewState(a.skill)
+	err := a.Update(state, paths...)
+	return state.agg, err
+}
+
+// Update adds to state's aggregate whatever was written to the telemetry
+// files at paths since state was last updated: new files, and lines
+// appended to JSON lines files. A JSON lines file that was compressed after
+// rotation is picked up where its uncompressed form was left. A JSON lines
+// file that shrank, and a JSON array or compressed file whose size or
+// modification time changed, is read again in place of what was read from
+// it before. Files that fail to read are left for the next update and their
+// errors returned together.
+func (a *Analyzer) Update(state *State, paths ...string) error {
+	if state.skill != a.skill {
+		return fmt.Errorf("analysis state is for skill %q, not %q", state.skill, a.skill)
+	}
+
+	files, err := listFiles(paths)
+	if err != nil {
+		return err
+	}
+
+	var pending []fileJob
+	for _, path := range sortedFiles(files) {
+		if job, ok := state.job(path, files); ok {
+			pending = append(pending, job)
+		}
+	}
+
+	jobs := make(chan fileJob)
+	results := make(chan fileResult)
+
+	var wg sync.WaitGroup
+	for i := 0; i < a.workers && i < len(pending); i++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for job := range jobs {
+				results <- a.readFile(job)
+			}
+		}()
+	}
+
+	go func() {
+		for _, job := range pending {
+			jobs <- job
+		}
+		close(jobs)
+		wg.Wait()
+		close(results)
+	}()
+
+	var errs []error
+	for result := range results {
+		if result.err != nil {
+			errs = append(errs, fmt.Errorf("%s: %w", result.path, result.err))
+			continue
+		}
+		if err := state.record(result); err != nil {
+			errs = append(errs, err)
+		}
+	}
+
+	if len(pending) > 0 {
+		agg, err := state.total()
+		if err != nil {
+			errs = append(errs, err)
+		} else {
+			state.agg = agg
+		}
+	}
+	return errors.Join(errs...)
+}
+
+// fileJob is a file to read from an offset in its uncompressed content
+type fileJob struct {
+	path   string
+	offset int64
+	// from is the state entry the offset came from, when it isn't path's
+	from string
+	// base is what was read before offset, which the result is added to
+	base *Aggregate
+}
+
+type fileResult struct {
+	fileJob
+	file fileState
+	agg  *Aggregate
+	err  error
+}
+
+func (a *Analyzer) readFile(job fileJob) fileResult {
+	result := fileResult{fileJob: job, agg: NewAggregate()}
+	result.file, result.err = readRecords(job.path, job.offset, func(record []byte) {
+		a.addLine(record, result.agg)
+	})
+	return result
+}
+
+// readRecords calls fn with each session record of a telemetry file, from
+// offset in its uncompressed content, and returns how far it read
+func readRecords(path string, offset int64, fn func(record []byte)) (state fileState, err error) {
+	f, err := os.Open(path)
+	if err != nil {
+		return state, err
+	}
+	defer func() { err = errors.Join(err, f.Close()) }()
+
+	info, err := f.Stat()
+	if err != nil {
+		return state, err
+	}
+	state.Size = info.Size()
+	state.ModTime = info.ModTime()
+
+	switch {
+	case strings.HasSuffix(path, ".gz"):
+		zr, err := gzip.NewReader(f)
+		if err != nil {
+			return state, err
+		}
+		if _, err := io.CopyN(io.Discard, zr, offset); err != nil {
+			return state, fmt.Errorf("content is shorter than the %d bytes read before: %w", offset, err)
+		}
+		state.Offset, err = readLines(zr, offset, fn)
+		state.Done = err == nil
+		return state, err
+	case strings.HasSuffix(path, ".json"):
+		err = readArray(f, fn)
+		state.Done = err == nil
+		return state, err
+	default:
+		if _, err := f.Seek(offset, io.SeekStart); err != nil {
+			return state, err
+		}
+		state.Offset, err = readLines(f, offset, fn)
+		return state, err
+	}
+}
+
+// readLines calls fn with each line of r and returns the offset after the
+// last line read, counting from offset, where r starts. A last line without
+// a newline is only read if it is complete JSON, since it may be half
+// written.
+func readLines(r io.Reader, offset int64, fn func(line []byte)) (int64, error) {
+	br := bufio.NewReaderSize(r, 256*1024)
+	var long []byte
+
+	for {
+		line, err := br.ReadSlice('\n')
+		if err == bufio.ErrBufferFull {
+			long = append(long[:0], line...)
+			for err == bufio.ErrBufferFull {
+				line, err = br.ReadSlice('\n')
+				long = append(long, line...)
+			}
+			line = long
+		}
+
+		switch {
+		case err == nil:
+			offset += int64(len(line))
+			fn(line)
+		case err == io.EOF:
+			if len(bytes.TrimSpace(line)) > 0 && json.Valid(line) {
+				offset += int64(len(line))
+				fn(line)
+			}
+			return offset, nil
+		default:
+			return offset, err
+		}
+	}
+}
+
+func (a *Analyzer) addLine(line []byte, agg *Aggregate) {
+	line = bytes.TrimSpace(line)
+	if len(line) == 0 {
+		return
+	}
+	if a.needle != nil && !bytes.Contains(line, a.needle) {
+		return
+	}
+
+	var rec sessionRecord
+	if err := json.Unmarshal(line, &rec); err != nil {
+		agg.Malformed++
+		return
+	}
+	if a.skill != "" && rec.SkillName != a.skill {
+		return
+	}
+	agg.add(&rec)
+}
+
+// readArray calls fn with each element of a JSON array, one at a time
+func readArray(r io.Reader, fn func(element []byte)) error {
+	dec := json.NewDecoder(bufio.NewReaderSize(r, 256*1024))
+	if tok, err := dec.Token(); err != nil || tok != json.Delim('[') {
+		return errors.Join(errors.New("not a JSON array of sessions"), err)
+	}
+
+	var raw json.RawMessage
+	for dec.More() {
+		raw = raw[:0]
+		if err := dec.Decode(&raw); err != nil {
+			return err
+		}
+		fn(raw)
+	}
+	return nil
+}
+
+// listFiles expands directories into the telemetry files below them
+func listFiles(paths []string) (map[string]bool, error) {
+	files := make(map[string]bool)
+	for _, path := range paths {
+		info, err := os.Stat(path)
+		if err != nil {
+			return nil, err
+		}
+		if !info.IsDir() {
+			files[filepath.Clean(path)] = true
+			continue
+		}
+
+		err = filepath.WalkDir(path, func(p string, d fs.DirEntry, err error) error {
+			if err != nil {
+				return err
+			}
+			if !d.IsDir() && isTelemetryFile(d.Name()) {
+				files[p] = true
+			}
+			return nil
+		})
+		if err != nil {
+			return nil, err
+		}
+	}
+
+	return files, nil
+}
+
+func isTelemetryFile(name string) bool {
+	for _, ext := range []string{".jsonl", ".jsonl.gz", ".json"} {
+		if strings.HasSuffix(name, ext) {
+			return true
+		}
+	}
+	return false
+}
+
+func sortedFiles(files map[string]bool) []string {
+	sorted := make([]string, 0, len(files))
+	for path := range files {
+		sorted = append(sorted, path)
+	}
+	sort.Strings(sorted)
+	return sorted
+}
+
+// fileState is how much of a file earlier updates read, and what it added
+type fileState struct {
+	// Offset is the end of the last line read, in uncompressed bytes
+	Offset  int64     `json:"offset"`
+	Size    int64     `json:"size"`
+	ModTime time.Time `json:"mod_time"`
+	// Done marks compressed and JSON array files, which are read whole and
+	// only read again once their size or modification time changes
+	Done bool `json:"done,omitempty"`
+	// Aggregate summarizes the sessions read from the file, so that a file
+	// read again replaces its earlier contribution instead of adding to it
+	Aggregate *Aggregate `json:"aggregate,omitempty"`
+}
+
+// State is an aggregate together with how much of each telemetry file it
+// covers, so that later updates only read what was added since
+type State struct {
+	skill string
+	files map[string]fileState
+	agg   *Aggregate
+}
+
+// stateFile is the on-disk form of a State
+type stateFile struct {
+	Skill     string               `json:"skill,omitempty"`
+	Files     map[string]fileState `json:"files"`
+	Aggregate *Aggregate           `json:"aggregate"`
+}
+
+// NewState creates an empty state for analyses of one skill, or of every
+// skill when skill is empty
+func NewState(skill string) *State {
+	return &State{skill: skill, files: make(map[string]fileState), agg: NewAggregate()}
+}
+
+// LoadState reads a state written by Save. A missing file gives an empty
+// state.
+func LoadState(path, skill string) (*State, error) {
+	data, err := os.ReadFile(path)
+	if errors.Is(err, os.ErrNotExist) {
+		return NewState(skill), nil
+	}
+	if err != nil {
+		return nil, err
+	}
+
+	var saved stateFile
+	if err := json.Unmarshal(data, &saved); err != nil {
+		return nil, fmt.Errorf("failed to parse analysis state %s: %w", path, err)
+	}
+	if saved.Skill != skill {
+		return nil, fmt.Errorf("analysis state %s is for skill %q, not %q", path, saved.Skill, skill)
+	}
+
+	state := NewState(skill)
+	if saved.Files != nil {
+		state.files = saved.Files
+	}
+	if saved.Aggregate != nil {
+		state.agg = saved.Aggregate
+		if state.agg.Skills == nil {
+			state.agg.Skills = make(map[string]*Counts)
+		}
+	}
+	return state, nil
+}
+
+// Save writes the state to path
+func (s *State) Save(path string) error {
+	data, err := json.Marshal(stateFile{Skill: s.skill, Files: s.files, Aggregate: s.agg})
+	if err != nil {
+		return err
+	}
+	if err := os.MkdirAll(filepath.Dir(path), 0755); err != nil {
+		return err
+	}
+	return os.WriteFile(path, data, 0644)
+}
+
+// Aggregate returns the summary of everything read so far
+func (s *State) Aggregate() *Aggregate {
+	return s.agg
+}
+
+// job returns what is left to read of path, or false when nothing is. files
+// is every file being analyzed.
+func (s *State) job(path string, files map[string]bool) (fileJob, bool) {
+	if prev, ok := s.files[path]; ok {
+		if _, tracked := s.files[path+".gz"]; files[path+".gz"] && !tracked {
+			// compressed since: the compressed file takes over its entry
+			return fileJob{}, false
+		}
+
+		info, err := os.Stat(path)
+		switch {
+		case err != nil:
+			// left for the read to report
+		case prev.Done && info.Size() == prev.Size && info.ModTime().Equal(prev.ModTime):
+			return fileJob{}, false
+		case prev.Done || info.Size() < prev.Offset:
+			// replaced rather than appended to
+			return fileJob{path: path}, true
+		case info.Size() == prev.Offset:
+			return fileJob{}, false
+		}
+		return fileJob{path: path, offset: prev.Offset, base: prev.Aggregate}, true
+	}
+
+	// a file caught between compression and removal is read compressed
+	if files[path+".gz"] {
+		return fileJob{}, false
+	}
+
+	if plain := strings.TrimSuffix(path, ".gz"); plain != path {
+		if prev, ok := s.files[plain]; ok {
+			return fileJob{path: path, offset: prev.Offset, from: plain, base: prev.Aggregate}, true
+		}
+	}
+	return fileJob{path: path}, true
+}
+
+// record adds what was read of a file to its entry and moves its offset
+// forward
+func (s *State) record(result fileResult) error {
+	file := result.file
+	file.Aggregate = result.agg
+	if result.base != nil {
+		file.Aggregate = NewAggregate()
+		for _, agg := range []*Aggregate{result.base, result.agg} {
+			if err := file.Aggregate.Merge(agg); err != nil {
+				return err
+			}
+		}
+	}
+
+	if result.from != "" {
+		delete(s.files, result.from)
+	}
+	s.files[result.path] = file
+	return nil
+}
+
+// total merges what every file added
+func (s *State) total() (*Aggregate, error) {
+	paths := make([]string, 0, len(s.files))
+	for path := range s.files {
+		paths = append(paths, path)
+	}
+	sort.Strings(paths)
+
+	agg := NewAggregate()
+	for _, path := range paths {
+		if file := s.files[path]; file.Aggregate != nil {
+			if err := agg.Merge(file.Aggregate); err != nil {
+				return nil, err
+			}
+		}
+	}
+	return agg, nil
+}
@@ -0,0 +1,258 @@
+package telemetry
+
+import (
+	"encoding/json"
+	"fmt"
+	"os"
+	"path/filepath"
+	"testing"
+	"time"
+
+	"github.com/stretchr/testify/require"
+)
+
+var analyzeStart = time.Date(2026, 1, 31, 12, 0, 0, 0, time.UTC)
+
+// testSession ends durationMs after it starts, with the given number of
+// tool calls
+func testSession(skill string, success bool, durationMs, toolCalls int) *Session {
+	end := analyzeStart.Add(time.Duration(durationMs) * time.Millisecond)
+	s := &Session{
+		SessionID: newSessionID(),
+		StartTime: analyzeStart,
+		EndTime:   &end,
+		SkillName: skill,
+		Prompt:    "prompt mentioning " + skill,
+		Success:   success,
+		Events:    []Event{{Timestamp: analyzeStart, EventType: EventSkillInvoked, SkillName: skill}},
+	}
+	for i := 0; i < toolCalls; i++ {
+		s.ToolCalls = append(s.ToolCalls, map[string]any{"tool": "az"})
+	}
+	return s
+}
+
+func appendLines(t *testing.T, path string, sessions ...*Session) {
+	t.Helper()
+
+	f, err := os.OpenFile(path, os.O_CREATE|os.O_APPEND|os.O_WRONLY, 0644)
+	require.NoError(t, err)
+	enc := json.NewEncoder(f)
+	for _, s := range sessions {
+		require.NoError(t, enc.Encode(s))
+	}
+	require.NoError(t, f.Close())
+}
+
+func appendText(t *testing.T, path, text string) {
+	t.Helper()
+
+	f, err := os.OpenFile(path, os.O_APPEND|os.O_WRONLY, 0644)
+	require.NoError(t, err)
+	_, err = f.WriteString(text)
+	require.NoError(t, err)
+	require.NoError(t, f.Close())
+}
+
+func TestAnalyzer_Analyze(t *testing.T) {
+	dir := t.TempDir()
+
+	sink, err := NewSink(filepath.Join(dir, "stream"), WithMaxBytes(2048), WithCompression(), WithFlushInterval(0))
+	require.NoError(t, err)
+	for i := 0; i < 100; i++ {
+		require.NoError(t, sink.Write(testSession("azure-deploy", i%4 != 0, 100+i, 2)))
+	}
+	require.NoError(t, sink.Close())
+
+	// an export written by the Python collector, with zoneless timestamps
+	export := `[
+  {"session_id": "a", "start_time": "2026-01-31T12:00:00", "end_time": "2026-01-31T12:00:01.500000",
+   "skill_name": "azure-diagnostics", "prompt": "mentions azure-deploy", "success": true,
+   "events": [], "tool_calls": [{"tool": "az"}], "metadata": {}},
+  {"session_id": "b", "start_time": "2026-01-31T12:00:00", "end_time": null,
+   "skill_name": "azure-diagnostics", "prompt": "", "success": false, "events": [], "tool_calls": []}
+]`
+	require.NoError(t, os.WriteFile(filepath.Join(dir, "export.json"), []byte(export), 0644))
+
+	// not telemetry
+	require.NoError(t, os.WriteFile(filepath.Join(dir, "notes.txt"), []byte("{}"), 0644))
+
+	agg, err := NewAnalyzer(WithParallelism(4)).Analyze(dir)
+	require.NoError(t, err)
+
+	m := agg.Metrics()
+	require.Equal(t, int64(102), m.Sessions)
+	require.Equal(t, int64(201), m.TotalToolCalls)
+	require.Equal(t, []string{"azure-deploy", "azure-diagnostics"}, agg.SkillNames())
+
+	deploy := agg.Skills["azure-deploy"].Metrics()
+	require.Equal(t, int64(100), deploy.Sessions)
+	require.InDelta(t, 0.75, deploy.SuccessRate, 1e-9)
+	require.InDelta(t, 149.5, deploy.AvgDurationMs, 1e-9)
+	require.InDelta(t, 149.5, deploy.P50DurationMs, 149.5*0.02)
+	require.InDelta(t, 2.0, deploy.AvgToolCallsPerSession, 1e-9)
+
+	diagnostics := agg.Skills["azure-diagnostics"].Metrics()
+	require.Equal(t, int64(2), diagnostics.Sessions)
+	require.InDelta(t, 1500, diagnostics.AvgDurationMs, 1e-9, "open sessions have no duration")
+
+	// the filter matches the skill, not other mentions of its name
+	agg, err = NewAnalyzer(WithSkill("azure-deploy"), WithParallelism(1)).Analyze(dir)
+	require.NoError(t, err)
+	require.Equal(t, int64(100), agg.Sessions)
+	require.Equal(t, []string{"azure-deploy"}, agg.SkillNames())
+}
+
+func TestAnalyzer_ParallelMatchesSerial(t *testing.T) {
+	dir := t.TempDir()
+	for f := 0; f < 8; f++ {
+		var sessions []*Session
+		for i := 0; i < 200; i++ {
+			sessions = append(sessions, testSession(fmt.Sprintf("skill-%d", i%3), i%5 != 0, f*1000+i*7, i%4))
+		}
+		appendLines(t, filepath.Join(dir, fmt.Sprintf("part-%d.jsonl", f)), sessions...)
+	}
+
+	serial, err := NewAnalyzer(WithParallelism(1)).Analyze(dir)
+	require.NoError(t, err)
+	parallel, err := NewAnalyzer(WithParallelism(8)).Analyze(dir)
+	require.NoError(t, err)
+
+	require.Equal(t, serial.Metrics(), parallel.Metrics())
+	for name, counts := range serial.Skills {
+		require.Equal(t, counts.Metrics(), parallel.Skills[name].Metrics())
+	}
+}
+
+func TestAnalyzer_Malformed(t *testing.T) {
+	path := filepath.Join(t.TempDir(), "sessions.jsonl")
+	appendLines(t, path, testSession("s", true, 10, 0))
+	appendText(t, path, "not json\n\n")
+
+	agg, err := NewAnalyzer().Analyze(path)
+	require.NoError(t, err)
+	require.Equal(t, int64(1), agg.Sessions)
+	require.Equal(t, int64(1), agg.Malformed)
+
+	_, err = NewAnalyzer().Analyze(filepath.Join(t.TempDir(), "missing"))
+	require.Error(t, err)
+}
+
+func TestAnalyzer_Incremental(t *testing.T) {
+	dir := t.TempDir()
+	statePath := filepath.Join(t.TempDir(), "state.json")
+	live := filepath.Join(dir, "sessions-1.jsonl")
+
+	update := func() *Aggregate {
+		t.Helper()
+		state, err := LoadState(statePath, "")
+		require.NoError(t, err)
+		require.NoError(t, NewAnalyzer().Update(state, dir))
+		require.NoError(t, state.Save(statePath))
+		return state.Aggregate()
+	}
+
+	appendLines(t, live, testSession("a", true, 10, 1), testSession("a", false, 20, 1))
+	require.Equal(t, int64(2), update().Sessions)
+	require.Equal(t, int64(2), update().Sessions, "nothing new")
+
+	// a half-written line is left for the next update
+	appendLines(t, live, testSession("a", true, 30, 1))
+	appendText(t, live, `{"session_id": "partial", "skill_na`)
+	require.Equal(t, int64(3), update().Sessions)
+
+	appendText(t, live, `me": "a", "success": true, "tool_calls": []}`+"\n")
+	appendLines(t, live, testSession("a", true, 40, 1))
+
+	// rotation compresses the file after more lines were appended; the
+	// compressed file is read from where the plain one was left
+	require.NoError(t, compressFile(live))
+	appendLines(t, filepath.Join(dir, "sessions-2.jsonl"), testSession("b", true, 50, 1))
+
+	agg := update()
+	require.Equal(t, int64(6), agg.Sessions)
+	require.Equal(t, int64(0), agg.Malformed)
+
+	full, err := NewAnalyzer().Analyze(dir)
+	require.NoError(t, err)
+	require.Equal(t, full.Metrics(), agg.Metrics())
+	require.Equal(t, int64(6), update().Sessions, "compressed files are not read again")
+
+	_, err = LoadState(statePath, "b")
+	require.ErrorContains(t, err, "is for skill")
+}
+
+func TestAnalyzer_IncrementalRewrites(t *testing.T) {
+	dir := t.TempDir()
+	statePath := filepath.Join(t.TempDir(), "state.json")
+	live := filepath.Join(dir, "sessions.jsonl")
+	export := filepath.Join(dir, "export.json")
+
+	update := func() *Aggregate {
+		t.Helper()
+		state, err := LoadState(statePath, "")
+		require.NoError(t, err)
+		require.NoError(t, NewAnalyzer().Update(state, dir))
+		require.NoError(t, state.Save(statePath))
+		return state.Aggregate()
+	}
+	writeExport := func(modTime time.Time, sessions ...*Session) {
+		t.Helper()
+		data, err := json.Marshal(sessions)
+		require.NoError(t, err)
+		require.NoError(t, os.WriteFile(export, data, 0644))
+		require.NoError(t, os.Chtimes(export, modTime, modTime))
+	}
+
+	appendLines(t, live, testSession("a", true, 10, 1), testSession("a", true, 20, 1), testSession("a", true, 30, 1))
+	writeExport(analyzeStart, testSession("b", true, 10, 1))
+	require.Equal(t, int64(4), update().Sessions)
+
+	// the live file is rewritten shorter: its earlier sessions are dropped
+	require.NoError(t, os.Remove(live))
+	appendLines(t, live, testSession("a", false, 40, 1))
+	agg := update()
+	require.Equal(t, int64(2), agg.Sessions)
+	require.Equal(t, int64(1), agg.Skills["a"].Sessions)
+
+	// the export is replaced by one of the same size
+	writeExport(analyzeStart.Add(time.Hour), testSession("c", true, 10, 1))
+	agg = update()
+	require.Equal(t, int64(2), agg.Sessions)
+	require.Equal(t, []string{"a", "c"}, agg.SkillNames())
+
+	full, err := NewAnalyzer().Analyze(dir)
+	require.NoError(t, err)
+	require.Equal(t, full.Metrics(), agg.Metrics())
+	require.Equal(t, int64(2), update().Sessions, "nothing new")
+}
+
+func BenchmarkAnalyzer(b *testing.B) {
+	dir := b.TempDir()
+	for f := 0; f < 8; f++ {
+		file, err := os.Create(filepath.Join(dir, fmt.Sprintf("part-%d.jsonl", f)))
+		if err != nil {
+			b.Fatal(err)
+		}
+		enc := json.NewEncoder(file)
+		for i := 0; i < 5000; i++ {
+			if err := enc.Encode(testSession(fmt.Sprintf("skill-%d", i%10), i%3 != 0, i, 5)); err != nil {
+				b.Fatal(err)
+			}
+		}
+		if err := file.Close(); err != nil {
+			b.Fatal(err)
+		}
+	}
+
+	for _, skill := range []string{"", "skill-3"} {
+		b.Run("skill="+skill, func(b *testing.B) {
+			a := NewAnalyzer(WithSkill(skill))
+			for i := 0; i < b.N; i++ {
+				if _, err := a.Analyze(dir); err != nil {
+					b.Fatal(err)
+				}
+			}
+		})
+	}
+}
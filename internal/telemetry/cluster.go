@@ -0,0 +1,336 @@
+package telemetry
+
+import (
+	"bytes"
+	"encoding/json"
+	"fmt"
+	"math"
+	"sort"
+	"strings"
+
+	"github.com/spboyer/waza/internal/models"
+)
+
+// DefaultSimilarity is the similarity above which sessions are taken to be
+// near duplicates
+const DefaultSimilarity = 0.7
+
+// Signature layout: the first half summarizes the prompt, the second the
+// sequence of tools called, so the two count equally towards similarity. A
+// session without tool calls leaves its tool half unset; that half is then
+// left out of similarity and banding rather than matching every other such
+// session.
+const (
+	promptHashes  = 64
+	toolHashes    = 64
+	signatureSize = promptHashes + toolHashes
+)
+
+// shingleSize is the length of the character shingles prompts are split into
+const shingleSize = 5
+
+// Sample is the part of a session that clustering and conversion use
+type Sample struct {
+	SessionID string           `json:"session_id"`
+	SkillName string           `json:"skill_name,omitempty"`
+	Prompt    string           `json:"prompt"`
+	Output    string           `json:"output"`
+	ToolCalls []map[string]any `json:"tool_calls"`
+	Success   bool             `json:"success"`
+	Metadata  map[string]any   `json:"metadata,omitempty"`
+}
+
+// Cluster is a group of near-duplicate sessions
+type Cluster struct {
+	// Representative is the session the cluster's task is made from: the
+	// first successful one, or the first one if none succeeded
+	Representative Sample
+	Size           int
+
+	signature []uint32
+}
+
+// Task turns the cluster into an eval task weighted by the number of
+// sessions it stands for. Expected outcomes are left for the author to add.
+func (c *Cluster) Task() models.TestCase {
+	s := c.Representative
+
+	tc := models.TestCase{
+		TestID:      "runtime-" + s.SessionID,
+		DisplayName: "Runtime session " + s.SessionID,
+		Summary:     fmt.Sprintf("Stands for %d similar production session(s)", c.Size),
+		Stimulus: models.TestStimulus{
+			Message:  s.Prompt,
+			Metadata: s.Metadata,
+		},
+		Labels: []string{"runtime"},
+		Weight: float64(c.Size),
+	}
+	if s.SkillName != "" {
+		tc.Labels = append(tc.Labels, s.SkillName)
+	}
+	return tc
+}
+
+// Clusterer groups sessions whose prompts and tool sequences are near
+// duplicates. Each session is summarized by a MinHash signature and looked
+// up by locality-sensitive hashing, so adding a session takes the same time
+// however many came before. Only each cluster's first session keeps its
+// signature, so memory grows with the number of clusters, not sessions.
+type Clusterer struct {
+	similarity float64
+	bands      int
+	rows       int
+	seeds      [signatureSize]uint64
+
+	// buckets maps each band of a signature to the cluster that put it there
+	buckets  []map[uint64]int
+	clusters []*Cluster
+}
+
+// ClusterOption configures a Clusterer
+type ClusterOption func(*Clusterer)
+
+// WithSimilarity sets the estimated Jaccard similarity, between 0 and 1, at
+// which a session joins a cluster
+func WithSimilarity(s float64) ClusterOption {
+	return func(c *Clusterer) {
+		c.similarity = s
+	}
+}
+
+// NewClusterer creates a clusterer
+func NewClusterer(opts ...ClusterOption) *Clusterer {
+	c := &Clusterer{similarity: DefaultSimilarity}
+	for _, opt := range opts {
+		opt(c)
+	}
+
+	c.bands, c.rows = bandsFor(c.similarity)
+	c.buckets = make([]map[uint64]int, c.bands)
+	for i := range c.buckets {
+		c.buckets[i] = make(map[uint64]int)
+	}
+
+	seed := uint64(0x5eed)
+	for i := range c.seeds {
+		seed += 0x9e3779b97f4a7c15
+		c.seeds[i] = mix(seed)
+	}
+	return c
+}
+
+// bandsFor splits signatures into the bands that make candidates of pairs
+// with the given similarity. Pairs share a band with probability
+// 1-(1-s^rows)^bands, which rises steeply around (1/bands)^(1/rows); the most
+// rows that keep that point at or below the threshold are used, and
+// candidates are checked against it.
+func bandsFor(similarity float64) (bands, rows int) {
+	bands, rows = signatureSize, 1
+	for r := 1; r <= signatureSize; r++ {
+		if signatureSize%r != 0 {
+			continue
+		}
+		b := signatureSize / r
+		if math.Pow(1/float64(b), 1/float64(r)) <= similarity {
+			bands, rows = b, r
+		}
+	}
+	return bands, rows
+}
+
+// Add puts a session in the cluster of its most similar near duplicate, or
+// starts a new cluster
+func (c *Clusterer) Add(s *Sample) {
+	sig := c.signature(s)
+
+	keys := make([]uint64, c.bands)
+	empty := make([]bool, c.bands)
+	best, bestSimilarity := -1, 0.0
+	for b := range keys {
+		band := sig[b*c.rows : (b+1)*c.rows]
+		if empty[b] = unset(band); empty[b] {
+			continue
+		}
+		keys[b] = bandKey(band)
+		idx, ok := c.buckets[b][keys[b]]
+		if !ok || idx == best {
+			continue
+		}
+		if sim := similarity(sig, c.clusters[idx].signature); sim >= c.similarity && sim > bestSimilarity {
+			best, bestSimilarity = idx, sim
+		}
+	}
+
+	if best >= 0 {
+		cluster := c.clusters[best]
+		cluster.Size++
+		if s.Success && !cluster.Representative.Success {
+			cluster.Representative = *s
+		}
+		return
+	}
+
+	idx := len(c.clusters)
+	c.clusters = append(c.clusters, &Cluster{Representative: *s, Size: 1, signature: sig})
+	for b, key := range keys {
+		if empty[b] {
+			continue
+		}
+		if _, taken := c.buckets[b][key]; !taken {
+			c.buckets[b][key] = idx
+		}
+	}
+}
+
+// Clusters returns the clusters, largest first
+func (c *Clusterer) Clusters() []*Cluster {
+	clusters := append([]*Cluster(nil), c.clusters...)
+	sort.SliceStable(clusters, func(i, j int) bool { return clusters[i].Size > clusters[j].Size })
+	return clusters
+}
+
+// signature computes a session's MinHash signature
+func (c *Clusterer) signature(s *Sample) []uint32 {
+	sig := make([]uint32, signatureSize)
+	for i := range sig {
+		sig[i] = math.MaxUint32
+	}
+	prompt, tools := sig[:promptHashes], sig[promptHashes:]
+
+	text := strings.ToLower(strings.Join(strings.Fields(s.Prompt), " "))
+	if len(text) <= shingleSize {
+		c.minHash(prompt, c.seeds[:promptHashes], hashString(text))
+	}
+	for i := 0; i+shingleSize <= len(text); i++ {
+		c.minHash(prompt, c.seeds[:promptHashes], hashString(text[i:i+shingleSize]))
+	}
+
+	// each tool, and each pair of consecutive tools
+	prev := "^"
+	for _, call := range s.ToolCalls {
+		name := toolName(call)
+		c.minHash(tools, c.seeds[promptHashes:], hashString("tool:"+name))
+		c.minHash(tools, c.seeds[promptHashes:], hashString("seq:"+prev+">"+name))
+		prev = name
+	}
+	return sig
+}
+
+func (c *Clusterer) minHash(sig []uint32, seeds []uint64, h uint64) {
+	for i, seed := range seeds {
+		if v := uint32(mix(h^seed) >> 32); v < sig[i] {
+			sig[i] = v
+		}
+	}
+}
+
+// similarity estimates the Jaccard similarity of the sessions two
+// signatures were computed from, averaged over the halves that are set in
+// either signature
+func similarity(a, b []uint32) float64 {
+	total, halves := 0.0, 0
+	for _, part := range [][2]int{{0, promptHashes}, {promptHashes, signatureSize}} {
+		x, y := a[part[0]:part[1]], b[part[0]:part[1]]
+		if unset(x) && unset(y) {
+			continue
+		}
+		same := 0
+		for i := range x {
+			if x[i] == y[i] {
+				same++
+			}
+		}
+		total += float64(same) / float64(len(x))
+		halves++
+	}
+	if halves == 0 {
+		return 1
+	}
+	return total / float64(halves)
+}
+
+// unset reports whether no hash was folded into a part of a signature
+func unset(part []uint32) bool {
+	for _, v := range part {
+		if v != math.MaxUint32 {
+			return false
+		}
+	}
+	return true
+}
+
+func toolName(call map[string]any) string {
+	for _, key := range []string{"tool", "name"} {
+		if name, ok := call[key].(string); ok {
+			return name
+		}
+	}
+	return ""
+}
+
+// hashString is 64-bit FNV-1a
+func hashString(s string) uint64 {
+	h := uint64(14695981039346656037)
+	for i := 0; i < len(s); i++ {
+		h ^= uint64(s[i])
+		h *= 1099511628211
+	}
+	return h
+}
+
+func bandKey(band []uint32) uint64 {
+	h := uint64(14695981039346656037)
+	for _, v := range band {
+		h ^= uint64(v)
+		h *= 1099511628211
+	}
+	return h
+}
+
+// mix is the splitmix64 finalizer
+func mix(x uint64) uint64 {
+	x ^= x >> 30
+	x *= 0xbf58476d1ce4e5b9
+	x ^= x >> 27
+	x *= 0x94d049bb133111eb
+	x ^= x >> 31
+	return x
+}
+
+// ReadSamples calls fn with each session in the telemetry files at paths, and
+// under those that are directories, in file name order. With a skill, other
+// skills' sessions are skipped. It returns the number of malformed records
+// skipped.
+func ReadSamples(paths []string, skill string, fn func(*Sample)) (int64, error) {
+	files, err := listFiles(paths)
+	if err != nil {
+		return 0, err
+	}
+
+	var needle []byte
+	if skill != "" {
+		needle, _ = json.Marshal(skill)
+	}
+
+	var malformed int64
+	for _, path := range sortedFiles(files) {
+		_, err := readRecords(path, 0, func(record []byte) {
+			if len(bytes.TrimSpace(record)) == 0 || (needle != nil && !bytes.Contains(record, needle)) {
+				return
+			}
+			var s Sample
+			if err := json.Unmarshal(record, &s); err != nil {
+				malformed++
+				return
+			}
+			if skill == "" || s.SkillName == skill {
+				fn(&s)
+			}
+		})
+		if err != nil {
+			return malformed, fmt.Errorf("%s: %w", path, err)
+		}
+	}
+	return malformed, nil
+}
@@ -0,0 +1,133 @@
+package telemetry
+
+import (
+	"fmt"
+	"path/filepath"
+	"testing"
+
+	"github.com/stretchr/testify/require"
+)
+
+func sample(id, prompt string, success bool, tools ...string) *Sample {
+	s := &Sample{SessionID: id, SkillName: "azure-deploy", Prompt: prompt, Success: success}
+	for _, tool := range tools {
+		s.ToolCalls = append(s.ToolCalls, map[string]any{"tool": tool})
+	}
+	return s
+}
+
+func TestClusterer(t *testing.T) {
+	c := NewClusterer()
+
+	c.Add(sample("1", "Deploy my web app to Azure App Service in the westus region", false, "az", "git"))
+	c.Add(sample("2", "deploy my web app to Azure App Service in the westus region", true, "az", "git"))
+	c.Add(sample("3", "Deploy my  web app to Azure App Service in the westus region!", true, "az", "git"))
+	c.Add(sample("4", "Deploy my web app to Azure App Service in the eastus region", true, "az", "git"))
+	// same prompt, different tools
+	c.Add(sample("5", "Deploy my web app to Azure App Service in the westus region", true, "bicep", "az", "kubectl"))
+	c.Add(sample("6", "Show me the logs of my function app from the last hour", true, "az"))
+
+	clusters := c.Clusters()
+	require.Len(t, clusters, 3)
+
+	require.Equal(t, 4, clusters[0].Size)
+	require.Equal(t, "2", clusters[0].Representative.SessionID, "the first successful session represents the cluster")
+	require.Equal(t, 1, clusters[1].Size)
+	require.Equal(t, "5", clusters[1].Representative.SessionID)
+	require.Equal(t, "6", clusters[2].Representative.SessionID)
+
+	task := clusters[0].Task()
+	require.Equal(t, "runtime-2", task.TestID)
+	require.Equal(t, "deploy my web app to Azure App Service in the westus region", task.Stimulus.Message)
+	require.Equal(t, 4.0, task.Weight)
+	require.Equal(t, []string{"runtime", "azure-deploy"}, task.Labels)
+}
+
+func TestClusterer_Scale(t *testing.T) {
+	templates := []string{
+		"Deploy the %s service to the production cluster",
+		"Why is my %s container restarting every few minutes?",
+		"Create a storage account named %s with geo redundancy",
+		"Rotate the secrets used by %s and restart it",
+	}
+	names := []string{"billing", "checkout", "inventory", "search", "payments"}
+
+	c := NewClusterer()
+	total := 0
+	for i := 0; i < 5000; i++ {
+		tmpl := templates[i%len(templates)]
+		name := names[(i/len(templates))%len(names)]
+		// the same request, phrased with small differences
+		prompt := fmt.Sprintf(tmpl, name)
+		if i%3 == 0 {
+			prompt = "please " + prompt
+		}
+		c.Add(sample(fmt.Sprint(i), prompt, true, "az", "kubectl"))
+		total++
+	}
+
+	clusters := c.Clusters()
+	require.LessOrEqual(t, len(clusters), len(templates)*len(names))
+	sum := 0
+	for _, cl := range clusters {
+		sum += cl.Size
+	}
+	require.Equal(t, total, sum)
+}
+
+func TestBandsFor(t *testing.T) {
+	bands, rows := bandsFor(0.7)
+	require.Equal(t, signatureSize, bands*rows)
+	require.Equal(t, 32, bands)
+	require.Equal(t, 4, rows)
+
+	bands, rows = bandsFor(0.1)
+	require.Equal(t, signatureSize, bands)
+	require.Equal(t, 1, rows)
+}
+
+func TestReadSamples(t *testing.T) {
+	path := filepath.Join(t.TempDir(), "sessions.jsonl")
+	appendLines(t, path, testSession("azure-deploy", true, 10, 2), testSession("other", true, 10, 0))
+	appendText(t, path, `{"skill_name": "azure-deploy", "prompt": `+"\n")
+
+	var samples []*Sample
+	malformed, err := ReadSamples([]string{path}, "azure-deploy", func(s *Sample) { samples = append(samples, s) })
+	require.NoError(t, err)
+	require.Equal(t, int64(1), malformed)
+	require.Len(t, samples, 1)
+	require.Equal(t, "prompt mentioning azure-deploy", samples[0].Prompt)
+	require.Equal(t, "az", toolName(samples[0].ToolCalls[0]))
+}
+
+func BenchmarkClusterer_Add(b *testing.B) {
+	c := NewClusterer()
+	prompts := make([]*Sample, 1000)
+	for i := range prompts {
+		prompts[i] = sample(fmt.Sprint(i), fmt.Sprintf("Deploy service number %d to the production cluster in region %d", i%200, i%7), true, "az", "kubectl")
+	}
+
+	b.ReportAllocs()
+	b.ResetTimer()
+	for i := 0; i < b.N; i++ {
+		c.Add(prompts[i%len(prompts)])
+	}
+}
+
+func TestClusterer_SessionsWithoutTools(t *testing.T) {
+	c := NewClusterer()
+
+	a := sample("1", "Deploy my web app to Azure App Service in the westus region", true)
+	b := sample("2", "Deploy my web app to Azure App Service in the westus region", true)
+	// a different request with similar wording: counting the unset tool
+	// halves as a match would lift it over the threshold
+	other := sample("3", "Deploy my web app to Azure Container Apps in the westus region", true)
+
+	require.Equal(t, 1.0, similarity(c.signature(a), c.signature(b)))
+	require.Less(t, similarity(c.signature(a), c.signature(other)), DefaultSimilarity)
+
+	c.Add(a)
+	c.Add(b)
+	c.Add(other)
+	require.Len(t, c.Clusters(), 2)
+}
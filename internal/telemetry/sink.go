@@ -0,0 +1,323 @@
+package telemetry
+
+import (
+	"bufio"
+	"compress/gzip"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"io"
+	"os"
+	"path/filepath"
+	"sync"
+	"time"
+)
+
+// Sink defaults
+const (
+	DefaultMaxBytes      = 64 << 20
+	DefaultMaxAge        = time.Hour
+	DefaultFlushInterval = time.Second
+)
+
+// filePrefix starts the name of every file a sink writes
+const filePrefix = "sessions"
+
+// errSinkClosed is returned by writes to a closed sink
+var errSinkClosed = errors.New("telemetry sink is closed")
+
+// Sink appends sessions as JSON lines to files in a directory. Writes are
+// buffered and flushed every flush interval. The current file is rotated once
+// it reaches the size limit or the age limit, and rotated files can be
+// gzipped in the background. It is safe for concurrent use.
+type Sink struct {
+	dir           string
+	maxBytes      int64
+	maxAge        time.Duration
+	flushInterval time.Duration
+	compress      bool
+	now           func() time.Time
+
+	mu     sync.Mutex
+	file   *os.File
+	buf    *bufio.Writer
+	count  *countingWriter
+	enc    *json.Encoder
+	opened time.Time
+	seq    int
+	closed bool
+
+	stop chan struct{}
+	done chan struct{}
+
+	compressing sync.WaitGroup
+	errMu       sync.Mutex
+	errs        []error
+}
+
+// SinkOption configures a Sink
+type SinkOption func(*Sink)
+
+// WithMaxBytes rotates files once they hold n bytes
+func WithMaxBytes(n int64) SinkOption {
+	return func(s *Sink) {
+		s.maxBytes = n
+	}
+}
+
+// WithMaxAge rotates files once they have been open for d
+func WithMaxAge(d time.Duration) SinkOption {
+	return func(s *Sink) {
+		s.maxAge = d
+	}
+}
+
+// WithFlushInterval sets how often buffered sessions are written out; 0
+// leaves them buffered until the buffer fills, Flush or Close
+func WithFlushInterval(d time.Duration) SinkOption {
+	return func(s *Sink) {
+		s.flushInterval = d
+	}
+}
+
+// WithCompression gzips rotated files
+func WithCompression() SinkOption {
+	return func(s *Sink) {
+		s.compress = true
+	}
+}
+
+// NewSink creates a sink writing to dir. Files are named
+// sessions-<UTC start time>-<n>.jsonl, with a .gz suffix once compressed.
+func NewSink(dir string, opts ...SinkOption) (*Sink, error) {
+	s := &Sink{
+		dir:           dir,
+		maxBytes:      DefaultMaxBytes,
+		maxAge:        DefaultMaxAge,
+		flushInterval: DefaultFlushInterval,
+		now:           time.Now,
+		stop:          make(chan struct{}),
+		done:          make(chan struct{}),
+	}
+	for _, opt := range opts {
+		opt(s)
+	}
+
+	if err := os.MkdirAll(dir, 0755); err != nil {
+		return nil, fmt.Errorf("failed to create telemetry directory: %w", err)
+	}
+
+	if s.flushInterval > 0 {
+		go s.flushLoop()
+	} else {
+		close(s.done)
+	}
+	return s, nil
+}
+
+// Write appends a session
+func (s *Sink) Write(session *Session) error {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	if s.closed {
+		return errSinkClosed
+	}
+
+	if s.file != nil && s.expired() {
+		if err := s.rotate(); err != nil {
+			return err
+		}
+	}
+	if s.file == nil {
+		if err := s.open(); err != nil {
+			return err
+		}
+	}
+
+	if err := s.enc.Encode(session); err != nil {
+		return err
+	}
+	if s.maxBytes > 0 && s.count.n >= s.maxBytes {
+		return s.rotate()
+	}
+	return nil
+}
+
+// Flush writes out buffered sessions
+func (s *Sink) Flush() error {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+
+	if s.buf == nil {
+		return nil
+	}
+	return s.buf.Flush()
+}
+
+// Close flushes and closes the current file, compressing it when enabled,
+// and waits for compression to finish. The error includes any failure to
+// flush or compress in the background since the sink was created.
+func (s *Sink) Close() error {
+	s.mu.Lock()
+	if s.closed {
+		s.mu.Unlock()
+		return nil
+	}
+	s.closed = true
+	s.mu.Unlock()
+
+	if s.flushInterval > 0 {
+		close(s.stop)
+	}
+	<-s.done
+
+	s.mu.Lock()
+	var err error
+	if s.file != nil {
+		err = s.rotate()
+	}
+	s.mu.Unlock()
+
+	s.compressing.Wait()
+
+	s.errMu.Lock()
+	defer s.errMu.Unlock()
+	return errors.Join(append([]error{err}, s.errs...)...)
+}
+
+// flushLoop flushes the buffer and closes expired files every flush interval
+func (s *Sink) flushLoop() {
+	defer close(s.done)
+
+	ticker := time.NewTicker(s.flushInterval)
+	defer ticker.Stop()
+
+	for {
+		select {
+		case <-s.stop:
+			return
+		case <-ticker.C:
+		}
+
+		s.mu.Lock()
+		var err error
+		switch {
+		case s.file == nil:
+		case s.expired():
+			err = s.rotate()
+		default:
+			err = s.buf.Flush()
+		}
+		s.mu.Unlock()
+
+		if err != nil {
+			s.fail(err)
+		}
+	}
+}
+
+func (s *Sink) expired() bool {
+	return s.maxAge > 0 && s.now().Sub(s.opened) >= s.maxAge
+}
+
+// open starts a new file. Names never repeat, so a rotated file is never
+// appended to, even by a later process.
+func (s *Sink) open() error {
+	s.opened = s.now()
+	stamp := s.opened.UTC().Format("20060102T150405Z")
+
+	for {
+		s.seq++
+		path := filepath.Join(s.dir, fmt.Sprintf("%s-%s-%d.jsonl", filePrefix, stamp, s.seq))
+		if _, err := os.Stat(path + ".gz"); err == nil {
+			continue
+		}
+
+		f, err := os.OpenFile(path, os.O_CREATE|os.O_EXCL|os.O_WRONLY, 0644)
+		if errors.Is(err, os.ErrExist) {
+			continue
+		}
+		if err != nil {
+			return err
+		}
+
+		s.file = f
+		s.buf = bufio.NewWriter(f)
+		s.count = &countingWriter{w: s.buf}
+		s.enc = json.NewEncoder(s.count)
+		return nil
+	}
+}
+
+// rotate closes the current file and hands it to the compressor
+func (s *Sink) rotate() error {
+	path := s.file.Name()
+	err := errors.Join(s.buf.Flush(), s.file.Close())
+	s.file, s.buf, s.count, s.enc = nil, nil, nil, nil
+	if err != nil {
+		return err
+	}
+
+	if s.compress {
+		s.compressing.Add(1)
+		go func() {
+			defer s.compressing.Done()
+			if err := compressFile(path); err != nil {
+				s.fail(err)
+			}
+		}()
+	}
+	return nil
+}
+
+func (s *Sink) fail(err error) {
+	s.errMu.Lock()
+	s.errs = append(s.errs, err)
+	s.errMu.Unlock()
+}
+
+// compressFile replaces path with path.gz. The compressed file only appears
+// under its final name once it is complete.
+func compressFile(path string) error {
+	tmp := path + ".gz.tmp"
+	if err := gzipFile(path, tmp); err != nil {
+		_ = os.Remove(tmp)
+		return fmt.Errorf("failed to compress %s: %w", path, err)
+	}
+	if err := os.Rename(tmp, path+".gz"); err != nil {
+		return err
+	}
+	return os.Remove(path)
+}
+
+func gzipFile(src, dst string) (err error) {
+	in, err := os.Open(src)
+	if err != nil {
+		return err
+	}
+	defer func() { err = errors.Join(err, in.Close()) }()
+
+	out, err := os.Create(dst)
+	if err != nil {
+		return err
+	}
+	defer func() { err = errors.Join(err, out.Close()) }()
+
+	zw := gzip.NewWriter(out)
+	if _, err := io.Copy(zw, in); err != nil {
+		return err
+	}
+	return zw.Close()
+}
+
+type countingWriter struct {
+	w io.Writer
+	n int64
+}
+
+func (c *countingWriter) Write(p []byte) (int, error) {
+	n, err := c.w.Write(p)
+	c.n += int64(n)
+	return n, err
+}
@@ -0,0 +1,147 @@
+package telemetry
+
+import (
+	"bufio"
+	"compress/gzip"
+	"encoding/json"
+	"errors"
+	"io"
+	"os"
+	"path/filepath"
+	"sort"
+	"strings"
+	"testing"
+	"time"
+
+	"github.com/stretchr/testify/require"
+)
+
+// readSessions reads every session written to dir, compressed or not
+func readSessions(t *testing.T, dir string) []Session {
+	t.Helper()
+
+	entries, err := os.ReadDir(dir)
+	require.NoError(t, err)
+
+	var sessions []Session
+	for _, entry := range entries {
+		f, err := os.Open(filepath.Join(dir, entry.Name()))
+		require.NoError(t, err)
+
+		var r io.Reader = f
+		if strings.HasSuffix(entry.Name(), ".gz") {
+			zr, err := gzip.NewReader(f)
+			require.NoError(t, err)
+			r = zr
+		}
+
+		lines := bufio.NewScanner(r)
+		lines.Buffer(nil, 1<<20)
+		for lines.Scan() {
+			var s Session
+			require.NoError(t, json.Unmarshal(lines.Bytes(), &s))
+			sessions = append(sessions, s)
+		}
+		require.NoError(t, lines.Err())
+		require.NoError(t, f.Close())
+	}
+	return sessions
+}
+
+func fileNames(t *testing.T, dir string) []string {
+	t.Helper()
+
+	entries, err := os.ReadDir(dir)
+	require.NoError(t, err)
+
+	var names []string
+	for _, entry := range entries {
+		names = append(names, entry.Name())
+	}
+	sort.Strings(names)
+	return names
+}
+
+func TestSink_RotatesBySize(t *testing.T) {
+	dir := t.TempDir()
+	sink, err := NewSink(dir, WithMaxBytes(1024), WithCompression(), WithFlushInterval(0))
+	require.NoError(t, err)
+
+	for i := 0; i < 20; i++ {
+		require.NoError(t, sink.Write(&Session{SessionID: "s", Prompt: strings.Repeat("x", 200)}))
+	}
+	require.NoError(t, sink.Close())
+	require.ErrorIs(t, sink.Write(&Session{}), errSinkClosed)
+	require.NoError(t, sink.Close())
+
+	names := fileNames(t, dir)
+	require.Greater(t, len(names), 3)
+	for _, name := range names {
+		require.True(t, strings.HasPrefix(name, "sessions-"), name)
+		require.True(t, strings.HasSuffix(name, ".jsonl.gz"), name)
+	}
+	require.Len(t, readSessions(t, dir), 20)
+}
+
+func TestSink_RotatesByAge(t *testing.T) {
+	dir := t.TempDir()
+	sink, err := NewSink(dir, WithMaxAge(time.Minute), WithFlushInterval(0))
+	require.NoError(t, err)
+
+	now := time.Date(2026, 1, 31, 12, 0, 0, 0, time.UTC)
+	sink.now = func() time.Time { return now }
+
+	require.NoError(t, sink.Write(&Session{SessionID: "a"}))
+	now = now.Add(30 * time.Second)
+	require.NoError(t, sink.Write(&Session{SessionID: "b"}))
+	now = now.Add(time.Minute)
+	require.NoError(t, sink.Write(&Session{SessionID: "c"}))
+	require.NoError(t, sink.Close())
+
+	require.Equal(t, []string{
+		"sessions-20260131T120000Z-1.jsonl",
+		"sessions-20260131T120130Z-2.jsonl",
+	}, fileNames(t, dir))
+	require.Len(t, readSessions(t, dir), 3)
+}
+
+func TestSink_FlushesInBackground(t *testing.T) {
+	dir := t.TempDir()
+	sink, err := NewSink(dir, WithFlushInterval(10*time.Millisecond))
+	require.NoError(t, err)
+	defer func() { require.NoError(t, sink.Close()) }()
+
+	require.NoError(t, sink.Write(&Session{SessionID: "a"}))
+	require.Eventually(t, func() bool {
+		return len(readSessions(t, dir)) == 1
+	}, time.Second, 10*time.Millisecond)
+}
+
+func TestSink_NeverReusesNames(t *testing.T) {
+	dir := t.TempDir()
+	now := time.Date(2026, 1, 31, 12, 0, 0, 0, time.UTC)
+
+	for i := 0; i < 2; i++ {
+		sink, err := NewSink(dir, WithCompression(), WithFlushInterval(0))
+		require.NoError(t, err)
+		sink.now = func() time.Time { return now }
+		require.NoError(t, sink.Write(&Session{SessionID: "a"}))
+		require.NoError(t, sink.Close())
+	}
+
+	require.Equal(t, []string{
+		"sessions-20260131T120000Z-1.jsonl.gz",
+		"sessions-20260131T120000Z-2.jsonl.gz",
+	}, fileNames(t, dir))
+}
+
+func TestSink_EncodeError(t *testing.T) {
+	sink, err := NewSink(t.TempDir(), WithFlushInterval(0))
+	require.NoError(t, err)
+
+	err = sink.Write(&Session{Metadata: map[string]any{"bad": make(chan int)}})
+	var unsupported *json.UnsupportedTypeError
+	require.True(t, errors.As(err, &unsupported))
+	require.NoError(t, sink.Write(&Session{SessionID: "ok"}))
+	require.NoError(t, sink.Close())
+}
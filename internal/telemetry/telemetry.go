@@ -0,0 +1,186 @@
+// Package telemetry records skill sessions from production runtimes. A
+// Collector holds each session in memory only while it is open; ended
+// sessions are either kept for a later Export or streamed to a rotating
+// Sink as JSON lines, so a long-running service's memory is bounded by its
+// open sessions.
+package telemetry
+
+import (
+	"crypto/rand"
+	"encoding/hex"
+	"encoding/json"
+	"fmt"
+	"os"
+	"path/filepath"
+	"sync"
+	"time"
+)
+
+// Event types with a meaning to the collector
+const (
+	EventSkillInvoked = "skill.invoked"
+	EventToolCalled   = "tool.called"
+)
+
+// Event is one thing that happened during a session
+type Event struct {
+	Timestamp time.Time      `json:"timestamp"`
+	EventType string         `json:"event_type"`
+	SkillName string         `json:"skill_name,omitempty"`
+	Data      map[string]any `json:"data,omitempty"`
+	SessionID string         `json:"session_id"`
+}
+
+// Session is one invocation of a skill, from prompt to output
+type Session struct {
+	SessionID string           `json:"session_id"`
+	StartTime time.Time        `json:"start_time"`
+	EndTime   *time.Time       `json:"end_time"`
+	SkillName string           `json:"skill_name,omitempty"`
+	Prompt    string           `json:"prompt"`
+	Output    string           `json:"output"`
+	Events    []Event          `json:"events"`
+	ToolCalls []map[string]any `json:"tool_calls"`
+	Success   bool             `json:"success"`
+	Error     string           `json:"error,omitempty"`
+	Metadata  map[string]any   `json:"metadata,omitempty"`
+}
+
+// Collector records sessions. It is safe for concurrent use.
+type Collector struct {
+	sink *Sink
+	now  func() time.Time
+
+	mu    sync.Mutex
+	open  map[string]*Session
+	ended []*Session
+}
+
+// Option configures a Collector
+type Option func(*Collector)
+
+// WithSink streams ended sessions to sink instead of keeping them in memory
+func WithSink(sink *Sink) Option {
+	return func(c *Collector) {
+		c.sink = sink
+	}
+}
+
+// NewCollector creates a collector
+func NewCollector(opts ...Option) *Collector {
+	c := &Collector{
+		now:  time.Now,
+		open: make(map[string]*Session),
+	}
+	for _, opt := range opts {
+		opt(c)
+	}
+	return c
+}
+
+// StartSession opens a session and returns its ID
+func (c *Collector) StartSession(prompt string, metadata map[string]any) string {
+	s := &Session{
+		SessionID: newSessionID(),
+		StartTime: c.now(),
+		Prompt:    prompt,
+		Metadata:  metadata,
+	}
+
+	c.mu.Lock()
+	c.open[s.SessionID] = s
+	c.mu.Unlock()
+
+	return s.SessionID
+}
+
+// RecordEvent adds an event to an open session. A skill.invoked event names
+// the session's skill and a tool.called event's data is kept as a tool call.
+func (c *Collector) RecordEvent(sessionID, eventType, skillName string, data map[string]any) error {
+	event := Event{
+		Timestamp: c.now(),
+		EventType: eventType,
+		SkillName: skillName,
+		Data:      data,
+		SessionID: sessionID,
+	}
+
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	s, ok := c.open[sessionID]
+	if !ok {
+		return fmt.Errorf("no open session %s", sessionID)
+	}
+
+	s.Events = append(s.Events, event)
+	if eventType == EventSkillInvoked && skillName != "" && s.SkillName == "" {
+		s.SkillName = skillName
+	}
+	if eventType == EventToolCalled && data != nil {
+		s.ToolCalls = append(s.ToolCalls, data)
+	}
+	return nil
+}
+
+// EndSession closes a session. With a sink the session is written to it and
+// dropped from memory; otherwise it is kept until Export.
+func (c *Collector) EndSession(sessionID, output string, success bool, errMsg string) error {
+	end := c.now()
+
+	c.mu.Lock()
+	s, ok := c.open[sessionID]
+	if !ok {
+		c.mu.Unlock()
+		return fmt.Errorf("no open session %s", sessionID)
+	}
+	delete(c.open, sessionID)
+
+	s.EndTime = &end
+	s.Output = output
+	s.Success = success
+	s.Error = errMsg
+
+	if c.sink == nil {
+		c.ended = append(c.ended, s)
+	}
+	c.mu.Unlock()
+
+	if c.sink != nil {
+		return c.sink.Write(s)
+	}
+	return nil
+}
+
+// OpenSessions returns how many sessions have started and not ended
+func (c *Collector) OpenSessions() int {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	return len(c.open)
+}
+
+// Export writes the ended sessions held in memory to path as a JSON array.
+// A collector with a sink holds none.
+func (c *Collector) Export(path string) error {
+	c.mu.Lock()
+	sessions := c.ended
+	if sessions == nil {
+		sessions = []*Session{}
+	}
+	data, err := json.MarshalIndent(sessions, "", "  ")
+	c.mu.Unlock()
+	if err != nil {
+		return err
+	}
+
+	if err := os.MkdirAll(filepath.Dir(path), 0755); err != nil {
+		return err
+	}
+	return os.WriteFile(path, data, 0644)
+}
+
+func newSessionID() string {
+	var b [8]byte
+	_, _ = rand.Read(b[:])
+	return hex.EncodeToString(b[:])
+}
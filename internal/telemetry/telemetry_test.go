@@ -0,0 +1,110 @@
+package telemetry
+
+import (
+	"encoding/json"
+	"fmt"
+	"os"
+	"path/filepath"
+	"sync"
+	"testing"
+
+	"github.com/stretchr/testify/require"
+)
+
+func TestCollector_Export(t *testing.T) {
+	c := NewCollector()
+
+	id := c.StartSession("Deploy my app", map[string]any{"environment": "production"})
+	require.NoError(t, c.RecordEvent(id, EventSkillInvoked, "azure-deploy", nil))
+	require.NoError(t, c.RecordEvent(id, EventToolCalled, "", map[string]any{"tool": "az"}))
+	require.NoError(t, c.RecordEvent(id, "tool.completed", "", map[string]any{"tool": "az", "success": true}))
+	require.Equal(t, 1, c.OpenSessions())
+
+	require.NoError(t, c.EndSession(id, "Deployed", true, ""))
+	require.Equal(t, 0, c.OpenSessions())
+	require.ErrorContains(t, c.RecordEvent(id, "late", "", nil), "no open session")
+	require.ErrorContains(t, c.EndSession(id, "", false, ""), "no open session")
+
+	path := filepath.Join(t.TempDir(), "telemetry", "sessions.json")
+	require.NoError(t, c.Export(path))
+
+	data, err := os.ReadFile(path)
+	require.NoError(t, err)
+	var sessions []Session
+	require.NoError(t, json.Unmarshal(data, &sessions))
+	require.Len(t, sessions, 1)
+
+	s := sessions[0]
+	require.Equal(t, id, s.SessionID)
+	require.Equal(t, "azure-deploy", s.SkillName)
+	require.Equal(t, "Deployed", s.Output)
+	require.True(t, s.Success)
+	require.NotNil(t, s.EndTime)
+	require.Len(t, s.Events, 3)
+	require.Equal(t, []map[string]any{{"tool": "az"}}, s.ToolCalls)
+	require.Equal(t, "production", s.Metadata["environment"])
+}
+
+func TestCollector_ExportEmpty(t *testing.T) {
+	path := filepath.Join(t.TempDir(), "sessions.json")
+	require.NoError(t, NewCollector().Export(path))
+
+	data, err := os.ReadFile(path)
+	require.NoError(t, err)
+	require.Equal(t, "[]", string(data))
+}
+
+func TestCollector_Sink(t *testing.T) {
+	dir := t.TempDir()
+	sink, err := NewSink(dir, WithMaxBytes(4096), WithCompression())
+	require.NoError(t, err)
+	c := NewCollector(WithSink(sink))
+
+	var wg sync.WaitGroup
+	for w := 0; w < 8; w++ {
+		wg.Add(1)
+		go func(w int) {
+			defer wg.Done()
+			for i := 0; i < 50; i++ {
+				id := c.StartSession(fmt.Sprintf("prompt %d-%d", w, i), nil)
+				if err := c.RecordEvent(id, EventSkillInvoked, "skill", nil); err != nil {
+					t.Error(err)
+				}
+				if err := c.EndSession(id, "done", i%2 == 0, ""); err != nil {
+					t.Error(err)
+				}
+			}
+		}(w)
+	}
+	wg.Wait()
+
+	require.Equal(t, 0, c.OpenSessions())
+	require.NoError(t, c.Export(filepath.Join(t.TempDir(), "out.json")))
+	require.NoError(t, sink.Close())
+
+	sessions := readSessions(t, dir)
+	require.Len(t, sessions, 400)
+	for _, s := range sessions {
+		require.Equal(t, "skill", s.SkillName)
+	}
+}
+
+func BenchmarkCollector_RecordEvent(b *testing.B) {
+	c := NewCollector()
+	data := map[string]any{"tool": "az", "args": []string{"webapp", "create"}}
+
+	b.ReportAllocs()
+	b.RunParallel(func(pb *testing.PB) {
+		id := c.StartSession("prompt", nil)
+		for i := 0; pb.Next(); i++ {
+			// keep sessions a realistic size
+			if i%100 == 99 {
+				_ = c.EndSession(id, "", true, "")
+				id = c.StartSession("prompt", nil)
+			}
+			if err := c.RecordEvent(id, EventToolCalled, "", data); err != nil {
+				b.Fatal(err)
+			}
+		}
+	})
+}